@@ -0,0 +1,120 @@
+"""
+Incrementally maintained account balances.
+Triggers on the transactions table apply every insert, update and delete to
+accounts_present.balance inside the writing transaction, so a balance read is
+a single row lookup however long the account's history is. Balances are kept
+rounded to the paisa so floating point error does not accumulate.
+
+Usage (from the backend directory):
+    python -m app.database.balances verify
+    python -m app.database.balances repair
+"""
+
+import sys
+from typing import Dict, List
+from sqlalchemy.engine import Connection
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ACCOUNTS_TABLE = "accounts_present"
+
+# Balances closer than this to the recomputed value are not reported as drift
+TOLERANCE = 0.005
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ACCOUNTS_TABLE}_txn_ai AFTER INSERT ON transactions BEGIN
+        UPDATE {ACCOUNTS_TABLE} SET balance = round(balance + new.amount, 2) WHERE cc_id = new.account_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ACCOUNTS_TABLE}_txn_ad AFTER DELETE ON transactions BEGIN
+        UPDATE {ACCOUNTS_TABLE} SET balance = round(balance - old.amount, 2) WHERE cc_id = old.account_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ACCOUNTS_TABLE}_txn_au
+    AFTER UPDATE OF amount, account_id ON transactions BEGIN
+        UPDATE {ACCOUNTS_TABLE} SET balance = round(balance - old.amount, 2) WHERE cc_id = old.account_id;
+        UPDATE {ACCOUNTS_TABLE} SET balance = round(balance + new.amount, 2) WHERE cc_id = new.account_id;
+    END
+    """,
+]
+
+# Every account with its stored balance and the balance recomputed from the
+# ledger, in one grouped pass over transactions
+_EXPECTED = f"""
+    SELECT a.id, a.cc_id, a.balance,
+           round(a.opening_balance + coalesce(ledger.total, 0), 2) AS expected
+    FROM {ACCOUNTS_TABLE} AS a
+    LEFT JOIN (
+        SELECT account_id, sum(amount) AS total FROM transactions GROUP BY account_id
+    ) AS ledger ON ledger.account_id = a.cc_id
+"""
+
+def install_balances(conn: Connection) -> None:
+    """
+    Create the balance triggers if missing.
+
+    Args:
+        conn (Connection): Sync connection (use run_sync from async code)
+    """
+    for statement in _TRIGGERS:
+        conn.exec_driver_sql(statement)
+
+def verify_balances(conn: Connection, repair: bool = False) -> Dict[str, object]:
+    """
+    Recompute every balance from the ledger and report drift.
+
+    Args:
+        conn (Connection): Sync connection
+        repair (bool): Overwrite drifted balances with the recomputed values
+
+    Returns:
+        Dict[str, object]: accounts checked, drifted accounts (id, cc_id, stored,
+            expected, drift) and whether they were repaired
+    """
+    rows = conn.exec_driver_sql(_EXPECTED).all()
+    drifted: List[Dict[str, object]] = [
+        {
+            "id": row.id,
+            "cc_id": row.cc_id,
+            "stored": row.balance,
+            "expected": row.expected,
+            "drift": round(row.balance - row.expected, 6),
+        }
+        for row in rows if abs(row.balance - row.expected) > TOLERANCE
+    ]
+    if drifted:
+        logger.warning(f"{len(drifted)} of {len(rows)} account balances drifted from the ledger")
+    if repair and drifted:
+        conn.exec_driver_sql(f"""
+            UPDATE {ACCOUNTS_TABLE} SET balance = expected.expected
+            FROM ({_EXPECTED}) AS expected
+            WHERE {ACCOUNTS_TABLE}.id = expected.id
+              AND abs({ACCOUNTS_TABLE}.balance - expected.expected) > {TOLERANCE}
+        """)
+    return {"accounts": len(rows), "drifted": drifted, "repaired": bool(repair and drifted)}
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from .database import engine, init_db_sync
+
+    if argv not in (["verify"], ["repair"]):
+        print("usage: python -m app.database.balances verify|repair")
+        return 2
+    engine.echo = False
+    init_db_sync()
+    with engine.begin() as conn:
+        report = verify_balances(conn, repair=argv == ["repair"])
+    for item in report["drifted"]:
+        print(f"{item['cc_id']:20}  stored {item['stored']:>16.2f}  expected {item['expected']:>16.2f}")
+    print(f"{report['accounts']} accounts checked, {len(report['drifted'])} drifted"
+          + (", repaired" if report["repaired"] else ""))
+    return 1 if report["drifted"] and not report["repaired"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
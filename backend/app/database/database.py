@@ -4,11 +4,17 @@ Implements database session management and connection pooling.
 """
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
+from typing import AsyncIterator
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import logging
+from .storage import load_profile, apply_pragmas
+from .write_queue import WriteQueue, WriteJob
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,21 +22,119 @@ logger = logging.getLogger(__name__)
 
 # Get the current directory
 current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-database_path = os.path.join(current_dir, '..', 'database', 'files.db')
+database_path = os.getenv(
+    "BDMS_DATABASE_PATH",
+    os.path.join(current_dir, '..', 'database', 'files.db')
+)
 
 # Database URL configuration
 DATABASE_URL = f"sqlite:///{database_path}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{database_path}"
+
+# SQLite tuning (journal mode, fsync level, caches, pooling, writer queue)
+storage_profile = load_profile()
+
+# Log every SQL statement (off by default: echo costs more than the queries on hot paths)
+sql_echo = os.getenv("BDMS_SQL_ECHO", "false").lower() in ("1", "true", "yes", "on")
+
+def _apply_storage_profile(dbapi_connection, connection_record):
+    """Apply the storage profile PRAGMAs to every new connection."""
+    apply_pragmas(dbapi_connection, storage_profile)
+
+def _configure_writer_connection(dbapi_connection, connection_record):
+    """
+    Apply the storage profile and take over transaction control from the driver,
+    so SAVEPOINTs work and each batch starts with BEGIN IMMEDIATE.
+    """
+    apply_pragmas(dbapi_connection, storage_profile)
+    dbapi_connection.isolation_level = None
+
+def _begin_immediate(conn):
+    """Take the write lock up front instead of upgrading mid-transaction."""
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+def create_read_engine(url: str) -> AsyncEngine:
+    """
+    Create an async engine with a read connection pool sized by the storage profile.
 
-# Create SQLAlchemy engine
+    Args:
+        url (str): aiosqlite database URL
+
+    Returns:
+        AsyncEngine: Engine applying the storage profile to every connection
+    """
+    read_engine = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=storage_profile.read_pool_size,
+        max_overflow=storage_profile.read_pool_overflow,
+        echo=sql_echo
+    )
+    event.listen(read_engine.sync_engine, "connect", _apply_storage_profile)
+    return read_engine
+
+def create_writer_engine(url: str) -> AsyncEngine:
+    """
+    Create an async engine with exactly one connection, for a write queue.
+
+    Args:
+        url (str): aiosqlite database URL
+
+    Returns:
+        AsyncEngine: Engine whose transactions start with BEGIN IMMEDIATE
+    """
+    single_writer_engine = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        echo=sql_echo
+    )
+    event.listen(single_writer_engine.sync_engine, "connect", _configure_writer_connection)
+    event.listen(single_writer_engine.sync_engine, "begin", _begin_immediate)
+    return single_writer_engine
+
+# Create SQLAlchemy engine (used by scripts and maintenance tasks)
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},  # Needed for SQLite
-    echo=True  # Log all SQL queries
+    echo=sql_echo
 )
+event.listen(engine, "connect", _apply_storage_profile)
+
+# Create async SQLAlchemy engine (used by the API request path for reads)
+async_engine = create_read_engine(ASYNC_DATABASE_URL)
+
+# Create the dedicated writer engine: exactly one connection, fed by write_queue
+writer_engine = create_writer_engine(ASYNC_DATABASE_URL)
 
 # SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# AsyncSessionLocal class for async database sessions.
+# Objects stay usable after commit so services can return them to the router.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# WriterSessionLocal class for sessions on the single writer connection
+WriterSessionLocal = async_sessionmaker(
+    bind=writer_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Queue serializing and group-committing all API writes
+write_queue = WriteQueue(
+    WriterSessionLocal,
+    max_batch=storage_profile.writer_max_batch,
+    linger_ms=storage_profile.writer_linger_ms
+)
+
 Base = declarative_base()
 
 @contextmanager
@@ -47,7 +151,7 @@ def get_db_session() -> Session:
     """
     session = SessionLocal()
     try:
-        logger.info("Creating new database session")
+        logger.debug("Creating new database session")
         yield session
         session.commit()
     except Exception as e:
@@ -55,21 +159,148 @@ def get_db_session() -> Session:
         session.rollback()
         raise
     finally:
-        logger.info("Closing database session")
+        logger.debug("Closing database session")
         session.close()
 
-def get_db():
+@asynccontextmanager
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Async context manager for database sessions.
+    Runs all database I/O off the event loop through aiosqlite.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    
+    Raises:
+        Exception: Any database-related exceptions that occur during session use
+    """
+    session = AsyncSessionLocal()
+    try:
+        logger.debug("Creating new async database session")
+        yield session
+        await session.commit()
+    except Exception as e:
+        logger.error(f"Database session error: {str(e)}")
+        await session.rollback()
+        raise
+    finally:
+        logger.debug("Closing async database session")
+        await session.close()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
     Dependency injection function for FastAPI.
-    Creates a new database session for each request.
+    Creates a new async database session for each request.
     
     Yields:
-        Session: SQLAlchemy database session
+        AsyncSession: SQLAlchemy async database session
     """
-    with get_db_session() as session:
+    async with get_async_db_session() as session:
         yield session
 
-def init_db():
+async def run_write(db: AsyncSession, job: WriteJob):
+    """
+    Execute a write job according to the storage profile.
+    With the single writer enabled the job is queued and group-committed on the
+    writer connection; otherwise it runs on the request session and commits there.
+    The job should flush, not commit.
+    
+    Args:
+        db (AsyncSession): Request database session
+        job (WriteJob): Coroutine function receiving the session to write with
+    
+    Returns:
+        Any: Whatever the job returned, after it has been committed
+    """
+    if storage_profile.single_writer:
+        return await write_queue.submit(job)
+    try:
+        result = await job(db)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return result
+
+def _add_missing_columns(conn, table) -> None:
+    """
+    Add nullable columns declared on a mapped table but missing from the database.
+
+    Args:
+        conn: SQLAlchemy sync connection
+        table: Mapped table
+    """
+    existing = {row[1] for row in conn.exec_driver_sql(f'PRAGMA table_info("{table.name}")')}
+    for column in table.columns:
+        if column.name in existing or not column.nullable:
+            continue
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN {column.name} {column_type}')
+        logger.info(f"Added column {table.name}.{column.name}")
+
+def _create_tables(conn, tables) -> None:
+    """
+    Create tables, then add the optional columns and indexes declared since
+    an existing table was created (create_all skips tables that exist).
+    Indexes use IF NOT EXISTS rather than checkfirst, which cannot see
+    expression indexes.
+
+    Args:
+        conn: SQLAlchemy sync connection
+        tables: Mapped tables, in dependency order
+    """
+    Base.metadata.create_all(bind=conn, tables=tables)
+    for table in tables:
+        _add_missing_columns(conn, table)
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+def create_file_schema(conn) -> None:
+    """
+    Create the file record tables with their search, facet, hash and
+    tombstone structures on a sync connection (used for department partitions).
+
+    Args:
+        conn: SQLAlchemy sync connection (use run_sync from async code)
+    """
+    from .models import FileRecord, FileFacet, FileTombstone
+    from .fts import install_fts
+    from .facets import install_facets
+    from .hashes import install_hashes
+    from .tombstones import install_tombstones
+
+    _create_tables(conn, [FileRecord.__table__, FileFacet.__table__, FileTombstone.__table__])
+    install_fts(conn)
+    install_facets(conn)
+    install_hashes(conn)
+    install_tombstones(conn)
+
+def create_schema(conn) -> None:
+    """
+    Create all tables, indexes and auxiliary structures on a sync connection.
+
+    Args:
+        conn: SQLAlchemy sync connection (use run_sync from async code)
+    """
+    from . import models  # noqa: F401  (registers the mapped tables on Base)
+    from .fts import install_fts
+    from .facets import install_facets
+    from .hashes import install_hashes
+    from .tombstones import install_tombstones
+    from .rollups import install_rollups
+    from .balances import install_balances
+    from .reports import install_reports
+
+    _create_tables(conn, Base.metadata.sorted_tables)
+    install_fts(conn)
+    install_facets(conn)
+    install_hashes(conn)
+    install_tombstones(conn)
+    install_rollups(conn)
+    install_balances(conn)
+    install_reports(conn)
+
+async def init_db():
     """
     Initialize the database by creating all tables.
     Should be called when application starts.
@@ -78,8 +309,34 @@ def init_db():
         logger.info("Initializing database tables")
         # Ensure the database directory exists
         os.makedirs(os.path.dirname(database_path), exist_ok=True)
-        Base.metadata.create_all(bind=engine)
+        async with writer_engine.begin() as conn:
+            await conn.run_sync(create_schema)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
+
+def init_db_sync():
+    """
+    Synchronous variant of init_db for command line tools and scripts.
+    """
+    try:
+        logger.info("Initializing database tables")
+        os.makedirs(os.path.dirname(database_path), exist_ok=True)
+        with engine.begin() as conn:
+            create_schema(conn)
+        logger.info("Database tables created successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {str(e)}")
+        raise
+
+async def close_db():
+    """
+    Dispose of pooled connections.
+    Should be called when application shuts down.
+    """
+    logger.info("Disposing database engines")
+    await write_queue.close()
+    await writer_engine.dispose()
+    await async_engine.dispose()
+    engine.dispose()
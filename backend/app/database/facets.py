@@ -0,0 +1,112 @@
+"""
+Incrementally maintained file facets.
+Triggers on the ByteDB table keep file_facets (one row per department, owner,
+file type and access level) in step with every insert, update and delete, so
+the filter sidebar never has to group the file table.
+
+Usage (from the backend directory):
+    python -m app.database.facets rebuild
+"""
+
+import sys
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FACET_TABLE = "file_facets"
+
+# Facet dimensions, in primary key order
+FACET_COLUMNS = ("department", "owner", "file_type", "access_level")
+
+def _key(row: str) -> str:
+    """Facet key of a ByteDB row, with NULL stored as ''."""
+    return ", ".join(f"coalesce({row}.{column}, '')" for column in FACET_COLUMNS)
+
+def _apply(row: str, sign: str) -> str:
+    """UPSERT adding (sign=+) or removing (sign=-) one file from its facet row."""
+    return f"""
+        INSERT INTO {FACET_TABLE} ({', '.join(FACET_COLUMNS)}, file_count, total_size)
+        VALUES ({_key(row)}, {sign}1, {sign}{row}.file_size)
+        ON CONFLICT ({', '.join(FACET_COLUMNS)}) DO UPDATE SET
+            file_count = file_count + excluded.file_count,
+            total_size = total_size + excluded.total_size;
+    """
+
+_PRUNE = f"""
+        DELETE FROM {FACET_TABLE}
+        WHERE ({', '.join(FACET_COLUMNS)}) = ({_key('old')}) AND file_count <= 0;
+"""
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FACET_TABLE}_ai AFTER INSERT ON ByteDB BEGIN
+        {_apply('new', '+')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FACET_TABLE}_ad AFTER DELETE ON ByteDB BEGIN
+        {_apply('old', '-')}
+        {_PRUNE}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FACET_TABLE}_au
+    AFTER UPDATE OF file_size, {', '.join(FACET_COLUMNS)} ON ByteDB BEGIN
+        {_apply('old', '-')}
+        {_PRUNE}
+        {_apply('new', '+')}
+    END
+    """,
+]
+
+def install_facets(conn: Connection) -> None:
+    """
+    Create the facet triggers if missing.
+    The facet table itself is a mapped model created by create_all; when it is
+    empty but ByteDB is not (first install), it is rebuilt.
+
+    Args:
+        conn (Connection): Sync connection (use run_sync from async code)
+    """
+    for statement in _TRIGGERS:
+        conn.exec_driver_sql(statement)
+    facets_empty = conn.execute(text(f"SELECT 1 FROM {FACET_TABLE} LIMIT 1")).first() is None
+    files_empty = conn.execute(text("SELECT 1 FROM ByteDB LIMIT 1")).first() is None
+    if facets_empty and not files_empty:
+        rebuild_facets(conn)
+
+def rebuild_facets(conn: Connection) -> None:
+    """
+    Recompute every facet row from the ByteDB table in one pass.
+
+    Args:
+        conn (Connection): Sync connection
+    """
+    logger.info("Rebuilding file facets")
+    conn.exec_driver_sql(f"DELETE FROM {FACET_TABLE}")
+    conn.exec_driver_sql(f"""
+        INSERT INTO {FACET_TABLE} ({', '.join(FACET_COLUMNS)}, file_count, total_size)
+        SELECT {_key('ByteDB')}, count(*), sum(file_size)
+        FROM ByteDB
+        GROUP BY 1, 2, 3, 4
+    """)
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from .database import engine, init_db_sync
+
+    if argv != ["rebuild"]:
+        print("usage: python -m app.database.facets rebuild")
+        return 2
+    init_db_sync()
+    with engine.begin() as conn:
+        rebuild_facets(conn)
+    logger.info("File facets rebuilt")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
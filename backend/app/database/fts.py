@@ -0,0 +1,158 @@
+"""
+FTS5 full-text index over ByteDB.
+Defines the external-content virtual table, the triggers that keep it in
+sync with ByteDB, and a command line entry point to rebuild it.
+
+Usage (from the backend directory):
+    python -m app.database.fts rebuild
+    python -m app.database.fts optimize
+"""
+
+import re
+import sys
+from typing import Optional
+from sqlalchemy import Column, Integer, MetaData, String, Table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "ByteDB_fts"
+
+# Column weights for bm25(): a hit in the file name outranks department/owner
+BM25_WEIGHTS = (10.0, 2.0, 2.0)
+
+# Kept out of Base.metadata so create_all never tries to create it as a plain table
+fts_table = Table(
+    FTS_TABLE,
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("file_name", String),
+    Column("department", String),
+    Column("owner", String),
+)
+
+_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        file_name, department, owner,
+        content='ByteDB', content_rowid='file_id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON ByteDB BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, file_name, department, owner)
+        VALUES (new.file_id, new.file_name, new.department, new.owner);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON ByteDB BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, file_name, department, owner)
+        VALUES ('delete', old.file_id, old.file_name, old.department, old.owner);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF file_name, department, owner ON ByteDB BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, file_name, department, owner)
+        VALUES ('delete', old.file_id, old.file_name, old.department, old.owner);
+        INSERT INTO {FTS_TABLE}(rowid, file_name, department, owner)
+        VALUES (new.file_id, new.file_name, new.department, new.owner);
+    END
+    """,
+]
+
+# Set by install_fts(); services fall back to LIKE search when FTS5 is unavailable
+fts_enabled = False
+
+def install_fts(conn: Connection) -> bool:
+    """
+    Create the FTS5 table and sync triggers if missing.
+    A freshly created index is rebuilt from the existing ByteDB rows.
+
+    Args:
+        conn (Connection): Sync connection (use run_sync from async code)
+
+    Returns:
+        bool: True if the full-text index is available
+    """
+    global fts_enabled
+    existed = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE}
+    ).first() is not None
+    try:
+        for statement in _DDL:
+            conn.exec_driver_sql(statement)
+    except OperationalError as e:
+        logger.warning(f"FTS5 unavailable, search falls back to LIKE: {str(e)}")
+        fts_enabled = False
+        return False
+    # Make the hidden rank column use the weighted bm25 so ORDER BY rank stays
+    # inside FTS5 and only the top rows are joined back to ByteDB
+    conn.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) "
+        f"VALUES ('rank', 'bm25({', '.join(str(w) for w in BM25_WEIGHTS)})')"
+    )
+    if not existed:
+        rebuild_fts(conn)
+    fts_enabled = True
+    return True
+
+def rebuild_fts(conn: Connection) -> None:
+    """
+    Rebuild the full-text index from the ByteDB content table.
+
+    Args:
+        conn (Connection): Sync connection
+    """
+    logger.info("Rebuilding full-text index")
+    conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+def optimize_fts(conn: Connection) -> None:
+    """
+    Merge the full-text index b-trees into one for faster queries.
+
+    Args:
+        conn (Connection): Sync connection
+    """
+    logger.info("Optimizing full-text index")
+    conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+def build_match_query(search_term: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    Every word becomes a quoted prefix query and all words must match.
+
+    Args:
+        search_term (str): Raw user input
+
+    Returns:
+        Optional[str]: MATCH expression, or None if the term has no searchable words
+    """
+    tokens = re.findall(r"\w+", search_term, re.UNICODE)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from .database import engine, init_db_sync
+
+    commands = {"rebuild": rebuild_fts, "optimize": optimize_fts}
+    if len(argv) != 1 or argv[0] not in commands:
+        print(f"usage: python -m app.database.fts {{{'|'.join(commands)}}}")
+        return 2
+    init_db_sync()
+    with engine.begin() as conn:
+        commands[argv[0]](conn)
+    logger.info(f"Full-text index {argv[0]} finished")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
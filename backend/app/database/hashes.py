@@ -0,0 +1,34 @@
+"""
+Invalidation of file content hashes.
+A trigger on the ByteDB table clears partial_hash and content_hash when a
+record's path or size changes, so the hashing job recomputes them.
+"""
+
+from sqlalchemy.engine import Connection
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS ByteDB_hash_au
+    AFTER UPDATE OF file_path, file_size ON ByteDB
+    WHEN (old.file_path IS NOT new.file_path OR old.file_size IS NOT new.file_size)
+     AND (new.partial_hash IS NOT NULL OR new.content_hash IS NOT NULL)
+    BEGIN
+        UPDATE ByteDB SET partial_hash = NULL, content_hash = NULL WHERE file_id = new.file_id;
+    END
+    """,
+]
+
+def install_hashes(conn: Connection) -> None:
+    """
+    Create the hash invalidation trigger if missing.
+
+    Args:
+        conn (Connection): Sync connection (use run_sync from async code)
+    """
+    for statement in _TRIGGERS:
+        conn.exec_driver_sql(statement)
@@ -4,13 +4,32 @@ Uses SQLAlchemy ORM for database interactions.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Index, func, literal_column
 from .database import Base
 
 class FileRecord(Base):
     """Model representing a file record in the ByteDB table."""
     
     __tablename__ = "ByteDB"
+    __table_args__ = (
+        # Composite indexes for the FileQuery filter shapes: equality columns first,
+        # the file_size range last. SQLite appends file_id (rowid) to every index,
+        # so equality-only filters also come back in file_id order without a sort.
+        Index("ix_bytedb_department_file_type_size", "department", "file_type", "file_size"),
+        Index("ix_bytedb_department_access_level_size", "department", "access_level", "file_size"),
+        Index("ix_bytedb_department_owner", "department", "owner"),
+        Index("ix_bytedb_owner_file_type_size", "owner", "file_type", "file_size"),
+        Index("ix_bytedb_file_type_access_level_size", "file_type", "access_level", "file_size"),
+        Index("ix_bytedb_access_level_size", "access_level", "file_size"),
+        Index("ix_bytedb_file_size", "file_size"),
+        # Change tracking and updated_at-ordered pages
+        Index("ix_bytedb_updated_at", "updated_at"),
+        # Day range refreshes of the file reports
+        Index("ix_bytedb_created_at", "created_at"),
+        # Duplicate detection: size groups split by partial hash, then full hash
+        Index("ix_bytedb_file_size_partial_hash", "file_size", "partial_hash"),
+        Index("ix_bytedb_content_hash", "content_hash"),
+    )
 
     file_id = Column(Integer, primary_key=True, index=True)
     file_name = Column(String, nullable=False)
@@ -22,11 +41,79 @@ class FileRecord(Base):
     access_level = Column(String, default="private")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optional content identity, filled in by the hashing job (BLAKE2b-256, hex);
+    # cleared by a trigger when file_path or file_size changes
+    partial_hash = Column(String)
+    content_hash = Column(String)
+
+# Directory part of file_path, up to and including the last '/': rtrim strips
+# trailing characters that occur in the path with its slashes removed. The
+# separators are literals so queries match the expression index exactly.
+FILE_DIRECTORY = func.rtrim(
+    FileRecord.file_path,
+    func.replace(FileRecord.file_path, literal_column("'/'"), literal_column("''"))
+)
+
+# Crawler lookups of the records in a directory (or a directory tree)
+Index("ix_bytedb_directory", FILE_DIRECTORY)
+
+class FileFacet(Base):
+    """
+    File count and size total per department, owner, file type and access level.
+    Maintained incrementally by triggers on the ByteDB table; NULL values are
+    stored as '' so every combination has exactly one row.
+    """
+
+    __tablename__ = "file_facets"
+
+    department = Column(String, primary_key=True)
+    owner = Column(String, primary_key=True)
+    file_type = Column(String, primary_key=True)
+    access_level = Column(String, primary_key=True)
+    file_count = Column(Integer, nullable=False, default=0)
+    total_size = Column(Integer, nullable=False, default=0)
+
+class FileTombstone(Base):
+    """
+    File ID of a deleted ByteDB row, in deletion order. Written by a trigger
+    so incremental readers (the analytics snapshot) can drop deleted records
+    without re-reading every file ID. Only the newest TOMBSTONE_ROWS (see
+    tombstones.py) are kept.
+    """
+
+    __tablename__ = "file_tombstones"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    # AUTOINCREMENT: sequence numbers are never reused, even after pruning
+    seq = Column(Integer, primary_key=True)
+    file_id = Column(Integer, nullable=False)
+
+class FilePartition(Base):
+    """
+    A department's file record partition (a SQLite file of its own).
+    Only used with partitioned file storage; records without a department
+    are stored under ''.
+    """
+
+    __tablename__ = "file_partitions"
+
+    partition_no = Column(Integer, primary_key=True)
+    department = Column(String, nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 class Transaction(Base):
     """Model representing a transaction record."""
     
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Ledger listings are filtered by department/category and ordered by date;
+        # dates are stored as ISO strings so ranges and ordering use these indexes
+        Index("ix_transactions_date", "date"),
+        Index("ix_transactions_department_date", "department", "date"),
+        Index("ix_transactions_category_date", "category", "date"),
+        # Per-account sums when an account is created or its balance verified
+        Index("ix_transactions_account_id", "account_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(String, nullable=False)
@@ -37,5 +124,122 @@ class Transaction(Base):
     department = Column(String, nullable=False)
     category = Column(String, nullable=False)
     zoho_match = Column(String, default="No")
+    # Set by Zoho reconciliation: the matched Zoho entry and the match score (0-1)
+    zoho_match_id = Column(String)
+    zoho_confidence = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class TransactionRollup(Base):
+    """
+    Daily rollup of transactions per department, category and payment mode.
+    Maintained incrementally by triggers on the transactions table.
+    """
+
+    __tablename__ = "transaction_rollups"
+
+    day = Column(String, primary_key=True)
+    department = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    payment_mode = Column(String, primary_key=True)
+    txn_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    credit_amount = Column(Float, nullable=False, default=0.0)
+    debit_amount = Column(Float, nullable=False, default=0.0)
+
+class ReportDirtyDay(Base):
+    """
+    A day whose role reports are out of date.
+    Recorded by triggers on the report sources (transactions and ByteDB) and
+    cleared when the reports for that day are recomputed.
+    """
+
+    __tablename__ = "report_dirty_days"
+
+    source = Column(String, primary_key=True)
+    day = Column(String, primary_key=True)
+
+class ReportState(Base):
+    """
+    Definition signature and refresh state of a materialized role report.
+    The report's rows live in a table of their own, report_<name>.
+    """
+
+    __tablename__ = "report_state"
+
+    name = Column(String, primary_key=True)
+    signature = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime)
+
+class FutureTransaction(Base):
+    """
+    Model representing a planned (FreedomFuture) transaction.
+    A recurring entry is stored once; next_due holds its next occurrence and is
+    advanced each time an occurrence is posted to the ledger.
+    """
+
+    __tablename__ = "freedom_future"
+    __table_args__ = (
+        # Due lookups: unpaid entries ordered by next occurrence
+        Index("ix_freedom_future_paid_next_due", "paid", "next_due"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    start_date = Column(String, nullable=False)
+    description = Column(String, nullable=False)
+    amount = Column(Float, nullable=False)
+    payment_mode = Column(String, nullable=False)
+    account_id = Column(String, nullable=False)
+    department = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    frequency = Column(String, nullable=False, default="once")
+    interval = Column(Integer, nullable=False, default=1)
+    max_occurrences = Column(Integer)
+    end_date = Column(String)
+    occurrences = Column(Integer, nullable=False, default=0)
+    next_due = Column(String)
+    paid = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Account(Base):
+    """
+    Model representing an account (AccountsPresent).
+    balance is opening_balance plus every ledger amount booked against cc_id;
+    triggers on the transactions table keep it current in the same commit.
+    """
+
+    __tablename__ = "accounts_present"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_name = Column(String, nullable=False)
+    type = Column(String, nullable=False)
+    cc_id = Column(String, nullable=False, unique=True, index=True)
+    opening_balance = Column(Float, nullable=False, default=0.0)
+    balance = Column(Float, nullable=False, default=0.0)
+    int_rate = Column(Float, nullable=False, default=0.0)
+    next_due_date = Column(String, default="Not applicable")
+    bank = Column(String, nullable=False)
+    tenure = Column(Integer)
+    emi_amount = Column(Float)
+    comments = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CrawledDirectory(Base):
+    """
+    A directory visited by the filesystem crawler.
+    mtime_ns and inode are the values seen when its entries were last read;
+    a later crawl skips listing the directory while both are unchanged.
+    """
+
+    __tablename__ = "crawled_directories"
+
+    path = Column(String, primary_key=True)
+    root = Column(String, nullable=False, index=True)
+    parent = Column(String, index=True)
+    mtime_ns = Column(Integer, nullable=False)
+    inode = Column(Integer, nullable=False)
+    file_count = Column(Integer, nullable=False, default=0)
+    scanned_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,598 @@
+"""
+Department-partitioned storage for file records.
+With BDMS_PARTITION_FILES enabled, each department's ByteDB rows live in a
+SQLite file of their own with its own writer queue, so a department's writes
+never wait on another department's write lock. Queries filtered by
+department read one partition; others fan out to every partition.
+
+Usage (from the backend directory):
+    python -m app.database.partitions list
+    python -m app.database.partitions migrate
+    python -m app.database.partitions dedupe
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from typing import (
+    Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+)
+from sqlalchemy import delete, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import logging
+from .database import (
+    async_engine, create_file_schema, create_read_engine, create_writer_engine,
+    database_path, run_write, storage_profile
+)
+from .models import FileRecord, FilePartition
+from .write_queue import WriteJob, WriteQueue
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# File IDs are partition_no * ID_SPAN + a per-partition sequence, so an ID
+# names the partition it was created in
+ID_SPAN = 1 << 40
+
+# Keeps every file ID an exact JavaScript number (below 2**53)
+MAX_PARTITIONS = (1 << 53) // ID_SPAN - 1
+
+# How long a process trusts its list of partitions before re-reading the
+# registry (other worker processes may have created partitions)
+REGISTRY_TTL_SECONDS = 1.0
+
+_INFO_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS partition_info (
+        partition_no INTEGER PRIMARY KEY,
+        department TEXT NOT NULL,
+        last_file_id INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO partition_info VALUES (:partition_no, :department, :last_file_id)",
+]
+
+T = TypeVar("T")
+
+class Partition:
+    """
+    One department's SQLite file, with its own read pool and writer queue.
+    partition_info holds the last file ID handed out, which never decreases,
+    so IDs are not reused even after the newest records are deleted or move
+    to another department.
+    """
+
+    def __init__(self, partition_no: int, department: str, path: str):
+        """
+        Args:
+            partition_no (int): Registry number, also the high part of its file IDs
+            department (str): Department stored here ('' for records without one)
+            path (str): SQLite file
+        """
+        self.partition_no = partition_no
+        self.department = department
+        self.path = path
+        url = f"sqlite+aiosqlite:///{path}"
+        self.read_engine = create_read_engine(url)
+        self.writer_engine = create_writer_engine(url)
+        self.sessions = async_sessionmaker(
+            bind=self.read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+        self.write_queue = WriteQueue(
+            async_sessionmaker(
+                bind=self.writer_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            ),
+            max_batch=storage_profile.writer_max_batch,
+            linger_ms=storage_profile.writer_linger_ms
+        )
+
+    @property
+    def first_id(self) -> int:
+        """Lowest file ID this partition hands out, minus one."""
+        return self.partition_no * ID_SPAN
+
+    def _create_schema(self, conn) -> None:
+        """Create the file tables and partition_info (sync, on the writer connection)."""
+        create_file_schema(conn)
+        conn.exec_driver_sql(_INFO_DDL[0])
+        conn.execute(text(_INFO_DDL[1]), {
+            "partition_no": self.partition_no,
+            "department": self.department,
+            "last_file_id": self.first_id,
+        })
+
+    async def open(self) -> None:
+        """Create the partition's file and schema if missing."""
+        async with self.writer_engine.begin() as conn:
+            await conn.run_sync(self._create_schema)
+
+    async def run_write(self, job: WriteJob) -> Any:
+        """
+        Execute a write job on this partition (see database.run_write).
+
+        Args:
+            job (WriteJob): Coroutine function receiving the session to write with
+
+        Returns:
+            Any: Whatever the job returned, after it has been committed
+        """
+        if storage_profile.single_writer:
+            return await self.write_queue.submit(job)
+        async with self.sessions() as session:
+            try:
+                result = await job(session)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        return result
+
+    async def allocate_ids(self, session: AsyncSession, count: int) -> int:
+        """
+        Reserve file IDs inside a write job.
+
+        Args:
+            session (AsyncSession): Writer session of this partition
+            count (int): IDs needed
+
+        Returns:
+            int: First of count consecutive IDs
+
+        Raises:
+            RuntimeError: If the partition has run out of IDs
+        """
+        last = (await session.execute(
+            text("UPDATE partition_info SET last_file_id = last_file_id + :count RETURNING last_file_id"),
+            {"count": count}
+        )).scalar_one()
+        if last >= self.first_id + ID_SPAN:
+            raise RuntimeError(f"File partition {self.partition_no} has run out of file IDs")
+        return last - count + 1
+
+    async def close(self) -> None:
+        """Drain the writer queue and dispose of the engines."""
+        await self.write_queue.close()
+        await self.writer_engine.dispose()
+        await self.read_engine.dispose()
+
+class FilePartitions:
+    """
+    Registry of department partitions (the file_partitions table in the main
+    database) and the routing of file records to them.
+    """
+
+    def __init__(self, enabled: bool = False, directory: Optional[str] = None):
+        """
+        Args:
+            enabled (bool): Store file records in department partitions
+            directory (Optional[str]): Directory of the partition files
+                (default: partitions/ next to the main database)
+        """
+        self.enabled = enabled
+        self.directory = directory or os.path.join(os.path.dirname(database_path), "partitions")
+        self._by_department: Dict[str, Partition] = {}
+        self._by_no: Dict[int, Partition] = {}
+        self._loaded_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        # Superseded copies of moved records still to delete, by partition number
+        self._stale: Dict[int, Set[int]] = {}
+
+    def require_single_file(self, feature: str) -> None:
+        """
+        Refuse features that read or write the main ByteDB table directly.
+
+        Args:
+            feature (str): Feature name used in the message
+
+        Raises:
+            RuntimeError: If partitioned storage is enabled
+        """
+        if self.enabled:
+            raise RuntimeError(f"{feature} is not available with partitioned file storage")
+
+    async def load(self, force: bool = True) -> None:
+        """
+        Open every registered partition not opened yet.
+
+        Args:
+            force (bool): Re-read the registry even if it was read recently
+        """
+        if not force and time.monotonic() - self._loaded_at < REGISTRY_TTL_SECONDS:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            async with async_engine.connect() as conn:
+                rows = (await conn.execute(
+                    select(FilePartition.partition_no, FilePartition.department)
+                    .order_by(FilePartition.partition_no)
+                )).all()
+            for partition_no, department in rows:
+                if partition_no not in self._by_no:
+                    await self._open(partition_no, department)
+            self._loaded_at = time.monotonic()
+
+    async def _open(self, partition_no: int, department: str) -> Partition:
+        """Open one registered partition (caller holds the lock)."""
+        os.makedirs(self.directory, exist_ok=True)
+        partition = Partition(
+            partition_no, department, os.path.join(self.directory, f"files-{partition_no:04d}.db")
+        )
+        await partition.open()
+        self._by_no[partition_no] = partition
+        self._by_department[department] = partition
+        return partition
+
+    async def all(self) -> List[Partition]:
+        """Every partition, in partition number order."""
+        await self.load(force=False)
+        return [self._by_no[number] for number in sorted(self._by_no)]
+
+    async def for_department(self, department: Optional[str], create: bool = False) -> Optional[Partition]:
+        """
+        Partition holding a department's records.
+
+        Args:
+            department (Optional[str]): Department (None or '' for records without one)
+            create (bool): Register and create the partition if it does not exist
+
+        Returns:
+            Optional[Partition]: The partition, or None if it does not exist and create is False
+
+        Raises:
+            RuntimeError: If MAX_PARTITIONS partitions exist already
+        """
+        key = department or ""
+        if key not in self._by_department:
+            await self.load()
+        if key in self._by_department or not create:
+            return self._by_department.get(key)
+        async with self._lock:
+            if key not in self._by_department:
+                async with async_engine.begin() as conn:
+                    await conn.execute(
+                        insert(FilePartition).values(department=key)
+                        .prefix_with("OR IGNORE")
+                    )
+                    partition_no = (await conn.execute(
+                        select(FilePartition.partition_no).where(FilePartition.department == key)
+                    )).scalar_one()
+                if partition_no > MAX_PARTITIONS:
+                    raise RuntimeError(f"At most {MAX_PARTITIONS} file partitions are supported")
+                logger.info(f"Creating file partition {partition_no} for department '{key}'")
+                await self._open(partition_no, key)
+        return self._by_department[key]
+
+    async def for_query(self, query_params: Any = None) -> List[Partition]:
+        """
+        Partitions a filtered query has to read.
+
+        Args:
+            query_params (FileQuery): Optional filters; a department filter selects one partition
+
+        Returns:
+            List[Partition]: Partitions to read (empty if the department has none)
+        """
+        department = getattr(query_params, "department", None)
+        if department:
+            partition = await self.for_department(department)
+            return [partition] if partition is not None else []
+        return await self.all()
+
+    async def locate(self, file_ids: Iterable[int]) -> Dict[int, Tuple[Partition, FileRecord]]:
+        """
+        Find file records by ID. Each ID is looked up in the partition that
+        created it first; records that moved to another department are then
+        searched for in every partition.
+
+        Args:
+            file_ids (Iterable[int]): File IDs
+
+        Returns:
+            Dict[int, Tuple[Partition, FileRecord]]: Partition and record of every ID found
+        """
+        wanted = set(file_ids)
+        await self.load(force=False)
+        by_home: Dict[int, List[int]] = {}
+        for file_id in wanted:
+            by_home.setdefault(file_id // ID_SPAN, []).append(file_id)
+
+        async def probe(partition: Partition, ids: List[int]) -> List[Tuple[Partition, FileRecord]]:
+            async with partition.sessions() as session:
+                result = await session.execute(select(FileRecord).where(FileRecord.file_id.in_(ids)))
+                return [(partition, record) for record in result.scalars()]
+
+        found: Dict[int, Tuple[Partition, FileRecord]] = {}
+
+        def keep(hits: List[Tuple[Partition, FileRecord]]) -> None:
+            for partition, record in hits:
+                if record.file_id in self._stale.get(partition.partition_no, ()):
+                    continue
+                current = found.get(record.file_id)
+                # Of two copies left by an interrupted move, the newer one is the record
+                if current is None or _updated(record) > _updated(current[1]):
+                    found[record.file_id] = (partition, record)
+
+        homes = [(self._by_no[number], ids) for number, ids in by_home.items() if number in self._by_no]
+        for hits in await asyncio.gather(*(probe(partition, ids) for partition, ids in homes)):
+            keep(hits)
+        missing = sorted(wanted - found.keys())
+        if missing:
+            for hits in await asyncio.gather(*(probe(partition, missing) for partition in await self.all())):
+                keep(hits)
+        return found
+
+    def mark_stale(self, partition: Partition, file_ids: Iterable[int]) -> None:
+        """
+        Record copies that a move left behind because deleting them failed.
+        locate ignores them from now on and purge_stale deletes them.
+
+        Args:
+            partition (Partition): Partition still holding the old copies
+            file_ids (Iterable[int]): IDs of the old copies
+        """
+        self._stale.setdefault(partition.partition_no, set()).update(file_ids)
+
+    async def purge_stale(self) -> int:
+        """
+        Delete the copies recorded by mark_stale. Copies whose partition
+        fails again are kept for the next call.
+
+        Returns:
+            int: Copies deleted
+        """
+        purged = 0
+        for partition_no, stale in list(self._stale.items()):
+            ids = sorted(stale)
+
+            async def _delete(session: AsyncSession, ids=ids) -> int:
+                result = await session.execute(delete(FileRecord).where(FileRecord.file_id.in_(ids)))
+                return result.rowcount
+
+            try:
+                purged += await self._by_no[partition_no].run_write(_delete)
+            except Exception as e:
+                logger.warning(f"Could not delete stale file copies from partition {partition_no}: {str(e)}")
+                continue
+            stale.difference_update(ids)
+            if not stale:
+                del self._stale[partition_no]
+        if purged:
+            logger.info(f"Deleted {purged} stale copies of moved file records")
+        return purged
+
+    async def dedupe(self) -> int:
+        """
+        Find records stored in more than one partition (a move interrupted
+        between its insert and its delete, possibly in another process),
+        keep the copy updated last and delete the others. Each such pair
+        holds a copy outside its partition's own ID range, so only those
+        copies and their home partitions are read.
+
+        Returns:
+            int: Copies deleted
+        """
+        partitions = await self.all()
+
+        async def foreign(partition: Partition) -> List[Tuple[int, Optional[datetime]]]:
+            async with partition.sessions() as session:
+                result = await session.execute(
+                    select(FileRecord.file_id, FileRecord.updated_at).where(or_(
+                        FileRecord.file_id <= partition.first_id,
+                        FileRecord.file_id > partition.first_id + ID_SPAN
+                    ))
+                )
+                return [tuple(row) for row in result]
+
+        copies: Dict[int, List[Tuple[Partition, Optional[datetime]]]] = {}
+        for partition, rows in zip(partitions, await asyncio.gather(*(foreign(p) for p in partitions))):
+            for file_id, updated_at in rows:
+                copies.setdefault(file_id, []).append((partition, updated_at))
+        by_home: Dict[int, List[int]] = {}
+        for file_id in copies:
+            by_home.setdefault(file_id // ID_SPAN, []).append(file_id)
+
+        async def native(partition: Partition, ids: List[int]) -> List[Tuple[int, Optional[datetime]]]:
+            async with partition.sessions() as session:
+                result = await session.execute(
+                    select(FileRecord.file_id, FileRecord.updated_at).where(FileRecord.file_id.in_(ids))
+                )
+                return [tuple(row) for row in result]
+
+        homes = [(self._by_no[number], ids) for number, ids in by_home.items() if number in self._by_no]
+        for (partition, _), rows in zip(homes, await asyncio.gather(*(native(p, ids) for p, ids in homes))):
+            for file_id, updated_at in rows:
+                copies[file_id].append((partition, updated_at))
+        for file_id, found in copies.items():
+            if len(found) > 1:
+                found.sort(key=lambda copy: copy[1] or datetime.min)
+                for partition, _ in found[:-1]:
+                    self.mark_stale(partition, [file_id])
+        return await self.purge_stale()
+
+    async def close(self) -> None:
+        """Close every partition."""
+        for partition in list(self._by_no.values()):
+            await partition.close()
+        self._by_no.clear()
+        self._by_department.clear()
+        self._stale.clear()
+        self._loaded_at = 0.0
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Opened partitions for monitoring.
+
+        Returns:
+            List[Dict[str, Any]]: Number, department, path and write queue counters of each
+        """
+        return [
+            {
+                "partition_no": partition.partition_no,
+                "department": partition.department or None,
+                "path": partition.path,
+                "write_batches": partition.write_queue.batches,
+                "write_jobs": partition.write_queue.jobs,
+            }
+            for partition in (self._by_no[number] for number in sorted(self._by_no))
+        ]
+
+def _updated(record: FileRecord) -> datetime:
+    """Last update time of a record, for choosing between two copies."""
+    return record.updated_at or datetime.min
+
+async def scatter(
+    partitions: Sequence[Partition],
+    read: Callable[[AsyncSession], Awaitable[T]]
+) -> List[T]:
+    """
+    Run a read on every partition concurrently, each on its own session.
+
+    Args:
+        partitions (Sequence[Partition]): Partitions to read
+        read (Callable): Coroutine function receiving a read session
+
+    Returns:
+        List[T]: Results in partition order
+    """
+    async def run(partition: Partition) -> T:
+        async with partition.sessions() as session:
+            return await read(session)
+
+    return list(await asyncio.gather(*(run(partition) for partition in partitions)))
+
+def merge_sorted(
+    results: Iterable[Iterable[T]],
+    key: Callable[[T], Any],
+    skip: int = 0,
+    limit: Optional[int] = None,
+    reverse: bool = False
+) -> List[T]:
+    """
+    K-way merge of per-partition results that are each sorted by key, then
+    apply the offset and limit. Each partition must have returned at least
+    skip + limit rows (when it has them) for the page to be exact.
+
+    Args:
+        results (Iterable[Iterable[T]]): Sorted results of each partition
+        key (Callable): Sort key
+        skip (int): Merged rows to skip
+        limit (Optional[int]): Maximum rows to return
+        reverse (bool): Inputs are sorted in descending order
+
+    Returns:
+        List[T]: One page of the merged order
+    """
+    merged = heapq.merge(*results, key=key, reverse=reverse)
+    return list(islice(merged, skip, None if limit is None else skip + limit))
+
+async def write_to(db: AsyncSession, partition: Optional[Partition], job: WriteJob) -> Any:
+    """
+    Run a write job on a partition, or through database.run_write on the main
+    database when partition is None (partitioned storage disabled).
+
+    Args:
+        db (AsyncSession): Request database session
+        partition (Optional[Partition]): Target partition
+        job (WriteJob): Coroutine function receiving the session to write with
+
+    Returns:
+        Any: Whatever the job returned, after it has been committed
+    """
+    if partition is None:
+        return await run_write(db, job)
+    return await partition.run_write(job)
+
+# Partition registry for file records (inactive unless BDMS_PARTITION_FILES is set)
+file_partitions = FilePartitions(
+    enabled=os.getenv("BDMS_PARTITION_FILES", "false").lower() in ("1", "true", "yes", "on"),
+    directory=os.getenv("BDMS_PARTITION_DIR"),
+)
+
+async def migrate(batch_rows: int = 5000) -> Dict[str, int]:
+    """
+    Move every record of the main ByteDB table into its department's
+    partition. A record's new file ID is partition_no * ID_SPAN plus its old
+    ID. Each batch is deleted from the main table once its partitions have
+    committed, so an interrupted migration can be run again.
+
+    Args:
+        batch_rows (int): Records moved per batch
+
+    Returns:
+        Dict[str, int]: Records moved per department ('' for none)
+    """
+    table = FileRecord.__table__
+    moved: Dict[str, int] = {}
+    while True:
+        async with async_engine.connect() as conn:
+            rows = [dict(row) for row in (await conn.execute(
+                select(table).order_by(table.c.file_id).limit(batch_rows)
+            )).mappings()]
+        if not rows:
+            return moved
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(row["department"] or "", []).append(row)
+        for department, group in groups.items():
+            partition = await file_partitions.for_department(department, create=True)
+            values = [{**row, "file_id": partition.first_id + row["file_id"]} for row in group]
+            last = values[-1]["file_id"]
+            if last >= partition.first_id + ID_SPAN:
+                raise RuntimeError(f"File ID {group[-1]['file_id']} is too large to migrate")
+
+            async def _insert(session: AsyncSession, values=values, last=last) -> None:
+                await session.execute(insert(FileRecord).prefix_with("OR IGNORE"), values)
+                await session.execute(
+                    text("UPDATE partition_info SET last_file_id = max(last_file_id, :last)"),
+                    {"last": last}
+                )
+
+            await partition.run_write(_insert)
+            moved[department] = moved.get(department, 0) + len(group)
+        async with async_engine.begin() as conn:
+            await conn.execute(table.delete().where(
+                table.c.file_id.between(rows[0]["file_id"], rows[-1]["file_id"])
+            ))
+        logger.info(f"Moved {len(rows)} file records into partitions")
+
+async def _main(command: str) -> int:
+    """Run a command with the partitions opened."""
+    from .database import init_db, close_db
+
+    await init_db()
+    try:
+        if command == "migrate":
+            result: Any = await migrate()
+        elif command == "dedupe":
+            result = {"deleted": await file_partitions.dedupe()}
+        else:
+            await file_partitions.load()
+            result = file_partitions.stats()
+            for entry, partition in zip(result, await file_partitions.all()):
+                async with partition.sessions() as session:
+                    entry["files"] = (await session.execute(
+                        select(func.count()).select_from(FileRecord)
+                    )).scalar_one()
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    finally:
+        await file_partitions.close()
+        await close_db()
+
+def main(argv) -> int:
+    """Command line entry point."""
+    if len(argv) != 1 or argv[0] not in ("list", "migrate", "dedupe"):
+        print("usage: python -m app.database.partitions list|migrate|dedupe")
+        return 2
+    return asyncio.run(_main(argv[0]))
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
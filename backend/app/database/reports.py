@@ -0,0 +1,373 @@
+"""
+Materialized role reports.
+Each report template declares dimensions and additive measures over the
+ledger or the file records; its rows (one per day and combination of
+dimension values) are stored in a table of its own, report_<name>. Triggers
+on the sources record every day a write touches in report_dirty_days, and a
+refresh recomputes only those days.
+
+Usage (from the backend directory):
+    python -m app.database.reports refresh
+    python -m app.database.reports rebuild
+"""
+
+import hashlib
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+import logging
+from .rollups import DAY_SQL
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DIRTY_TABLE = "report_dirty_days"
+STATE_TABLE = "report_state"
+
+# Dirty days closer together than this are recomputed as one date range
+SPAN_GAP_DAYS = 7
+
+@dataclass(frozen=True)
+class ReportSource:
+    """
+    A table reports are computed from.
+
+    Attributes:
+        table (str): Source table
+        date_column (str): Column the day is derived from (range filters use
+            it, so it needs an index)
+        day_sql (str): Day bucket of a row, with {0} standing for the table or
+            trigger row alias
+        columns (Tuple[str, ...]): Columns the templates read; updates that
+            change none of them leave the reports as they are
+    """
+    table: str
+    date_column: str
+    day_sql: str
+    columns: Tuple[str, ...] = ()
+
+SOURCES: Dict[str, ReportSource] = {
+    "transactions": ReportSource(
+        "transactions", "date", DAY_SQL,
+        ("date", "amount", "account_id", "category", "payment_mode", "department", "zoho_match"),
+    ),
+    "files": ReportSource(
+        "ByteDB", "created_at", "date({0}.created_at)",
+        ("created_at", "department", "access_level", "file_size"),
+    ),
+}
+
+@dataclass(frozen=True)
+class ReportTemplate:
+    """
+    Declarative definition of a role report.
+
+    Attributes:
+        name (str): Report name; its rows are stored in report_<name>
+        role (str): Role the report is prepared for (ca, owner, budget_analyst)
+        title (str): Human readable title
+        source (str): Key of SOURCES
+        dimensions (Dict[str, str]): Column name -> SQL expression over the source
+            (NULL is stored as '')
+        measures (Dict[str, str]): Column name -> SQL expression summed per group;
+            sums are additive, so any date range is answered by summing days
+        where (Optional[str]): SQL condition on the source rows
+    """
+    name: str
+    role: str
+    title: str
+    source: str
+    dimensions: Dict[str, str] = field(default_factory=dict)
+    measures: Dict[str, str] = field(default_factory=dict)
+    where: Optional[str] = None
+
+    @property
+    def table(self) -> str:
+        """Name of the table holding the report's rows."""
+        return f"report_{self.name}"
+
+    @property
+    def signature(self) -> str:
+        """Hash of everything that shapes the stored rows; a change forces a rebuild."""
+        definition = repr((
+            self.source, sorted(self.dimensions.items()), sorted(self.measures.items()), self.where
+        ))
+        return hashlib.blake2b(definition.encode(), digest_size=8).hexdigest()
+
+# Zoho reconciliation sets zoho_match to 'Yes'
+_UNRECONCILED = "coalesce(zoho_match, 'No') != 'Yes'"
+
+REPORT_TEMPLATES: Tuple[ReportTemplate, ...] = (
+    ReportTemplate(
+        name="ca_ledger",
+        role="ca",
+        title="Daily ledger by account, category and payment mode, with unreconciled entries",
+        source="transactions",
+        dimensions={"account_id": "account_id", "category": "category", "payment_mode": "payment_mode"},
+        measures={
+            "txn_count": "1",
+            "credit_amount": "max(amount, 0)",
+            "debit_amount": "min(amount, 0)",
+            "net_amount": "amount",
+            "unreconciled_count": _UNRECONCILED,
+            "unreconciled_amount": f"CASE WHEN {_UNRECONCILED} THEN amount ELSE 0 END",
+        },
+    ),
+    ReportTemplate(
+        name="owner_cash_flow",
+        role="owner",
+        title="Daily income and expenses by department",
+        source="transactions",
+        dimensions={"department": "department"},
+        measures={
+            "txn_count": "1",
+            "income": "max(amount, 0)",
+            "expenses": "max(-amount, 0)",
+            "net_amount": "amount",
+        },
+    ),
+    ReportTemplate(
+        name="owner_files",
+        role="owner",
+        title="Files added per day by department and access level",
+        source="files",
+        dimensions={"department": "department", "access_level": "access_level"},
+        measures={"file_count": "1", "total_size": "file_size"},
+    ),
+    ReportTemplate(
+        name="budget_spend",
+        role="budget_analyst",
+        title="Daily spending and receipts by department and category",
+        source="transactions",
+        dimensions={"department": "department", "category": "category"},
+        measures={
+            "txn_count": "1",
+            "spent": "max(-amount, 0)",
+            "received": "max(amount, 0)",
+            "net_amount": "amount",
+        },
+    ),
+)
+
+REPORTS: Dict[str, ReportTemplate] = {template.name: template for template in REPORT_TEMPLATES}
+
+def _mark_dirty(source: str, row: str) -> str:
+    """Statement recording the day of a trigger row (new or old) as dirty."""
+    day = SOURCES[source].day_sql.format(row)
+    return f"""
+        INSERT OR IGNORE INTO {DIRTY_TABLE} (source, day)
+        SELECT '{source}', {day} WHERE {day} IS NOT NULL;
+    """
+
+def _triggers(source: str) -> Dict[str, str]:
+    """
+    Insert, delete and update triggers of a report source, by name. The
+    update trigger only fires when a column the templates read changes, so
+    hash updates and crawler re-stats of files mark no days.
+    """
+    report_source = SOURCES[source]
+    table = report_source.table
+    prefix = f"{DIRTY_TABLE}_{source}"
+    changed = " OR ".join(f"old.{name} IS NOT new.{name}" for name in report_source.columns)
+    return {
+        f"{prefix}_ai": f"""CREATE TRIGGER {prefix}_ai AFTER INSERT ON {table} BEGIN
+            {_mark_dirty(source, 'new')}
+        END""",
+        f"{prefix}_ad": f"""CREATE TRIGGER {prefix}_ad AFTER DELETE ON {table} BEGIN
+            {_mark_dirty(source, 'old')}
+        END""",
+        f"{prefix}_au": f"""CREATE TRIGGER {prefix}_au
+        AFTER UPDATE OF {", ".join(report_source.columns)} ON {table}
+        WHEN {changed}
+        BEGIN
+            {_mark_dirty(source, 'old')}
+            {_mark_dirty(source, 'new')}
+        END""",
+    }
+
+def _insert_sql(template: ReportTemplate, condition: Optional[str] = None) -> str:
+    """INSERT ... SELECT computing a template's rows for the source rows matching condition."""
+    source = SOURCES[template.source]
+    day = source.day_sql.format(source.table)
+    selected = [day]
+    selected += [f"coalesce({expression}, '')" for expression in template.dimensions.values()]
+    selected += [f"coalesce(sum({expression}), 0)" for expression in template.measures.values()]
+    conditions = [f"{day} IS NOT NULL"] + [c for c in (template.where, condition) if c]
+    columns = ["day", *template.dimensions, *template.measures]
+    return f"""
+        INSERT INTO {template.table} ({", ".join(columns)})
+        SELECT {", ".join(selected)}
+        FROM {source.table}
+        WHERE {" AND ".join(f"({c})" for c in conditions)}
+        GROUP BY {", ".join(str(n) for n in range(1, len(template.dimensions) + 2))}
+    """
+
+def _create_table(conn: Connection, template: ReportTemplate) -> None:
+    """(Re)create a template's report table, empty."""
+    columns = ["day TEXT NOT NULL"]
+    columns += [f"{name} TEXT NOT NULL" for name in template.dimensions]
+    columns += [f"{name} NUMERIC NOT NULL DEFAULT 0" for name in template.measures]
+    key = ", ".join(["day", *template.dimensions])
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {template.table}")
+    conn.exec_driver_sql(
+        f"CREATE TABLE {template.table} ({', '.join(columns)}, PRIMARY KEY ({key}))"
+    )
+
+def _mark_refreshed(conn: Connection, template: ReportTemplate) -> None:
+    """Record the template's signature and bump its version."""
+    conn.execute(
+        text(f"""
+            INSERT INTO {STATE_TABLE} (name, signature, version, refreshed_at)
+            VALUES (:name, :signature, 1, :now)
+            ON CONFLICT (name) DO UPDATE SET
+                signature = excluded.signature,
+                version = version + 1,
+                refreshed_at = excluded.refreshed_at
+        """),
+        {"name": template.name, "signature": template.signature, "now": datetime.utcnow()},
+    )
+
+def install_reports(conn: Connection) -> None:
+    """
+    Create the dirty day triggers (replacing those whose definition changed),
+    and the report tables that are missing or whose template changed (those
+    are rebuilt from their source).
+    The dirty day and state tables are mapped models created by create_all.
+
+    Args:
+        conn (Connection): Sync connection (use run_sync from async code)
+    """
+    existing = dict(conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")).all())
+    for source in SOURCES:
+        for name, statement in _triggers(source).items():
+            # Replace triggers created by an older definition
+            if existing.get(name) != statement:
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+                conn.exec_driver_sql(statement)
+    signatures = dict(conn.execute(text(f"SELECT name, signature FROM {STATE_TABLE}")).all())
+    for template in REPORT_TEMPLATES:
+        if signatures.get(template.name) != template.signature:
+            logger.info(f"Creating report table {template.table}")
+            _create_table(conn, template)
+            rebuild_report(conn, template)
+
+def rebuild_report(conn: Connection, template: ReportTemplate) -> None:
+    """
+    Recompute every row of a report from its source in one pass.
+
+    Args:
+        conn (Connection): Sync connection
+        template (ReportTemplate): Report to rebuild
+    """
+    conn.exec_driver_sql(f"DELETE FROM {template.table}")
+    conn.exec_driver_sql(_insert_sql(template))
+    _mark_refreshed(conn, template)
+
+def rebuild_reports(conn: Connection) -> None:
+    """
+    Recompute every report and clear the dirty days.
+
+    Args:
+        conn (Connection): Sync connection
+    """
+    logger.info("Rebuilding role reports")
+    for template in REPORT_TEMPLATES:
+        rebuild_report(conn, template)
+    conn.exec_driver_sql(f"DELETE FROM {DIRTY_TABLE}")
+
+def _spans(days: Iterable[date]) -> List[Tuple[date, date]]:
+    """Merge sorted days into [start, end) ranges, joining gaps of up to SPAN_GAP_DAYS."""
+    spans: List[List[date]] = []
+    for day in days:
+        if spans and (day - spans[-1][1]).days < SPAN_GAP_DAYS:
+            spans[-1][1] = day + timedelta(days=1)
+        else:
+            spans.append([day, day + timedelta(days=1)])
+    return [(start, end) for start, end in spans]
+
+def _refresh_days(conn: Connection, template: ReportTemplate, days: Sequence[str]) -> None:
+    """
+    Recompute a report's rows for the given days.
+    ISO days are recomputed as date ranges over the source's date column, so
+    its index is used; days in the gaps of a range are recomputed too, which
+    gives the same rows. Unparseable dates form day buckets of their own and
+    are matched exactly.
+    """
+    source = SOURCES[template.source]
+    iso_days, other_days = [], []
+    for day in days:
+        try:
+            iso_days.append(date.fromisoformat(day))
+        except ValueError:
+            other_days.append(day)
+    day_sql = source.day_sql.format(source.table)
+    in_range = (
+        f"{source.table}.{source.date_column} >= :start AND {source.table}.{source.date_column} < :end "
+        f"AND {day_sql} >= :start AND {day_sql} < :end"
+    )
+    delete_range = text(f"DELETE FROM {template.table} WHERE day >= :start AND day < :end")
+    insert_range = text(_insert_sql(template, in_range))
+    for start, end in _spans(sorted(iso_days)):
+        bounds = {"start": start.isoformat(), "end": end.isoformat()}
+        conn.execute(delete_range, bounds)
+        conn.execute(insert_range, bounds)
+    if other_days:
+        days_param = bindparam("days", expanding=True)
+        conn.execute(
+            text(f"DELETE FROM {template.table} WHERE day IN :days").bindparams(days_param),
+            {"days": other_days},
+        )
+        exact = f"{source.table}.{source.date_column} IN :days AND {day_sql} IN :days"
+        conn.execute(text(_insert_sql(template, exact)).bindparams(days_param), {"days": other_days})
+
+def refresh_reports(conn: Connection) -> Dict[str, object]:
+    """
+    Recompute the report rows of every dirty day and clear those days.
+    Run it in a write transaction: days marked by writes that commit
+    meanwhile are not lost, because only the days read here are cleared.
+
+    Args:
+        conn (Connection): Sync connection
+
+    Returns:
+        Dict[str, object]: days (recomputed day buckets) and reports (names refreshed)
+    """
+    dirty: Dict[str, List[str]] = defaultdict(list)
+    for source, day in conn.execute(text(f"SELECT source, day FROM {DIRTY_TABLE}")):
+        dirty[source].append(day)
+    refreshed = []
+    for template in REPORT_TEMPLATES:
+        days = dirty.get(template.source)
+        if days:
+            _refresh_days(conn, template, days)
+            _mark_refreshed(conn, template)
+            refreshed.append(template.name)
+    cleared = [{"source": source, "day": day} for source, days in dirty.items() for day in days]
+    if cleared:
+        conn.execute(text(f"DELETE FROM {DIRTY_TABLE} WHERE source = :source AND day = :day"), cleared)
+    return {"days": len(cleared), "reports": refreshed}
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from .database import engine, init_db_sync
+
+    if argv not in (["refresh"], ["rebuild"]):
+        print("usage: python -m app.database.reports refresh|rebuild")
+        return 2
+    init_db_sync()
+    with engine.begin() as conn:
+        if argv == ["rebuild"]:
+            rebuild_reports(conn)
+            logger.info("Role reports rebuilt")
+        else:
+            result = refresh_reports(conn)
+            logger.info(f"Role reports refreshed: {result['days']} days, {result['reports']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
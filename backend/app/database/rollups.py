@@ -0,0 +1,124 @@
+"""
+Incrementally maintained transaction rollups.
+Triggers on the transactions table keep transaction_rollups (one row per day,
+department, category and payment mode) in step with every insert, update and
+delete, so summaries never have to scan the ledger.
+
+Usage (from the backend directory):
+    python -m app.database.rollups rebuild
+"""
+
+import sys
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLE = "transaction_rollups"
+
+# Day bucket of a ledger date: ISO dates are normalized by date(), anything
+# unparseable keeps its own bucket instead of being dropped
+DAY_SQL = "coalesce(date({0}.date), {0}.date)"
+
+def _apply(row: str, sign: str) -> str:
+    """UPSERT adding (sign=+) or removing (sign=-) one transaction from its bucket."""
+    return f"""
+        INSERT INTO {ROLLUP_TABLE} (
+            day, department, category, payment_mode,
+            txn_count, total_amount, credit_amount, debit_amount
+        ) VALUES (
+            {DAY_SQL.format(row)}, {row}.department, {row}.category, {row}.payment_mode,
+            {sign}1, {sign}{row}.amount,
+            {sign}max({row}.amount, 0), {sign}min({row}.amount, 0)
+        )
+        ON CONFLICT (day, department, category, payment_mode) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            total_amount = total_amount + excluded.total_amount,
+            credit_amount = credit_amount + excluded.credit_amount,
+            debit_amount = debit_amount + excluded.debit_amount;
+    """
+
+_PRUNE = f"""
+        DELETE FROM {ROLLUP_TABLE}
+        WHERE day = {DAY_SQL.format('old')} AND department = old.department
+          AND category = old.category AND payment_mode = old.payment_mode
+          AND txn_count <= 0;
+"""
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ROLLUP_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        {_apply('new', '+')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ROLLUP_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        {_apply('old', '-')}
+        {_PRUNE}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ROLLUP_TABLE}_au
+    AFTER UPDATE OF date, amount, department, category, payment_mode ON transactions BEGIN
+        {_apply('old', '-')}
+        {_PRUNE}
+        {_apply('new', '+')}
+    END
+    """,
+]
+
+def install_rollups(conn: Connection) -> None:
+    """
+    Create the rollup triggers if missing.
+    The rollup table itself is a mapped model created by create_all; when it
+    is empty but the ledger is not (first install), it is rebuilt.
+    
+    Args:
+        conn (Connection): Sync connection (use run_sync from async code)
+    """
+    for statement in _TRIGGERS:
+        conn.exec_driver_sql(statement)
+    rollups_empty = conn.execute(text(f"SELECT 1 FROM {ROLLUP_TABLE} LIMIT 1")).first() is None
+    ledger_empty = conn.execute(text("SELECT 1 FROM transactions LIMIT 1")).first() is None
+    if rollups_empty and not ledger_empty:
+        rebuild_rollups(conn)
+
+def rebuild_rollups(conn: Connection) -> None:
+    """
+    Recompute every rollup row from the transactions table in one pass.
+    Also clears floating point drift accumulated by incremental updates.
+    
+    Args:
+        conn (Connection): Sync connection
+    """
+    logger.info("Rebuilding transaction rollups")
+    conn.exec_driver_sql(f"DELETE FROM {ROLLUP_TABLE}")
+    conn.exec_driver_sql(f"""
+        INSERT INTO {ROLLUP_TABLE} (
+            day, department, category, payment_mode,
+            txn_count, total_amount, credit_amount, debit_amount
+        )
+        SELECT {DAY_SQL.format('transactions')}, department, category, payment_mode,
+               count(*), sum(amount), sum(max(amount, 0)), sum(min(amount, 0))
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+    """)
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from .database import engine, init_db_sync
+
+    if argv != ["rebuild"]:
+        print("usage: python -m app.database.rollups rebuild")
+        return 2
+    init_db_sync()
+    with engine.begin() as conn:
+        rebuild_rollups(conn)
+    logger.info("Transaction rollups rebuilt")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,120 @@
+"""
+SQLite storage profiles.
+Defines the PRAGMA settings and connection policy applied to every engine.
+"""
+
+import os
+from dataclasses import dataclass, fields, replace
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """
+    Tuning knobs for the SQLite database file and its connection pools.
+
+    Attributes:
+        journal_mode (str): SQLite journal mode, WAL lets readers run alongside the writer
+        synchronous (str): fsync level (OFF, NORMAL, FULL, EXTRA)
+        mmap_size (int): Bytes of the database file to memory-map
+        cache_size (int): Page cache size, negative values are KiB
+        busy_timeout (int): Milliseconds to wait on a locked database before failing
+        read_pool_size (int): Pooled read connections kept open
+        read_pool_overflow (int): Extra read connections allowed under burst
+        single_writer (bool): Route all writes through one queued writer connection
+        writer_max_batch (int): Maximum write jobs group-committed in one transaction
+        writer_linger_ms (int): Time the writer waits for more jobs before committing
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size: int = -64 * 1024
+    busy_timeout: int = 5000
+    read_pool_size: int = 8
+    read_pool_overflow: int = 16
+    single_writer: bool = True
+    writer_max_batch: int = 256
+    writer_linger_ms: int = 0
+
+    def pragmas(self) -> dict:
+        """
+        PRAGMA statements to run on every new connection.
+
+        Returns:
+            dict: Mapping of PRAGMA name to value
+        """
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "busy_timeout": self.busy_timeout,
+        }
+
+# Named presets selectable through BDMS_SQLITE_PROFILE
+PROFILES = {
+    # WAL with NORMAL sync: durable across application crashes, fast commits
+    "balanced": StorageProfile(),
+    # Full fsync on every commit for deployments that cannot lose a transaction
+    "durable": StorageProfile(synchronous="FULL"),
+    # Large batches and no fsync, for seeding and benchmarks only
+    "bulk": StorageProfile(synchronous="OFF", writer_max_batch=2048, writer_linger_ms=2),
+    # Plain SQLite defaults, kept for comparison
+    "legacy": StorageProfile(
+        journal_mode="DELETE", synchronous="FULL", mmap_size=0, cache_size=-2000,
+        busy_timeout=5000, single_writer=False
+    ),
+}
+
+def _coerce(value: str, target):
+    """Convert an environment string to the type of a profile field."""
+    if isinstance(target, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(target, int):
+        return int(value)
+    return value
+
+def load_profile() -> StorageProfile:
+    """
+    Build the storage profile from environment variables.
+    BDMS_SQLITE_PROFILE picks a preset, and BDMS_SQLITE_<FIELD> overrides a single field
+    (for example BDMS_SQLITE_BUSY_TIMEOUT=10000).
+
+    Returns:
+        StorageProfile: Effective storage profile
+
+    Raises:
+        ValueError: If the preset name is unknown
+    """
+    name = os.getenv("BDMS_SQLITE_PROFILE", "balanced").lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{name}', expected one of {sorted(PROFILES)}")
+    profile = PROFILES[name]
+    overrides = {}
+    for field in fields(StorageProfile):
+        raw = os.getenv(f"BDMS_SQLITE_{field.name.upper()}")
+        if raw is not None:
+            overrides[field.name] = _coerce(raw, getattr(profile, field.name))
+    if overrides:
+        profile = replace(profile, **overrides)
+    logger.info(f"Using SQLite storage profile '{name}': {profile}")
+    return profile
+
+def apply_pragmas(dbapi_connection, profile: StorageProfile) -> None:
+    """
+    Apply the profile PRAGMAs to a raw DBAPI connection.
+    Works for both the sqlite3 and the aiosqlite adapted connection.
+
+    Args:
+        dbapi_connection: Newly opened DBAPI connection
+        profile (StorageProfile): Profile to apply
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in profile.pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
@@ -0,0 +1,41 @@
+"""
+Tombstones of deleted file records.
+A trigger on the ByteDB table appends the file ID of every deleted row to
+file_tombstones and keeps only the newest TOMBSTONE_ROWS of them, so readers
+that cache file records can catch up on deletes incrementally.
+"""
+
+from sqlalchemy.engine import Connection
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOMBSTONE_TABLE = "file_tombstones"
+
+# Tombstones kept; a reader further behind than this re-reads every file ID
+TOMBSTONE_ROWS = 100000
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS ByteDB_tombstone_ad AFTER DELETE ON ByteDB BEGIN
+        INSERT INTO {TOMBSTONE_TABLE} (file_id) VALUES (old.file_id);
+        DELETE FROM {TOMBSTONE_TABLE} WHERE seq <= last_insert_rowid() - {TOMBSTONE_ROWS};
+    END
+    """,
+]
+
+# Sequence number of the last tombstone written (no row if none was)
+LAST_TOMBSTONE_SQL = f"SELECT seq FROM sqlite_sequence WHERE name = '{TOMBSTONE_TABLE}'"
+
+def install_tombstones(conn: Connection) -> None:
+    """
+    Create the tombstone trigger if missing.
+    The file_tombstones table is a mapped model created by create_all.
+
+    Args:
+        conn (Connection): Sync connection (use run_sync from async code)
+    """
+    for statement in _TRIGGERS:
+        conn.exec_driver_sql(statement)
@@ -0,0 +1,132 @@
+"""
+Single-writer queue for SQLite.
+Serializes all writes onto one connection and group-commits pending jobs.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WriteJob = Callable[[AsyncSession], Awaitable[Any]]
+
+class WriteQueue:
+    """
+    Queue feeding a dedicated writer session.
+
+    Every job submitted while the writer is busy is collected into the next
+    batch. A batch runs inside one transaction with a SAVEPOINT per job, so a
+    failing job is rolled back on its own and the rest still commit together.
+    One fsync therefore covers the whole batch.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        max_batch: int = 256,
+        linger_ms: int = 0
+    ):
+        """
+        Args:
+            session_factory (async_sessionmaker): Factory bound to the writer engine
+            max_batch (int): Maximum jobs per group commit
+            linger_ms (int): Time to wait for more jobs before committing a batch
+        """
+        self._session_factory = session_factory
+        self._max_batch = max_batch
+        self._linger = linger_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.jobs = 0
+
+    def _ensure_started(self) -> None:
+        """Start the writer task on the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(), name="bdms-sqlite-writer")
+
+    async def submit(self, job: WriteJob) -> Any:
+        """
+        Queue a write job and wait until its batch has committed.
+
+        Args:
+            job (WriteJob): Coroutine function receiving the writer session
+
+        Returns:
+            Any: Whatever the job returned
+
+        Raises:
+            Exception: The job's own exception, or the commit failure of its batch
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((job, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[WriteJob, asyncio.Future]]:
+        """Wait for one job, then take everything else already pending."""
+        batch = [await self._queue.get()]
+        if self._linger:
+            await asyncio.sleep(self._linger)
+        while len(batch) < self._max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Writer loop: run and group-commit batches until cancelled."""
+        while True:
+            batch = await self._collect()
+            results = []
+            try:
+                async with self._session_factory() as session:
+                    async with session.begin():
+                        for job, future in batch:
+                            try:
+                                async with session.begin_nested():
+                                    results.append((future, await job(session), None))
+                            except Exception as e:
+                                results.append((future, None, e))
+                self.batches += 1
+                self.jobs += len(batch)
+                for future, result, error in results:
+                    if future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Write batch of {len(batch)} jobs failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def close(self) -> None:
+        """Commit everything still queued, then stop the writer task."""
+        if self._worker is not None and not self._worker.done():
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
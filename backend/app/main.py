@@ -4,11 +4,22 @@ Configures and runs the BDMS API server.
 """
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 import uvicorn
-from .database.database import init_db
-from .routers import file_router
+from .database.database import init_db, close_db, engine, async_engine, writer_engine
+from .database.partitions import file_partitions
+from .routers import (
+    file_router, transaction_router, future_router, account_router, change_router, analytics_router,
+    report_router
+)
+from .services.admission import AdmissionMiddleware
+from .services.scheduler import future_scheduler
+from .services.account_service import balance_audit
+from .services.crawler import file_crawler
+from .services.hashing import file_hasher
+from .services.metrics import MetricsMiddleware, instrument_engine, metrics
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +35,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Admission control per route class (inside CORS, so 503 responses carry CORS headers)
+app.add_middleware(AdmissionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -33,19 +47,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics (outermost, so the latency includes every other middleware)
+app.add_middleware(MetricsMiddleware)
+
+# SQL statement timing on every engine
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "read")
+instrument_engine(writer_engine.sync_engine, "write")
+
 # Include routers
 app.include_router(file_router.router)
+app.include_router(transaction_router.router)
+app.include_router(future_router.router)
+app.include_router(account_router.router)
+app.include_router(change_router.router)
+app.include_router(analytics_router.router)
+app.include_router(report_router.router)
 
 @app.on_event("startup")
 async def startup_event():
     """
     Initialize application on startup.
-    Creates database tables and performs any necessary setup.
+    Creates database tables, performs any necessary setup (opening the file
+    partitions and removing copies left by interrupted department moves when
+    storage is partitioned) and starts the planned
+    transaction scheduler and the balance audit.
     """
     logger.info("Initializing application")
-    init_db()
+    await init_db()
+    if file_partitions.enabled:
+        await file_partitions.load()
+        await file_partitions.dedupe()
+    await future_scheduler.start()
+    await balance_audit.start()
     logger.info("Application initialized successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Release resources on shutdown.
+    Stops background tasks (a running crawl or hashing run stops
+    after its current batch) and disposes pooled database connections.
+    """
+    logger.info("Shutting down application")
+    await file_crawler.stop()
+    await file_hasher.stop()
+    await balance_audit.stop()
+    await future_scheduler.stop()
+    await file_partitions.close()
+    await close_db()
+
 @app.get("/", tags=["root"])
 async def root():
     """
@@ -60,6 +111,16 @@ async def root():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus scrape endpoint.
+
+    Returns:
+        PlainTextResponse: Metrics in the Prometheus text exposition format
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -0,0 +1,197 @@
+"""
+API routes for account (AccountsPresent) operations.
+Implements RESTful endpoints using FastAPI.
+"""
+
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from ..database.database import get_db
+from ..schemas.account_schemas import (
+    AccountCreate, AccountUpdate, AccountResponse, AccountQuery, AccountBalance, BalanceReport
+)
+from ..services.account_service import AccountService
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create router instance
+router = APIRouter(
+    prefix="/api/accounts",
+    tags=["accounts"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.post("/", response_model=AccountResponse, status_code=201)
+async def create_account(
+    account_data: AccountCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a new account. Its balance starts at the opening balance plus any
+    ledger entries already booked against its cc_id.
+
+    Args:
+        account_data (AccountCreate): Account data to create
+        db (AsyncSession): Database session
+
+    Returns:
+        AccountResponse: Created account
+
+    Raises:
+        HTTPException: If creation fails
+    """
+    try:
+        logger.info("Creating new account")
+        return await AccountService.create_account(db, account_data)
+    except Exception as e:
+        logger.error(f"Error creating account: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/verify", response_model=BalanceReport)
+async def verify_balances(
+    repair: bool = Query(False, description="Overwrite drifted balances with the recomputed values"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Recompute every balance from the ledger and report drift.
+
+    Args:
+        repair (bool): Repair drifted balances
+        db (AsyncSession): Database session
+
+    Returns:
+        BalanceReport: Accounts checked and drifted balances
+    """
+    logger.info("Verifying account balances")
+    return await AccountService.verify_balances(db, repair)
+
+@router.get("/balance/{cc_id}", response_model=AccountBalance)
+async def get_balance(
+    cc_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Current balance of an account by its cc_id.
+
+    Args:
+        cc_id (str): Account ID used by transactions
+        db (AsyncSession): Database session
+
+    Returns:
+        AccountBalance: Balance
+
+    Raises:
+        HTTPException: If the account does not exist
+    """
+    balance = await AccountService.get_balance(db, cc_id)
+    if balance is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return AccountBalance(cc_id=cc_id, balance=balance)
+
+@router.get("/{account_id}", response_model=AccountResponse)
+async def get_account(
+    account_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve an account by ID.
+
+    Args:
+        account_id (int): ID of the account
+        db (AsyncSession): Database session
+
+    Returns:
+        AccountResponse: Account
+
+    Raises:
+        HTTPException: If not found
+    """
+    logger.info(f"Retrieving account: {account_id}")
+    account = await AccountService.get_account(db, account_id)
+    if account is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return account
+
+@router.get("/", response_model=List[AccountResponse])
+async def get_accounts(
+    skip: int = Query(0, description="Number of accounts to skip"),
+    limit: int = Query(100, description="Maximum number of accounts to return"),
+    query_params: AccountQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve accounts with optional filtering.
+
+    Args:
+        skip (int): Number of accounts to skip
+        limit (int): Maximum number of accounts to return
+        query_params (AccountQuery): Optional query parameters for filtering
+        db (AsyncSession): Database session
+
+    Returns:
+        List[AccountResponse]: List of accounts
+    """
+    logger.info("Retrieving accounts")
+    return await AccountService.get_accounts(db, skip, limit, query_params)
+
+@router.put("/{account_id}", response_model=AccountResponse)
+async def update_account(
+    account_id: int,
+    account_data: AccountUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update an account.
+
+    Args:
+        account_id (int): ID of the account
+        account_data (AccountUpdate): Updated account data
+        db (AsyncSession): Database session
+
+    Returns:
+        AccountResponse: Updated account
+
+    Raises:
+        HTTPException: If not found or update fails
+    """
+    try:
+        logger.info(f"Updating account: {account_id}")
+        account = await AccountService.update_account(db, account_id, account_data)
+        if account is None:
+            raise HTTPException(status_code=404, detail="Account not found")
+        return account
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating account: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/{account_id}", status_code=204)
+async def delete_account(
+    account_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete an account.
+
+    Args:
+        account_id (int): ID of the account
+        db (AsyncSession): Database session
+
+    Raises:
+        HTTPException: If not found or deletion fails
+    """
+    try:
+        logger.info(f"Deleting account: {account_id}")
+        success = await AccountService.delete_account(db, account_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Account not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting account: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
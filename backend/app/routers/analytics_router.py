@@ -0,0 +1,102 @@
+"""
+API routes for file storage analytics.
+Answers aggregate questions from the in-memory columnar snapshot of ByteDB.
+"""
+
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+import logging
+
+from ..schemas.analytics_schemas import AnalyticsDimension, AnalyticsSnapshotStatus, FileAnalytics
+from ..schemas.file_schemas import FileQuery
+from ..services.analytics import file_analytics
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create router instance
+router = APIRouter(
+    prefix="/api/analytics",
+    tags=["analytics"],
+)
+
+@router.get("/files", response_model=FileAnalytics)
+async def get_file_analytics(
+    group_by: Optional[List[AnalyticsDimension]] = Query(
+        None, description="Columns to group by, e.g. department and file_type"
+    ),
+    order_by: Literal["total_size", "count"] = Query("total_size", description="Group order (descending)"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum groups to return"),
+    percentile: Optional[List[float]] = Query(
+        None, description="File size percentiles to compute (default 50, 90, 99)"
+    ),
+    histogram: Optional[Literal["log2", "linear"]] = Query(
+        "log2", description="File size histogram: power-of-two or equal-width buckets"
+    ),
+    bins: int = Query(20, ge=1, le=1000, description="Buckets of a linear histogram"),
+    query_params: FileQuery = Depends()
+):
+    """
+    Total bytes and file counts per group, file size percentiles and a size
+    histogram for the records matching the filters. Answered from an
+    in-memory column snapshot that is refreshed from the database when it is
+    older than BDMS_ANALYTICS_REFRESH_SECONDS.
+
+    Args:
+        group_by (Optional[List[AnalyticsDimension]]): Columns to group by
+        order_by (str): Group order
+        limit (int): Maximum groups to return
+        percentile (Optional[List[float]]): Percentiles to compute
+        histogram (Optional[str]): Histogram scale
+        bins (int): Buckets of a linear histogram
+        query_params (FileQuery): Query parameters for filtering
+
+    Returns:
+        FileAnalytics: Totals, groups, percentiles and histogram
+
+    Raises:
+        HTTPException: If a percentile is out of range or NumPy is not installed
+    """
+    logger.info(f"Computing file analytics grouped by {group_by or []}")
+    try:
+        return await file_analytics.query(
+            query_params,
+            group_by=group_by or (),
+            order_by=order_by,
+            limit=limit,
+            percentiles=percentile if percentile is not None else (50, 90, 99),
+            histogram=histogram,
+            bins=bins,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/status", response_model=AnalyticsSnapshotStatus)
+async def get_analytics_status():
+    """
+    Report the size and freshness of the analytics snapshot.
+
+    Returns:
+        AnalyticsSnapshotStatus: Snapshot state
+    """
+    return file_analytics.stats()
+
+@router.post("/refresh", response_model=AnalyticsSnapshotStatus)
+async def refresh_analytics():
+    """
+    Refresh the analytics snapshot now instead of on the next query.
+
+    Returns:
+        AnalyticsSnapshotStatus: Snapshot state after the refresh
+
+    Raises:
+        HTTPException: If NumPy is not installed
+    """
+    try:
+        await file_analytics.refresh(force=True)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return file_analytics.stats()
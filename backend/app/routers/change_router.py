@@ -0,0 +1,73 @@
+"""
+API routes for the change feed.
+Streams committed file and transaction writes as Server-Sent Events.
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+import logging
+
+from ..schemas.change_schemas import ChangeEntity, ChangeFeedStatus
+from ..services.changes import change_feed
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create router instance
+router = APIRouter(
+    prefix="/api/changes",
+    tags=["changes"],
+)
+
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Event stream"}},
+)
+async def stream_changes(
+    entity: Optional[List[ChangeEntity]] = Query(
+        None, description="Entities to receive events for (default: all)"
+    ),
+    last_event_id: Optional[str] = Query(
+        None, description="Resume after this event ID (for clients that cannot send Last-Event-ID)"
+    ),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Stream committed writes as Server-Sent Events.
+    Each event is named after its entity ("file" or "transaction") and
+    carries a ChangeEvent as JSON: created/updated records in full, IDs of
+    deleted records, or a "reload" op after bulk writes. A client that
+    reconnects with the ID of the last event it applied receives everything
+    it missed; if those events are no longer buffered (or the server
+    restarted) it receives a "reset" event and should re-fetch.
+
+    Args:
+        entity (Optional[List[ChangeEntity]]): Entities to receive events for
+        last_event_id (Optional[str]): Resume position as a query parameter
+        last_event_id_header (Optional[str]): Resume position sent by EventSource on reconnect
+
+    Returns:
+        StreamingResponse: text/event-stream response
+    """
+    entities = set(entity or ("file", "transaction"))
+    # The header is newer: EventSource keeps the original URL when it reconnects
+    resume_from = last_event_id_header or last_event_id
+    logger.info(f"Opening change stream for {sorted(entities)} from {resume_from or 'now'}")
+    return StreamingResponse(
+        change_feed.stream(resume_from, entities),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/status", response_model=ChangeFeedStatus)
+async def get_change_feed_status():
+    """
+    Report change feed position, buffer use and open streams.
+
+    Returns:
+        ChangeFeedStatus: Feed state
+    """
+    return change_feed.stats()
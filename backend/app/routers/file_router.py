@@ -3,14 +3,28 @@ API routes for file management operations.
 Implements RESTful endpoints using FastAPI.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from ..database.database import get_db
-from ..schemas.file_schemas import FileCreate, FileUpdate, FileResponse, FileQuery
-from ..services.file_service import FileService
+from ..database.partitions import file_partitions
+from ..schemas.file_schemas import (
+    FileCreate, FileUpdate, FileResponse, FileQuery, FileSearchResult, BulkIngestResult,
+    FilePage, FileSortField, QueryPlan, FileBatchIds, FileBatchUpdate, FileBatchItem, FileBatchResult,
+    FileFacets, CrawlRequest, CrawlStatus, DuplicateReport, HashRequest, HashStatus
+)
+from ..services.file_service import FileService, PartialWriteError
+from ..services.ingest import detect_format, parse_rows
+from ..services.index_advisor import explain_files_query
+from ..services.cache import file_cache, etag_matches
+from ..services.single_flight import file_reads
+from ..services.export import export_response
+from ..services.crawler import file_crawler
+from ..services.hashing import file_hasher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,17 +37,97 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Serializers for cached responses (same wire format as the response models)
+_FILE = TypeAdapter(FileResponse)
+_FILE_LIST = TypeAdapter(List[FileResponse])
+_FILE_PAGE = TypeAdapter(FilePage)
+_FILE_FACETS = TypeAdapter(FileFacets)
+_DUPLICATES = TypeAdapter(DuplicateReport)
+_SEARCH_RESULTS = TypeAdapter(List[FileSearchResult])
+
+def _query_key(query_params: Optional[FileQuery]) -> Tuple[Tuple[str, Any], ...]:
+    """Normalized, hashable form of the applied filters."""
+    if not query_params:
+        return ()
+    return tuple(sorted(
+        (name, value) for name, value in query_params.model_dump().items()
+        if value not in (None, "")
+    ))
+
+def _batch_result(
+    file_ids: List[int],
+    records: Dict[int, Any],
+    status: Literal["found", "updated", "deleted"],
+    failed: Optional[Dict[int, str]] = None
+) -> FileBatchResult:
+    """
+    Per-ID outcomes of a batch request, in request order without duplicates.
+    
+    Args:
+        file_ids (List[int]): Requested IDs
+        records (Dict[int, Any]): Records (or None for deletes) of the IDs that exist
+        status (str): Outcome of the IDs that exist
+        failed (Optional[Dict[int, str]]): Error of the IDs that could not be written
+        
+    Returns:
+        FileBatchResult: Counts and per-ID outcomes
+    """
+    failed = failed or {}
+    results = [
+        FileBatchItem(file_id=file_id, status=status, file=records[file_id])
+        if file_id in records else
+        FileBatchItem(file_id=file_id, status="failed", error=failed[file_id])
+        if file_id in failed else FileBatchItem(file_id=file_id, status="not_found")
+        for file_id in dict.fromkeys(file_ids)
+    ]
+    succeeded = sum(1 for item in results if item.status == status)
+    failures = sum(1 for item in results if item.status == "failed")
+    return FileBatchResult(
+        requested=len(results), succeeded=succeeded, not_found=len(results) - succeeded - failures,
+        failed=failures, results=results
+    )
+
+async def _cached_json(
+    request: Request,
+    key: Hashable,
+    load: Callable[[], Awaitable[bytes]],
+    matches: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> Response:
+    """
+    Serve a JSON body through the file cache with a strong ETag.
+    On a miss, identical concurrent requests share one load. Answers 304 Not
+    Modified without a body when If-None-Match is current.
+    
+    Args:
+        request (Request): Incoming request
+        key (Hashable): Cache key
+        load (Callable[[], Awaitable[bytes]]): Produces the serialized body on a miss
+        matches (Optional[Callable]): Row predicate for list responses
+        
+    Returns:
+        Response: 200 with the body, or 304
+    """
+    entry = file_cache.get(key)
+    if entry is None:
+        generation = file_cache.generation
+        body = await file_reads.do((key, generation), load)
+        entry = file_cache.put(key, body, generation, matches)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
 @router.post("/", response_model=FileResponse, status_code=201)
 async def create_file(
     file_data: FileCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new file record.
     
     Args:
         file_data (FileCreate): File data to create
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         FileResponse: Created file record
@@ -42,23 +136,430 @@ async def create_file(
         HTTPException: If creation fails
     """
     try:
-        logger.info("Creating new file record")
+        logger.debug("Creating new file record")
         return await FileService.create_file(db, file_data)
     except Exception as e:
         logger.error(f"Error creating file record: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post(
+    "/bulk",
+    response_model=BulkIngestResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_files(
+    request: Request,
+    upload_format: Optional[str] = Query(
+        None, alias="format", description="Upload format (ndjson or csv), defaults to Content-Type"
+    ),
+    chunk_size: int = Query(1000, ge=1, le=10000, description="Rows validated and inserted per batch"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk-create file records from a streamed NDJSON or CSV body.
+    The body is parsed and inserted chunk by chunk; invalid rows are reported
+    individually without aborting the rest of the upload.
+    
+    Args:
+        request (Request): Incoming request, read as a stream
+        upload_format (Optional[str]): Explicit upload format
+        chunk_size (int): Rows validated and inserted per batch
+        db (AsyncSession): Database session
+        
+    Returns:
+        BulkIngestResult: Counts and per-row errors
+        
+    Raises:
+        HTTPException: If the format is unsupported or the upload fails
+    """
+    try:
+        fmt = detect_format(request.headers.get("content-type"), upload_format)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    try:
+        logger.debug(f"Bulk creating file records from {fmt} upload")
+        return await FileService.bulk_create_files(db, parse_rows(request.stream(), fmt), chunk_size)
+    except Exception as e:
+        logger.error(f"Error bulk creating file records: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/page", response_model=FilePage)
+async def get_files_page(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    sort_by: FileSortField = Query("file_id", description="Sort column, file_id breaks ties"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    query_params: FileQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve file records with cursor-based (keyset) pagination.
+    Pass the returned next_cursor, with the same filters, to fetch the following page.
+    
+    Args:
+        request (Request): Incoming request
+        cursor (Optional[str]): Cursor of the page to fetch, omitted for the first page
+        limit (int): Maximum number of records to return
+        sort_by (FileSortField): Sort column
+        order (str): Sort direction
+        query_params (FileQuery): Query parameters for filtering
+        db (AsyncSession): Database session
+        
+    Returns:
+        FilePage: Records and the cursor of the next page
+        
+    Raises:
+        HTTPException: If the cursor is invalid or does not match the filters
+    """
+    logger.debug("Retrieving file record page")
+
+    async def load() -> bytes:
+        try:
+            items, next_cursor = await FileService.get_files_page(
+                db, limit, cursor, sort_by, order, query_params
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        page = _FILE_PAGE.validate_python(
+            {"items": items, "next_cursor": next_cursor}, from_attributes=True
+        )
+        return _FILE_PAGE.dump_json(page)
+
+    key = ("page", _query_key(query_params), cursor, limit, sort_by, order)
+    return await _cached_json(
+        request, key, load, lambda row: FileService.matches_query(query_params, row)
+    )
+
+@router.get("/facets", response_model=FileFacets)
+async def get_file_facets(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum values per dimension"),
+    query_params: FileQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Count file records and total their sizes per department, owner, file type
+    and access level for the filter sidebar. Each dimension ignores its own
+    filter, so the other values of a selected dimension are still listed.
+    
+    Args:
+        request (Request): Incoming request
+        limit (int): Maximum values per dimension
+        query_params (FileQuery): Query parameters for filtering
+        db (AsyncSession): Database session
+        
+    Returns:
+        FileFacets: Totals and per-dimension counts
+    """
+    logger.debug("Retrieving file facets")
+
+    async def load() -> bytes:
+        facets = await FileService.get_facets(db, query_params, limit)
+        return _FILE_FACETS.dump_json(_FILE_FACETS.validate_python(facets))
+
+    key = ("facets", _query_key(query_params), limit)
+    return await _cached_json(
+        request, key, load, lambda row: FileService.matches_facets(query_params, row)
+    )
+
+@router.post("/crawl", response_model=CrawlStatus, status_code=202)
+async def start_crawl(request: CrawlRequest):
+    """
+    Start indexing the configured filesystem roots into ByteDB in the background.
+    Unchanged directories are skipped unless full is set; poll GET /crawl for progress.
+    
+    Args:
+        request (CrawlRequest): Roots to crawl and whether to list every directory
+        
+    Returns:
+        CrawlStatus: Crawler state after starting
+        
+    Raises:
+        HTTPException: If a crawl is already running or a root is not configured
+    """
+    try:
+        logger.info("Starting filesystem crawl")
+        file_crawler.start_crawl(request.roots, request.full)
+        return file_crawler.status()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/crawl", response_model=CrawlStatus)
+async def get_crawl_status():
+    """
+    Report crawler progress and the outcome of the last crawl.
+    
+    Returns:
+        CrawlStatus: Crawler state
+    """
+    return file_crawler.status()
+
+@router.get("/duplicates", response_model=DuplicateReport)
+async def get_duplicate_files(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Number of groups to skip"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of groups to return"),
+    query_params: FileQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List files with identical content, grouped by content hash, with the
+    bytes reclaimable per department. Only files hashed by the hashing job
+    (POST /hash) are considered.
+    
+    Args:
+        request (Request): Incoming request
+        skip (int): Number of groups to skip
+        limit (int): Maximum number of groups to return
+        query_params (FileQuery): Query parameters for filtering
+        db (AsyncSession): Database session
+        
+    Returns:
+        DuplicateReport: Totals, per-department reclaimable bytes and duplicate groups
+        
+    Raises:
+        HTTPException: If file storage is partitioned
+    """
+    logger.debug("Retrieving duplicate files")
+
+    async def load() -> bytes:
+        report = await FileService.get_duplicates(db, query_params, skip, limit)
+        return _DUPLICATES.dump_json(_DUPLICATES.validate_python(report, from_attributes=True))
+
+    key = ("duplicates", _query_key(query_params), skip, limit)
+    try:
+        return await _cached_json(
+            request, key, load,
+            lambda row: row.get("content_hash") is not None and FileService.matches_query(query_params, row)
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/hash", response_model=HashStatus, status_code=202)
+async def start_hashing(request: HashRequest):
+    """
+    Start hashing file contents in the background for duplicate detection.
+    Only files that share their size with another record are read; poll
+    GET /hash for progress.
+    
+    Args:
+        request (HashRequest): Whether to recompute every stored hash
+        
+    Returns:
+        HashStatus: Hashing job state after starting
+        
+    Raises:
+        HTTPException: If a hashing run is already in progress
+    """
+    try:
+        logger.info("Starting content hashing")
+        file_hasher.start_hashing(request.rehash)
+        return file_hasher.status()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/hash", response_model=HashStatus)
+async def get_hashing_status():
+    """
+    Report hashing progress and the outcome of the last run.
+    
+    Returns:
+        HashStatus: Hashing job state
+    """
+    return file_hasher.status()
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Report file response cache and read coalescing counters.
+    
+    Returns:
+        dict: Size, hits, misses, evictions, invalidations and hit ratio, and
+            under coalescing the reads run and the reads that joined one in flight
+    """
+    return {**file_cache.stats(), "coalescing": file_reads.stats()}
+
+@router.get("/partitions")
+async def get_partitions():
+    """
+    List the department partitions of file storage (empty unless
+    BDMS_PARTITION_FILES is enabled).
+    
+    Returns:
+        list: Number, department, path and write queue counters of each partition
+    """
+    if file_partitions.enabled:
+        await file_partitions.load(force=False)
+    return file_partitions.stats()
+
+@router.get("/explain", response_model=QueryPlan)
+async def explain_files(
+    sort_by: Optional[FileSortField] = Query(
+        None, description="Explain a cursor page sorted by this column instead of the offset listing"
+    ),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    limit: int = Query(100, ge=1, le=1000, description="Page size"),
+    query_params: FileQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Show the SQLite query plan for a file listing and flag full scans.
+    
+    Args:
+        sort_by (Optional[FileSortField]): Sort column of a cursor page
+        order (str): Sort direction
+        limit (int): Page size
+        query_params (FileQuery): Query parameters for filtering
+        db (AsyncSession): Database session
+        
+    Returns:
+        QueryPlan: Analyzed query plan (of one partition with partitioned storage)
+        
+    Raises:
+        HTTPException: If file storage is partitioned and has no partition yet
+    """
+    logger.debug("Explaining file listing query")
+    try:
+        return await explain_files_query(db, query_params, sort_by, order, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}, "application/x-ndjson": {}, "application/gzip": {}}}},
+)
+async def export_files(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format", description="Export format"),
+    compress: bool = Query(False, alias="gzip", description="Gzip the download"),
+    query_params: FileQuery = Depends()
+):
+    """
+    Stream every file record matching the filters as CSV or NDJSON.
+    Rows are read from a server-side cursor and encoded directly, so the
+    export runs in constant memory regardless of its size.
+    
+    Args:
+        export_format (str): csv or ndjson
+        compress (bool): Gzip the download
+        query_params (FileQuery): Query parameters for filtering
+        
+    Returns:
+        StreamingResponse: File records as a download
+    """
+    logger.debug(f"Exporting file records as {export_format}")
+    engines = None
+    if file_partitions.enabled:
+        engines = [partition.read_engine for partition in await file_partitions.for_query(query_params)]
+    return export_response(
+        FileService.build_export_query(query_params), export_format, "bytedb", compress, engines=engines
+    )
+
+@router.post("/batch/get", response_model=FileBatchResult)
+async def get_files_batch(
+    batch: FileBatchIds,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve many file records by ID with one query.
+    
+    Args:
+        batch (FileBatchIds): IDs to retrieve
+        db (AsyncSession): Database session
+        
+    Returns:
+        FileBatchResult: Per-ID outcomes (found or not_found)
+    """
+    logger.debug(f"Retrieving {len(batch.file_ids)} file records")
+    records = await FileService.get_files_by_ids(db, batch.file_ids)
+    return _batch_result(batch.file_ids, records, "found")
+
+@router.put("/batch", response_model=FileBatchResult)
+async def update_files_batch(
+    batch: FileBatchUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update many file records in one transaction.
+    Send per-ID changes in updates, or the same changes for every ID in
+    file_ids (e.g. {"file_ids": [...], "changes": {"department": "HR"}}).
+    
+    Args:
+        batch (FileBatchUpdate): Changes to apply
+        db (AsyncSession): Database session
+        
+    Returns:
+        FileBatchResult: Per-ID outcomes (updated or not_found; failed when a
+            partition of partitioned storage could not be written)
+        
+    Raises:
+        HTTPException: If the update fails; no record is changed
+    """
+    try:
+        changes = batch.changes_by_id()
+        logger.debug(f"Batch updating {len(changes)} file records")
+        records = await FileService.update_files(db, changes)
+        return _batch_result(list(batch.updates) + batch.file_ids, records, "updated")
+    except PartialWriteError as e:
+        return _batch_result(list(batch.updates) + batch.file_ids, e.done, "updated", e.failed)
+    except Exception as e:
+        logger.error(f"Error batch updating file records: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/batch/delete", response_model=FileBatchResult)
+async def delete_files_batch(
+    batch: FileBatchIds,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete many file records in one transaction.
+    
+    Args:
+        batch (FileBatchIds): IDs to delete
+        db (AsyncSession): Database session
+        
+    Returns:
+        FileBatchResult: Per-ID outcomes (deleted or not_found; failed when a
+            partition of partitioned storage could not be written)
+        
+    Raises:
+        HTTPException: If deletion fails; no record is deleted
+    """
+    try:
+        logger.debug(f"Batch deleting {len(batch.file_ids)} file records")
+        deleted = await FileService.delete_files(db, batch.file_ids)
+        return _batch_result(batch.file_ids, dict.fromkeys(deleted), "deleted")
+    except PartialWriteError as e:
+        return _batch_result(batch.file_ids, e.done, "deleted", e.failed)
+    except Exception as e:
+        logger.error(f"Error batch deleting file records: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{file_id}", response_model=FileResponse)
 async def get_file(
+    request: Request,
     file_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve a specific file record by ID.
+    Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified.
     
     Args:
+        request (Request): Incoming request
         file_id (int): ID of the file to retrieve
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         FileResponse: Retrieved file record
@@ -66,39 +567,60 @@ async def get_file(
     Raises:
         HTTPException: If file not found
     """
-    logger.info(f"Retrieving file record: {file_id}")
-    file = await FileService.get_file(db, file_id)
-    if file is None:
-        raise HTTPException(status_code=404, detail="File not found")
-    return file
+    logger.debug(f"Retrieving file record: {file_id}")
+
+    async def load() -> bytes:
+        file = await FileService.get_file(db, file_id)
+        if file is None:
+            raise HTTPException(status_code=404, detail="File not found")
+        return _FILE.dump_json(_FILE.validate_python(file, from_attributes=True))
+
+    return await _cached_json(request, ("file", file_id), load)
 
 @router.get("/", response_model=List[FileResponse])
 async def get_files(
+    request: Request,
     skip: int = Query(0, description="Number of records to skip"),
     limit: int = Query(100, description="Maximum number of records to return"),
-    query_params: Optional[FileQuery] = None,
-    db: Session = Depends(get_db)
+    fast: bool = Query(False, description="Encode rows directly, skipping ORM objects and validation"),
+    query_params: FileQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve multiple file records with optional filtering.
+    Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified.
+    With fast=true the same JSON is produced from column tuples, which is much
+    cheaper for large limits.
     
     Args:
+        request (Request): Incoming request
         skip (int): Number of records to skip
         limit (int): Maximum number of records to return
+        fast (bool): Use the fast serialization path
         query_params (FileQuery): Optional query parameters for filtering
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         List[FileResponse]: List of file records
     """
-    logger.info("Retrieving file records")
-    return await FileService.get_files(db, skip, limit, query_params)
+    logger.debug("Retrieving file records")
+
+    async def load() -> bytes:
+        if fast:
+            return await FileService.get_files_json(db, skip, limit, query_params)
+        records = await FileService.get_files(db, skip, limit, query_params)
+        return _FILE_LIST.dump_json(_FILE_LIST.validate_python(records, from_attributes=True))
+
+    key = ("files", _query_key(query_params), skip, limit)
+    return await _cached_json(
+        request, key, load, lambda row: FileService.matches_query(query_params, row)
+    )
 
 @router.put("/{file_id}", response_model=FileResponse)
 async def update_file(
     file_id: int,
     file_data: FileUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an existing file record.
@@ -106,7 +628,7 @@ async def update_file(
     Args:
         file_id (int): ID of the file to update
         file_data (FileUpdate): Updated file data
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         FileResponse: Updated file record
@@ -115,11 +637,13 @@ async def update_file(
         HTTPException: If file not found or update fails
     """
     try:
-        logger.info(f"Updating file record: {file_id}")
+        logger.debug(f"Updating file record: {file_id}")
         file = await FileService.update_file(db, file_id, file_data)
         if file is None:
             raise HTTPException(status_code=404, detail="File not found")
         return file
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating file record: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -127,43 +651,61 @@ async def update_file(
 @router.delete("/{file_id}", status_code=204)
 async def delete_file(
     file_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a file record.
     
     Args:
         file_id (int): ID of the file to delete
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Raises:
         HTTPException: If file not found or deletion fails
     """
     try:
-        logger.info(f"Deleting file record: {file_id}")
+        logger.debug(f"Deleting file record: {file_id}")
         success = await FileService.delete_file(db, file_id)
         if not success:
             raise HTTPException(status_code=404, detail="File not found")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error deleting file record: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/search/{search_term}", response_model=List[FileResponse])
+@router.get("/search/{search_term}", response_model=List[FileSearchResult])
 async def search_files(
     search_term: str,
     limit: int = Query(100, description="Maximum number of records to return"),
-    db: Session = Depends(get_db)
+    highlight: bool = Query(False, description="Include highlighted matches per field"),
+    fast: bool = Query(False, description="Encode rows directly, skipping ORM objects and validation"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Search for file records based on a search term.
+    Every word is matched as a prefix against file name, department and owner,
+    and results are ordered by relevance. Identical concurrent searches share
+    one query.
     
     Args:
         search_term (str): Term to search for
         limit (int): Maximum number of records to return
-        db (Session): Database session
+        highlight (bool): Include highlighted matches per field
+        fast (bool): Use the fast serialization path
+        db (AsyncSession): Database session
         
     Returns:
-        List[FileResponse]: List of matching file records
+        List[FileSearchResult]: List of matching file records
     """
-    logger.info(f"Searching file records with term: {search_term}")
-    return await FileService.search_files(db, search_term, limit)
+    logger.debug(f"Searching file records with term: {search_term}")
+
+    async def load() -> bytes:
+        if fast:
+            return await FileService.search_files_json(db, search_term, limit, highlight)
+        results = await FileService.search_files(db, search_term, limit, highlight)
+        return _SEARCH_RESULTS.dump_json(_SEARCH_RESULTS.validate_python(results, from_attributes=True))
+
+    key = ("search", search_term, limit, highlight, fast, file_cache.generation)
+    body = await file_reads.do(key, load)
+    return Response(content=body, media_type="application/json")
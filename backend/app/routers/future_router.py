@@ -0,0 +1,211 @@
+"""
+API routes for planned (FreedomFuture) transactions.
+Implements RESTful endpoints using FastAPI.
+"""
+
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from ..database.database import get_db
+from ..schemas.future_schemas import (
+    FutureTransactionCreate, FutureTransactionUpdate, FutureTransactionResponse,
+    FutureTransactionQuery, SchedulerRun, SchedulerStatus
+)
+from ..services.future_service import FutureService
+from ..services.scheduler import future_scheduler
+from ..services.transaction_service import normalize_ledger_date
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create router instance
+router = APIRouter(
+    prefix="/api/future",
+    tags=["future"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.post("/", response_model=FutureTransactionResponse, status_code=201)
+async def create_future(
+    future_data: FutureTransactionCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a planned (one-off or recurring) transaction.
+
+    Args:
+        future_data (FutureTransactionCreate): Planned transaction data
+        db (AsyncSession): Database session
+
+    Returns:
+        FutureTransactionResponse: Created planned transaction
+
+    Raises:
+        HTTPException: If a date is invalid or creation fails
+    """
+    try:
+        logger.info("Creating new planned transaction")
+        return await FutureService.create_future(db, future_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error creating planned transaction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/process", response_model=SchedulerRun)
+async def process_future(
+    as_of: Optional[str] = Query(None, description="Post occurrences due on or before this date (default today)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Post every planned transaction that has fallen due into the ledger.
+    The background scheduler does this automatically; this runs it on demand.
+
+    Args:
+        as_of (Optional[str]): Due date cutoff, not later than today
+        db (AsyncSession): Database session
+
+    Returns:
+        SchedulerRun: Entries processed and transactions posted
+
+    Raises:
+        HTTPException: If the date is invalid or in the future
+    """
+    try:
+        cutoff = normalize_ledger_date(as_of) if as_of else date.today().isoformat()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cutoff > date.today().isoformat():
+        raise HTTPException(status_code=400, detail="Cannot post transactions due in the future")
+    try:
+        logger.info(f"Processing planned transactions due by {cutoff}")
+        return await future_scheduler.run(db, cutoff)
+    except Exception as e:
+        logger.error(f"Error processing planned transactions: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/scheduler", response_model=SchedulerStatus)
+async def get_scheduler_status():
+    """
+    Report scheduler state.
+
+    Returns:
+        SchedulerStatus: Queue size, next due date and last run
+    """
+    return future_scheduler.status()
+
+@router.get("/{future_id}", response_model=FutureTransactionResponse)
+async def get_future(
+    future_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve a planned transaction by ID.
+
+    Args:
+        future_id (int): ID of the planned transaction
+        db (AsyncSession): Database session
+
+    Returns:
+        FutureTransactionResponse: Planned transaction
+
+    Raises:
+        HTTPException: If not found
+    """
+    logger.info(f"Retrieving planned transaction: {future_id}")
+    entry = await FutureService.get_future(db, future_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Planned transaction not found")
+    return entry
+
+@router.get("/", response_model=List[FutureTransactionResponse])
+async def get_futures(
+    skip: int = Query(0, description="Number of entries to skip"),
+    limit: int = Query(100, description="Maximum number of entries to return"),
+    query_params: FutureTransactionQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve planned transactions ordered by next due date.
+
+    Args:
+        skip (int): Number of entries to skip
+        limit (int): Maximum number of entries to return
+        query_params (FutureTransactionQuery): Optional query parameters for filtering
+        db (AsyncSession): Database session
+
+    Returns:
+        List[FutureTransactionResponse]: Planned transactions
+
+    Raises:
+        HTTPException: If due_before is invalid
+    """
+    logger.info("Retrieving planned transactions")
+    try:
+        return await FutureService.get_futures(db, skip, limit, query_params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/{future_id}", response_model=FutureTransactionResponse)
+async def update_future(
+    future_id: int,
+    future_data: FutureTransactionUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update a planned transaction.
+
+    Args:
+        future_id (int): ID of the planned transaction
+        future_data (FutureTransactionUpdate): Updated data
+        db (AsyncSession): Database session
+
+    Returns:
+        FutureTransactionResponse: Updated planned transaction
+
+    Raises:
+        HTTPException: If not found or update fails
+    """
+    try:
+        logger.info(f"Updating planned transaction: {future_id}")
+        entry = await FutureService.update_future(db, future_id, future_data)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Planned transaction not found")
+        return entry
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error updating planned transaction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/{future_id}", status_code=204)
+async def delete_future(
+    future_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete a planned transaction.
+
+    Args:
+        future_id (int): ID of the planned transaction
+        db (AsyncSession): Database session
+
+    Raises:
+        HTTPException: If not found or deletion fails
+    """
+    try:
+        logger.info(f"Deleting planned transaction: {future_id}")
+        success = await FutureService.delete_future(db, future_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Planned transaction not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting planned transaction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
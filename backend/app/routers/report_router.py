@@ -0,0 +1,124 @@
+"""
+API routes for materialized role reports.
+Serves the CA, Owner and Budget Analyst reports from their report tables.
+"""
+
+from datetime import timezone
+from email.utils import format_datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from ..database.database import get_db
+from ..schemas.report_schemas import ReportDefinition, ReportRole, ReportStatus, RoleReport
+from ..schemas.transaction_schemas import SummaryBucket
+from ..services.cache import etag_matches
+from ..services.report_service import role_reports
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create router instance
+router = APIRouter(
+    prefix="/api/reports",
+    tags=["reports"],
+)
+
+@router.get("/", response_model=List[ReportDefinition])
+async def list_reports(
+    role: Optional[ReportRole] = Query(None, description="Only the reports for this role")
+):
+    """
+    List the role report templates with the state of their tables.
+
+    Args:
+        role (Optional[ReportRole]): Role filter
+
+    Returns:
+        List[ReportDefinition]: Report templates
+    """
+    return await role_reports.list_reports(role)
+
+@router.get("/status", response_model=ReportStatus)
+async def get_report_status():
+    """
+    Report refresh counters and report cache usage.
+
+    Returns:
+        ReportStatus: Engine state
+    """
+    return role_reports.stats()
+
+@router.post("/refresh", response_model=ReportStatus)
+async def refresh_reports():
+    """
+    Recompute the days written since the last refresh now instead of on the next read.
+
+    Returns:
+        ReportStatus: Engine state after the refresh
+    """
+    await role_reports.refresh(force=True)
+    return role_reports.stats()
+
+@router.get("/{name}", response_model=RoleReport)
+async def get_report(
+    request: Request,
+    name: str,
+    start_date: Optional[str] = Query(None, description="First day included"),
+    end_date: Optional[str] = Query(None, description="Last day included"),
+    group_by: Optional[List[str]] = Query(
+        None, description="Dimensions and/or period to group by (default: period and every dimension)"
+    ),
+    bucket: SummaryBucket = Query("day", description="Date bucket for the period column"),
+    where: Optional[List[str]] = Query(None, description="Dimension filters as name=value (repeatable)"),
+    limit: int = Query(10000, ge=1, le=100000, description="Maximum groups to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate a role report from its materialized table. A daily report is
+    start_date = end_date with the default grouping.
+    Responses carry an ETag and Last-Modified, and may be cached for
+    BDMS_REPORTS_REFRESH_SECONDS (reports are at most that stale); send the
+    ETag back in If-None-Match to get 304 Not Modified.
+
+    Args:
+        request (Request): Incoming request
+        name (str): Report name (see GET /api/reports/)
+        start_date (Optional[str]): First day included
+        end_date (Optional[str]): Last day included
+        group_by (Optional[List[str]]): Columns to group by
+        bucket (SummaryBucket): Date bucket for the period column
+        where (Optional[List[str]]): Dimension filters
+        limit (int): Maximum groups to return
+        db (AsyncSession): Database session
+
+    Returns:
+        RoleReport: Grouped rows and totals
+
+    Raises:
+        HTTPException: If the report does not exist, a parameter is invalid, or
+            it is a file report and file storage is partitioned
+    """
+    logger.info(f"Generating report {name}")
+    try:
+        result = await role_reports.get_report(
+            db, name, start_date, end_date, group_by, bucket, where or (), limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    entry, refreshed_at = result
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"private, max-age={int(role_reports.refresh_seconds)}",
+    }
+    if refreshed_at is not None:
+        headers["Last-Modified"] = format_datetime(refreshed_at.replace(tzinfo=timezone.utc), usegmt=True)
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
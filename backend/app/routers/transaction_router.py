@@ -0,0 +1,379 @@
+"""
+API routes for transaction operations.
+Implements RESTful endpoints using FastAPI.
+"""
+
+import tempfile
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from ..database.database import get_db
+from ..schemas.file_schemas import BulkIngestResult
+from ..schemas.transaction_schemas import (
+    TransactionCreate, TransactionUpdate, TransactionResponse, TransactionQuery,
+    TransactionSummary, SummaryDimension, SummaryBucket, ReconciliationResult
+)
+from ..services.transaction_service import TransactionService
+from ..services.export import export_response
+from ..services.ingest import iter_csv_rows
+from ..services.ledger_import import (
+    DEFAULT_SHEET, detect_ledger_format, iter_ledger_rows, iter_xlsx_rows
+)
+from ..services.reconciliation import DEFAULT_MIN_CONFIDENCE, DEFAULT_WINDOW_DAYS, reconcile
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create router instance
+router = APIRouter(
+    prefix="/api/transactions",
+    tags=["transactions"],
+    responses={404: {"description": "Not found"}},
+)
+
+# XLSX uploads are spooled to disk past this size (workbooks need random access)
+XLSX_SPOOL_BYTES = 16 * 1024 * 1024
+
+@router.post("/", response_model=TransactionResponse, status_code=201)
+async def create_transaction(
+    transaction_data: TransactionCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a new transaction.
+    
+    Args:
+        transaction_data (TransactionCreate): Transaction data to create
+        db (AsyncSession): Database session
+        
+    Returns:
+        TransactionResponse: Created transaction
+        
+    Raises:
+        HTTPException: If the date is invalid or creation fails
+    """
+    try:
+        logger.info("Creating new transaction")
+        return await TransactionService.create_transaction(db, transaction_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error creating transaction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/import",
+    response_model=BulkIngestResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        }
+    },
+)
+async def import_transactions(
+    request: Request,
+    upload_format: Optional[str] = Query(
+        None, alias="format", description="Upload format (csv or xlsx), defaults to Content-Type"
+    ),
+    sheet: str = Query(DEFAULT_SHEET, description="Worksheet to read from an XLSX workbook"),
+    chunk_size: int = Query(5000, ge=1, le=50000, description="Rows validated and inserted per batch"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import a TransactionsPast ledger export (CSV or XLSX).
+    Columns are matched by name (SlNo, Date, Description, Amount, PaymentMode,
+    AccID, Department, Comments, Category, ZohoMatch); DD-MON-YY dates are
+    stored as ISO dates. Rows are inserted in chunks and invalid rows are
+    reported individually without aborting the import.
+    
+    Args:
+        request (Request): Incoming request, read as a stream
+        upload_format (Optional[str]): Explicit upload format
+        sheet (str): Worksheet name for XLSX uploads
+        chunk_size (int): Rows validated and inserted per batch
+        db (AsyncSession): Database session
+        
+    Returns:
+        BulkIngestResult: Counts and per-row errors
+        
+    Raises:
+        HTTPException: If the format is unsupported or the import fails
+    """
+    try:
+        fmt = detect_ledger_format(request.headers.get("content-type"), upload_format)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    try:
+        logger.info(f"Importing transactions from {fmt} upload")
+        if fmt == "csv":
+            rows = iter_csv_rows(request.stream())
+            return await TransactionService.import_transactions(db, iter_ledger_rows(rows), chunk_size)
+        with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES) as workbook:
+            async for chunk in request.stream():
+                workbook.write(chunk)
+            workbook.seek(0)
+            rows = iter_xlsx_rows(workbook, sheet)
+            return await TransactionService.import_transactions(db, iter_ledger_rows(rows), chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error importing transactions: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/reconcile",
+    response_model=ReconciliationResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        }
+    },
+)
+async def reconcile_transactions(
+    request: Request,
+    upload_format: Optional[str] = Query(
+        None, alias="format", description="Upload format (csv or xlsx), defaults to Content-Type"
+    ),
+    sheet: Optional[str] = Query(None, description="Worksheet to read from an XLSX workbook (default: active)"),
+    window_days: int = Query(DEFAULT_WINDOW_DAYS, ge=0, le=60, description="Largest date difference of a match"),
+    min_confidence: float = Query(
+        DEFAULT_MIN_CONFIDENCE, ge=0, le=1, description="Lowest match score accepted"
+    ),
+    rematch: bool = Query(False, description="Clear earlier matches in the export's date range first"),
+    dry_run: bool = Query(False, description="Report matches without writing them"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Reconcile a Zoho ledger export (CSV or XLSX) with the transactions.
+    Columns are matched by name (Date, Description or Transaction Details,
+    Amount or Debit/Credit, Transaction ID). Entries pair with transactions
+    of the same amount dated at most window_days apart, scored on
+    description similarity and date distance; matched transactions get
+    zoho_match "Yes" with the Zoho entry ID and the score.
+    
+    Args:
+        request (Request): Incoming request, read as a stream
+        upload_format (Optional[str]): Explicit upload format
+        sheet (Optional[str]): Worksheet name for XLSX uploads
+        window_days (int): Largest date difference between matched entries
+        min_confidence (float): Lowest score accepted as a match
+        rematch (bool): Clear earlier matches in the date range and match again
+        dry_run (bool): Report matches without writing them
+        db (AsyncSession): Database session
+        
+    Returns:
+        ReconciliationResult: Counts, matches and unmatched Zoho entries
+        
+    Raises:
+        HTTPException: If the format is unsupported or reconciliation fails
+    """
+    try:
+        fmt = detect_ledger_format(request.headers.get("content-type"), upload_format)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    options = dict(window_days=window_days, min_confidence=min_confidence, rematch=rematch, dry_run=dry_run)
+    try:
+        logger.info(f"Reconciling transactions with a Zoho {fmt} export")
+        if fmt == "csv":
+            return await reconcile(db, iter_csv_rows(request.stream()), **options)
+        with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES) as workbook:
+            async for chunk in request.stream():
+                workbook.write(chunk)
+            workbook.seek(0)
+            return await reconcile(db, iter_xlsx_rows(workbook, sheet), **options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error reconciling transactions: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/summary", response_model=TransactionSummary)
+async def get_transaction_summary(
+    group_by: List[SummaryDimension] = Query(
+        ["department"], description="Dimensions to group by (repeatable)"
+    ),
+    bucket: SummaryBucket = Query("month", description="Date bucket for the period dimension"),
+    query_params: TransactionQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Aggregate transactions for dashboards.
+    Returns overall totals, grouped sums and counts, and the distinct departments,
+    categories and payment modes under the applied filters.
+    
+    Args:
+        group_by (List[SummaryDimension]): Dimensions to group by
+        bucket (SummaryBucket): Date bucket for the period dimension
+        query_params (TransactionQuery): Query parameters for filtering
+        db (AsyncSession): Database session
+        
+    Returns:
+        TransactionSummary: Aggregated transactions
+        
+    Raises:
+        HTTPException: If a date filter is invalid
+    """
+    logger.info("Summarizing transactions")
+    try:
+        return await TransactionService.get_summary(db, query_params, group_by, bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}, "application/x-ndjson": {}, "application/gzip": {}}}},
+)
+async def export_transactions(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format", description="Export format"),
+    compress: bool = Query(False, alias="gzip", description="Gzip the download"),
+    query_params: TransactionQuery = Depends()
+):
+    """
+    Stream every transaction matching the filters as CSV or NDJSON, in id order.
+    
+    Args:
+        export_format (str): csv or ndjson
+        compress (bool): Gzip the download
+        query_params (TransactionQuery): Query parameters for filtering
+        
+    Returns:
+        StreamingResponse: Transactions as a download
+        
+    Raises:
+        HTTPException: If a date filter is invalid
+    """
+    logger.info(f"Exporting transactions as {export_format}")
+    try:
+        query = TransactionService.build_export_query(query_params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return export_response(query, export_format, "transactions", compress)
+
+@router.get("/{transaction_id}", response_model=TransactionResponse)
+async def get_transaction(
+    transaction_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve a specific transaction by ID.
+    
+    Args:
+        transaction_id (int): ID of the transaction to retrieve
+        db (AsyncSession): Database session
+        
+    Returns:
+        TransactionResponse: Retrieved transaction
+        
+    Raises:
+        HTTPException: If transaction not found
+    """
+    logger.info(f"Retrieving transaction: {transaction_id}")
+    transaction = await TransactionService.get_transaction(db, transaction_id)
+    if transaction is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return transaction
+
+@router.get("/", response_model=List[TransactionResponse])
+async def get_transactions(
+    skip: int = Query(0, description="Number of transactions to skip"),
+    limit: int = Query(100, description="Maximum number of transactions to return"),
+    query_params: TransactionQuery = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve transactions with optional filtering, newest first.
+    
+    Args:
+        skip (int): Number of transactions to skip
+        limit (int): Maximum number of transactions to return
+        query_params (TransactionQuery): Optional query parameters for filtering
+        db (AsyncSession): Database session
+        
+    Returns:
+        List[TransactionResponse]: List of transactions
+        
+    Raises:
+        HTTPException: If a date filter is invalid
+    """
+    logger.info("Retrieving transactions")
+    try:
+        return await TransactionService.get_transactions(db, skip, limit, query_params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/{transaction_id}", response_model=TransactionResponse)
+async def update_transaction(
+    transaction_id: int,
+    transaction_data: TransactionUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update an existing transaction.
+    
+    Args:
+        transaction_id (int): ID of the transaction to update
+        transaction_data (TransactionUpdate): Updated transaction data
+        db (AsyncSession): Database session
+        
+    Returns:
+        TransactionResponse: Updated transaction
+        
+    Raises:
+        HTTPException: If transaction not found or update fails
+    """
+    try:
+        logger.info(f"Updating transaction: {transaction_id}")
+        transaction = await TransactionService.update_transaction(db, transaction_id, transaction_data)
+        if transaction is None:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+        return transaction
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error updating transaction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/{transaction_id}", status_code=204)
+async def delete_transaction(
+    transaction_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete a transaction.
+    
+    Args:
+        transaction_id (int): ID of the transaction to delete
+        db (AsyncSession): Database session
+        
+    Raises:
+        HTTPException: If transaction not found or deletion fails
+    """
+    try:
+        logger.info(f"Deleting transaction: {transaction_id}")
+        success = await TransactionService.delete_transaction(db, transaction_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting transaction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,72 @@
+"""
+Pydantic schemas for account (AccountsPresent) data validation
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+class AccountBase(BaseModel):
+    """Base schema for account data"""
+    account_name: str
+    type: str
+    cc_id: str = Field(..., description="Account ID used by transactions (account_id)")
+    opening_balance: float = Field(default=0.0, description="Balance before the first ledger entry")
+    int_rate: float = Field(default=0.0)
+    next_due_date: str = Field(default="Not applicable")
+    bank: str
+    tenure: Optional[int] = None
+    emi_amount: Optional[float] = None
+    comments: Optional[str] = None
+
+class AccountCreate(AccountBase):
+    """Schema for creating a new account"""
+    pass
+
+class AccountUpdate(BaseModel):
+    """Schema for updating an account"""
+    account_name: Optional[str] = None
+    type: Optional[str] = None
+    cc_id: Optional[str] = None
+    opening_balance: Optional[float] = None
+    int_rate: Optional[float] = None
+    next_due_date: Optional[str] = None
+    bank: Optional[str] = None
+    tenure: Optional[int] = None
+    emi_amount: Optional[float] = None
+    comments: Optional[str] = None
+
+class AccountResponse(AccountBase):
+    """Schema for account response"""
+    id: int
+    balance: float
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        """Pydantic configuration"""
+        from_attributes = True
+
+class AccountQuery(BaseModel):
+    """Schema for account query parameters"""
+    type: Optional[str] = None
+    bank: Optional[str] = None
+
+class AccountBalance(BaseModel):
+    """Schema for a balance lookup"""
+    cc_id: str
+    balance: float
+
+class BalanceDrift(BaseModel):
+    """Schema for an account whose stored balance differs from the ledger"""
+    id: int
+    cc_id: str
+    stored: float
+    expected: float
+    drift: float
+
+class BalanceReport(BaseModel):
+    """Schema for balance verification results"""
+    accounts: int
+    drifted: List[BalanceDrift]
+    repaired: bool
@@ -0,0 +1,61 @@
+"""
+Pydantic schemas for file storage analytics
+"""
+
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+# Columns file analytics can group by
+AnalyticsDimension = Literal["department", "owner", "file_type", "access_level"]
+
+class AnalyticsGroup(BaseModel):
+    """
+    Schema for one group of an analytics query.
+    """
+    key: Dict[str, Optional[str]] = Field(..., description="Value of each group-by column (null: none)")
+    count: int = Field(..., description="File records in the group")
+    total_size: int = Field(..., description="Total size in bytes")
+    mean_size: float = Field(..., description="Mean size in bytes")
+
+class SizePercentile(BaseModel):
+    """
+    Schema for one file size percentile.
+    """
+    percentile: float
+    file_size: Optional[float] = Field(None, description="Size in bytes (linear interpolation), null without files")
+
+class SizeBucket(BaseModel):
+    """
+    Schema for one file size histogram bucket, covering lower <= size < upper
+    (the last linear bucket includes upper).
+    """
+    lower: int
+    upper: int
+    count: int
+    total_size: int
+
+class AnalyticsSnapshotStatus(BaseModel):
+    """
+    Schema for the state of the in-memory analytics snapshot.
+    """
+    rows: int = Field(..., description="File records in the snapshot")
+    memory_bytes: int = Field(..., description="Size of the column arrays")
+    dictionary_sizes: Dict[str, int] = Field(..., description="Distinct values seen per text column")
+    watermark: Optional[datetime] = Field(None, description="Latest updated_at read")
+    refreshed_at: Optional[datetime] = None
+    refreshes: int
+    full_reconciles: int = Field(..., description="Refreshes that re-read every file ID to drop deleted rows")
+    last_refresh_ms: float
+
+class FileAnalytics(BaseModel):
+    """
+    Schema for a file storage analytics query.
+    """
+    total: int = Field(..., description="File records matching the filters")
+    total_size: int = Field(..., description="Total size of those records in bytes")
+    groups: List[AnalyticsGroup] = Field(default_factory=list)
+    percentiles: List[SizePercentile] = Field(default_factory=list)
+    histogram: List[SizeBucket] = Field(default_factory=list)
+    query_ms: float = Field(..., description="Time spent on the vectorized query, excluding the refresh")
+    snapshot: AnalyticsSnapshotStatus
@@ -0,0 +1,40 @@
+"""
+Pydantic schemas for the change feed
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+# Record types published on the change feed
+ChangeEntity = Literal["file", "transaction"]
+
+class ChangeEvent(BaseModel):
+    """
+    Schema for the data of a change feed event (sent as Server-Sent Events,
+    with the entity as the event name and "<epoch>-<seq>" as the event ID).
+    """
+    seq: int
+    entity: ChangeEntity
+    op: Literal["created", "updated", "deleted", "reload"] = Field(
+        ..., description="reload: too many rows changed to list them; re-fetch"
+    )
+    at: datetime
+    count: Optional[int] = Field(None, description="Rows affected, when known")
+    rows: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Records after a create or update, in the response model's format"
+    )
+    ids: Optional[List[int]] = Field(None, description="IDs of deleted records")
+
+class ChangeFeedStatus(BaseModel):
+    """
+    Schema for change feed state.
+    """
+    epoch: str = Field(..., description="Changes when the server process restarts")
+    last_event_id: str
+    oldest_seq: Optional[int] = Field(None, description="Oldest event a stream can resume after")
+    buffered: int
+    buffer_size: int
+    published: int
+    streams: int = Field(..., description="Open event streams")
+    resets: int = Field(..., description="Streams told to re-fetch after missing events")
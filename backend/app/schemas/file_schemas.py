@@ -4,8 +4,8 @@ Implements data validation and serialization for the API.
 """
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
 
 class FileBase(BaseModel):
     """
@@ -47,6 +47,9 @@ class FileResponse(FileBase):
     file_id: int = Field(..., description="Unique identifier for the file record")
     created_at: datetime = Field(..., description="Timestamp when the record was created")
     updated_at: datetime = Field(..., description="Timestamp when the record was last updated")
+    content_hash: Optional[str] = Field(
+        None, description="BLAKE2b-256 of the file content, set for files that share their size"
+    )
 
     class Config:
         """
@@ -56,6 +59,16 @@ class FileResponse(FileBase):
         orm_mode = True
         from_attributes = True
 
+class FileSearchResult(FileResponse):
+    """
+    Schema for full-text search results.
+    Adds the relevance score and optional highlighted fields to FileResponse.
+    """
+    score: Optional[float] = Field(None, description="Relevance score, higher is better")
+    highlight: Optional[Dict[str, Optional[str]]] = Field(
+        None, description="Matched terms wrapped in <mark> tags, keyed by field"
+    )
+
 class FileQuery(BaseModel):
     """
     Schema for file search/filter parameters.
@@ -67,3 +80,248 @@ class FileQuery(BaseModel):
     access_level: Optional[str] = None
     min_size: Optional[int] = Field(None, description="Minimum file size in bytes")
     max_size: Optional[int] = Field(None, description="Maximum file size in bytes")
+
+class BulkRowError(BaseModel):
+    """
+    Schema for a rejected row in a bulk upload.
+    """
+    row: int = Field(..., description="1-based data row number in the upload")
+    errors: List[str] = Field(..., description="Validation or database errors for the row")
+
+class BulkIngestResult(BaseModel):
+    """
+    Schema for the outcome of a bulk upload.
+    Row errors are capped; failed always holds the full count.
+    """
+    received: int = Field(..., description="Data rows read from the upload")
+    inserted: int = Field(..., description="Rows inserted")
+    failed: int = Field(..., description="Rows rejected")
+    errors: List[BulkRowError] = Field(default_factory=list, description="Per-row errors")
+    errors_truncated: bool = Field(False, description="True if more errors occurred than are listed")
+
+# Columns accepted by the cursor-paginated listing
+FileSortField = Literal[
+    "file_id", "file_name", "file_type", "file_size", "created_at", "updated_at",
+    "department", "owner", "access_level"
+]
+
+class FilePage(BaseModel):
+    """
+    Schema for one page of a cursor-paginated file listing.
+    """
+    items: List[FileResponse] = Field(..., description="File records on this page")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page, null on the last page"
+    )
+
+class QueryPlanStep(BaseModel):
+    """
+    Schema for one row of EXPLAIN QUERY PLAN output.
+    """
+    id: int
+    parent: int
+    detail: str
+
+class QueryPlan(BaseModel):
+    """
+    Schema for an analyzed query plan.
+    """
+    sql: str = Field(..., description="Explained SQL with inlined parameters")
+    plan: List[QueryPlanStep] = Field(..., description="EXPLAIN QUERY PLAN rows")
+    full_scan: bool = Field(..., description="True if a table is scanned without an index")
+    temp_sort: bool = Field(..., description="True if a temporary B-tree is used for sorting")
+    indexes: List[str] = Field(default_factory=list, description="Indexes used by the plan")
+    partition_no: Optional[int] = Field(None, description="Partition the plan was taken on (partitioned storage only)")
+
+# Largest number of file IDs accepted by one batch request
+MAX_BATCH_IDS = 1000
+
+class FileBatchIds(BaseModel):
+    """
+    Schema for a batch get or delete request.
+    """
+    file_ids: List[int] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_IDS, description="File record IDs"
+    )
+
+class FileBatchUpdate(BaseModel):
+    """
+    Schema for a batch update request.
+    Either give per-record changes in updates, or one set of changes applied
+    to every ID in file_ids (e.g. moving files to another department); both
+    may be combined, with updates taking precedence for IDs in both.
+    """
+    updates: Dict[int, FileUpdate] = Field(
+        default_factory=dict, description="Changes per file record ID"
+    )
+    file_ids: List[int] = Field(
+        default_factory=list, max_length=MAX_BATCH_IDS, description="IDs that receive changes"
+    )
+    changes: Optional[FileUpdate] = Field(None, description="Changes applied to every ID in file_ids")
+
+    @model_validator(mode="after")
+    def _check_targets(self) -> "FileBatchUpdate":
+        if self.file_ids and self.changes is None:
+            raise ValueError("changes is required with file_ids")
+        if not self.updates and not self.file_ids:
+            raise ValueError("updates or file_ids must not be empty")
+        if len(set(self.file_ids) | set(self.updates)) > MAX_BATCH_IDS:
+            raise ValueError(f"at most {MAX_BATCH_IDS} file IDs per batch")
+        return self
+
+    def changes_by_id(self) -> Dict[int, Dict[str, object]]:
+        """Explicitly set fields to change, per file record ID."""
+        shared = self.changes.model_dump(exclude_unset=True) if self.changes else {}
+        merged = {file_id: shared for file_id in self.file_ids}
+        merged.update({
+            file_id: update.model_dump(exclude_unset=True) for file_id, update in self.updates.items()
+        })
+        return merged
+
+class FileBatchItem(BaseModel):
+    """
+    Schema for the outcome of one ID in a batch request.
+    """
+    file_id: int
+    status: Literal["found", "updated", "deleted", "not_found", "failed"]
+    file: Optional[FileResponse] = Field(None, description="Record (found/updated only)")
+    error: Optional[str] = Field(None, description="Why the write failed (failed only)")
+
+class FileBatchResult(BaseModel):
+    """
+    Schema for the outcome of a batch request, in request order.
+    """
+    requested: int = Field(..., description="Distinct IDs in the request")
+    succeeded: int = Field(..., description="IDs found, updated or deleted")
+    not_found: int = Field(..., description="IDs with no matching record")
+    failed: int = Field(0, description="IDs whose partition failed to write (partitioned storage only)")
+    results: List[FileBatchItem] = Field(..., description="Per-ID outcomes")
+
+class FacetValue(BaseModel):
+    """
+    Schema for one value of a facet dimension.
+    """
+    value: Optional[str] = Field(None, description="Column value, null for files without one")
+    count: int = Field(..., description="Matching file records")
+    total_size: int = Field(..., description="Total size of the matching records in bytes")
+
+class FileFacets(BaseModel):
+    """
+    Schema for the file filter sidebar.
+    Each dimension is counted under every applied filter except its own, so
+    the alternatives to a selected value stay visible; total and total_size
+    apply all filters.
+    """
+    total: int = Field(..., description="File records matching all filters")
+    total_size: int = Field(..., description="Total size of those records in bytes")
+    department: List[FacetValue] = Field(default_factory=list)
+    owner: List[FacetValue] = Field(default_factory=list)
+    file_type: List[FacetValue] = Field(default_factory=list)
+    access_level: List[FacetValue] = Field(default_factory=list)
+
+class CrawlRequest(BaseModel):
+    """
+    Schema for starting a filesystem crawl.
+    """
+    roots: List[str] = Field(
+        default_factory=list, description="Configured root paths to crawl (default: all)"
+    )
+    full: bool = Field(False, description="List every directory, even if unchanged since the last crawl")
+
+class CrawlRootRun(BaseModel):
+    """
+    Schema for the outcome of crawling one root.
+    """
+    root: str
+    department: Optional[str] = None
+    directories_scanned: int = Field(..., description="Directories listed")
+    directories_skipped: int = Field(..., description="Directories unchanged since the last crawl")
+    directories_removed: int = Field(..., description="Vanished directories whose records were deleted")
+    files_seen: int = Field(..., description="Files in the listed directories")
+    inserted: int
+    updated: int
+    deleted: int
+    errors: int = Field(..., description="Directories that could not be read")
+    stopped: bool = Field(False, description="True if the crawl was stopped before it finished")
+    seconds: float
+
+class CrawlRun(BaseModel):
+    """
+    Schema for a finished crawl.
+    """
+    started_at: datetime
+    finished_at: datetime
+    full: bool
+    roots: List[CrawlRootRun] = Field(default_factory=list)
+    error: Optional[str] = None
+
+class CrawlStatus(BaseModel):
+    """
+    Schema for crawler state.
+    """
+    running: bool
+    roots: List[str] = Field(..., description="Configured crawl roots (BDMS_CRAWL_ROOTS)")
+    progress: Optional[CrawlRootRun] = Field(None, description="Counts of the root being crawled")
+    last_run: Optional[CrawlRun] = None
+    runs: int
+
+class DuplicateGroup(BaseModel):
+    """
+    Schema for files with identical content.
+    """
+    content_hash: str
+    file_size: int = Field(..., description="Size of each copy in bytes")
+    count: int = Field(..., description="Records with this content")
+    reclaimable_bytes: int = Field(..., description="Bytes freed by keeping a single copy")
+    files: List[FileResponse] = Field(default_factory=list, description="The copies, oldest first")
+
+class DepartmentReclaim(BaseModel):
+    """
+    Schema for the duplicate copies held by one department.
+    """
+    department: Optional[str] = None
+    files: int = Field(..., description="Redundant copies (every copy but the oldest of each group)")
+    reclaimable_bytes: int
+
+class DuplicateReport(BaseModel):
+    """
+    Schema for one page of duplicate groups with overall totals.
+    """
+    total_groups: int = Field(..., description="Duplicate groups matching the filters")
+    reclaimable_bytes: int = Field(..., description="Bytes freed by keeping one copy per group")
+    departments: List[DepartmentReclaim] = Field(
+        default_factory=list, description="Reclaimable bytes per department, largest first"
+    )
+    groups: List[DuplicateGroup] = Field(
+        default_factory=list, description="Groups on this page, most reclaimable first"
+    )
+
+class HashRequest(BaseModel):
+    """
+    Schema for starting a hashing run.
+    """
+    rehash: bool = Field(False, description="Clear every stored hash first")
+
+class HashRun(BaseModel):
+    """
+    Schema for a finished hashing run.
+    """
+    started_at: datetime
+    finished_at: datetime
+    rehash: bool = False
+    partial_hashed: int = Field(0, description="Files whose first and last blocks were hashed")
+    content_hashed: int = Field(0, description="Files that received a content hash")
+    bytes_read: int = 0
+    skipped: int = Field(0, description="Files missing, unreadable or changed since they were recorded")
+    stopped: bool = False
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+class HashStatus(BaseModel):
+    """
+    Schema for hashing job state.
+    """
+    running: bool
+    progress: Optional[Dict[str, Any]] = Field(None, description="Running counts of the current run")
+    last_run: Optional[HashRun] = None
+    runs: int
@@ -0,0 +1,78 @@
+"""
+Pydantic schemas for planned (FreedomFuture) transaction validation
+"""
+
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+# How often a planned transaction recurs
+Frequency = Literal["once", "daily", "weekly", "monthly", "quarterly", "yearly"]
+
+class FutureTransactionBase(BaseModel):
+    """Base schema for planned transaction data"""
+    start_date: str = Field(..., description="First due date (ISO or DD-MON-YY)")
+    description: str
+    amount: float
+    payment_mode: str
+    account_id: str
+    department: str
+    category: str
+    frequency: Frequency = Field(default="once")
+    interval: int = Field(default=1, ge=1, description="Recur every N frequency units")
+    max_occurrences: Optional[int] = Field(None, ge=1, description="Stop after N postings (e.g. EMI tenure)")
+    end_date: Optional[str] = Field(None, description="Last date an occurrence may fall on")
+
+class FutureTransactionCreate(FutureTransactionBase):
+    """Schema for creating a planned transaction"""
+    pass
+
+class FutureTransactionUpdate(BaseModel):
+    """Schema for updating a planned transaction"""
+    start_date: Optional[str] = None
+    description: Optional[str] = None
+    amount: Optional[float] = None
+    payment_mode: Optional[str] = None
+    account_id: Optional[str] = None
+    department: Optional[str] = None
+    category: Optional[str] = None
+    frequency: Optional[Frequency] = None
+    interval: Optional[int] = Field(None, ge=1)
+    max_occurrences: Optional[int] = Field(None, ge=1)
+    end_date: Optional[str] = None
+
+class FutureTransactionResponse(FutureTransactionBase):
+    """Schema for planned transaction response"""
+    id: int
+    occurrences: int
+    next_due: Optional[str]
+    paid: bool
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        """Pydantic configuration"""
+        from_attributes = True
+
+class FutureTransactionQuery(BaseModel):
+    """Schema for planned transaction query parameters"""
+    department: Optional[str] = None
+    account_id: Optional[str] = None
+    category: Optional[str] = None
+    paid: Optional[bool] = None
+    due_before: Optional[str] = None
+
+class SchedulerRun(BaseModel):
+    """Schema for the result of processing due transactions"""
+    as_of: str
+    entries: int = Field(..., description="Planned transactions that were due")
+    posted: int = Field(..., description="Transactions posted to the ledger")
+    completed: int = Field(..., description="Entries with no occurrences left (marked paid)")
+
+class SchedulerStatus(BaseModel):
+    """Schema for scheduler state"""
+    running: bool
+    queued: int = Field(..., description="Entries in the due-date heap")
+    next_due: Optional[str]
+    last_run: Optional[SchedulerRun] = None
+    runs: int
@@ -0,0 +1,59 @@
+"""
+Pydantic schemas for materialized role reports
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+# Roles reports are prepared for
+ReportRole = Literal["ca", "owner", "budget_analyst"]
+
+class ReportDefinition(BaseModel):
+    """
+    Schema for a role report template and the state of its table.
+    """
+    name: str
+    role: ReportRole
+    title: str
+    source: Literal["transactions", "files"]
+    dimensions: List[str] = Field(..., description="Columns rows can be grouped and filtered by")
+    measures: List[str] = Field(..., description="Summed columns")
+    version: int = Field(..., description="Incremented whenever the report's rows are recomputed")
+    refreshed_at: Optional[datetime] = None
+
+class RoleReport(BaseModel):
+    """
+    Schema for a generated role report.
+    """
+    name: str
+    role: ReportRole
+    title: str
+    refreshed_at: Optional[datetime] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    group_by: List[str]
+    bucket: str = Field(..., description="Date bucket of the period column")
+    rows: List[Dict[str, Any]] = Field(
+        ..., description="Group-by values (period first) and summed measures, in group order"
+    )
+    totals: Dict[str, float] = Field(..., description="Measures summed over every matching row")
+    truncated: bool = Field(False, description="More groups matched than the limit")
+
+class ReportRefresh(BaseModel):
+    """
+    Schema for the outcome of a report refresh.
+    """
+    days: int = Field(..., description="Dirty day buckets recomputed")
+    reports: List[str] = Field(..., description="Reports whose rows changed")
+    refresh_ms: float
+
+class ReportStatus(BaseModel):
+    """
+    Schema for report engine state.
+    """
+    refresh_seconds: float = Field(..., description="How often reads check for dirty days")
+    refreshes: int
+    last_refresh: Optional[ReportRefresh] = None
+    checked_at: Optional[datetime] = None
+    cache: Dict[str, Any] = Field(..., description="Generated report cache counters")
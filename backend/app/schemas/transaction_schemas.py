@@ -3,8 +3,9 @@ Pydantic schemas for transaction data validation
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
+from .file_schemas import BulkRowError
 
 class TransactionBase(BaseModel):
     """Base schema for transaction data"""
@@ -35,6 +36,8 @@ class TransactionUpdate(BaseModel):
 class TransactionResponse(TransactionBase):
     """Schema for transaction response"""
     id: int
+    zoho_match_id: Optional[str] = Field(None, description="Zoho entry matched by reconciliation")
+    zoho_confidence: Optional[float] = Field(None, description="Reconciliation match score (0-1)")
     created_at: datetime
     updated_at: datetime
 
@@ -51,3 +54,57 @@ class TransactionQuery(BaseModel):
     max_amount: Optional[float] = None
     start_date: Optional[str] = None
     end_date: Optional[str] = None
+
+# Dimensions a transaction summary can be grouped by
+SummaryDimension = Literal["department", "category", "payment_mode", "period"]
+
+# Date bucket used for the period dimension
+SummaryBucket = Literal["day", "week", "month", "year"]
+
+class TransactionTotals(BaseModel):
+    """Schema for aggregated transaction amounts"""
+    count: int
+    total_amount: float
+    credit_amount: float = Field(..., description="Sum of positive amounts (received)")
+    debit_amount: float = Field(..., description="Sum of negative amounts (paid)")
+
+class TransactionGroup(TransactionTotals):
+    """Schema for one group of a transaction summary"""
+    department: Optional[str] = None
+    category: Optional[str] = None
+    payment_mode: Optional[str] = None
+    period: Optional[str] = None
+
+class TransactionSummary(BaseModel):
+    """Schema for transaction summary response"""
+    totals: TransactionTotals
+    groups: List[TransactionGroup]
+    distinct: Dict[str, List[str]] = Field(
+        ..., description="Distinct departments, categories and payment modes under the filters"
+    )
+    source: Literal["rollup", "ledger"] = Field(
+        ..., description="rollup when served from transaction_rollups, ledger for amount filters"
+    )
+
+class ReconciliationMatch(BaseModel):
+    """Schema for one transaction matched to a Zoho ledger entry"""
+    transaction_id: int
+    zoho_id: str
+    confidence: float = Field(..., description="Match score from 0 to 1")
+    day_offset: int = Field(..., description="Zoho entry date minus transaction date, in days")
+
+class ReconciliationResult(BaseModel):
+    """Schema for the outcome of a Zoho reconciliation run"""
+    zoho_entries: int = Field(..., description="Zoho ledger rows read")
+    zoho_already_matched: int = Field(..., description="Zoho entries matched by an earlier run")
+    transactions: int = Field(..., description="Unmatched transactions in the ledger's date range")
+    candidate_pairs: int = Field(..., description="Pairs with equal amounts within the date window")
+    matched: int
+    unmatched_zoho: int
+    written: bool = Field(..., description="False for a dry run")
+    seconds: float
+    matches: List[ReconciliationMatch] = Field(default_factory=list, description="Matches (capped)")
+    unmatched_zoho_ids: List[str] = Field(default_factory=list, description="Zoho entries left unmatched (capped)")
+    failed: int = Field(0, description="Zoho rows that could not be read")
+    skipped_transactions: int = Field(0, description="Ledger transactions skipped because their date could not be parsed")
+    errors: List[BulkRowError] = Field(default_factory=list, description="Unreadable rows (capped)")
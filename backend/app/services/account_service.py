@@ -0,0 +1,276 @@
+"""
+Service layer for accounts (AccountsPresent).
+Implements account CRUD, balance lookups and the periodic balance audit.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+import logging
+from ..database.balances import verify_balances
+from ..database.database import get_async_db_session, run_write
+from ..database.models import Account, Transaction
+from ..schemas.account_schemas import AccountCreate, AccountUpdate, AccountQuery
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def _ledger_total(session: AsyncSession, cc_id: str) -> float:
+    """Sum of ledger amounts booked against an account (uses ix_transactions_account_id)."""
+    result = await session.execute(
+        select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(Transaction.account_id == cc_id)
+    )
+    return float(result.scalar_one())
+
+class AccountService:
+    """
+    Service class for handling account operations.
+    Balances are maintained by database triggers; this service only seeds them
+    when an account is created or re-pointed, and audits them.
+    """
+
+    @staticmethod
+    async def create_account(db: AsyncSession, account_data: AccountCreate) -> Account:
+        """
+        Create an account, with its balance seeded from the existing ledger.
+
+        Args:
+            db (AsyncSession): Database session
+            account_data (AccountCreate): Account data to create
+
+        Returns:
+            Account: Created account
+
+        Raises:
+            Exception: If creation fails (e.g. duplicate cc_id)
+        """
+        try:
+            logger.info(f"Creating new account: {account_data.cc_id}")
+
+            async def _create(session: AsyncSession) -> Account:
+                account = Account(**account_data.model_dump())
+                account.balance = round(account.opening_balance + await _ledger_total(session, account.cc_id), 2)
+                session.add(account)
+                await session.flush()
+                return account
+
+            account = await run_write(db, _create)
+            logger.info(f"Account created successfully: {account.id}")
+            return account
+        except Exception as e:
+            logger.error(f"Error creating account: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_account(db: AsyncSession, account_id: int) -> Optional[Account]:
+        """
+        Retrieve an account by ID.
+
+        Args:
+            db (AsyncSession): Database session
+            account_id (int): ID of the account
+
+        Returns:
+            Optional[Account]: Found account or None
+        """
+        logger.info(f"Retrieving account: {account_id}")
+        result = await db.execute(select(Account).where(Account.id == account_id))
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_balance(db: AsyncSession, cc_id: str) -> Optional[float]:
+        """
+        Current balance of an account: one indexed row read, independent of history.
+
+        Args:
+            db (AsyncSession): Database session
+            cc_id (str): Account ID used by transactions
+
+        Returns:
+            Optional[float]: Balance, or None if the account does not exist
+        """
+        result = await db.execute(select(Account.balance).where(Account.cc_id == cc_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_accounts(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        query_params: Optional[AccountQuery] = None
+    ) -> List[Account]:
+        """
+        Retrieve accounts with optional filtering.
+
+        Args:
+            db (AsyncSession): Database session
+            skip (int): Number of accounts to skip
+            limit (int): Maximum number of accounts to return
+            query_params (AccountQuery): Optional query parameters for filtering
+
+        Returns:
+            List[Account]: List of accounts
+        """
+        logger.info("Retrieving accounts with filters")
+        filters = []
+        if query_params:
+            if query_params.type:
+                filters.append(Account.type == query_params.type)
+            if query_params.bank:
+                filters.append(Account.bank == query_params.bank)
+        query = select(Account)
+        if filters:
+            query = query.where(and_(*filters))
+        result = await db.execute(query.order_by(Account.id).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def update_account(
+        db: AsyncSession,
+        account_id: int,
+        account_data: AccountUpdate
+    ) -> Optional[Account]:
+        """
+        Update an account. Changing cc_id or opening_balance re-seeds the balance.
+
+        Args:
+            db (AsyncSession): Database session
+            account_id (int): ID of the account
+            account_data (AccountUpdate): Updated account data
+
+        Returns:
+            Optional[Account]: Updated account or None
+
+        Raises:
+            Exception: If update fails
+        """
+        try:
+            logger.info(f"Updating account: {account_id}")
+            update_data = account_data.model_dump(exclude_unset=True)
+
+            async def _update(session: AsyncSession) -> Optional[Account]:
+                account = await session.get(Account, account_id)
+                if not account:
+                    return None
+                for key, value in update_data.items():
+                    setattr(account, key, value)
+                if "cc_id" in update_data or "opening_balance" in update_data:
+                    account.balance = round(account.opening_balance + await _ledger_total(session, account.cc_id), 2)
+                await session.flush()
+                return account
+
+            account = await run_write(db, _update)
+            if account:
+                logger.info(f"Account updated successfully: {account_id}")
+            return account
+        except Exception as e:
+            logger.error(f"Error updating account: {str(e)}")
+            raise
+
+    @staticmethod
+    async def delete_account(db: AsyncSession, account_id: int) -> bool:
+        """
+        Delete an account (its ledger entries are kept).
+
+        Args:
+            db (AsyncSession): Database session
+            account_id (int): ID of the account
+
+        Returns:
+            bool: True if deleted successfully, False otherwise
+
+        Raises:
+            Exception: If deletion fails
+        """
+        try:
+            logger.info(f"Deleting account: {account_id}")
+
+            async def _delete(session: AsyncSession) -> bool:
+                account = await session.get(Account, account_id)
+                if not account:
+                    return False
+                await session.delete(account)
+                await session.flush()
+                return True
+
+            deleted = await run_write(db, _delete)
+            if deleted:
+                logger.info(f"Account deleted successfully: {account_id}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting account: {str(e)}")
+            raise
+
+    @staticmethod
+    async def verify_balances(db: AsyncSession, repair: bool = False) -> Dict[str, object]:
+        """
+        Recompute all balances from the ledger in one grouped pass and report drift.
+        Repairs run as a write job, so no transaction can land between the
+        recomputation and the correction.
+
+        Args:
+            db (AsyncSession): Database session
+            repair (bool): Overwrite drifted balances
+
+        Returns:
+            Dict[str, object]: Fields of BalanceReport
+        """
+        logger.info(f"Verifying account balances (repair={repair})")
+
+        async def _verify(session: AsyncSession) -> Dict[str, object]:
+            return await session.run_sync(lambda sync: verify_balances(sync.connection(), repair))
+
+        if repair:
+            return await run_write(db, _verify)
+        return await _verify(db)
+
+class BalanceAudit:
+    """Background task that periodically verifies (and repairs) account balances."""
+
+    def __init__(self, interval_seconds: float = 86400.0, repair: bool = True):
+        """
+        Args:
+            interval_seconds (float): Seconds between audits; 0 disables the task
+            repair (bool): Repair drifted balances when found
+        """
+        self.interval_seconds = interval_seconds
+        self.repair = repair
+        self.last_report: Optional[Dict[str, object]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _loop(self) -> None:
+        """Run an audit every interval_seconds."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                async with get_async_db_session() as db:
+                    self.last_report = await AccountService.verify_balances(db, self.repair)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Balance audit failed: {str(e)}")
+
+    async def start(self) -> None:
+        """Start the background task (if enabled)."""
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the background task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+# Periodic balance audit
+balance_audit = BalanceAudit(
+    interval_seconds=float(os.getenv("BDMS_BALANCE_AUDIT_SECONDS", "86400")),
+    repair=os.getenv("BDMS_BALANCE_AUDIT_REPAIR", "true").lower() in ("1", "true", "yes", "on"),
+)
@@ -0,0 +1,299 @@
+"""
+Admission control for API requests.
+Requests are sorted into route classes (reads, searches, analytics,
+exports, writes).
+Each class admits a bounded number of requests at a time and queues a
+bounded number more. A request that finds the queue full, or waits longer
+than the maximum wait, is answered 503 with a Retry-After estimate instead
+of piling onto the database connection pools and the write queue, so tail
+latency degrades gracefully under overload.
+"""
+
+import asyncio
+import math
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Pattern, Tuple
+from starlette.responses import JSONResponse
+import logging
+from ..database.database import storage_profile
+from .metrics import metrics
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Route classes in match order: (class, methods, path pattern). Paths that
+# match none (the change stream, health and metrics) are not limited.
+ROUTE_RULES: Tuple[Tuple[str, Tuple[str, ...], Pattern[str]], ...] = (
+    ("export", ("GET",), re.compile(r"^/api/[^/]+/export")),
+    ("search", ("GET",), re.compile(r"^/api/files/search/")),
+    ("analytics", ("GET", "HEAD", "POST"), re.compile(r"^/api/(analytics|reports)(/|$)")),
+    ("read", ("POST",), re.compile(r"^/api/files/batch/get$")),
+    ("read", ("GET", "HEAD"), re.compile(r"^/api/(?!changes)")),
+    ("write", ("POST", "PUT", "PATCH", "DELETE"), re.compile(r"^/api/")),
+)
+
+# Bounds of the Retry-After estimate, in seconds
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+# Weight of the newest sample in the moving average of request durations
+DURATION_SMOOTHING = 0.1
+
+class Overloaded(Exception):
+    """
+    A route class cannot admit the request.
+
+    Attributes:
+        route_class (str): Saturated class
+        retry_after (int): Seconds the client should wait before retrying
+    """
+
+    def __init__(self, route_class: str, retry_after: int):
+        super().__init__(f"Too many concurrent {route_class} requests")
+        self.route_class = route_class
+        self.retry_after = retry_after
+
+@dataclass
+class RouteClass:
+    """
+    Concurrency limit and queue of one route class.
+
+    Attributes:
+        name (str): Class name
+        limit (int): Requests served at the same time
+        queue (int): Requests allowed to wait for a slot
+        in_flight (int): Requests being served
+        admitted (int): Requests admitted so far
+        rejected (int): Requests refused because the queue was full
+        timed_out (int): Requests refused after waiting the maximum wait
+        mean_seconds (float): Moving average of the time a request holds a slot
+    """
+    name: str
+    limit: int
+    queue: int
+    in_flight: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    mean_seconds: float = 0.05
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+
+class AdmissionController:
+    """
+    Per route class slots with bounded FIFO queues.
+
+    A finishing request hands its slot straight to the oldest waiter, so
+    queued requests are served in arrival order and new arrivals cannot
+    overtake them. Each worker process admits independently.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Tuple[int, int]],
+        max_wait_seconds: float = 5.0,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            limits (Dict[str, Tuple[int, int]]): Route class -> (concurrent requests, queued requests)
+            max_wait_seconds (float): Longest time a request may wait for a slot
+            enabled (bool): When False every request is admitted at once
+        """
+        self.classes = {name: RouteClass(name, limit, queue) for name, (limit, queue) in limits.items()}
+        self.max_wait_seconds = max_wait_seconds
+        self.enabled = enabled
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        """
+        Route class of a request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+
+        Returns:
+            Optional[str]: Class name, or None if the request is not limited
+        """
+        for name, methods, pattern in ROUTE_RULES:
+            if method in methods and pattern.match(path) and name in self.classes:
+                return name
+        return None
+
+    def retry_after(self, route_class: RouteClass) -> int:
+        """Seconds until the queue ahead of a new request should have drained."""
+        backlog = len(route_class.waiters) + route_class.in_flight
+        estimate = math.ceil(route_class.mean_seconds * backlog / route_class.limit)
+        return min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, estimate))
+
+    def _refuse(self, route_class: RouteClass, reason: str) -> Overloaded:
+        """Count a refusal and build its exception."""
+        if reason == "queue_full":
+            route_class.rejected += 1
+        else:
+            route_class.timed_out += 1
+        metrics.admission_rejected.inc((route_class.name, reason))
+        return Overloaded(route_class.name, self.retry_after(route_class))
+
+    async def acquire(self, name: str) -> None:
+        """
+        Take a slot of a route class, waiting in its queue if needed.
+
+        Args:
+            name (str): Route class
+
+        Raises:
+            Overloaded: If the queue is full or the wait exceeded max_wait_seconds
+        """
+        route_class = self.classes[name]
+        if route_class.in_flight < route_class.limit and not route_class.waiters:
+            route_class.in_flight += 1
+            route_class.admitted += 1
+            return
+        if len(route_class.waiters) >= route_class.queue:
+            raise self._refuse(route_class, "queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        route_class.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                # The slot was handed over just as the wait ended: pass it on
+                self.release(name)
+            else:
+                waiter.cancel()
+                route_class.waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._refuse(route_class, "timeout")
+            raise
+        route_class.admitted += 1
+
+    def release(self, name: str, seconds: Optional[float] = None) -> None:
+        """
+        Give a slot back, handing it to the oldest waiter if there is one.
+
+        Args:
+            name (str): Route class
+            seconds (Optional[float]): How long the request held the slot
+        """
+        route_class = self.classes[name]
+        if seconds is not None:
+            route_class.mean_seconds += DURATION_SMOOTHING * (seconds - route_class.mean_seconds)
+        while route_class.waiters:
+            waiter = route_class.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        route_class.in_flight -= 1
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        Per class state for monitoring.
+
+        Returns:
+            Dict[str, Dict[str, object]]: Limits, occupancy and refusal counts by class
+        """
+        return {
+            name: {
+                "limit": route_class.limit,
+                "queue": route_class.queue,
+                "in_flight": route_class.in_flight,
+                "waiting": len(route_class.waiters),
+                "admitted": route_class.admitted,
+                "rejected": route_class.rejected,
+                "timed_out": route_class.timed_out,
+                "mean_ms": round(route_class.mean_seconds * 1000, 1),
+            }
+            for name, route_class in self.classes.items()
+        }
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware admitting each API request through its route class.
+    Holds the slot until the response has been sent, so a streaming export
+    occupies its slot for the whole download.
+    """
+
+    def __init__(self, app, controller: "AdmissionController" = None):
+        """
+        Args:
+            app: Wrapped ASGI application
+            controller (AdmissionController): Controller to admit through (defaults to admission)
+        """
+        self.app = app
+        self.controller = controller or admission
+
+    async def __call__(self, scope, receive, send):
+        controller = self.controller
+        name = None
+        if scope["type"] == "http" and controller.enabled:
+            name = controller.classify(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await controller.acquire(name)
+        except Overloaded as e:
+            response = JSONResponse(
+                {"detail": f"{e}, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(name, time.perf_counter() - started)
+
+def load_limits(defaults: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[int, int]]:
+    """
+    Route class limits, overridden by BDMS_ADMISSION_<CLASS>=<limit>:<queue>
+    (for example BDMS_ADMISSION_SEARCH=8:32).
+
+    Args:
+        defaults (Dict[str, Tuple[int, int]]): Default (limit, queue) per class
+
+    Returns:
+        Dict[str, Tuple[int, int]]: Effective limits
+
+    Raises:
+        ValueError: If an override is malformed
+    """
+    limits = dict(defaults)
+    for name in defaults:
+        raw = os.getenv(f"BDMS_ADMISSION_{name.upper()}")
+        if raw is None:
+            continue
+        limit, _, queue = raw.partition(":")
+        try:
+            limits[name] = (max(1, int(limit)), max(0, int(queue or 0)))
+        except ValueError:
+            raise ValueError(f"Invalid BDMS_ADMISSION_{name.upper()} '{raw}', expected <limit>:<queue>")
+    return limits
+
+# Reads and searches are sized to the read connection pool. Analytics and
+# report queries scan far more rows than a file read, so they get a few slots
+# of their own instead of taking the hot reads' ones. Writes are capped at
+# one typical group commit: a request holding a write slot mostly waits for
+# the single writer, so more of them would only lengthen that wait.
+_READ_CONNECTIONS = storage_profile.read_pool_size + storage_profile.read_pool_overflow
+_WRITE_CONCURRENCY = min(storage_profile.writer_max_batch, 32)
+
+# Admission control for the API
+admission = AdmissionController(
+    limits=load_limits({
+        "read": (_READ_CONNECTIONS, _READ_CONNECTIONS * 4),
+        "search": (max(1, _READ_CONNECTIONS // 2), _READ_CONNECTIONS * 2),
+        "analytics": (4, 16),
+        "export": (4, 8),
+        "write": (_WRITE_CONCURRENCY, _WRITE_CONCURRENCY * 2),
+    }),
+    max_wait_seconds=float(os.getenv("BDMS_ADMISSION_MAX_WAIT_SECONDS", "5")),
+    enabled=os.getenv("BDMS_ADMISSION_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+)
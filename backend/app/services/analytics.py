@@ -0,0 +1,535 @@
+"""
+In-memory columnar snapshot of ByteDB for storage analytics.
+Keeps file sizes, timestamps and dictionary-encoded text columns as NumPy
+arrays, refreshed incrementally from updated_at, and answers group-by,
+percentile and histogram queries with vectorized operations.
+
+Usage:
+    report = await file_analytics.query(FileQuery(department="Finance"), group_by=["owner"])
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import DateTime, String, select, text, type_coerce
+from sqlalchemy.ext.asyncio import AsyncEngine
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the analytics endpoints need it
+    np = None
+
+from ..database.database import async_engine
+from ..database.models import FileRecord, FileTombstone
+from ..database.partitions import file_partitions
+from ..database.tombstones import LAST_TOMBSTONE_SQL
+from ..schemas.file_schemas import FileQuery
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Dictionary-encoded text columns (also the group-by dimensions)
+TEXT_COLUMNS = ("department", "owner", "file_type", "access_level")
+
+# Timestamps are held as int64 microseconds since the epoch
+EPOCH = datetime(1970, 1, 1)
+
+# File IDs per IN (...) query when re-reading deleted IDs
+ID_BATCH = 500
+
+# Group keys are combined arithmetically and counted with bincount while the
+# key space stays below this; larger key spaces are sorted instead
+MAX_DENSE_GROUPS = 1 << 22
+
+class Dictionary:
+    """
+    Append-only string dictionary for one text column. Code 0 is NULL; codes
+    never change once assigned, so arrays encoded earlier stay valid.
+    """
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self.codes: Dict[Optional[str], int] = {None: 0}
+
+    def encode(self, values: Sequence[Optional[str]]) -> "np.ndarray":
+        """
+        Codes of a column of values, adding unseen values to the dictionary.
+
+        Args:
+            values (Sequence[Optional[str]]): Column values
+
+        Returns:
+            np.ndarray: int32 codes
+        """
+        codes = self.codes
+        for value in set(values).difference(codes):
+            codes[value] = len(self.values)
+            self.values.append(value)
+        return np.fromiter((codes[value] for value in values), dtype=np.int32, count=len(values))
+
+class FileSnapshot:
+    """
+    Columnar copy of the ByteDB columns analytics queries need, sorted by file_id.
+
+    A refresh reads only rows whose updated_at is at or after the last seen
+    value (less an overlap, since rows can commit slightly after the time
+    they were stamped) and upserts them by file_id. Deletes leave no
+    updated_at behind: they are read from each database's file_tombstones
+    after the last sequence number seen, and those IDs dropped (and re-read,
+    in case the record moved to another partition). Only a snapshot that
+    fell behind the tombstones kept re-reads every file ID. Queries refresh
+    the snapshot first if it is older than refresh_seconds; between
+    refreshes they may trail the database by that long.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = 5.0,
+        overlap_seconds: float = 5.0,
+        batch_rows: int = 50000
+    ):
+        """
+        Args:
+            refresh_seconds (float): Age after which a query refreshes the snapshot
+            overlap_seconds (float): Re-read rows stamped this long before the watermark
+            batch_rows (int): Rows fetched and encoded per batch
+        """
+        self.refresh_seconds = refresh_seconds
+        self.overlap_seconds = overlap_seconds
+        self.batch_rows = batch_rows
+        self.dictionaries = {name: Dictionary() for name in TEXT_COLUMNS}
+        self.columns: Optional[Dict[str, "np.ndarray"]] = None
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[datetime] = None
+        self.refreshes = 0
+        self.full_reconciles = 0
+        self.last_refresh_ms = 0.0
+        self._refreshed = 0.0
+        self._sorted_sizes: Optional["np.ndarray"] = None
+        self._tombstones: Dict[str, int] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def require_numpy() -> None:
+        """
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if np is None:
+            raise RuntimeError("File analytics requires NumPy (pip install numpy)")
+
+    @staticmethod
+    async def _engines() -> List[AsyncEngine]:
+        """Databases holding file records."""
+        if file_partitions.enabled:
+            return [partition.read_engine for partition in await file_partitions.all()]
+        return [async_engine]
+
+    async def refresh(self, force: bool = False) -> None:
+        """
+        Bring the snapshot up to date with the database.
+
+        Args:
+            force (bool): Refresh even if the snapshot is younger than refresh_seconds
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        self.require_numpy()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not force and time.monotonic() - self._refreshed < self.refresh_seconds:
+                return
+            started = time.perf_counter()
+            engines = await self._engines()
+            since = None
+            if self.watermark is not None:
+                since = self.watermark - timedelta(seconds=self.overlap_seconds)
+            # Tombstones first: a delete committing after this is read next time
+            deleted, behind = await self._deleted(engines, full=self.columns is None)
+            changed = await self._read(engines, since, deleted)
+            columns = self.columns
+            if columns is not None and behind:
+                columns = await self._reconcile(engines, columns)
+            elif columns is not None and len(deleted):
+                keep = ~np.isin(columns["file_id"], deleted)
+                if not keep.all():
+                    columns = {name: column[keep] for name, column in columns.items()}
+            columns = self._upsert(columns, changed)
+            if len(changed["updated_at"]):
+                latest = EPOCH + timedelta(microseconds=int(changed["updated_at"].max()))
+                self.watermark = latest if self.watermark is None else max(self.watermark, latest)
+            if columns is not self.columns or len(changed["file_id"]):
+                self._sorted_sizes = None
+            self.columns = columns
+            self._refreshed = time.monotonic()
+            self.refreshed_at = datetime.utcnow()
+            self.refreshes += 1
+            self.last_refresh_ms = (time.perf_counter() - started) * 1000
+            logger.debug(
+                f"Analytics snapshot refreshed: {len(changed['file_id'])} changed, "
+                f"{len(deleted)} deleted, {len(columns['file_id'])} rows in {self.last_refresh_ms:.1f} ms"
+            )
+
+    async def _deleted(self, engines: List[AsyncEngine], full: bool) -> Tuple["np.ndarray", bool]:
+        """
+        File IDs deleted since the last refresh, from each database's tombstones.
+
+        Args:
+            engines (List[AsyncEngine]): Databases to read
+            full (bool): Every row is about to be read; only note the last
+                tombstone of each database
+
+        Returns:
+            Tuple[np.ndarray, bool]: Sorted deleted file IDs, and True if a
+                database pruned tombstones not read yet (the snapshot must then
+                re-read every file ID)
+        """
+        ids = []
+        behind = False
+        for engine in engines:
+            key = str(engine.url)
+            seen = self._tombstones.get(key, 0)
+            async with engine.connect() as conn:
+                last = (await conn.execute(text(LAST_TOMBSTONE_SQL))).scalar() or 0
+                if not full and last > seen:
+                    rows = (await conn.execute(
+                        select(FileTombstone.seq, FileTombstone.file_id)
+                        .where(FileTombstone.seq > seen, FileTombstone.seq <= last)
+                        .order_by(FileTombstone.seq)
+                    )).all()
+                    # Sequence numbers are gapless until pruned
+                    if not rows or rows[0][0] != seen + 1:
+                        behind = True
+                    else:
+                        ids.append(np.array([file_id for _, file_id in rows], dtype=np.int64))
+            self._tombstones[key] = last
+        return (np.unique(np.concatenate(ids)) if ids else np.empty(0, np.int64)), behind
+
+    async def _read(
+        self,
+        engines: List[AsyncEngine],
+        since: Optional[datetime],
+        file_ids: Optional["np.ndarray"] = None
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Read and encode the rows updated since a time, batch by batch.
+
+        Args:
+            engines (List[AsyncEngine]): Databases to read
+            since (Optional[datetime]): Lower bound of updated_at; None reads every row
+            file_ids (Optional[np.ndarray]): Also read these IDs whatever their
+                updated_at (deleted IDs that may exist elsewhere)
+
+        Returns:
+            Dict[str, np.ndarray]: Columns sorted by file_id, one row per file_id
+        """
+        table = FileRecord.__table__
+        names = ("file_id", "file_size", "created_at", "updated_at", *TEXT_COLUMNS)
+        # Timestamps are read as stored text and parsed by NumPy, not row by row
+        query = select(*(
+            type_coerce(table.c[name], String) if isinstance(table.c[name].type, DateTime) else table.c[name]
+            for name in names
+        )).order_by(table.c.file_id)
+        queries = [query]
+        if since is not None:
+            queries = [query.where(table.c.updated_at >= since)]
+            ids = [] if file_ids is None else file_ids.tolist()
+            for offset in range(0, len(ids), ID_BATCH):
+                queries.append(query.where(table.c.file_id.in_(ids[offset:offset + ID_BATCH])))
+        chunks: List[Dict[str, "np.ndarray"]] = []
+        for engine in engines:
+            async with engine.connect() as conn:
+                for statement in queries:
+                    result = await conn.stream(statement.execution_options(yield_per=self.batch_rows))
+                    async for rows in result.partitions():
+                        chunks.append(self._encode(names, rows))
+        if not chunks:
+            return self._encode(names, [])
+        columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in names}
+        if len(engines) == 1 and len(queries) == 1:
+            return columns
+        # Keep the latest version of a file_id read twice (a record moving
+        # between partitions, or matched by more than one query)
+        order = np.lexsort((columns["updated_at"], columns["file_id"]))
+        ids = columns["file_id"][order]
+        last = np.append(ids[1:] != ids[:-1], True)
+        return {name: column[order[last]] for name, column in columns.items()}
+
+    def _encode(self, names: Sequence[str], rows: Sequence[Tuple[Any, ...]]) -> Dict[str, "np.ndarray"]:
+        """Encode a batch of rows (in names order) as columns."""
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        columns = dict(zip(names, values))
+        encoded = {
+            "file_id": np.array(columns["file_id"], dtype=np.int64),
+            "file_size": np.array(columns["file_size"], dtype=np.int64),
+        }
+        for name in ("created_at", "updated_at"):
+            stamps = np.array(columns[name], dtype="datetime64[us]")
+            encoded[name] = stamps.astype(np.int64)
+        for name in TEXT_COLUMNS:
+            encoded[name] = self.dictionaries[name].encode(columns[name])
+        return encoded
+
+    @staticmethod
+    def _upsert(
+        columns: Optional[Dict[str, "np.ndarray"]],
+        changed: Dict[str, "np.ndarray"]
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Merge changed rows into the snapshot by file_id.
+
+        Args:
+            columns (Optional[Dict[str, np.ndarray]]): Current snapshot, sorted by file_id
+            changed (Dict[str, np.ndarray]): Changed rows, sorted by file_id
+
+        Returns:
+            Dict[str, np.ndarray]: Updated snapshot, sorted by file_id
+        """
+        if columns is None or not len(columns["file_id"]):
+            return changed
+        if not len(changed["file_id"]):
+            return columns
+        ids, new_ids = columns["file_id"], changed["file_id"]
+        positions = np.minimum(np.searchsorted(ids, new_ids), len(ids) - 1)
+        found = ids[positions] == new_ids
+        for name, column in columns.items():
+            column[positions[found]] = changed[name][found]
+        added = ~found
+        if not added.any():
+            return columns
+        columns = {name: np.concatenate((column, changed[name][added])) for name, column in columns.items()}
+        if new_ids[added][0] < ids[-1]:
+            order = np.argsort(columns["file_id"], kind="stable")
+            columns = {name: column[order] for name, column in columns.items()}
+        return columns
+
+    async def _reconcile(
+        self,
+        engines: List[AsyncEngine],
+        columns: Dict[str, "np.ndarray"]
+    ) -> Dict[str, "np.ndarray"]:
+        """Drop snapshot rows whose file_id is no longer in the database (a full ID scan)."""
+        self.full_reconciles += 1
+        ids = []
+        for engine in engines:
+            async with engine.connect() as conn:
+                result = await conn.execute(select(FileRecord.file_id))
+                ids.append(np.array(result.scalars().all(), dtype=np.int64))
+        keep = np.isin(columns["file_id"], np.concatenate(ids) if ids else np.empty(0, np.int64))
+        if keep.all():
+            return columns
+        return {name: column[keep] for name, column in columns.items()}
+
+    def _mask(self, query_params: Optional[FileQuery]) -> Optional["np.ndarray"]:
+        """Rows matching the FileQuery filters, or None for all rows."""
+        if query_params is None:
+            return None
+        columns = self.columns
+        mask = None
+
+        def apply(condition: "np.ndarray") -> None:
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        for name in TEXT_COLUMNS:
+            value = getattr(query_params, name)
+            if value:
+                code = self.dictionaries[name].codes.get(value)
+                if code is None:
+                    apply(np.zeros(len(columns["file_id"]), dtype=bool))
+                else:
+                    apply(columns[name] == code)
+        if query_params.min_size is not None:
+            apply(columns["file_size"] >= query_params.min_size)
+        if query_params.max_size is not None:
+            apply(columns["file_size"] <= query_params.max_size)
+        return mask
+
+    def _groups(
+        self,
+        mask: Optional["np.ndarray"],
+        sizes: "np.ndarray",
+        group_by: Sequence[str],
+        order_by: str,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Count and total file sizes per combination of group_by values."""
+        codes = [self.columns[name] if mask is None else self.columns[name][mask] for name in group_by]
+        key = np.zeros(len(sizes), dtype=np.int64)
+        space = 1
+        for name, column in zip(group_by, codes):
+            radix = len(self.dictionaries[name].values)
+            if space * radix > MAX_DENSE_GROUPS:
+                # Re-number the combinations seen so far to keep the key space small
+                uniques, key = np.unique(key, return_inverse=True)
+                space = len(uniques)
+            key = key * radix + column
+            space *= radix
+        if space > MAX_DENSE_GROUPS:
+            uniques, key = np.unique(key, return_inverse=True)
+            space = len(uniques)
+        counts = np.bincount(key, minlength=space)
+        totals = np.bincount(key, weights=sizes, minlength=space)
+        # Any one row of each group, to decode its values from
+        rows = np.zeros(space, dtype=np.int64)
+        rows[key] = np.arange(len(key))
+        present = np.flatnonzero(counts)
+        counts, totals, rows = counts[present], totals[present], rows[present]
+        primary, secondary = (totals, counts) if order_by == "total_size" else (counts, totals)
+        # Sort only the top candidates; there can be as many groups as rows
+        candidates = np.arange(len(primary))
+        if len(candidates) > limit:
+            candidates = np.argpartition(-primary, limit - 1)[:limit]
+        rank = candidates[np.lexsort((-secondary[candidates], -primary[candidates]))]
+        groups = []
+        for index in rank.tolist():
+            count, total = int(counts[index]), int(totals[index])
+            groups.append({
+                "key": {
+                    name: self.dictionaries[name].values[int(column[rows[index]])]
+                    for name, column in zip(group_by, codes)
+                },
+                "count": count,
+                "total_size": total,
+                "mean_size": total / count,
+            })
+        return groups
+
+    def _percentiles(
+        self,
+        mask: Optional["np.ndarray"],
+        sizes: "np.ndarray",
+        percentiles: Sequence[float]
+    ) -> List[Optional[float]]:
+        """
+        File size percentiles with linear interpolation (NumPy's default method).
+        Unfiltered queries read them from a sorted copy of the sizes kept until
+        the next refresh that changes rows.
+        """
+        if not len(sizes) or not percentiles:
+            return [None] * len(percentiles)
+        if mask is not None:
+            return np.percentile(sizes, percentiles).tolist()
+        if self._sorted_sizes is None:
+            self._sorted_sizes = np.sort(sizes)
+        ordered = self._sorted_sizes
+        positions = np.asarray(percentiles, dtype=np.float64) / 100 * (len(ordered) - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, len(ordered) - 1)
+        return (ordered[lower] + (ordered[upper] - ordered[lower]) * (positions - lower)).tolist()
+
+    @staticmethod
+    def _histogram(sizes: "np.ndarray", scale: str, bins: int) -> List[Dict[str, Any]]:
+        """File counts and bytes per size bucket (powers of two, or equal widths)."""
+        if not len(sizes):
+            return []
+        if scale == "log2":
+            # frexp puts size in [2**(e-1), 2**e); zero-byte files land in bucket 0
+            _, exponents = np.frexp(sizes.astype(np.float64))
+            counts = np.bincount(exponents, minlength=1)
+            totals = np.bincount(exponents, weights=sizes, minlength=1)
+            return [
+                {
+                    "lower": 0 if exponent == 0 else 1 << (exponent - 1),
+                    "upper": 1 if exponent == 0 else 1 << exponent,
+                    "count": int(counts[exponent]),
+                    "total_size": int(totals[exponent]),
+                }
+                for exponent in np.flatnonzero(counts).tolist()
+            ]
+        counts, edges = np.histogram(sizes, bins=bins)
+        totals, _ = np.histogram(sizes, bins=edges, weights=sizes)
+        return [
+            {
+                "lower": int(np.ceil(edges[index])),
+                "upper": int(np.ceil(edges[index + 1])),
+                "count": int(counts[index]),
+                "total_size": int(totals[index]),
+            }
+            for index in range(len(counts))
+        ]
+
+    async def query(
+        self,
+        query_params: Optional[FileQuery] = None,
+        group_by: Sequence[str] = (),
+        order_by: str = "total_size",
+        limit: int = 100,
+        percentiles: Sequence[float] = (50, 90, 99),
+        histogram: Optional[str] = "log2",
+        bins: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Storage statistics of the file records matching the filters.
+
+        Args:
+            query_params (Optional[FileQuery]): Filters
+            group_by (Sequence[str]): Text columns to group by (none: no groups)
+            order_by (str): Group order, "total_size" or "count" (descending)
+            limit (int): Maximum groups to return
+            percentiles (Sequence[float]): File size percentiles to compute (0-100)
+            histogram (Optional[str]): "log2" (power-of-two buckets), "linear" or None
+            bins (int): Buckets of a linear histogram
+
+        Returns:
+            dict: Fields of FileAnalytics
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+            ValueError: If a group-by column is unknown or a percentile is out of range
+        """
+        group_by = list(dict.fromkeys(group_by))
+        unknown = [name for name in group_by if name not in TEXT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Cannot group by {', '.join(unknown)}")
+        if any(not 0 <= percentile <= 100 for percentile in percentiles):
+            raise ValueError("Percentiles must be between 0 and 100")
+        await self.refresh()
+        started = time.perf_counter()
+        mask = self._mask(query_params)
+        sizes = self.columns["file_size"] if mask is None else self.columns["file_size"][mask]
+        values = self._percentiles(mask, sizes, percentiles)
+        report: Dict[str, Any] = {
+            "total": int(len(sizes)),
+            "total_size": int(sizes.sum()),
+            "groups": self._groups(mask, sizes, group_by, order_by, limit) if group_by else [],
+            "percentiles": [
+                {"percentile": percentile, "file_size": value}
+                for percentile, value in zip(percentiles, values)
+            ],
+            "histogram": self._histogram(sizes, histogram, bins) if histogram else [],
+        }
+        report["query_ms"] = (time.perf_counter() - started) * 1000
+        report["snapshot"] = self.stats()
+        return report
+
+    def stats(self) -> dict:
+        """
+        Snapshot state for monitoring.
+
+        Returns:
+            dict: Fields of AnalyticsSnapshotStatus
+        """
+        columns = self.columns or {}
+        return {
+            "rows": int(len(columns["file_id"])) if columns else 0,
+            "memory_bytes": sum(int(column.nbytes) for column in columns.values()),
+            "dictionary_sizes": {name: len(self.dictionaries[name].values) - 1 for name in TEXT_COLUMNS},
+            "watermark": self.watermark,
+            "refreshed_at": self.refreshed_at,
+            "refreshes": self.refreshes,
+            "full_reconciles": self.full_reconciles,
+            "last_refresh_ms": self.last_refresh_ms,
+        }
+
+# Snapshot behind the /api/analytics endpoints
+file_analytics = FileSnapshot(
+    refresh_seconds=float(os.getenv("BDMS_ANALYTICS_REFRESH_SECONDS", "5")),
+    overlap_seconds=float(os.getenv("BDMS_ANALYTICS_OVERLAP_SECONDS", "5")),
+)
@@ -0,0 +1,215 @@
+"""
+In-process read-through response cache.
+Stores serialized JSON bodies with strong ETags in an LRU with a TTL, and
+invalidates entries precisely from the rows a write touched.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RowPredicate = Callable[[Dict[str, Any]], bool]
+
+@dataclass
+class CacheEntry:
+    """
+    A cached response body.
+
+    Attributes:
+        body (bytes): Serialized JSON body
+        etag (str): Strong ETag (quoted content hash)
+        expires_at (float): Monotonic expiry time
+        matches (Optional[RowPredicate]): For list entries, tells whether a row belongs to it
+    """
+    body: bytes
+    etag: str
+    expires_at: float
+    matches: Optional[RowPredicate] = None
+
+def make_etag(body: bytes) -> str:
+    """
+    Strong ETag for a response body.
+
+    Args:
+        body (bytes): Serialized response
+
+    Returns:
+        str: Quoted ETag value
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an ETag.
+
+    Args:
+        if_none_match (Optional[str]): Header value
+        etag (str): Current ETag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(
+        (value[2:] if value.startswith("W/") else value) == etag for value in candidates
+    )
+
+class ResponseCache:
+    """
+    LRU + TTL cache of serialized responses.
+
+    Point entries (one record) are dropped by key. List entries carry a row
+    predicate and are dropped when a written row, before or after the write,
+    matches their filters. A generation counter stops a read that started
+    before a write from storing its now stale result. Each worker process has
+    its own cache, so the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0, enabled: bool = True):
+        """
+        Args:
+            max_entries (int): Maximum cached responses before LRU eviction
+            ttl_seconds (float): Lifetime of an entry
+            enabled (bool): When False every lookup misses and nothing is stored
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Look up a live entry and mark it most recently used.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            Optional[CacheEntry]: Entry, or None on a miss
+        """
+        entry = self._entries.get(key) if self.enabled else None
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: Hashable,
+        body: bytes,
+        generation: int,
+        matches: Optional[RowPredicate] = None
+    ) -> CacheEntry:
+        """
+        Store a freshly loaded body unless a write happened while it was loading.
+
+        Args:
+            key (Hashable): Cache key
+            body (bytes): Serialized response
+            generation (int): Value of self.generation when loading started
+            matches (Optional[RowPredicate]): Row predicate for list entries
+
+        Returns:
+            CacheEntry: The entry (also returned when it was not stored)
+        """
+        entry = CacheEntry(body, make_etag(body), time.monotonic() + self.ttl_seconds, matches)
+        if not self.enabled or generation != self.generation:
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate_key(self, key: Hashable) -> None:
+        """
+        Drop a single entry.
+
+        Args:
+            key (Hashable): Cache key
+        """
+        self.generation += 1
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def invalidate_rows(self, rows: Iterable[Optional[Dict[str, Any]]]) -> None:
+        """
+        Drop every list entry that any of the rows belongs to.
+
+        Args:
+            rows (Iterable[Optional[Dict[str, Any]]]): Row snapshots before/after a write
+        """
+        self.generation += 1
+        rows = [row for row in rows if row is not None]
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.matches is not None and any(entry.matches(row) for row in rows)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def invalidate_lists(self) -> None:
+        """Drop every list entry (used after bulk writes)."""
+        self.generation += 1
+        stale = [key for key, entry in self._entries.items() if entry.matches is not None]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for monitoring.
+
+        Returns:
+            Dict[str, Any]: Size, hit/miss/eviction/invalidation counts and hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+# Cache for file record responses
+file_cache = ResponseCache(
+    max_entries=int(os.getenv("BDMS_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("BDMS_CACHE_TTL_SECONDS", "30")),
+    enabled=os.getenv("BDMS_CACHE_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+)
@@ -0,0 +1,254 @@
+"""
+In-process change feed for file records and transactions.
+Services publish each committed write once; the events are kept in a
+bounded buffer with increasing sequence numbers, which Server-Sent Events
+streams replay from and then follow.
+"""
+
+import asyncio
+import os
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Collection, Deque, Dict, Iterable, List, Optional, Tuple
+import logging
+from ..schemas.file_schemas import FileResponse
+from ..schemas.transaction_schemas import TransactionResponse
+from .fast_json import dumps
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fields sent for the rows of each entity (the wire format of its response model)
+ENTITY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "file": tuple(FileResponse.model_fields),
+    "transaction": tuple(TransactionResponse.model_fields),
+}
+
+# Reconnection delay suggested to EventSource clients
+RETRY_MS = 3000
+
+@dataclass
+class ChangeEvent:
+    """
+    One committed write.
+
+    Attributes:
+        seq (int): Position in the feed
+        entity (str): "file" or "transaction"
+        op (str): "created", "updated", "deleted", or "reload" when too many
+            rows changed to list them (clients re-fetch)
+        frame (bytes): The event encoded once as an SSE frame, shared by every stream
+    """
+    seq: int
+    entity: str
+    op: str
+    frame: bytes
+
+class ChangeFeed:
+    """
+    Publish/subscribe hub for committed writes.
+
+    publish() must run on the event loop after the write has committed.
+    Event IDs are "<epoch>-<seq>": the epoch changes when the process
+    restarts, so a client resuming with an ID from another process, or one
+    that fell further behind than the buffer holds, is sent a reset event
+    and should re-fetch. Each worker process has its own feed, which covers
+    the writes made through that process.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 10000,
+        heartbeat_seconds: float = 15.0,
+        stream_seconds: float = 60.0
+    ):
+        """
+        Args:
+            buffer_size (int): Events kept for resuming streams
+            heartbeat_seconds (float): Idle time before a stream sends a keep-alive comment
+            stream_seconds (float): Lifetime of a stream; clients reconnect and resume
+                from their last event, so none are lost (this also bounds how long
+                open streams hold up a server shutdown)
+        """
+        self.buffer_size = buffer_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stream_seconds = stream_seconds
+        self.epoch = secrets.token_hex(4)
+        self.seq = 0
+        self.published = 0
+        self.streams = 0
+        self.resets = 0
+        self._events: Deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self._wakeup = asyncio.Event()
+
+    def event_id(self, seq: int) -> str:
+        """SSE event ID of a sequence number."""
+        return f"{self.epoch}-{seq}"
+
+    def publish(
+        self,
+        entity: str,
+        op: str,
+        rows: Iterable[Dict[str, object]] = (),
+        ids: Iterable[int] = (),
+        count: Optional[int] = None
+    ) -> int:
+        """
+        Append a committed write to the feed and wake every stream.
+
+        Args:
+            entity (str): "file" or "transaction"
+            op (str): "created", "updated", "deleted" or "reload"
+            rows (Iterable[Dict[str, object]]): Column values after the write (created/updated)
+            ids (Iterable[int]): IDs of deleted rows
+            count (Optional[int]): Rows affected, when neither rows nor ids are listed
+                (omitted when unknown)
+
+        Returns:
+            int: Sequence number of the event
+        """
+        fields = ENTITY_FIELDS[entity]
+        rows = [{name: row.get(name) for name in fields} for row in rows]
+        ids = list(ids)
+        self.seq += 1
+        payload = {
+            "seq": self.seq,
+            "entity": entity,
+            "op": op,
+            "at": datetime.utcnow(),
+        }
+        if count is None and (rows or ids):
+            count = len(rows) or len(ids)
+        if count is not None:
+            payload["count"] = count
+        if rows:
+            payload["rows"] = rows
+        if ids:
+            payload["ids"] = ids
+        frame = self._frame(self.event_id(self.seq), entity, payload)
+        self._events.append(ChangeEvent(self.seq, entity, op, frame))
+        self.published += 1
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+        return self.seq
+
+    @staticmethod
+    def _frame(event_id: str, event: str, payload: Dict[str, object]) -> bytes:
+        """Encode one SSE frame (JSON is a single line, so one data field)."""
+        return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), dumps(payload))
+
+    def resume_point(self, last_event_id: Optional[str]) -> Optional[int]:
+        """
+        Sequence number to replay after, or None if the client has missed events.
+
+        Args:
+            last_event_id (Optional[str]): ID of the last event the client applied;
+                None or "" for a new client, which starts from the current position
+
+        Returns:
+            Optional[int]: Last sequence number the client has seen
+        """
+        if not last_event_id:
+            return self.seq
+        epoch, _, seq = last_event_id.rpartition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self.seq:
+            return None
+        return int(seq) if self._replayable(int(seq)) else None
+
+    def _replayable(self, seq: int) -> bool:
+        """True if every event after seq is still buffered."""
+        oldest = self._events[0].seq if self._events else self.seq + 1
+        return seq >= oldest - 1
+
+    def since(self, seq: int) -> List[ChangeEvent]:
+        """
+        Buffered events after a sequence number (which must be replayable).
+
+        Args:
+            seq (int): Last sequence number seen
+
+        Returns:
+            List[ChangeEvent]: Events in order
+        """
+        if seq >= self.seq:
+            return []
+        start = len(self._events) - (self.seq - seq)
+        return [self._events[index] for index in range(start, len(self._events))]
+
+    def _reset_frame(self) -> bytes:
+        """Frame telling a client to re-fetch, positioned at the current sequence number."""
+        self.resets += 1
+        return self._frame(self.event_id(self.seq), "reset", {"seq": self.seq})
+
+    async def stream(
+        self,
+        last_event_id: Optional[str],
+        entities: Collection[str]
+    ) -> AsyncIterator[bytes]:
+        """
+        SSE frames for one client: the missed events, then new ones as they are
+        published, until the stream lifetime ends (a disconnect cancels it).
+
+        Args:
+            last_event_id (Optional[str]): Resume position (the Last-Event-ID header)
+            entities (Collection[str]): Entities to send events for
+
+        Yields:
+            bytes: SSE frames and keep-alive comments
+        """
+        self.streams += 1
+        try:
+            yield b"retry: %d\n\n" % RETRY_MS
+            cursor = self.resume_point(last_event_id)
+            if cursor is None:
+                cursor = self.seq
+                yield self._reset_frame()
+            deadline = time.monotonic() + self.stream_seconds
+            while True:
+                wakeup = self._wakeup
+                if not self._replayable(cursor):
+                    # This client fell further behind than the buffer holds
+                    cursor = self.seq
+                    yield self._reset_frame()
+                for event in self.since(cursor):
+                    cursor = event.seq
+                    if event.entity in entities:
+                        yield event.frame
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    await asyncio.wait_for(wakeup.wait(), min(self.heartbeat_seconds, remaining))
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+        finally:
+            self.streams -= 1
+
+    def stats(self) -> dict:
+        """
+        Feed state for monitoring.
+
+        Returns:
+            dict: Fields of ChangeFeedStatus
+        """
+        return {
+            "epoch": self.epoch,
+            "last_event_id": self.event_id(self.seq),
+            "oldest_seq": self._events[0].seq if self._events else None,
+            "buffered": len(self._events),
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "streams": self.streams,
+            "resets": self.resets,
+        }
+
+# Change feed for the /api/changes stream
+change_feed = ChangeFeed(
+    buffer_size=int(os.getenv("BDMS_CHANGES_BUFFER", "10000")),
+    heartbeat_seconds=float(os.getenv("BDMS_CHANGES_HEARTBEAT_SECONDS", "15")),
+    stream_seconds=float(os.getenv("BDMS_CHANGES_STREAM_SECONDS", "60")),
+)
@@ -0,0 +1,540 @@
+"""
+Parallel filesystem crawler that populates ByteDB.
+Directories are listed with os.scandir on a thread pool and their files are
+upserted in large batches. Later crawls skip directories whose mtime and
+inode are unchanged, and delete the records of files and directories that
+have vanished.
+
+Usage (from the backend directory):
+    python -m app.services.crawler /srv/finance=Finance /srv/shared
+    python -m app.services.crawler /srv/shared --full --workers 32
+"""
+
+import argparse
+import json
+import os
+import stat
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+from sqlalchemy import and_, bindparam, delete, insert, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from ..database.database import engine
+from ..database.models import FILE_DIRECTORY, CrawledDirectory, FileRecord
+from ..database.partitions import file_partitions
+from .jobs import BackgroundJob
+
+try:
+    import pwd
+except ImportError:  # not available on Windows: owners are reported as uids
+    pwd = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Directories listed concurrently; listing and stat calls release the GIL
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files upserted per transaction
+DEFAULT_BATCH_FILES = 5000
+
+# Directories per transaction (bounds the IN lists of mostly empty directories)
+MAX_BATCH_DIRECTORIES = 500
+
+# Listings queued per worker; the queue is depth first, so memory stays
+# proportional to tree depth times fan-out rather than to the tree size
+QUEUED_PER_WORKER = 4
+
+FILES = FileRecord.__table__
+DIRECTORIES = CrawledDirectory.__table__
+
+# ByteDB fields derived from the filesystem (department only when configured)
+DERIVED_FIELDS = ("file_name", "file_type", "file_size", "owner", "access_level", "department")
+
+@dataclass
+class CrawlRoot:
+    """
+    A directory tree to index.
+
+    Attributes:
+        path (str): Absolute path of the root directory
+        department (Optional[str]): Department assigned to every file below it
+    """
+    path: str
+    department: Optional[str] = None
+
+@dataclass
+class DirectoryScan:
+    """
+    One directory as seen by a worker.
+
+    Attributes:
+        path (str): Directory path
+        parent (Optional[str]): Parent directory path (None for a root)
+        mtime_ns (int): Modification time before the listing was read
+        inode (int): Inode number
+        unchanged (bool): True if mtime and inode matched the last crawl (not listed)
+        files (list): (name, path, size, uid, mode) of the regular files
+        subdirs (List[str]): Paths of the subdirectories
+        error (Optional[str]): Reason the directory could not be read
+    """
+    path: str
+    parent: Optional[str]
+    mtime_ns: int = 0
+    inode: int = 0
+    unchanged: bool = False
+    files: list = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+def parse_root(spec: str) -> CrawlRoot:
+    """
+    Parse a root given as PATH or PATH=DEPARTMENT.
+
+    Args:
+        spec (str): Root specification
+
+    Returns:
+        CrawlRoot: Root with an absolute, normalized path
+    """
+    path, _, department = spec.partition("=")
+    return CrawlRoot(os.path.abspath(os.path.expanduser(path)), department.strip() or None)
+
+def parse_roots(value: Optional[str]) -> List[CrawlRoot]:
+    """
+    Parse a list of roots separated by os.pathsep (BDMS_CRAWL_ROOTS).
+
+    Args:
+        value (Optional[str]): Root specifications
+
+    Returns:
+        List[CrawlRoot]: Parsed roots
+    """
+    return [parse_root(spec) for spec in (value or "").split(os.pathsep) if spec.strip()]
+
+def file_type_of(name: str) -> str:
+    """Lower-case extension without the dot ('' for files without one)."""
+    return os.path.splitext(name)[1][1:].lower()
+
+def access_level_of(mode: int) -> str:
+    """Map permission bits to public (world-readable), internal (group-readable) or private."""
+    if mode & stat.S_IROTH:
+        return "public"
+    if mode & stat.S_IRGRP:
+        return "internal"
+    return "private"
+
+@lru_cache(maxsize=4096)
+def owner_of(uid: int) -> str:
+    """User name of a uid, or the uid itself when it has no account."""
+    if pwd is not None:
+        try:
+            return pwd.getpwuid(uid).pw_name
+        except KeyError:
+            pass
+    return str(uid)
+
+def directory_key(path: str) -> str:
+    """The FILE_DIRECTORY value of the files directly in a directory."""
+    return path if path.endswith("/") else path + "/"
+
+def scan_directory(path: str, parent: Optional[str], known: Optional[Tuple[int, int]]) -> DirectoryScan:
+    """
+    Read one directory (runs on a worker thread).
+    The directory is stat'ed before it is listed, so a change made during the
+    listing shows up as a newer mtime on the next crawl. When (mtime_ns, inode)
+    equals known the listing is skipped.
+
+    Args:
+        path (str): Directory path
+        parent (Optional[str]): Parent directory path
+        known (Optional[Tuple[int, int]]): (mtime_ns, inode) from the last crawl
+
+    Returns:
+        DirectoryScan: Files and subdirectories, or the unchanged/error marker
+    """
+    scan = DirectoryScan(path, parent)
+    try:
+        info = os.stat(path)
+        scan.mtime_ns, scan.inode = info.st_mtime_ns, info.st_ino
+        if known == (scan.mtime_ns, scan.inode):
+            scan.unchanged = True
+            return scan
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        scan.subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        details = entry.stat(follow_symlinks=False)
+                        scan.files.append(
+                            (entry.name, entry.path, details.st_size, details.st_uid, details.st_mode)
+                        )
+                except OSError:
+                    # Removed between the listing and the stat
+                    continue
+    except OSError as e:
+        scan.error = str(e)
+    return scan
+
+class RootCrawl:
+    """
+    Crawl of one root: walks the tree on a thread pool and applies the
+    changes to ByteDB and crawled_directories in batches.
+
+    Each batch commits the file changes of its directories together with
+    their new (mtime_ns, inode), so an interrupted crawl resumes where it
+    stopped. Only directories whose mtime changed are listed, which catches
+    created, deleted and renamed entries; a file modified in place does not
+    change its directory's mtime and is picked up by a full crawl.
+    """
+
+    def __init__(
+        self,
+        root: CrawlRoot,
+        workers: int = DEFAULT_WORKERS,
+        batch_files: int = DEFAULT_BATCH_FILES,
+        full: bool = False,
+        should_stop: Optional[Callable[[], bool]] = None,
+        on_batch: Optional[Callable[[Dict[str, object]], None]] = None
+    ):
+        """
+        Args:
+            root (CrawlRoot): Root to crawl
+            workers (int): Directories listed concurrently
+            batch_files (int): Files upserted per transaction
+            full (bool): List every directory, even if unchanged
+            should_stop (Optional[Callable[[], bool]]): Polled between results; True stops the crawl
+            on_batch (Optional[Callable]): Called with the running counts after each commit
+        """
+        self.root = root
+        self.workers = max(1, workers)
+        self.batch_files = max(1, batch_files)
+        self.full = full
+        self.should_stop = should_stop or (lambda: False)
+        self.on_batch = on_batch
+        self.stats: Dict[str, object] = {
+            "root": root.path,
+            "department": root.department,
+            "directories_scanned": 0,
+            "directories_skipped": 0,
+            "directories_removed": 0,
+            "files_seen": 0,
+            "inserted": 0,
+            "updated": 0,
+            "deleted": 0,
+            "errors": 0,
+            "stopped": False,
+            "seconds": 0.0,
+        }
+        self._known: Dict[str, Tuple[int, int]] = {}
+        self._children: Dict[str, List[str]] = defaultdict(list)
+        self._scans: List[DirectoryScan] = []
+        self._removed: List[str] = []
+        self._batched_files = 0
+
+    def _load_directories(self) -> None:
+        """Load the (mtime_ns, inode) and children of every directory crawled before."""
+        with engine.connect() as conn:
+            result = conn.execute(
+                select(DIRECTORIES.c.path, DIRECTORIES.c.parent, DIRECTORIES.c.mtime_ns, DIRECTORIES.c.inode)
+                .where(DIRECTORIES.c.root == self.root.path)
+            )
+            for path, parent, mtime_ns, inode in result:
+                self._known[path] = (mtime_ns, inode)
+                if parent is not None:
+                    self._children[parent].append(path)
+
+    def run(self) -> Dict[str, object]:
+        """
+        Crawl the root.
+
+        Returns:
+            Dict[str, object]: Directory and file counts (fields of CrawlRootRun)
+
+        Raises:
+            ValueError: If the root is not a directory
+        """
+        if not os.path.isdir(self.root.path):
+            raise ValueError(f"Crawl root '{self.root.path}' is not a directory")
+        started = time.perf_counter()
+        self._load_directories()
+        logger.info(f"Crawling {self.root.path} ({len(self._known)} directories known)")
+
+        pending: List[Tuple[str, Optional[str]]] = [(self.root.path, None)]
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="crawler") as pool:
+            running = set()
+            while pending or running:
+                while pending and len(running) < self.workers * QUEUED_PER_WORKER:
+                    path, parent = pending.pop()
+                    known = None if self.full else self._known.get(path)
+                    running.add(pool.submit(scan_directory, path, parent, known))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.extend(self._visit(future.result()))
+                if self.should_stop():
+                    self.stats["stopped"] = True
+                    pending.clear()
+                    for future in running:
+                        future.cancel()
+                    break
+        self._flush()
+        self.stats["seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Crawled {self.root.path}: {json.dumps(self.stats)}")
+        return self.stats
+
+    def _visit(self, scan: DirectoryScan) -> List[Tuple[str, Optional[str]]]:
+        """Record one scanned directory; return its subdirectories to visit."""
+        if scan.error is not None:
+            # Keep what was indexed before: an unreadable directory is not a vanished one
+            logger.warning(f"Cannot read {scan.path}: {scan.error}")
+            self.stats["errors"] += 1
+            return []
+        if scan.unchanged:
+            self.stats["directories_skipped"] += 1
+            return [(child, scan.path) for child in self._children.get(scan.path, ())]
+
+        self.stats["directories_scanned"] += 1
+        self.stats["files_seen"] += len(scan.files)
+        current = set(scan.subdirs)
+        self._removed.extend(
+            child for child in self._children.get(scan.path, ()) if child not in current
+        )
+        self._scans.append(scan)
+        self._batched_files += len(scan.files)
+        if self._batched_files >= self.batch_files or len(self._scans) >= MAX_BATCH_DIRECTORIES:
+            self._flush()
+        return [(subdir, scan.path) for subdir in scan.subdirs]
+
+    def _derive(self, name: str, path: str, size: int, uid: int, mode: int) -> Dict[str, object]:
+        """ByteDB fields of one file."""
+        values = {
+            "file_name": name,
+            "file_type": file_type_of(name),
+            "file_size": size,
+            "file_path": path,
+            "owner": owner_of(uid),
+            "access_level": access_level_of(mode),
+        }
+        if self.root.department:
+            values["department"] = self.root.department
+        return values
+
+    def _flush(self) -> None:
+        """Apply the batched directories to the database in one transaction."""
+        if not self._scans and not self._removed:
+            return
+        scans, removed = self._scans, self._removed
+        self._scans, self._removed, self._batched_files = [], [], 0
+
+        # Records currently stored for the batched directories, by path
+        existing: Dict[str, list] = defaultdict(list)
+        keys = [directory_key(scan.path) for scan in scans]
+        with engine.connect() as conn:
+            for start in range(0, len(keys), MAX_BATCH_DIRECTORIES):
+                result = conn.execute(
+                    select(FILES.c.file_id, FILES.c.file_path, *(FILES.c[name] for name in DERIVED_FIELDS))
+                    .where(FILE_DIRECTORY.in_(keys[start:start + MAX_BATCH_DIRECTORIES]))
+                )
+                for row in result:
+                    existing[row.file_path].append(row)
+
+        inserts, updates, seen = [], [], set()
+        for scan in scans:
+            for entry in scan.files:
+                values = self._derive(*entry)
+                seen.add(values["file_path"])
+                rows = existing.get(values["file_path"])
+                if not rows:
+                    inserts.append(values)
+                elif any(getattr(rows[0], name) != value for name, value in values.items()):
+                    updates.append({"b_file_id": rows[0].file_id, **values})
+        deletes = [row.file_id for path, rows in existing.items() if path not in seen for row in rows]
+        now = datetime.utcnow()
+        directories = [
+            {
+                "path": scan.path, "root": self.root.path, "parent": scan.parent,
+                "mtime_ns": scan.mtime_ns, "inode": scan.inode,
+                "file_count": len(scan.files), "scanned_at": now,
+            }
+            for scan in scans
+        ]
+        # Subdirectories are recorded right away with an mtime that never
+        # matches, so one that is not crawled yet (stopped or failed run) is
+        # still visited next time even though its parent is then skipped
+        placeholders = [
+            {
+                "path": subdir, "root": self.root.path, "parent": scan.path,
+                "mtime_ns": 0, "inode": 0, "file_count": 0, "scanned_at": now,
+            }
+            for scan in scans for subdir in scan.subdirs
+        ]
+
+        with engine.begin() as conn:
+            for path in removed:
+                low, high = directory_key(path), path.rstrip("/") + "0"
+                result = conn.execute(delete(FILES).where(FILE_DIRECTORY >= low, FILE_DIRECTORY < high))
+                self.stats["deleted"] += result.rowcount
+                conn.execute(delete(DIRECTORIES).where(or_(
+                    DIRECTORIES.c.path == path,
+                    and_(DIRECTORIES.c.path >= low, DIRECTORIES.c.path < high),
+                )))
+            for start in range(0, len(deletes), MAX_BATCH_DIRECTORIES):
+                conn.execute(delete(FILES).where(FILES.c.file_id.in_(deletes[start:start + MAX_BATCH_DIRECTORIES])))
+            if updates:
+                conn.execute(update(FILES).where(FILES.c.file_id == bindparam("b_file_id")), updates)
+            if inserts:
+                conn.execute(insert(FILES), inserts)
+            if directories:
+                statement = sqlite_insert(DIRECTORIES)
+                conn.execute(statement.on_conflict_do_update(
+                    index_elements=[DIRECTORIES.c.path],
+                    set_={
+                        name: statement.excluded[name]
+                        for name in ("root", "parent", "mtime_ns", "inode", "file_count", "scanned_at")
+                    },
+                ), directories)
+            if placeholders:
+                statement = sqlite_insert(DIRECTORIES).on_conflict_do_nothing(index_elements=[DIRECTORIES.c.path])
+                conn.execute(statement, placeholders)
+
+        self.stats["directories_removed"] += len(removed)
+        self.stats["inserted"] += len(inserts)
+        self.stats["updated"] += len(updates)
+        self.stats["deleted"] += len(deletes)
+        if self.on_batch is not None:
+            self.on_batch(dict(self.stats))
+
+def crawl(
+    roots: List[CrawlRoot],
+    workers: int = DEFAULT_WORKERS,
+    batch_files: int = DEFAULT_BATCH_FILES,
+    full: bool = False,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_batch: Optional[Callable[[Dict[str, object]], None]] = None
+) -> List[Dict[str, object]]:
+    """
+    Crawl roots one after another (each root is crawled in parallel).
+
+    Args:
+        roots (List[CrawlRoot]): Roots to crawl
+        workers (int): Directories listed concurrently
+        batch_files (int): Files upserted per transaction
+        full (bool): List every directory, even if unchanged
+        should_stop (Optional[Callable[[], bool]]): Polled during the crawl; True stops it
+        on_batch (Optional[Callable]): Called with the running counts after each commit
+
+    Returns:
+        List[Dict[str, object]]: Counts per root
+
+    Raises:
+        ValueError: If a root is not a directory
+    """
+    results = []
+    for root in roots:
+        results.append(RootCrawl(root, workers, batch_files, full, should_stop, on_batch).run())
+        if results[-1]["stopped"]:
+            break
+    return results
+
+class CrawlJob(BackgroundJob):
+    """
+    Background crawl of the configured roots, started through the API.
+    The crawl runs on a worker thread with its own thread pool.
+    """
+
+    def __init__(
+        self,
+        roots: List[CrawlRoot],
+        workers: int = DEFAULT_WORKERS,
+        batch_files: int = DEFAULT_BATCH_FILES
+    ):
+        """
+        Args:
+            roots (List[CrawlRoot]): Roots the API may crawl
+            workers (int): Directories listed concurrently
+            batch_files (int): Files upserted per transaction
+        """
+        super().__init__("crawl")
+        self.roots = roots
+        self.workers = workers
+        self.batch_files = batch_files
+
+    def start_crawl(self, paths: Optional[List[str]] = None, full: bool = False) -> None:
+        """
+        Start crawling in the background.
+
+        Args:
+            paths (Optional[List[str]]): Configured root paths to crawl (default: all)
+            full (bool): List every directory, even if unchanged
+
+        Raises:
+            RuntimeError: If a crawl is already running or file storage is partitioned
+            ValueError: If no roots are configured or a path is not a configured root
+        """
+        if not self.roots:
+            raise ValueError("No crawl roots configured (set BDMS_CRAWL_ROOTS)")
+        configured = {root.path: root for root in self.roots}
+        selected = self.roots
+        if paths:
+            unknown = [path for path in paths if os.path.abspath(path) not in configured]
+            if unknown:
+                raise ValueError(f"Not a configured crawl root: {', '.join(unknown)}")
+            selected = [configured[os.path.abspath(path)] for path in dict.fromkeys(paths)]
+
+        def work(should_stop, on_progress) -> Dict[str, object]:
+            return {"roots": crawl(selected, self.workers, self.batch_files, full, should_stop, on_progress)}
+
+        self.start(work, full=full)
+
+    def status(self) -> dict:
+        """
+        Crawl state for monitoring.
+
+        Returns:
+            dict: Fields of CrawlStatus
+        """
+        return {**super().status(), "roots": [root.path for root in self.roots]}
+
+# Crawler for the roots configured in BDMS_CRAWL_ROOTS
+file_crawler = CrawlJob(
+    roots=parse_roots(os.getenv("BDMS_CRAWL_ROOTS")),
+    workers=int(os.getenv("BDMS_CRAWL_WORKERS", str(DEFAULT_WORKERS))),
+    batch_files=int(os.getenv("BDMS_CRAWL_BATCH_FILES", str(DEFAULT_BATCH_FILES))),
+)
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from ..database.database import init_db_sync
+
+    parser = argparse.ArgumentParser(description="Index directory trees into ByteDB")
+    parser.add_argument("roots", nargs="*", help="PATH or PATH=DEPARTMENT (default: BDMS_CRAWL_ROOTS)")
+    parser.add_argument("--full", action="store_true", help="List every directory, even if unchanged")
+    parser.add_argument("--workers", type=int, default=file_crawler.workers, help="Directories listed concurrently")
+    parser.add_argument("--batch-files", type=int, default=file_crawler.batch_files,
+                        help="Files upserted per transaction")
+    args = parser.parse_args(argv)
+
+    roots = [parse_root(spec) for spec in args.roots] or file_crawler.roots
+    if not roots:
+        parser.error("no roots given and BDMS_CRAWL_ROOTS is not set")
+    try:
+        file_partitions.require_single_file("Crawling")
+        init_db_sync()
+        results = crawl(roots, args.workers, args.batch_files, args.full)
+    except (RuntimeError, ValueError) as e:
+        logger.error(str(e))
+        return 1
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""
+Fast-path JSON for list responses.
+Rows are selected as plain column tuples and encoded straight to JSON bytes,
+skipping ORM hydration and per-row Pydantic validation, in the same wire
+format as the response models.
+"""
+
+from typing import Any, Iterable, List, Sequence
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import DateTime, String, Table, func, type_coerce
+import logging
+
+try:
+    import orjson
+except ImportError:  # optional: pydantic-core's encoder is the fallback
+    orjson = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def response_columns(table: Table, model: type[BaseModel]) -> list:
+    """
+    Columns of a table in a response model's field order.
+    Timestamps are read as stored text and rewritten in SQL to the ISO format
+    Pydantic emits ('T' separator, no fraction when microseconds are zero),
+    so no datetime objects are created.
+
+    Args:
+        table (Table): Source table
+        model (type[BaseModel]): Response model whose fields are all table columns
+
+    Returns:
+        list: Column expressions labelled with the field names
+    """
+    columns = []
+    for name in model.model_fields:
+        column = table.c[name]
+        if isinstance(column.type, DateTime):
+            text_value = type_coerce(column, String)
+            column = func.replace(func.replace(text_value, " ", "T"), ".000000", "")
+        columns.append(column.label(name))
+    return columns
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact JSON (orjson when installed).
+
+    Args:
+        value (Any): Lists, dicts and scalars
+
+    Returns:
+        bytes: UTF-8 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return to_json(value)
+
+def encode_rows(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> bytes:
+    """
+    Encode row tuples as a JSON array of objects.
+
+    Args:
+        fields (Sequence[str]): Object keys, in row order
+        rows (Iterable[Sequence[Any]]): Row tuples
+
+    Returns:
+        bytes: UTF-8 JSON array
+    """
+    objects: List[dict] = [dict(zip(fields, row)) for row in rows]
+    return dumps(objects)
@@ -3,17 +3,75 @@ Service layer for handling file record business logic.
 Implements CRUD operations and business rules for file management.
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+import asyncio
+from datetime import datetime
+from operator import attrgetter, itemgetter
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, select, insert, update, delete, or_, and_, func, literal_column, text
+from pydantic import ValidationError
 import logging
-from ..database.models import FileRecord
-from ..schemas.file_schemas import FileCreate, FileUpdate, FileQuery
+from ..database import fts
+from ..database.database import run_write
+from ..database.write_queue import WriteJob
+from ..database.facets import FACET_COLUMNS
+from ..database.partitions import Partition, file_partitions, merge_sorted, scatter, write_to
+from ..database.models import FileRecord, FileFacet
+from ..schemas.file_schemas import (
+    FileCreate, FileUpdate, FileQuery, FileResponse, BulkIngestResult, BulkRowError
+)
+from .ingest import ParsedRow
+from .pagination import decode_cursor, encode_cursor, filter_fingerprint, keyset_condition
+from .cache import file_cache
+from .changes import change_feed
+from .export import export_columns
+from .fast_json import dumps, encode_rows, response_columns
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns cursor pages can be ordered by; nullable text sorts as '' so the
+# (sort key, file_id) order stays total
+SORTABLE_COLUMNS = {
+    "file_id": FileRecord.file_id,
+    "file_name": FileRecord.file_name,
+    "file_type": FileRecord.file_type,
+    "file_size": FileRecord.file_size,
+    "created_at": FileRecord.created_at,
+    "updated_at": FileRecord.updated_at,
+    "department": func.coalesce(FileRecord.department, ""),
+    "owner": func.coalesce(FileRecord.owner, ""),
+    "access_level": func.coalesce(FileRecord.access_level, ""),
+}
+
+# FileResponse fields as plain columns, for the fast list serialization path
+RESPONSE_COLUMNS = response_columns(FileRecord.__table__, FileResponse)
+RESPONSE_FIELDS = tuple(FileResponse.model_fields)
+FILE_ID_FIELD = RESPONSE_FIELDS.index("file_id")
+
+def snapshot(record: FileRecord) -> Dict[str, Any]:
+    """Plain dict copy of a file record's column values."""
+    return {column.name: getattr(record, column.name) for column in FileRecord.__table__.columns}
+
+class PartialWriteError(Exception):
+    """
+    A write spanning several file partitions committed in some of them only.
+    The cache and the change feed have been updated for the committed part.
+    
+    Attributes:
+        done (Dict[int, Any]): Rows after the write (None for deletes) of the
+            IDs that were written, by file_id
+        failed (Dict[int, str]): Error message of every ID that was not written
+    """
+    
+    def __init__(self, done: Dict[int, Any], failed: Dict[int, str]):
+        super().__init__(
+            f"{len(failed)} file records could not be written: {next(iter(failed.values()))}"
+        )
+        self.done = done
+        self.failed = failed
+
 class FileService:
     """
     Service class for handling file record operations.
@@ -21,12 +79,12 @@ class FileService:
     """
 
     @staticmethod
-    async def create_file(db: Session, file_data: FileCreate) -> FileRecord:
+    async def create_file(db: AsyncSession, file_data: FileCreate) -> FileRecord:
         """
         Create a new file record in the database.
         
         Args:
-            db (Session): Database session
+            db (AsyncSession): Database session
             file_data (FileCreate): File data to create
             
         Returns:
@@ -36,35 +94,52 @@ class FileService:
             Exception: If creation fails
         """
         try:
-            logger.info(f"Creating new file record: {file_data.file_name}")
-            db_file = FileRecord(**file_data.model_dump())
-            db.add(db_file)
-            await db.commit()
-            await db.refresh(db_file)
-            logger.info(f"File record created successfully: {db_file.file_id}")
+            logger.debug(f"Creating new file record: {file_data.file_name}")
+            partition = (
+                await file_partitions.for_department(file_data.department, create=True)
+                if file_partitions.enabled else None
+            )
+
+            async def _create(session: AsyncSession) -> FileRecord:
+                db_file = FileRecord(**file_data.model_dump())
+                if partition is not None:
+                    db_file.file_id = await partition.allocate_ids(session, 1)
+                session.add(db_file)
+                await session.flush()
+                return db_file
+
+            db_file = await write_to(db, partition, _create)
+            row = snapshot(db_file)
+            file_cache.invalidate_rows([row])
+            change_feed.publish("file", "created", [row])
+            logger.debug(f"File record created successfully: {db_file.file_id}")
             return db_file
         except Exception as e:
             logger.error(f"Error creating file record: {str(e)}")
             raise
 
     @staticmethod
-    async def get_file(db: Session, file_id: int) -> Optional[FileRecord]:
+    async def get_file(db: AsyncSession, file_id: int) -> Optional[FileRecord]:
         """
         Retrieve a file record by ID.
         
         Args:
-            db (Session): Database session
+            db (AsyncSession): Database session
             file_id (int): ID of the file to retrieve
             
         Returns:
             Optional[FileRecord]: Found file record or None
         """
-        logger.info(f"Retrieving file record: {file_id}")
-        return db.query(FileRecord).filter(FileRecord.file_id == file_id).first()
+        logger.debug(f"Retrieving file record: {file_id}")
+        if file_partitions.enabled:
+            located = await file_partitions.locate([file_id])
+            return located[file_id][1] if file_id in located else None
+        result = await db.execute(select(FileRecord).where(FileRecord.file_id == file_id))
+        return result.scalars().first()
 
     @staticmethod
     async def get_files(
-        db: Session, 
+        db: AsyncSession, 
         skip: int = 0, 
         limit: int = 100,
         query_params: Optional[FileQuery] = None
@@ -73,7 +148,7 @@ class FileService:
         Retrieve multiple file records with optional filtering.
         
         Args:
-            db (Session): Database session
+            db (AsyncSession): Database session
             skip (int): Number of records to skip
             limit (int): Maximum number of records to return
             query_params (FileQuery): Optional query parameters for filtering
@@ -81,11 +156,436 @@ class FileService:
         Returns:
             List[FileRecord]: List of file records
         """
-        logger.info("Retrieving file records with filters")
-        query = db.query(FileRecord)
+        logger.debug("Retrieving file records with filters")
+        query = FileService.build_list_query(query_params)
+        if file_partitions.enabled:
+            return await FileService._scatter_ordered(
+                query_params, query.order_by(FileRecord.file_id), skip, limit, attrgetter("file_id")
+            )
+        result = await db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_files_json(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        query_params: Optional[FileQuery] = None
+    ) -> bytes:
+        """
+        Fast path of get_files: the same records, already encoded as the JSON
+        FileResponse list. Selects column tuples and encodes them directly,
+        without ORM objects or per-row validation.
+        
+        Args:
+            db (AsyncSession): Database session
+            skip (int): Number of records to skip
+            limit (int): Maximum number of records to return
+            query_params (FileQuery): Optional query parameters for filtering
+            
+        Returns:
+            bytes: JSON array of file records
+        """
+        logger.debug("Retrieving file records with filters (fast path)")
+        query = FileService.build_list_query(query_params).with_only_columns(*RESPONSE_COLUMNS)
+        if file_partitions.enabled:
+            rows = await FileService._scatter_ordered(
+                query_params, query.order_by(FileRecord.file_id), skip, limit,
+                itemgetter(FILE_ID_FIELD), scalars=False
+            )
+            return encode_rows(RESPONSE_FIELDS, rows)
+        result = await db.execute(query.offset(skip).limit(limit))
+        return encode_rows(RESPONSE_FIELDS, result.all())
 
+    @staticmethod
+    async def get_files_page(
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort_by: str = "file_id",
+        order: str = "asc",
+        query_params: Optional[FileQuery] = None
+    ) -> Tuple[List[FileRecord], Optional[str]]:
+        """
+        Retrieve one page of file records using keyset pagination.
+        Rows are ordered by sort_by with file_id as tiebreaker, and each page
+        continues strictly after the cursor, so the cost per page is constant
+        and concurrent inserts never shift rows between pages.
+        
+        Args:
+            db (AsyncSession): Database session
+            limit (int): Maximum number of records to return
+            cursor (Optional[str]): next_cursor of the previous page, None for the first page
+            sort_by (str): Sort column (ignored when a cursor is given)
+            order (str): "asc" or "desc" (ignored when a cursor is given)
+            query_params (FileQuery): Optional query parameters for filtering
+            
+        Returns:
+            Tuple[List[FileRecord], Optional[str]]: Records and the cursor of the next page
+            
+        Raises:
+            ValueError: If the cursor or sort column is invalid
+        """
+        logger.debug(f"Retrieving file record page sorted by {sort_by}")
+        fingerprint = filter_fingerprint(query_params.model_dump() if query_params else None)
+        position = None
+        if cursor:
+            position = decode_cursor(cursor)
+            if position["fingerprint"] != fingerprint:
+                raise ValueError("Cursor does not match the applied filters")
+            sort_by, descending = position["sort_by"], position["descending"]
+        else:
+            descending = order == "desc"
+
+        query = FileService.build_page_query(query_params, sort_by, descending, position)
+        # Fetch one extra row to learn whether another page exists
+        if file_partitions.enabled:
+            records = await FileService._scatter_ordered(
+                query_params, query, 0, limit + 1, FileService._sort_key(sort_by), descending
+            )
+        else:
+            result = await db.execute(query.limit(limit + 1))
+            records = list(result.scalars().all())
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            value: Any = getattr(last, sort_by)
+            if value is None:
+                value = ""
+            next_cursor = encode_cursor(sort_by, descending, value, last.file_id, fingerprint)
+        return records, next_cursor
+
+    @staticmethod
+    async def get_facets(
+        db: AsyncSession,
+        query_params: Optional[FileQuery] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Count file records and total their sizes per department, owner, file
+        type and access level. Each dimension is filtered by every applied
+        filter except its own. Equality filters are answered from the
+        trigger-maintained file_facets table; a size range is not part of the
+        summary, so with min_size/max_size the file table is grouped instead.
+        
+        Args:
+            db (AsyncSession): Database session
+            query_params (FileQuery): Optional query parameters for filtering
+            limit (int): Maximum values per dimension, largest counts first
+            
+        Returns:
+            Dict[str, Any]: total, total_size and a value list per dimension
+        """
+        logger.debug("Retrieving file facets")
+        if not file_partitions.enabled:
+            return await FileService._facet_counts(db, query_params, limit)
+        # The department dimension ignores the department filter, so every
+        # partition is read; values are only cut to the limit once summed
+        results = await scatter(
+            await file_partitions.all(),
+            lambda session: FileService._facet_counts(session, query_params, None)
+        )
+        facets: Dict[str, Any] = {
+            "total": sum(result["total"] for result in results),
+            "total_size": sum(result["total_size"] for result in results),
+        }
+        for name in FACET_COLUMNS:
+            merged: Dict[Optional[str], List[int]] = {}
+            for result in results:
+                for item in result[name]:
+                    counts = merged.setdefault(item["value"], [0, 0])
+                    counts[0] += item["count"]
+                    counts[1] += item["total_size"]
+            ordered = sorted(merged.items(), key=lambda entry: (-entry[1][0], entry[0] or ""))
+            facets[name] = [
+                {"value": value, "count": count, "total_size": total_size}
+                for value, (count, total_size) in ordered[:limit]
+            ]
+        return facets
+
+    @staticmethod
+    async def _facet_counts(
+        db: AsyncSession,
+        query_params: Optional[FileQuery],
+        limit: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Facets of one database (see get_facets).
+        
+        Args:
+            db (AsyncSession): Database session
+            query_params (FileQuery): Optional query parameters for filtering
+            limit (Optional[int]): Maximum values per dimension, None for all
+            
+        Returns:
+            Dict[str, Any]: total, total_size and a value list per dimension
+        """
+        sized = query_params is not None and (
+            query_params.min_size is not None or query_params.max_size is not None
+        )
+        if sized:
+            source = FileRecord.__table__
+            count, size = func.count(), func.sum(source.c.file_size)
+            size_only = query_params.model_copy(update={name: None for name in FACET_COLUMNS})
+            base_filters = FileService._build_filters(size_only)
+        else:
+            source = FileFacet.__table__
+            count, size = func.sum(source.c.file_count), func.sum(source.c.total_size)
+            base_filters = []
+
+        def conditions(exclude: Optional[str] = None) -> list:
+            selected = list(base_filters)
+            for name in FACET_COLUMNS:
+                value = getattr(query_params, name) if query_params else None
+                if value and name != exclude:
+                    selected.append(source.c[name] == value)
+            return selected
+
+        totals = (await db.execute(
+            select(func.coalesce(count, 0), func.coalesce(size, 0))
+            .select_from(source).where(*conditions())
+        )).one()
+        facets: Dict[str, Any] = {"total": totals[0], "total_size": totals[1]}
+        for name in FACET_COLUMNS:
+            value = func.coalesce(source.c[name], "") if sized else source.c[name]
+            result = await db.execute(
+                select(value, count, size).where(*conditions(name))
+                .group_by(value).order_by(count.desc(), value).limit(limit)
+            )
+            facets[name] = [
+                {"value": row[0] or None, "count": row[1], "total_size": row[2] or 0}
+                for row in result.all()
+            ]
+        return facets
+
+    @staticmethod
+    async def get_duplicates(
+        db: AsyncSession,
+        query_params: Optional[FileQuery] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Group hashed file records by content hash. Filters apply before
+        grouping, so a department filter finds copies within that department.
+        Reclaimable bytes assume the oldest record of each group is kept.
+        
+        Args:
+            db (AsyncSession): Database session
+            query_params (FileQuery): Optional query parameters for filtering
+            skip (int): Groups to skip
+            limit (int): Maximum number of groups to return
+            
+        Returns:
+            Dict[str, Any]: Totals, reclaimable bytes per department and one page of groups
+            
+        Raises:
+            RuntimeError: With partitioned storage (hashes are only computed for the main database)
+        """
+        logger.debug("Retrieving duplicate file groups")
+        file_partitions.require_single_file("Duplicate detection")
+        table = FileRecord.__table__
+        filters = [table.c.content_hash.is_not(None), *FileService._build_filters(query_params)]
+        count = func.count()
+        reclaimable = ((count - 1) * func.min(table.c.file_size)).label("reclaimable")
+        groups = (
+            select(table.c.content_hash, func.min(table.c.file_size), count, reclaimable)
+            .where(*filters).group_by(table.c.content_hash).having(count > 1)
+        )
+        summary = groups.subquery()
+        totals = (await db.execute(
+            select(func.count(), func.coalesce(func.sum(summary.c.reclaimable), 0))
+        )).one()
+
+        # Every copy but the oldest of each group is reclaimable
+        copies = select(
+            table.c.department,
+            table.c.file_size,
+            func.row_number().over(
+                partition_by=table.c.content_hash, order_by=table.c.file_id
+            ).label("copy"),
+        ).where(*filters).subquery()
+        departments = await db.execute(
+            select(copies.c.department, func.count(), func.sum(copies.c.file_size))
+            .where(copies.c.copy > 1).group_by(copies.c.department)
+            .order_by(func.sum(copies.c.file_size).desc())
+        )
+
+        page = (await db.execute(
+            groups.order_by(reclaimable.desc(), table.c.content_hash).offset(skip).limit(limit)
+        )).all()
+        members: Dict[str, List[FileRecord]] = {row[0]: [] for row in page}
+        if members:
+            records = await db.execute(
+                select(FileRecord).where(*filters, FileRecord.content_hash.in_(list(members)))
+                .order_by(FileRecord.file_id)
+            )
+            for record in records.scalars():
+                members[record.content_hash].append(record)
+        return {
+            "total_groups": totals[0],
+            "reclaimable_bytes": totals[1],
+            "departments": [
+                {"department": row[0], "files": row[1], "reclaimable_bytes": row[2]}
+                for row in departments.all()
+            ],
+            "groups": [
+                {
+                    "content_hash": content_hash, "file_size": size, "count": copies_count,
+                    "reclaimable_bytes": reclaimable_bytes, "files": members[content_hash],
+                }
+                for content_hash, size, copies_count, reclaimable_bytes in page
+            ],
+        }
+
+    @staticmethod
+    def build_list_query(query_params: Optional[FileQuery] = None) -> Select:
+        """
+        Build the filtered (unordered) listing query used by get_files.
+        
+        Args:
+            query_params (FileQuery): Optional query parameters for filtering
+            
+        Returns:
+            Select: Query selecting FileRecord rows
+        """
+        query = select(FileRecord)
+        filters = FileService._build_filters(query_params)
+        if filters:
+            query = query.where(and_(*filters))
+        return query
+
+    @staticmethod
+    def build_export_query(query_params: Optional[FileQuery] = None) -> Select:
+        """
+        Build the column query used to stream filtered file records in id order.
+        Selects plain columns so rows are never hydrated into ORM objects.
+        
+        Args:
+            query_params (FileQuery): Optional query parameters for filtering
+            
+        Returns:
+            Select: Query over every ByteDB column
+        """
+        query = select(*export_columns(FileRecord.__table__))
+        filters = FileService._build_filters(query_params)
+        if filters:
+            query = query.where(and_(*filters))
+        return query.order_by(FileRecord.file_id)
+
+    @staticmethod
+    def build_page_query(
+        query_params: Optional[FileQuery] = None,
+        sort_by: str = "file_id",
+        descending: bool = False,
+        position: Optional[Dict[str, Any]] = None
+    ) -> Select:
+        """
+        Build the ordered keyset query used by get_files_page (without LIMIT).
+        
+        Args:
+            query_params (FileQuery): Optional query parameters for filtering
+            sort_by (str): Sort column
+            descending (bool): Sort direction
+            position (Optional[Dict[str, Any]]): Decoded cursor to continue after
+            
+        Returns:
+            Select: Query selecting FileRecord rows
+            
+        Raises:
+            ValueError: If the sort column is invalid
+        """
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+
+        sort_expr = SORTABLE_COLUMNS[sort_by]
+        filters = FileService._build_filters(query_params)
+        if position is not None:
+            if sort_by == "file_id":
+                filters.append(
+                    FileRecord.file_id < position["last_id"] if descending
+                    else FileRecord.file_id > position["last_id"]
+                )
+            else:
+                filters.append(keyset_condition(
+                    sort_expr, FileRecord.file_id, position["value"], position["last_id"], descending
+                ))
+
+        query = select(FileRecord)
+        if filters:
+            query = query.where(and_(*filters))
+        if sort_by == "file_id":
+            ordering = [FileRecord.file_id.desc() if descending else FileRecord.file_id.asc()]
+        elif descending:
+            ordering = [sort_expr.desc(), FileRecord.file_id.desc()]
+        else:
+            ordering = [sort_expr.asc(), FileRecord.file_id.asc()]
+        return query.order_by(*ordering)
+
+    @staticmethod
+    def matches_query(query_params: Optional[FileQuery], row: Dict[str, Any]) -> bool:
+        """
+        Evaluate FileQuery filters against a row snapshot in Python.
+        Mirrors _build_filters; used to invalidate cached listings precisely.
+        
+        Args:
+            query_params (FileQuery): Optional query parameters for filtering
+            row (Dict[str, Any]): Column values of a file record
+            
+        Returns:
+            bool: True if the row would appear in a listing with these filters
+        """
+        if not query_params:
+            return True
+        for name in ("department", "owner", "file_type", "access_level"):
+            expected = getattr(query_params, name)
+            if expected and row.get(name) != expected:
+                return False
+        size = row.get("file_size")
+        if query_params.min_size is not None and (size is None or size < query_params.min_size):
+            return False
+        if query_params.max_size is not None and (size is None or size > query_params.max_size):
+            return False
+        return True
+
+    @staticmethod
+    def matches_facets(query_params: Optional[FileQuery], row: Dict[str, Any]) -> bool:
+        """
+        Tell whether a row counts towards the facets for these filters, i.e.
+        it passes the size range and all but at most one equality filter.
+        
+        Args:
+            query_params (FileQuery): Optional query parameters for filtering
+            row (Dict[str, Any]): Column values of a file record
+            
+        Returns:
+            bool: True if writing the row can change the facets
+        """
+        if not query_params:
+            return True
+        size_only = query_params.model_copy(update={name: None for name in FACET_COLUMNS})
+        if not FileService.matches_query(size_only, row):
+            return False
+        mismatched = sum(
+            1 for name in FACET_COLUMNS
+            if getattr(query_params, name) and row.get(name) != getattr(query_params, name)
+        )
+        return mismatched <= 1
+
+    @staticmethod
+    def _build_filters(query_params: Optional[FileQuery]) -> list:
+        """
+        Translate FileQuery parameters into SQL filter expressions.
+        
+        Args:
+            query_params (FileQuery): Optional query parameters for filtering
+            
+        Returns:
+            list: Filter expressions to AND together
+        """
+        filters = []
         if query_params:
-            filters = []
             if query_params.department:
                 filters.append(FileRecord.department == query_params.department)
             if query_params.owner:
@@ -98,15 +598,11 @@ class FileService:
                 filters.append(FileRecord.file_size >= query_params.min_size)
             if query_params.max_size is not None:
                 filters.append(FileRecord.file_size <= query_params.max_size)
-
-            if filters:
-                query = query.filter(and_(*filters))
-
-        return query.offset(skip).limit(limit).all()
+        return filters
 
     @staticmethod
     async def update_file(
-        db: Session, 
+        db: AsyncSession, 
         file_id: int, 
         file_data: FileUpdate
     ) -> Optional[FileRecord]:
@@ -114,7 +610,7 @@ class FileService:
         Update an existing file record.
         
         Args:
-            db (Session): Database session
+            db (AsyncSession): Database session
             file_id (int): ID of the file to update
             file_data (FileUpdate): Updated file data
             
@@ -125,28 +621,47 @@ class FileService:
             Exception: If update fails
         """
         try:
-            logger.info(f"Updating file record: {file_id}")
-            db_file = db.query(FileRecord).filter(FileRecord.file_id == file_id).first()
-            if db_file:
-                update_data = file_data.model_dump(exclude_unset=True)
+            logger.debug(f"Updating file record: {file_id}")
+            update_data = file_data.model_dump(exclude_unset=True)
+
+            async def _update(session: AsyncSession) -> Tuple[Optional[FileRecord], Optional[dict]]:
+                db_file = await session.get(FileRecord, file_id)
+                if not db_file:
+                    return None, None
+                before = snapshot(db_file)
                 for key, value in update_data.items():
                     setattr(db_file, key, value)
-                await db.commit()
-                await db.refresh(db_file)
-                logger.info(f"File record updated successfully: {file_id}")
-                return db_file
-            return None
+                await session.flush()
+                # Pick up columns changed by triggers (ByteDB_hash_au clears the hashes)
+                await session.refresh(db_file)
+                return db_file, before
+
+            if file_partitions.enabled:
+                after, previous, failed = await FileService._update_partitioned({file_id: update_data})
+                if failed:
+                    raise RuntimeError(failed[file_id])
+                db_file = FileRecord(**after[file_id]) if file_id in after else None
+                before = previous[0] if previous else None
+            else:
+                db_file, before = await run_write(db, _update)
+            if db_file:
+                file_cache.invalidate_key(("file", file_id))
+                row = snapshot(db_file)
+                file_cache.invalidate_rows([before, row])
+                change_feed.publish("file", "updated", [row])
+                logger.debug(f"File record updated successfully: {file_id}")
+            return db_file
         except Exception as e:
             logger.error(f"Error updating file record: {str(e)}")
             raise
 
     @staticmethod
-    async def delete_file(db: Session, file_id: int) -> bool:
+    async def delete_file(db: AsyncSession, file_id: int) -> bool:
         """
         Delete a file record.
         
         Args:
-            db (Session): Database session
+            db (AsyncSession): Database session
             file_id (int): ID of the file to delete
             
         Returns:
@@ -156,40 +671,721 @@ class FileService:
             Exception: If deletion fails
         """
         try:
-            logger.info(f"Deleting file record: {file_id}")
-            db_file = db.query(FileRecord).filter(FileRecord.file_id == file_id).first()
-            if db_file:
-                await db.delete(db_file)
-                await db.commit()
-                logger.info(f"File record deleted successfully: {file_id}")
-                return True
-            return False
+            logger.debug(f"Deleting file record: {file_id}")
+
+            async def _delete(session: AsyncSession) -> Optional[dict]:
+                db_file = await session.get(FileRecord, file_id)
+                if db_file:
+                    before = snapshot(db_file)
+                    await session.delete(db_file)
+                    await session.flush()
+                    return before
+                return None
+
+            if file_partitions.enabled:
+                deleted, failed = await FileService._delete_partitioned([file_id])
+                if failed:
+                    raise RuntimeError(failed[file_id])
+                before = deleted[0] if deleted else None
+            else:
+                before = await run_write(db, _delete)
+            if before is None:
+                return False
+            file_cache.invalidate_key(("file", file_id))
+            file_cache.invalidate_rows([before])
+            change_feed.publish("file", "deleted", ids=[file_id])
+            logger.debug(f"File record deleted successfully: {file_id}")
+            return True
         except Exception as e:
             logger.error(f"Error deleting file record: {str(e)}")
             raise
 
+    @staticmethod
+    async def get_files_by_ids(db: AsyncSession, file_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Retrieve many file records with one IN (...) select.
+        
+        Args:
+            db (AsyncSession): Database session
+            file_ids (List[int]): IDs of the files to retrieve
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: Column values of the found records by file_id
+        """
+        logger.debug(f"Retrieving {len(file_ids)} file records")
+        if file_partitions.enabled:
+            located = await file_partitions.locate(file_ids)
+            return {file_id: snapshot(record) for file_id, (_, record) in located.items()}
+        table = FileRecord.__table__
+        result = await db.execute(select(table).where(table.c.file_id.in_(set(file_ids))))
+        return {row["file_id"]: dict(row) for row in result.mappings()}
+
+    @staticmethod
+    async def update_files(
+        db: AsyncSession,
+        changes_by_id: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Update many file records in one transaction.
+        Existing IDs are found with one IN (...) select, then IDs sharing the same
+        changes are updated by a single UPDATE ... WHERE file_id IN (...) RETURNING,
+        so reclassifying any number of files is one statement.
+        
+        Args:
+            db (AsyncSession): Database session
+            changes_by_id (Dict[int, Dict[str, Any]]): Fields to set per file_id
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: Column values after the update, for the IDs
+                that exist
+            
+        Raises:
+            PartialWriteError: If partitioned storage is enabled and the update
+                failed in some partitions only
+            Exception: If the update fails (nothing is changed)
+        """
+        try:
+            logger.debug(f"Batch updating {len(changes_by_id)} file records")
+            failed: Dict[int, str] = {}
+            if file_partitions.enabled:
+                after, before, failed = await FileService._update_partitioned(changes_by_id)
+            else:
+                after, before = await run_write(db, FileService._update_job(changes_by_id))
+            for file_id in after:
+                file_cache.invalidate_key(("file", file_id))
+            file_cache.invalidate_rows(before + list(after.values()))
+            if after:
+                change_feed.publish("file", "updated", after.values())
+            logger.debug(f"Batch updated {len(after)} file records")
+            if failed:
+                if not after:
+                    raise RuntimeError(next(iter(failed.values())))
+                raise PartialWriteError(after, failed)
+            return after
+        except Exception as e:
+            logger.error(f"Error batch updating file records: {str(e)}")
+            raise
+
+    @staticmethod
+    async def delete_files(db: AsyncSession, file_ids: List[int]) -> List[int]:
+        """
+        Delete many file records with one IN (...) select and one DELETE, in one
+        transaction.
+        
+        Args:
+            db (AsyncSession): Database session
+            file_ids (List[int]): IDs of the files to delete
+            
+        Returns:
+            List[int]: IDs that existed and were deleted
+            
+        Raises:
+            PartialWriteError: If partitioned storage is enabled and deletion
+                failed in some partitions only
+            Exception: If deletion fails (nothing is deleted)
+        """
+        try:
+            logger.debug(f"Batch deleting {len(file_ids)} file records")
+            failed: Dict[int, str] = {}
+            if file_partitions.enabled:
+                before, failed = await FileService._delete_partitioned(file_ids)
+            else:
+                before = await run_write(db, FileService._delete_job(file_ids))
+            for row in before:
+                file_cache.invalidate_key(("file", row["file_id"]))
+            file_cache.invalidate_rows(before)
+            if before:
+                change_feed.publish("file", "deleted", ids=[row["file_id"] for row in before])
+            logger.debug(f"Batch deleted {len(before)} file records")
+            if failed:
+                if not before:
+                    raise RuntimeError(next(iter(failed.values())))
+                raise PartialWriteError(dict.fromkeys(row["file_id"] for row in before), failed)
+            return [row["file_id"] for row in before]
+        except Exception as e:
+            logger.error(f"Error batch deleting file records: {str(e)}")
+            raise
+
+    @staticmethod
+    def _update_job(changes_by_id: Dict[int, Dict[str, Any]]) -> WriteJob:
+        """
+        Write job for update_files: one UPDATE ... RETURNING per distinct set of changes.
+        
+        Args:
+            changes_by_id (Dict[int, Dict[str, Any]]): Fields to set per file_id
+            
+        Returns:
+            WriteJob: Job returning the rows after and before the update
+        """
+        table = FileRecord.__table__
+
+        async def _update(session: AsyncSession) -> Tuple[Dict[int, dict], List[dict]]:
+            result = await session.execute(
+                select(table).where(table.c.file_id.in_(list(changes_by_id)))
+            )
+            before = {row["file_id"]: dict(row) for row in result.mappings()}
+            groups: Dict[Tuple[Tuple[str, Any], ...], List[int]] = {}
+            for file_id in before:
+                groups.setdefault(tuple(sorted(changes_by_id[file_id].items())), []).append(file_id)
+            after = dict(before)
+            for changes, file_ids in groups.items():
+                if not changes:
+                    continue
+                result = await session.execute(
+                    update(table).where(table.c.file_id.in_(file_ids))
+                    .values(dict(changes)).returning(*table.c)
+                )
+                for row in map(dict, result.mappings()):
+                    old = before[row["file_id"]]
+                    # RETURNING does not see ByteDB_hash_au clearing the hashes
+                    if row["file_path"] != old["file_path"] or row["file_size"] != old["file_size"]:
+                        row["partial_hash"] = row["content_hash"] = None
+                    after[row["file_id"]] = row
+            return after, list(before.values())
+
+        return _update
+
+    @staticmethod
+    def _delete_job(file_ids: List[int]) -> WriteJob:
+        """
+        Write job for delete_files: one IN (...) select and one DELETE.
+        
+        Args:
+            file_ids (List[int]): IDs of the files to delete
+            
+        Returns:
+            WriteJob: Job returning the deleted rows
+        """
+        table = FileRecord.__table__
+
+        async def _delete(session: AsyncSession) -> List[dict]:
+            result = await session.execute(select(table).where(table.c.file_id.in_(set(file_ids))))
+            before = [dict(row) for row in result.mappings()]
+            if before:
+                await session.execute(
+                    delete(table).where(table.c.file_id.in_([row["file_id"] for row in before]))
+                )
+            return before
+
+        return _delete
+
+    @staticmethod
+    def _insert_job(rows: List[Dict[str, Any]], partition: Optional[Partition] = None) -> WriteJob:
+        """
+        Write job inserting file records with one batched INSERT.
+        
+        Args:
+            rows (List[Dict[str, Any]]): Column values
+            partition (Optional[Partition]): Partition to allocate file IDs from
+                (the rows are updated with them); None keeps the given IDs
+            
+        Returns:
+            WriteJob: Insert job
+        """
+        async def _insert(session: AsyncSession) -> None:
+            if partition is not None:
+                first_id = await partition.allocate_ids(session, len(rows))
+                for offset, row in enumerate(rows):
+                    row["file_id"] = first_id + offset
+            await session.execute(insert(FileRecord), rows)
+
+        return _insert
+
+    @staticmethod
+    async def _update_partitioned(
+        changes_by_id: Dict[int, Dict[str, Any]]
+    ) -> Tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]], Dict[int, str]]:
+        """
+        update_files with partitioned storage. Records keeping their department
+        are updated in their partitions concurrently. A record whose department
+        changes moves, keeping its ID: it is inserted into the new partition
+        and then deleted from the old one, so an interruption in between
+        leaves a copy in both rather than in neither. locate prefers the newer
+        copy; the old one is deleted by the next partitioned write, or at
+        startup by FilePartitions.dedupe.
+        Each partition commits on its own; a partition that fails does not
+        undo the others, its IDs are returned as failed instead.
+        
+        Args:
+            changes_by_id (Dict[int, Dict[str, Any]]): Fields to set per file_id
+            
+        Returns:
+            Tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]], Dict[int, str]]:
+                Rows after the update by file_id, rows before it, and the error
+                of every ID that was not updated
+        """
+        if await file_partitions.purge_stale():
+            file_cache.invalidate_lists()
+        in_place: Dict[Partition, Dict[int, Dict[str, Any]]] = {}
+        moves: Dict[Tuple[Partition, Partition], List[Dict[str, Any]]] = {}
+        originals: Dict[int, Dict[str, Any]] = {}
+        now = datetime.utcnow()
+        for file_id, (partition, record) in (await file_partitions.locate(changes_by_id)).items():
+            changes = changes_by_id[file_id]
+            target = partition
+            if "department" in changes:
+                target = await file_partitions.for_department(changes["department"], create=True)
+            if target is partition:
+                in_place.setdefault(partition, {})[file_id] = changes
+                continue
+            row = snapshot(record)
+            originals[file_id] = row
+            moved = {**row, **changes, "updated_at": now}
+            if moved["file_path"] != row["file_path"] or moved["file_size"] != row["file_size"]:
+                moved["partial_hash"] = moved["content_hash"] = None
+            moves.setdefault((partition, target), []).append(moved)
+
+        async def move(source: Partition, target: Partition, rows: List[Dict[str, Any]]) -> None:
+            await target.run_write(FileService._insert_job(rows))
+            try:
+                await source.run_write(FileService._delete_job([row["file_id"] for row in rows]))
+            except Exception as e:
+                # The new copy is committed and is the newer one: the move
+                # stands, and the old copy is deleted by a later write
+                logger.warning(
+                    f"Could not remove {len(rows)} moved file records from partition "
+                    f"{source.partition_no}: {str(e)}"
+                )
+                file_partitions.mark_stale(source, [row["file_id"] for row in rows])
+
+        after: Dict[int, Dict[str, Any]] = {}
+        before: List[Dict[str, Any]] = []
+        failed: Dict[int, str] = {}
+        results = await asyncio.gather(
+            *(partition.run_write(FileService._update_job(changes)) for partition, changes in in_place.items()),
+            *(move(source, target, rows) for (source, target), rows in moves.items()),
+            return_exceptions=True
+        )
+        groups = [list(changes) for changes in in_place.values()]
+        groups += [[row["file_id"] for row in rows] for rows in moves.values()]
+        for file_ids, result in zip(groups, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error updating {len(file_ids)} partitioned file records: {str(result)}")
+                failed.update(dict.fromkeys(file_ids, str(result)))
+            elif result is not None:
+                updated, previous = result
+                after.update(updated)
+                before.extend(previous)
+        for rows in moves.values():
+            for row in rows:
+                if row["file_id"] not in failed:
+                    after[row["file_id"]] = row
+                    before.append(originals[row["file_id"]])
+        return after, before, failed
+
+    @staticmethod
+    async def _delete_partitioned(file_ids: List[int]) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+        """
+        delete_files with partitioned storage: one delete job per partition,
+        concurrently. A partition that fails does not undo the others.
+        
+        Args:
+            file_ids (List[int]): IDs of the files to delete
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[int, str]]: The deleted rows, and the
+                error of every ID that was not deleted
+        """
+        if await file_partitions.purge_stale():
+            file_cache.invalidate_lists()
+        by_partition: Dict[Partition, List[int]] = {}
+        for file_id, (partition, _) in (await file_partitions.locate(file_ids)).items():
+            by_partition.setdefault(partition, []).append(file_id)
+        results = await asyncio.gather(*(
+            partition.run_write(FileService._delete_job(ids)) for partition, ids in by_partition.items()
+        ), return_exceptions=True)
+        deleted: List[Dict[str, Any]] = []
+        failed: Dict[int, str] = {}
+        for ids, result in zip(by_partition.values(), results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error deleting {len(ids)} partitioned file records: {str(result)}")
+                failed.update(dict.fromkeys(ids, str(result)))
+            else:
+                deleted.extend(result)
+        return deleted, failed
+
+    @staticmethod
+    async def _insert_partitioned(values: List[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Insert new file records into their departments' partitions, concurrently.
+        A partition that fails does not undo the others.
+        
+        Args:
+            values (List[Dict[str, Any]]): Column values (without file_id)
+            
+        Returns:
+            Dict[int, str]: Error by position in values of every record that
+                was not inserted
+        """
+        by_department: Dict[Optional[str], List[int]] = {}
+        for index, value in enumerate(values):
+            by_department.setdefault(value.get("department") or None, []).append(index)
+        failed: Dict[int, str] = {}
+        partitions: List[Partition] = []
+        groups: List[List[int]] = []
+        for department, indexes in by_department.items():
+            try:
+                partitions.append(await file_partitions.for_department(department, create=True))
+                groups.append(indexes)
+            except Exception as e:
+                failed.update(dict.fromkeys(indexes, str(e)))
+        results = await asyncio.gather(*(
+            partition.run_write(FileService._insert_job([values[index] for index in indexes], partition))
+            for partition, indexes in zip(partitions, groups)
+        ), return_exceptions=True)
+        for partition, indexes, result in zip(partitions, groups, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"Error inserting {len(indexes)} file records into partition "
+                    f"{partition.partition_no}: {str(result)}"
+                )
+                failed.update(dict.fromkeys(indexes, str(result)))
+        return failed
+
+    @staticmethod
+    async def _scatter_ordered(
+        query_params: Optional[FileQuery],
+        query: Select,
+        skip: int,
+        limit: int,
+        key: Callable[[Any], Any],
+        descending: bool = False,
+        scalars: bool = True
+    ) -> List[Any]:
+        """
+        Run an ordered query on every partition the filters select and k-way
+        merge the results. Each partition returns skip + limit rows, so the
+        merged page is exact; a single partition applies the offset itself.
+        
+        Args:
+            query_params (FileQuery): Filters (a department filter selects one partition)
+            query (Select): Query ordered consistently with key
+            skip (int): Rows to skip
+            limit (int): Maximum rows to return
+            key (Callable): Sort key of a result row
+            descending (bool): The query orders descending
+            scalars (bool): Return ORM objects rather than row tuples
+            
+        Returns:
+            List[Any]: One page of the merged order
+        """
+        partitions = await file_partitions.for_query(query_params)
+        if len(partitions) == 1:
+            query, skip = query.offset(skip).limit(limit), 0
+        else:
+            query = query.limit(skip + limit)
+
+        async def read(session: AsyncSession) -> List[Any]:
+            result = await session.execute(query)
+            return list(result.scalars().all() if scalars else result.all())
+
+        return merge_sorted(await scatter(partitions, read), key, skip, limit, descending)
+
+    @staticmethod
+    def _sort_key(sort_by: str) -> Callable[[FileRecord], Any]:
+        """Python sort key matching build_page_query's ORDER BY (NULL text sorts as '')."""
+        if sort_by == "file_id":
+            return attrgetter("file_id")
+
+        def key(record: FileRecord) -> Tuple[Any, int]:
+            value = getattr(record, sort_by)
+            return ("" if value is None else value), record.file_id
+
+        return key
+
     @staticmethod
     async def search_files(
-        db: Session, 
+        db: AsyncSession, 
         search_term: str, 
-        limit: int = 100
+        limit: int = 100,
+        highlight: bool = False
     ) -> List[FileRecord]:
         """
         Search for file records based on a search term.
+        Uses the FTS5 index (prefix match on every word, bm25 ranking) when it is
+        available and falls back to substring matching otherwise.
         
         Args:
-            db (Session): Database session
+            db (AsyncSession): Database session
             search_term (str): Term to search for
             limit (int): Maximum number of records to return
+            highlight (bool): Attach highlighted name/department/owner to each record
             
         Returns:
-            List[FileRecord]: List of matching file records
+            List[FileRecord]: List of matching file records, best match first
+        """
+        logger.debug(f"Searching file records with term: {search_term}")
+        match = fts.build_match_query(search_term) if fts.fts_enabled else None
+        if file_partitions.enabled:
+            async def read(session: AsyncSession) -> List[FileRecord]:
+                return await FileService._search_records(session, search_term, match, limit, highlight)
+
+            results = await scatter(await file_partitions.all(), read)
+            if match is None:
+                return merge_sorted(results, attrgetter("file_id"), 0, limit)
+            return merge_sorted(results, attrgetter("score"), 0, limit, reverse=True)
+        return await FileService._search_records(db, search_term, match, limit, highlight)
+
+    @staticmethod
+    async def _search_records(
+        db: AsyncSession,
+        search_term: str,
+        match: Optional[str],
+        limit: int,
+        highlight: bool
+    ) -> List[FileRecord]:
+        """
+        search_files against one database.
+        
+        Args:
+            db (AsyncSession): Database session
+            search_term (str): Term to search for
+            match (Optional[str]): FTS5 MATCH expression; None to match substrings
+            limit (int): Maximum number of records to return
+            highlight (bool): Attach highlighted name/department/owner to each record
+            
+        Returns:
+            List[FileRecord]: Matching file records, best match first (by file_id without match)
+        """
+        if match is None:
+            return await FileService._search_files_like(db, search_term, limit)
+
+        hits = FileService._search_hits(match, limit, highlight)
+        query = (
+            select(FileRecord, hits)
+            .join(hits, FileRecord.file_id == hits.c.rowid)
+            .order_by(hits.c.score)
+        )
+        records = []
+        for row in await db.execute(query):
+            record = row[0]
+            # bm25 is lower-is-better; expose it as higher-is-better
+            record.score = -row.score
+            if highlight:
+                record.highlight = {
+                    "file_name": row.file_name_hl,
+                    "department": row.department_hl,
+                    "owner": row.owner_hl,
+                }
+            records.append(record)
+        return records
+
+    @staticmethod
+    async def search_files_json(
+        db: AsyncSession,
+        search_term: str,
+        limit: int = 100,
+        highlight: bool = False
+    ) -> bytes:
+        """
+        Fast path of search_files: the same results, already encoded as the JSON
+        FileSearchResult list, without ORM objects or per-row validation.
+        
+        Args:
+            db (AsyncSession): Database session
+            search_term (str): Term to search for
+            limit (int): Maximum number of records to return
+            highlight (bool): Attach highlighted name/department/owner to each record
+            
+        Returns:
+            bytes: JSON array of matching file records, best match first
+        """
+        logger.debug(f"Searching file records with term: {search_term} (fast path)")
+        match = fts.build_match_query(search_term) if fts.fts_enabled else None
+        if file_partitions.enabled:
+            async def read(session: AsyncSession) -> List[Dict[str, Any]]:
+                return await FileService._search_rows(session, search_term, match, limit, highlight)
+
+            results = await scatter(await file_partitions.all(), read)
+            if match is None:
+                return dumps(merge_sorted(results, itemgetter("file_id"), 0, limit))
+            return dumps(merge_sorted(results, itemgetter("score"), 0, limit, reverse=True))
+        return dumps(await FileService._search_rows(db, search_term, match, limit, highlight))
+
+    @staticmethod
+    async def _search_rows(
+        db: AsyncSession,
+        search_term: str,
+        match: Optional[str],
+        limit: int,
+        highlight: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        search_files_json against one database, before encoding.
+        
+        Args:
+            db (AsyncSession): Database session
+            search_term (str): Term to search for
+            match (Optional[str]): FTS5 MATCH expression; None to match substrings
+            limit (int): Maximum number of records to return
+            highlight (bool): Attach highlighted name/department/owner to each record
+            
+        Returns:
+            List[Dict[str, Any]]: FileSearchResult fields, best match first (by file_id without match)
         """
-        logger.info(f"Searching file records with term: {search_term}")
-        return db.query(FileRecord).filter(
+        if match is None:
+            result = await db.execute(
+                FileService._like_query(search_term).with_only_columns(*RESPONSE_COLUMNS).limit(limit)
+            )
+            return [
+                {**dict(zip(RESPONSE_FIELDS, row)), "score": None, "highlight": None}
+                for row in result.all()
+            ]
+
+        hits = FileService._search_hits(match, limit, highlight)
+        columns = [*RESPONSE_COLUMNS, (-hits.c.score).label("score")]
+        if highlight:
+            columns += [hits.c.file_name_hl, hits.c.department_hl, hits.c.owner_hl]
+        result = await db.execute(
+            select(*columns)
+            .select_from(FileRecord.__table__.join(hits, FileRecord.file_id == hits.c.rowid))
+            .order_by(hits.c.score)
+        )
+        count = len(RESPONSE_FIELDS)
+        results = []
+        for row in result.all():
+            item = dict(zip(RESPONSE_FIELDS, row))
+            item["score"] = row[count]
+            item["highlight"] = {
+                "file_name": row[count + 1], "department": row[count + 2], "owner": row[count + 3]
+            } if highlight else None
+            results.append(item)
+        return results
+
+    @staticmethod
+    def _search_hits(match: str, limit: int, highlight: bool):
+        """
+        Top FTS5 matches (rowid, bm25 score and optional highlights), ranked and
+        limited inside FTS5 so only these rows are joined to ByteDB.
+        
+        Args:
+            match (str): FTS5 MATCH expression
+            limit (int): Maximum number of hits
+            highlight (bool): Add highlighted name/department/owner columns
+            
+        Returns:
+            Subquery: Hits ordered by score (lower is better)
+        """
+        index = literal_column(fts.FTS_TABLE)
+        rank = literal_column("rank")
+        columns = [fts.fts_table.c.rowid, rank.label("score")]
+        if highlight:
+            columns += [
+                func.highlight(index, position, "<mark>", "</mark>").label(f"{name}_hl")
+                for position, name in enumerate(("file_name", "department", "owner"))
+            ]
+        return (
+            select(*columns)
+            .where(text(f"{fts.FTS_TABLE} MATCH :match").bindparams(match=match))
+            .order_by(rank)
+            .limit(limit)
+            .subquery()
+        )
+
+    @staticmethod
+    def _like_query(search_term: str) -> Select:
+        """Substring match on file name, department and owner."""
+        return select(FileRecord).where(
             or_(
                 FileRecord.file_name.ilike(f"%{search_term}%"),
                 FileRecord.department.ilike(f"%{search_term}%"),
                 FileRecord.owner.ilike(f"%{search_term}%")
             )
-        ).limit(limit).all()
+        ).order_by(FileRecord.file_id)
+
+    @staticmethod
+    async def _search_files_like(
+        db: AsyncSession,
+        search_term: str,
+        limit: int = 100
+    ) -> List[FileRecord]:
+        """
+        Substring search with LIKE, used when the full-text index is unavailable.
+        
+        Args:
+            db (AsyncSession): Database session
+            search_term (str): Term to search for
+            limit (int): Maximum number of records to return
+            
+        Returns:
+            List[FileRecord]: List of matching file records
+        """
+        result = await db.execute(FileService._like_query(search_term).limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def bulk_create_files(
+        db: AsyncSession,
+        rows: AsyncIterable[ParsedRow],
+        chunk_size: int = 1000,
+        max_errors: int = 1000
+    ) -> BulkIngestResult:
+        """
+        Validate and insert a stream of file records in chunks.
+        Each chunk is validated against FileCreate and written with one batched
+        INSERT. Invalid rows are reported and skipped; they never abort the upload.
+        Only one chunk is held in memory at a time.
+        
+        Args:
+            db (AsyncSession): Database session
+            rows (AsyncIterable[ParsedRow]): Parsed upload rows
+            chunk_size (int): Rows per validation/insert batch
+            max_errors (int): Maximum row errors listed in the result
+            
+        Returns:
+            BulkIngestResult: Counts and per-row errors
+        """
+        logger.debug(f"Bulk creating file records in chunks of {chunk_size}")
+        result = BulkIngestResult(received=0, inserted=0, failed=0)
+        chunk: List[Tuple[int, Dict[str, object]]] = []
+
+        def reject(row_number: int, messages: List[str]) -> None:
+            result.failed += 1
+            if len(result.errors) < max_errors:
+                result.errors.append(BulkRowError(row=row_number, errors=messages))
+            else:
+                result.errors_truncated = True
+
+        async def flush() -> None:
+            values = [value for _, value in chunk]
+
+            failed: Dict[int, str] = {}
+            try:
+                if file_partitions.enabled:
+                    failed = await FileService._insert_partitioned(values)
+                else:
+                    await run_write(db, FileService._insert_job(values))
+            except Exception as e:
+                logger.error(f"Error inserting bulk chunk: {str(e)}")
+                failed = dict.fromkeys(range(len(chunk)), str(e))
+            for index, error in sorted(failed.items()):
+                reject(chunk[index][0], [f"Database error: {error}"])
+            inserted = len(chunk) - len(failed)
+            if inserted:
+                result.inserted += inserted
+                file_cache.invalidate_lists()
+                change_feed.publish("file", "reload", count=inserted)
+            chunk.clear()
+
+        async for row_number, payload in rows:
+            result.received += 1
+            if isinstance(payload, str):
+                reject(row_number, [payload])
+                continue
+            try:
+                chunk.append((row_number, FileCreate.model_validate(payload).model_dump()))
+            except ValidationError as e:
+                reject(row_number, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ])
+                continue
+            if len(chunk) >= chunk_size:
+                await flush()
+        if chunk:
+            await flush()
+
+        logger.debug(
+            f"Bulk create finished: {result.inserted} inserted, {result.failed} failed"
+        )
+        return result
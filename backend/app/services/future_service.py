@@ -0,0 +1,212 @@
+"""
+Service layer for planned (FreedomFuture) transactions.
+Implements CRUD for recurring and one-off entries; posting is done by the scheduler.
+"""
+
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+import logging
+from ..database.database import run_write
+from ..database.models import FutureTransaction
+from ..schemas.future_schemas import (
+    FutureTransactionCreate, FutureTransactionUpdate, FutureTransactionQuery
+)
+from .scheduler import future_scheduler, next_occurrence
+from .transaction_service import normalize_ledger_date
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fields that change when the next occurrence falls due
+SCHEDULE_FIELDS = ("start_date", "frequency", "interval", "max_occurrences", "end_date")
+
+class FutureService:
+    """
+    Service class for handling planned transaction operations.
+    Keeps next_due consistent with the recurrence rule and notifies the scheduler.
+    """
+
+    @staticmethod
+    def _normalize_dates(values: dict) -> dict:
+        """Store start and end dates as ISO dates (raises ValueError)."""
+        for key in ("start_date", "end_date"):
+            if values.get(key) is not None:
+                values[key] = normalize_ledger_date(values[key])
+        return values
+
+    @staticmethod
+    async def create_future(db: AsyncSession, future_data: FutureTransactionCreate) -> FutureTransaction:
+        """
+        Create a planned transaction due first on its start date.
+
+        Args:
+            db (AsyncSession): Database session
+            future_data (FutureTransactionCreate): Planned transaction data
+
+        Returns:
+            FutureTransaction: Created planned transaction
+
+        Raises:
+            ValueError: If a date cannot be parsed
+            Exception: If creation fails
+        """
+        try:
+            logger.info(f"Creating planned transaction: {future_data.description}")
+            values = FutureService._normalize_dates(future_data.model_dump())
+
+            async def _create(session: AsyncSession) -> FutureTransaction:
+                entry = FutureTransaction(**values, occurrences=0)
+                entry.next_due = next_occurrence(entry)
+                entry.paid = entry.next_due is None
+                session.add(entry)
+                await session.flush()
+                return entry
+
+            entry = await run_write(db, _create)
+            future_scheduler.push(entry.id, entry.next_due)
+            logger.info(f"Planned transaction created successfully: {entry.id}")
+            return entry
+        except Exception as e:
+            logger.error(f"Error creating planned transaction: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_future(db: AsyncSession, future_id: int) -> Optional[FutureTransaction]:
+        """
+        Retrieve a planned transaction by ID.
+
+        Args:
+            db (AsyncSession): Database session
+            future_id (int): ID of the planned transaction
+
+        Returns:
+            Optional[FutureTransaction]: Found planned transaction or None
+        """
+        logger.info(f"Retrieving planned transaction: {future_id}")
+        result = await db.execute(select(FutureTransaction).where(FutureTransaction.id == future_id))
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_futures(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        query_params: Optional[FutureTransactionQuery] = None
+    ) -> List[FutureTransaction]:
+        """
+        Retrieve planned transactions ordered by next due date.
+
+        Args:
+            db (AsyncSession): Database session
+            skip (int): Number of entries to skip
+            limit (int): Maximum number of entries to return
+            query_params (FutureTransactionQuery): Optional query parameters for filtering
+
+        Returns:
+            List[FutureTransaction]: Planned transactions
+
+        Raises:
+            ValueError: If due_before cannot be parsed
+        """
+        logger.info("Retrieving planned transactions with filters")
+        filters = []
+        if query_params:
+            if query_params.department:
+                filters.append(FutureTransaction.department == query_params.department)
+            if query_params.account_id:
+                filters.append(FutureTransaction.account_id == query_params.account_id)
+            if query_params.category:
+                filters.append(FutureTransaction.category == query_params.category)
+            if query_params.paid is not None:
+                filters.append(FutureTransaction.paid.is_(query_params.paid))
+            if query_params.due_before:
+                filters.append(FutureTransaction.next_due <= normalize_ledger_date(query_params.due_before))
+        query = select(FutureTransaction)
+        if filters:
+            query = query.where(and_(*filters))
+        query = query.order_by(FutureTransaction.next_due, FutureTransaction.id)
+        result = await db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def update_future(
+        db: AsyncSession,
+        future_id: int,
+        future_data: FutureTransactionUpdate
+    ) -> Optional[FutureTransaction]:
+        """
+        Update a planned transaction. Changing the recurrence rule recomputes
+        the next occurrence from the occurrences already posted.
+
+        Args:
+            db (AsyncSession): Database session
+            future_id (int): ID of the planned transaction
+            future_data (FutureTransactionUpdate): Updated data
+
+        Returns:
+            Optional[FutureTransaction]: Updated planned transaction or None
+
+        Raises:
+            ValueError: If a date cannot be parsed
+            Exception: If update fails
+        """
+        try:
+            logger.info(f"Updating planned transaction: {future_id}")
+            update_data = FutureService._normalize_dates(future_data.model_dump(exclude_unset=True))
+
+            async def _update(session: AsyncSession) -> Optional[FutureTransaction]:
+                entry = await session.get(FutureTransaction, future_id)
+                if not entry:
+                    return None
+                for key, value in update_data.items():
+                    setattr(entry, key, value)
+                if any(key in update_data for key in SCHEDULE_FIELDS):
+                    entry.next_due = next_occurrence(entry)
+                    entry.paid = entry.next_due is None
+                await session.flush()
+                return entry
+
+            entry = await run_write(db, _update)
+            if entry:
+                future_scheduler.push(entry.id, entry.next_due)
+                logger.info(f"Planned transaction updated successfully: {future_id}")
+            return entry
+        except Exception as e:
+            logger.error(f"Error updating planned transaction: {str(e)}")
+            raise
+
+    @staticmethod
+    async def delete_future(db: AsyncSession, future_id: int) -> bool:
+        """
+        Delete a planned transaction (already posted occurrences stay in the ledger).
+
+        Args:
+            db (AsyncSession): Database session
+            future_id (int): ID of the planned transaction
+
+        Returns:
+            bool: True if deleted successfully, False otherwise
+
+        Raises:
+            Exception: If deletion fails
+        """
+        try:
+            logger.info(f"Deleting planned transaction: {future_id}")
+
+            async def _delete(session: AsyncSession) -> bool:
+                entry = await session.get(FutureTransaction, future_id)
+                if not entry:
+                    return False
+                await session.delete(entry)
+                await session.flush()
+                return True
+
+            deleted = await run_write(db, _delete)
+            if deleted:
+                logger.info(f"Planned transaction deleted successfully: {future_id}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting planned transaction: {str(e)}")
+            raise
@@ -0,0 +1,305 @@
+"""
+Content hashing for duplicate detection.
+Only files that share their size with another record are read: a partial
+hash of their first and last blocks splits each size group, and only files
+that still collide are hashed in full. Files are read in a process pool.
+
+Usage (from the backend directory):
+    python -m app.services.hashing
+    python -m app.services.hashing --rehash --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+from sqlalchemy import Select, bindparam, func, select, tuple_, update
+from ..database.database import engine
+from ..database.models import FileRecord
+from ..database.partitions import file_partitions
+from .jobs import BackgroundJob
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes read from each end of a file for the partial hash; files up to twice
+# this size are read whole, so their partial hash is their content hash
+PARTIAL_BLOCK = 64 * 1024
+
+# Buffer for files that cannot be memory-mapped
+READ_BLOCK = 1024 * 1024
+
+# Files handed to the process pool per database round trip
+DEFAULT_BATCH_FILES = 2000
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+FILES = FileRecord.__table__
+
+# (file_id, path, expected size, full) -> (file_id, digest or None, error or None)
+HashTask = Tuple[int, str, int, bool]
+HashResult = Tuple[int, Optional[str], Optional[str]]
+
+def _new_digest():
+    """Hash object used for partial and content hashes."""
+    return hashlib.blake2b(digest_size=32)
+
+def partial_digest(handle, size: int) -> str:
+    """
+    Hash of the first and last PARTIAL_BLOCK bytes, or of the whole file if
+    it is no larger than both blocks together.
+
+    Args:
+        handle: File opened in binary mode
+        size (int): File size in bytes
+
+    Returns:
+        str: Hex digest
+    """
+    digest = _new_digest()
+    if size <= 2 * PARTIAL_BLOCK:
+        digest.update(handle.read())
+    else:
+        digest.update(handle.read(PARTIAL_BLOCK))
+        handle.seek(-PARTIAL_BLOCK, os.SEEK_END)
+        digest.update(handle.read(PARTIAL_BLOCK))
+    return digest.hexdigest()
+
+def content_digest(handle) -> str:
+    """
+    Hash of the whole file, through mmap, or large buffered reads where the
+    file cannot be mapped.
+
+    Args:
+        handle: File opened in binary mode
+
+    Returns:
+        str: Hex digest
+    """
+    digest = _new_digest()
+    try:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            digest.update(view)
+        return digest.hexdigest()
+    except (OSError, ValueError):
+        pass
+    handle.seek(0)
+    buffer = bytearray(READ_BLOCK)
+    view = memoryview(buffer)
+    while True:
+        read = handle.readinto(buffer)
+        if not read:
+            return digest.hexdigest()
+        digest.update(view[:read])
+
+def hash_file(task: HashTask) -> HashResult:
+    """
+    Hash one file (runs in a worker process).
+    Files whose size no longer matches their record are skipped: the record
+    is stale and the next crawl will update it.
+
+    Args:
+        task (HashTask): File ID, path, recorded size and whether to hash in full
+
+    Returns:
+        HashResult: File ID with its digest, or with the reason it was skipped
+    """
+    file_id, path, size, full = task
+    try:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size != size:
+                return file_id, None, "size changed"
+            return file_id, content_digest(handle) if full else partial_digest(handle, size), None
+    except OSError as e:
+        return file_id, None, e.strerror or str(e)
+
+def partial_candidates() -> Select:
+    """Unhashed records whose size is shared with another record."""
+    shared_sizes = (
+        select(FILES.c.file_size).where(FILES.c.file_size > 0)
+        .group_by(FILES.c.file_size).having(func.count() > 1)
+    )
+    return select(FILES.c.file_id, FILES.c.file_path, FILES.c.file_size).where(
+        FILES.c.partial_hash.is_(None), FILES.c.file_size.in_(shared_sizes)
+    ).order_by(FILES.c.file_id)
+
+def full_candidates() -> Select:
+    """Records without a content hash whose (size, partial hash) is shared with another record."""
+    shared_partials = (
+        select(FILES.c.file_size, FILES.c.partial_hash).where(FILES.c.partial_hash.is_not(None))
+        .group_by(FILES.c.file_size, FILES.c.partial_hash).having(func.count() > 1)
+    )
+    return select(FILES.c.file_id, FILES.c.file_path, FILES.c.file_size).where(
+        FILES.c.content_hash.is_(None),
+        FILES.c.file_size > 2 * PARTIAL_BLOCK,
+        tuple_(FILES.c.file_size, FILES.c.partial_hash).in_(shared_partials),
+    ).order_by(FILES.c.file_id)
+
+def _batches(query: Select, size: int) -> Iterator[List[tuple]]:
+    """Run a query and yield its rows in lists of at most size."""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(query)
+        while True:
+            rows = result.fetchmany(size)
+            if not rows:
+                return
+            yield [tuple(row) for row in rows]
+
+def _store(updates: List[Dict[str, object]]) -> None:
+    """
+    Write computed hashes in one transaction. A record whose path or size
+    changed while its file was being read is left alone. updated_at is kept:
+    hashes are derived data, not an edit of the record.
+
+    Args:
+        updates (List[Dict[str, object]]): Hash values with b_file_id, b_file_path and b_file_size
+    """
+    if not updates:
+        return
+    with engine.begin() as conn:
+        conn.execute(update(FILES).where(
+            FILES.c.file_id == bindparam("b_file_id"),
+            FILES.c.file_path == bindparam("b_file_path"),
+            FILES.c.file_size == bindparam("b_file_size"),
+        ).values(updated_at=FILES.c.updated_at), updates)
+
+def hash_files(
+    workers: int = DEFAULT_WORKERS,
+    batch_files: int = DEFAULT_BATCH_FILES,
+    rehash: bool = False,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_batch: Optional[Callable[[Dict[str, object]], None]] = None
+) -> Dict[str, object]:
+    """
+    Compute partial and content hashes for every record that may be a duplicate.
+    Records that already have a hash keep it, so repeated runs only read new
+    or changed files. Files that cannot be read are counted and retried on
+    the next run.
+
+    Args:
+        workers (int): Worker processes reading files
+        batch_files (int): Files hashed per database round trip
+        rehash (bool): Clear every stored hash first
+        should_stop (Optional[Callable[[], bool]]): Polled between batches; True stops the run
+        on_batch (Optional[Callable]): Called with the running counts after each commit
+
+    Returns:
+        Dict[str, object]: Fields of HashRun
+    """
+    should_stop = should_stop or (lambda: False)
+    started = time.perf_counter()
+    stats: Dict[str, object] = {
+        "rehash": rehash, "partial_hashed": 0, "content_hashed": 0,
+        "bytes_read": 0, "skipped": 0, "stopped": False, "seconds": 0.0,
+    }
+    if rehash:
+        with engine.begin() as conn:
+            conn.execute(update(FILES).values(
+                partial_hash=None, content_hash=None, updated_at=FILES.c.updated_at
+            ))
+
+    # Workers are spawned rather than forked: the API process runs threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max(1, workers), mp_context=context) as pool:
+        for full, query in ((False, partial_candidates()), (True, full_candidates())):
+            for rows in _batches(query, batch_files):
+                tasks = [(file_id, path, size, full) for file_id, path, size in rows]
+                records = {file_id: (path, size) for file_id, path, size in rows}
+                chunk = max(1, len(tasks) // (max(1, workers) * 4))
+                updates = []
+                for file_id, digest, error in pool.map(hash_file, tasks, chunksize=chunk):
+                    if digest is None:
+                        logger.debug(f"Not hashing file {file_id}: {error}")
+                        stats["skipped"] += 1
+                        continue
+                    path, size = records[file_id]
+                    values = {"b_file_id": file_id, "b_file_path": path, "b_file_size": size}
+                    if full:
+                        values["content_hash"] = digest
+                        stats["bytes_read"] += size
+                    else:
+                        # Small files were read whole: the partial hash is the content hash
+                        values["partial_hash"] = digest
+                        values["content_hash"] = digest if size <= 2 * PARTIAL_BLOCK else None
+                        stats["bytes_read"] += min(size, 2 * PARTIAL_BLOCK)
+                    updates.append(values)
+                _store(updates)
+                stats["content_hashed" if full else "partial_hashed"] += len(updates)
+                if not full:
+                    stats["content_hashed"] += sum(1 for values in updates if values["content_hash"])
+                if on_batch is not None:
+                    on_batch(dict(stats))
+                if should_stop():
+                    stats["stopped"] = True
+                    break
+            if stats["stopped"]:
+                break
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(f"Hashing finished: {json.dumps(stats)}")
+    return stats
+
+class HashJob(BackgroundJob):
+    """Background hashing run, started through the API."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, batch_files: int = DEFAULT_BATCH_FILES):
+        """
+        Args:
+            workers (int): Worker processes reading files
+            batch_files (int): Files hashed per database round trip
+        """
+        super().__init__("hashing run")
+        self.workers = workers
+        self.batch_files = batch_files
+
+    def start_hashing(self, rehash: bool = False) -> None:
+        """
+        Start hashing in the background.
+
+        Args:
+            rehash (bool): Clear every stored hash first
+
+        Raises:
+            RuntimeError: If a hashing run is already in progress or file storage is partitioned
+        """
+        def work(should_stop, on_progress) -> Dict[str, object]:
+            return hash_files(self.workers, self.batch_files, rehash, should_stop, on_progress)
+
+        self.start(work, rehash=rehash)
+
+# Hashing job for the duplicates report
+file_hasher = HashJob(
+    workers=int(os.getenv("BDMS_HASH_WORKERS", str(DEFAULT_WORKERS))),
+    batch_files=int(os.getenv("BDMS_HASH_BATCH_FILES", str(DEFAULT_BATCH_FILES))),
+)
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from ..database.database import init_db_sync
+
+    parser = argparse.ArgumentParser(description="Hash file records that may be duplicates")
+    parser.add_argument("--rehash", action="store_true", help="Clear every stored hash first")
+    parser.add_argument("--workers", type=int, default=file_hasher.workers, help="Worker processes")
+    parser.add_argument("--batch-files", type=int, default=file_hasher.batch_files,
+                        help="Files hashed per database round trip")
+    args = parser.parse_args(argv)
+
+    try:
+        file_partitions.require_single_file("Hashing")
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+    init_db_sync()
+    json.dump(hash_files(args.workers, args.batch_files, args.rehash), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,191 @@
+"""
+Index advisor for file listing queries.
+Runs EXPLAIN QUERY PLAN for the exact SQL behind a FileQuery and flags full
+table scans and temporary sorts.
+
+Usage (from the backend directory):
+    python -m app.services.index_advisor --department Finance --min-size 1000
+    python -m app.services.index_advisor --all --sort-by file_size
+"""
+
+import argparse
+import itertools
+import sys
+from typing import List, Optional, Sequence
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+from ..database.partitions import file_partitions
+from ..schemas.file_schemas import FileQuery, QueryPlan, QueryPlanStep
+from .file_service import FileService
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Placeholder values used when enumerating every filter combination
+SAMPLE_FILTERS = {
+    "department": "Finance",
+    "owner": "John Doe",
+    "file_type": "pdf",
+    "access_level": "internal",
+    "min_size": 1024,
+    "max_size": 1048576,
+}
+
+def build_query(
+    query_params: Optional[FileQuery] = None,
+    sort_by: Optional[str] = None,
+    order: str = "asc",
+    limit: int = 100
+) -> Select:
+    """
+    Build the listing query the API would run for these parameters.
+
+    Args:
+        query_params (FileQuery): Optional query parameters for filtering
+        sort_by (Optional[str]): Sort column of a cursor page, None for the offset listing
+        order (str): Sort direction of a cursor page
+        limit (int): Page size
+
+    Returns:
+        Select: Listing query with LIMIT applied
+    """
+    if sort_by is None:
+        return FileService.build_list_query(query_params).limit(limit)
+    return FileService.build_page_query(query_params, sort_by, order == "desc").limit(limit + 1)
+
+def compile_sql(query: Select) -> str:
+    """
+    Render a query as SQLite SQL with inlined parameters.
+
+    Args:
+        query (Select): Query to render
+
+    Returns:
+        str: SQL text
+    """
+    return str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+def analyze_plan(sql: str, rows: Sequence) -> QueryPlan:
+    """
+    Interpret EXPLAIN QUERY PLAN output.
+
+    Args:
+        sql (str): Explained SQL
+        rows (Sequence): Rows of (id, parent, notused, detail)
+
+    Returns:
+        QueryPlan: Plan steps with scan/sort flags and the indexes used
+    """
+    steps = [QueryPlanStep(id=row[0], parent=row[1], detail=row[3]) for row in rows]
+    indexes = []
+    full_scan = False
+    temp_sort = False
+    for step in steps:
+        detail = step.detail
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            full_scan = True
+        if "TEMP B-TREE" in detail:
+            temp_sort = True
+        if " INDEX " in detail:
+            name = detail.split(" INDEX ", 1)[1].split(" ", 1)[0]
+            if name not in indexes:
+                indexes.append(name)
+    return QueryPlan(sql=sql, plan=steps, full_scan=full_scan, temp_sort=temp_sort, indexes=indexes)
+
+async def explain_files_query(
+    db: AsyncSession,
+    query_params: Optional[FileQuery] = None,
+    sort_by: Optional[str] = None,
+    order: str = "asc",
+    limit: int = 100
+) -> QueryPlan:
+    """
+    Explain the listing query for a FileQuery on the live database.
+    With partitioned storage the plan is taken on the first partition the
+    listing reads; every partition has the same schema and indexes.
+
+    Args:
+        db (AsyncSession): Database session
+        query_params (FileQuery): Optional query parameters for filtering
+        sort_by (Optional[str]): Sort column of a cursor page, None for the offset listing
+        order (str): Sort direction of a cursor page
+        limit (int): Page size
+
+    Returns:
+        QueryPlan: Analyzed plan
+
+    Raises:
+        RuntimeError: If file storage is partitioned and no partition exists yet
+    """
+    sql = compile_sql(build_query(query_params, sort_by, order, limit))
+    if not file_partitions.enabled:
+        result = await db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return analyze_plan(sql, result.all())
+    partitions = await file_partitions.for_query(query_params) or await file_partitions.all()
+    if not partitions:
+        raise RuntimeError("No file partition exists yet to explain the query on")
+    async with partitions[0].sessions() as session:
+        result = await session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    plan = analyze_plan(sql, result.all())
+    plan.partition_no = partitions[0].partition_no
+    return plan
+
+def filter_combinations() -> List[FileQuery]:
+    """
+    Every combination of FileQuery dimensions, filled with SAMPLE_FILTERS values.
+
+    Returns:
+        List[FileQuery]: 2^6 queries, from no filters to all filters
+    """
+    names = list(SAMPLE_FILTERS)
+    combos = []
+    for size in range(len(names) + 1):
+        for chosen in itertools.combinations(names, size):
+            combos.append(FileQuery(**{name: SAMPLE_FILTERS[name] for name in chosen}))
+    return combos
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from ..database.database import engine, init_db_sync
+
+    parser = argparse.ArgumentParser(description="Explain file listing queries")
+    for name in ("department", "owner", "file_type", "access_level"):
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name)
+    parser.add_argument("--min-size", type=int)
+    parser.add_argument("--max-size", type=int)
+    parser.add_argument("--sort-by", help="Explain a cursor page sorted by this column")
+    parser.add_argument("--order", choices=["asc", "desc"], default="asc")
+    parser.add_argument("--all", action="store_true", help="Explain every filter combination")
+    parser.add_argument("--analyze", action="store_true", help="Refresh planner statistics first")
+    args = parser.parse_args(argv)
+
+    engine.echo = False
+    init_db_sync()
+    if args.all:
+        queries = filter_combinations()
+    else:
+        fields = {name: getattr(args, name) for name in SAMPLE_FILTERS}
+        queries = [FileQuery(**fields)]
+
+    flagged = 0
+    with engine.connect() as conn:
+        if args.analyze:
+            conn.exec_driver_sql("ANALYZE")
+        for query_params in queries:
+            sql = compile_sql(build_query(query_params, args.sort_by, args.order))
+            plan = analyze_plan(sql, conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all())
+            applied = ",".join(query_params.model_dump(exclude_none=True)) or "(no filters)"
+            status = "SCAN" if plan.full_scan and applied != "(no filters)" else "ok"
+            flagged += status == "SCAN"
+            extra = " +sort" if plan.temp_sort else ""
+            print(f"{status:4}  {applied:55}  {','.join(plan.indexes) or '-'}{extra}")
+            if not args.all:
+                for step in plan.plan:
+                    print(f"      {step.detail}")
+    return 1 if flagged else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,155 @@
+"""
+Streaming parsers for bulk uploads.
+Turns an async byte stream (NDJSON or CSV) into numbered row dictionaries
+without buffering the whole body.
+"""
+
+import csv
+import json
+import codecs
+from typing import AsyncIterable, AsyncIterator, Dict, Optional, Tuple, Union
+
+# Parsed row: (row number, field dict) or (row number, error message)
+ParsedRow = Tuple[int, Union[Dict[str, object], str]]
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+# Longest CSV record accepted before an unbalanced quote is reported as an error
+MAX_RECORD_CHARS = 1 << 20
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Pick the upload format from an explicit value or the Content-Type header.
+
+    Args:
+        content_type (Optional[str]): Request Content-Type header
+        requested (Optional[str]): Explicit format, takes precedence
+
+    Returns:
+        str: One of SUPPORTED_FORMATS
+
+    Raises:
+        ValueError: If the format cannot be determined
+    """
+    if requested:
+        fmt = requested.lower()
+    elif content_type and "csv" in content_type.lower():
+        fmt = "csv"
+    elif content_type and any(t in content_type.lower() for t in ("ndjson", "jsonl", "json-seq")):
+        fmt = "ndjson"
+    else:
+        raise ValueError("Unable to detect upload format, use text/csv or application/x-ndjson")
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of {SUPPORTED_FORMATS}")
+    return fmt
+
+async def iter_lines(stream: AsyncIterable[bytes], encoding: str = "utf-8") -> AsyncIterator[str]:
+    """
+    Split an async byte stream into text lines (newline stripped).
+
+    Args:
+        stream (AsyncIterable[bytes]): Body chunks
+        encoding (str): Text encoding of the body
+
+    Yields:
+        str: One line at a time
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+def _clean(row: Dict[str, object]) -> Dict[str, object]:
+    """Drop empty values so schema defaults apply."""
+    return {key: value for key, value in row.items() if value not in ("", None)}
+
+async def iter_ndjson_rows(stream: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Parse newline-delimited JSON objects.
+
+    Args:
+        stream (AsyncIterable[bytes]): Body chunks
+
+    Yields:
+        ParsedRow: Row number with the decoded object, or with a parse error
+    """
+    row_number = 0
+    async for line in iter_lines(stream):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(value, dict):
+            yield row_number, "Expected a JSON object"
+            continue
+        yield row_number, _clean(value)
+
+async def iter_csv_rows(stream: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Parse CSV with a header row. Quoted fields may span lines.
+
+    Args:
+        stream (AsyncIterable[bytes]): Body chunks
+
+    Yields:
+        ParsedRow: Row number with a header-keyed dict, or with a parse error
+    """
+    header = None
+    record = ""
+    row_number = 0
+    async for line in iter_lines(stream):
+        record = f"{record}\n{line}" if record else line
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            if len(record) <= MAX_RECORD_CHARS:
+                continue
+            row_number += 1
+            record = ""
+            yield row_number, "Invalid CSV: unterminated quoted field"
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            row_number += 1
+            yield row_number, f"Invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_number, _clean(dict(zip(header, values)))
+    if record:
+        row_number += 1
+        yield row_number, "Invalid CSV: unterminated quoted field"
+
+def parse_rows(stream: AsyncIterable[bytes], fmt: str) -> AsyncIterator[ParsedRow]:
+    """
+    Dispatch to the parser for fmt.
+
+    Args:
+        stream (AsyncIterable[bytes]): Body chunks
+        fmt (str): One of SUPPORTED_FORMATS
+
+    Returns:
+        AsyncIterator[ParsedRow]: Parsed rows
+    """
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    return iter_ndjson_rows(stream)
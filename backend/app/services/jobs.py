@@ -0,0 +1,115 @@
+"""
+Background jobs for long-running maintenance work started through the API.
+A job runs a blocking function on a worker thread, at most one run at a
+time, and keeps its progress and the outcome of the last run for polling.
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import logging
+from ..database.partitions import file_partitions
+from .cache import file_cache
+from .changes import change_feed
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A job body: called with should_stop and on_progress, returns fields of the run
+JobWork = Callable[[Callable[[], bool], Callable[[Dict[str, object]], None]], Dict[str, object]]
+
+class BackgroundJob:
+    """
+    One kind of background work (e.g. a crawl), run on a worker thread.
+
+    The work function polls should_stop to end early and reports running
+    counts through on_progress after each committed batch. The work writes
+    ByteDB outside the API write path, so at every report and when the run
+    ends the file response cache is cleared and the change feed tells
+    clients to reload file records.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name (str): Name used in messages (e.g. "crawl")
+        """
+        self.name = name
+        self.runs = 0
+        self.progress: Optional[Dict[str, object]] = None
+        self.last_run: Optional[Dict[str, object]] = None
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def running(self) -> bool:
+        """True while a run is in progress."""
+        return self._task is not None and not self._task.done()
+
+    def start(self, work: JobWork, **details) -> None:
+        """
+        Start a run in the background.
+
+        Args:
+            work (JobWork): Blocking function doing the work
+            **details: Fields recorded on the run (e.g. its options)
+
+        Raises:
+            RuntimeError: If a run is already in progress, or file storage is
+                partitioned (jobs write the main ByteDB table)
+        """
+        file_partitions.require_single_file(f"The {self.name}")
+        if self.running():
+            raise RuntimeError(f"A {self.name} is already running")
+        self._stop.clear()
+        self.progress = None
+        self._task = asyncio.create_task(self._run(work, details))
+
+    async def _run(self, work: JobWork, details: Dict[str, object]) -> None:
+        """Run the work on a worker thread and record the outcome."""
+        loop = asyncio.get_running_loop()
+
+        def on_progress(progress: Dict[str, object]) -> None:
+            self.progress = progress
+            loop.call_soon_threadsafe(self._written)
+
+        run: Dict[str, object] = {"started_at": datetime.utcnow(), **details, "error": None}
+        try:
+            run.update(await asyncio.to_thread(work, self._stop.is_set, on_progress))
+        except Exception as e:
+            logger.error(f"{self.name.capitalize()} failed: {str(e)}")
+            run["error"] = str(e)
+        finally:
+            self._written()
+            run["finished_at"] = datetime.utcnow()
+            self.last_run = run
+            self.runs += 1
+
+    @staticmethod
+    def _written() -> None:
+        """Drop cached file responses and announce the change (runs on the event loop)."""
+        file_cache.clear()
+        change_feed.publish("file", "reload")
+
+    async def stop(self) -> None:
+        """Ask a running job to stop and wait for it."""
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    def status(self) -> dict:
+        """
+        Job state for monitoring.
+
+        Returns:
+            dict: running, progress, last_run and runs
+        """
+        return {
+            "running": self.running(),
+            "progress": self.progress,
+            "last_run": self.last_run,
+            "runs": self.runs,
+        }
@@ -0,0 +1,291 @@
+"""
+Parsers for TransactionsPast ledger exports.
+Maps the bookkeeping sheet layout (SlNo, Date, Description, Amount,
+PaymentMode, AccID, Department, Comments, Category, ZohoMatch) from CSV or
+XLSX onto transaction fields.
+
+Usage (from the backend directory):
+    python -m app.services.ledger_import TransactionsPast.xlsx
+    python -m app.services.ledger_import ledger.csv --chunk-size 5000
+    python -m app.services.ledger_import --normalize-dates
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from datetime import date, datetime
+from itertools import islice
+from typing import IO, AsyncIterable, AsyncIterator, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+import logging
+from .ingest import ParsedRow, iter_csv_rows
+from .transaction_service import normalize_ledger_date
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEDGER_FORMATS = ("csv", "xlsx")
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Sheet holding the ledger in the bookkeeping workbook
+DEFAULT_SHEET = "TransactionsPast"
+
+# Normalized header -> transaction field; None marks columns that are not imported
+# (SlNo is replaced by the database id, Comments has no column)
+LEDGER_COLUMNS: Dict[str, Optional[str]] = {
+    "slno": None,
+    "date": "date",
+    "description": "description",
+    "amount": "amount",
+    "paymentmode": "payment_mode",
+    "accid": "account_id",
+    "accountid": "account_id",
+    "department": "department",
+    "comments": None,
+    "category": "category",
+    "zohomatch": "zoho_match",
+}
+
+# Rows read from a worksheet per worker thread hop
+XLSX_BATCH_ROWS = 1000
+
+_TRUE_VALUES = {"yes", "y", "true", "1", "matched"}
+
+def detect_ledger_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Pick the ledger upload format from an explicit value or the Content-Type header.
+
+    Args:
+        content_type (Optional[str]): Request Content-Type header
+        requested (Optional[str]): Explicit format, takes precedence
+
+    Returns:
+        str: One of LEDGER_FORMATS
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if requested:
+        fmt = requested.lower()
+    else:
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        fmt = "xlsx" if media_type == XLSX_CONTENT_TYPE else "csv" if media_type in (
+            "text/csv", "application/csv"
+        ) else media_type
+    if fmt not in LEDGER_FORMATS:
+        raise ValueError(f"Unsupported ledger format '{fmt}', expected one of {', '.join(LEDGER_FORMATS)}")
+    return fmt
+
+def header_key(name: object) -> str:
+    """Header name reduced to lowercase letters, so 'Payment Mode' matches PaymentMode."""
+    return re.sub(r"[^a-z]", "", str(name).lower())
+
+def parse_amount(value: object) -> float:
+    """Parse an amount, accepting rupee signs and Indian digit grouping."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text_value = str(value).replace("₹", "").replace(",", "").replace(" ", "")
+    if text_value.startswith("(") and text_value.endswith(")"):
+        text_value = f"-{text_value[1:-1]}"
+    return float(text_value)
+
+def parse_date(value: object) -> str:
+    """Normalize a date cell (datetime from XLSX, DD-MON-YY text from CSV) to ISO."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return normalize_ledger_date(str(value))
+
+def map_ledger_row(raw: Dict[str, object]) -> Dict[str, object]:
+    """
+    Map one TransactionsPast row onto TransactionCreate fields.
+
+    Args:
+        raw (Dict[str, object]): Header-keyed row
+
+    Returns:
+        Dict[str, object]: Transaction fields (unknown columns dropped)
+
+    Raises:
+        ValueError: If the date or amount cannot be parsed
+    """
+    row: Dict[str, object] = {}
+    for name, value in raw.items():
+        field = LEDGER_COLUMNS.get(header_key(name))
+        if field is None or value is None or value == "":
+            continue
+        if field == "date":
+            value = parse_date(value)
+        elif field == "amount":
+            try:
+                value = parse_amount(value)
+            except ValueError:
+                raise ValueError(f"amount: invalid amount '{value}'")
+        elif field == "zoho_match":
+            value = "Yes" if str(value).strip().lower() in _TRUE_VALUES else "No"
+        else:
+            value = str(value).strip()
+        row[field] = value
+    return row
+
+async def iter_ledger_rows(rows: AsyncIterable[ParsedRow]) -> AsyncIterator[ParsedRow]:
+    """
+    Map parsed sheet rows onto transaction fields, turning bad cells into row errors.
+
+    Args:
+        rows (AsyncIterable[ParsedRow]): Header-keyed rows
+
+    Yields:
+        ParsedRow: Row number with transaction fields, or with an error
+    """
+    async for row_number, payload in rows:
+        if isinstance(payload, str):
+            yield row_number, payload
+            continue
+        try:
+            yield row_number, map_ledger_row(payload)
+        except ValueError as e:
+            yield row_number, str(e)
+
+async def iter_xlsx_rows(source: IO[bytes], sheet: Optional[str] = DEFAULT_SHEET) -> AsyncIterator[ParsedRow]:
+    """
+    Read a worksheet in read-only mode, a batch of rows at a time on a worker thread.
+
+    Args:
+        source (IO[bytes]): Seekable workbook file
+        sheet (Optional[str]): Sheet name; the active sheet if missing or None
+
+    Yields:
+        ParsedRow: Row number with a header-keyed dict
+
+    Raises:
+        ValueError: If openpyxl is not installed or the workbook cannot be read
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX import requires openpyxl (pip install openpyxl)")
+
+    try:
+        workbook = await asyncio.to_thread(load_workbook, source, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Invalid XLSX workbook: {e}")
+    try:
+        worksheet = workbook[sheet] if sheet and sheet in workbook.sheetnames else workbook.active
+        cells = worksheet.iter_rows(values_only=True)
+        header = None
+        row_number = 0
+        while True:
+            batch = await asyncio.to_thread(lambda: list(islice(cells, XLSX_BATCH_ROWS)))
+            if not batch:
+                break
+            for values in batch:
+                if all(value in (None, "") for value in values):
+                    continue
+                if header is None:
+                    header = [str(value).strip() if value is not None else "" for value in values]
+                    continue
+                row_number += 1
+                yield row_number, {
+                    name: value for name, value in zip(header, values)
+                    if name and value not in (None, "")
+                }
+    finally:
+        workbook.close()
+
+async def iter_file_chunks(handle: IO[bytes], chunk_size: int = 1 << 16) -> AsyncIterator[bytes]:
+    """Async byte stream over a local file."""
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+async def _import_file(path: str, sheet: str, chunk_size: int) -> dict:
+    """Import a local CSV or XLSX ledger through TransactionService."""
+    from ..database.database import get_async_db_session, init_db, close_db
+    from .transaction_service import TransactionService
+
+    await init_db()
+    fmt = "xlsx" if path.lower().endswith((".xlsx", ".xlsm")) else "csv"
+    try:
+        with open(path, "rb") as handle:
+            rows = iter_xlsx_rows(handle, sheet) if fmt == "xlsx" else iter_csv_rows(iter_file_chunks(handle))
+            async with get_async_db_session() as db:
+                result = await TransactionService.import_transactions(db, iter_ledger_rows(rows), chunk_size)
+    finally:
+        await close_db()
+    return result.model_dump()
+
+def normalize_stored_dates(conn: Connection, max_errors: int = 100) -> Dict[str, object]:
+    """
+    Rewrite ledger dates stored before dates were normalized on write (such
+    as 05-Jan-24 or 2024-01-05 00:00:00) as ISO dates. The rollup and report
+    triggers move each rewritten transaction to its day.
+    
+    Args:
+        conn (Connection): Sync connection (the caller commits)
+        max_errors (int): Maximum unparseable dates listed in the result
+    
+    Returns:
+        Dict[str, object]: Dates found not in ISO form, how many were
+            normalized, how many could not be parsed and the first of those
+    """
+    rows = conn.execute(text(
+        "SELECT id, date FROM transactions WHERE date(date) IS NULL OR date(date) != date"
+    )).all()
+    updates = []
+    errors = []
+    for txn_id, value in rows:
+        try:
+            updates.append({"id": txn_id, "date": normalize_ledger_date(value)})
+        except ValueError:
+            if len(errors) < max_errors:
+                errors.append({"id": txn_id, "date": value})
+    if updates:
+        conn.execute(text("UPDATE transactions SET date = :date WHERE id = :id"), updates)
+    logger.info(f"Normalized {len(updates)} of {len(rows)} non-ISO ledger dates")
+    return {
+        "checked": len(rows),
+        "normalized": len(updates),
+        "unparseable": len(rows) - len(updates),
+        "errors": errors,
+    }
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from ..database.database import engine, async_engine, writer_engine, init_db_sync
+
+    parser = argparse.ArgumentParser(description="Import a TransactionsPast ledger export")
+    parser.add_argument("path", nargs="?", help="CSV or XLSX file")
+    parser.add_argument("--sheet", default=DEFAULT_SHEET, help="Worksheet name for XLSX files")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows inserted per batch")
+    parser.add_argument(
+        "--normalize-dates", action="store_true",
+        help="Rewrite non-ISO dates already in the ledger instead of importing"
+    )
+    args = parser.parse_args(argv)
+    if (args.path is None) != args.normalize_dates:
+        parser.error("give either a file to import or --normalize-dates")
+
+    engine.echo = async_engine.echo = writer_engine.echo = False
+    if args.normalize_dates:
+        init_db_sync()
+        with engine.begin() as conn:
+            report = normalize_stored_dates(conn)
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 1 if report["unparseable"] else 0
+    result = asyncio.run(_import_file(args.path, args.sheet, args.chunk_size))
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if result["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
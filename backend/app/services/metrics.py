@@ -0,0 +1,262 @@
+"""
+Low-overhead request and SQL metrics.
+A pure ASGI middleware records per-route latency histograms, status codes and
+in-flight requests; SQLAlchemy cursor events time every statement and count
+affected rows. Everything is rendered in the Prometheus text format.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (seconds)
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+# Statement label by leading keyword; everything else is "other"
+STATEMENT_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "SAVEPOINT", "RELEASE", "PRAGMA", "CREATE"}
+
+class Histogram:
+    """
+    Fixed-bucket histogram keyed by a label tuple.
+    Buckets are stored non-cumulatively and summed when rendered.
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        """
+        Args:
+            name (str): Metric name
+            help_text (str): HELP line
+            label_names (Sequence[str]): Label names, in label tuple order
+            buckets (Sequence[float]): Sorted bucket upper bounds
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            labels (Tuple[str, ...]): Label values
+            value (float): Observed value
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # bucket counts..., +Inf count, sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self) -> int:
+        """Total observations across all series."""
+        with self._lock:
+            return int(sum(sum(series[:-1]) for series in self._series.values()))
+
+    def render(self) -> Iterable[str]:
+        """Prometheus text lines for every series."""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(snapshot):
+            base = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f'{self.name}_bucket{{{base}{"," if base else ""}le="{le}"}} {cumulative}'
+            yield f"{self.name}_sum{{{base}}} {series[-1]}"
+            yield f"{self.name}_count{{{base}}} {cumulative}"
+
+class Counter:
+    """Monotonic counter keyed by a label tuple."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        """
+        Args:
+            name (str): Metric name
+            help_text (str): HELP line
+            label_names (Sequence[str]): Label names, in label tuple order
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1) -> None:
+        """
+        Increment a series.
+
+        Args:
+            labels (Tuple[str, ...]): Label values
+            amount (float): Increment
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        """Prometheus text lines for every series."""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for labels, value in snapshot:
+            yield f"{self.name}{{{_labels(self.label_names, labels)}}} {value}"
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render label pairs, escaping values."""
+    return ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+
+class MetricsRegistry:
+    """All application metrics."""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled (bool): Record metrics; when False the middleware and SQL
+                hooks do nothing
+        """
+        self.enabled = enabled
+        self.in_flight = 0
+        self.request_duration = Histogram(
+            "bdms_http_request_duration_seconds", "HTTP request latency by route",
+            ("method", "route"), REQUEST_BUCKETS,
+        )
+        self.requests = Counter(
+            "bdms_http_requests_total", "HTTP responses by route and status code",
+            ("method", "route", "status"),
+        )
+        self.statement_duration = Histogram(
+            "bdms_db_statement_duration_seconds", "SQL statement execution time",
+            ("engine", "operation"), STATEMENT_BUCKETS,
+        )
+        self.statement_rows = Counter(
+            "bdms_db_statement_rows_total",
+            "Rows affected by INSERT/UPDATE/DELETE statements (drivers report no count for SELECT)",
+            ("engine", "operation"),
+        )
+        self.admission_rejected = Counter(
+            "bdms_admission_rejected_total",
+            "Requests answered 503 by admission control (queue_full or timeout)",
+            ("route_class", "reason"),
+        )
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = [
+            "# HELP bdms_http_requests_in_flight HTTP requests currently being served",
+            "# TYPE bdms_http_requests_in_flight gauge",
+            f"bdms_http_requests_in_flight {self.in_flight}",
+        ]
+        for metric in (
+            self.requests, self.request_duration, self.statement_duration, self.statement_rows,
+            self.admission_rejected,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request.
+    Requests are labelled with the matched route template (not the raw path),
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app, registry: "MetricsRegistry" = None):
+        """
+        Args:
+            app: Wrapped ASGI application
+            registry (MetricsRegistry): Registry to record into (defaults to metrics)
+        """
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope, receive, send):
+        registry = self.registry
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.in_flight -= 1
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            registry.request_duration.observe((method, path), elapsed)
+            registry.requests.inc((method, path, str(status)))
+
+def _statement_operation(statement: str) -> str:
+    """Leading SQL keyword used as the operation label."""
+    keyword = statement.lstrip()[:9].split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword.lower() if keyword in STATEMENT_OPERATIONS else "other"
+
+def instrument_engine(sync_engine: Engine, label: str, registry: "MetricsRegistry" = None) -> None:
+    """
+    Time every statement run on an engine and count affected rows.
+
+    Args:
+        sync_engine (Engine): Engine (use .sync_engine for async engines)
+        label (str): Value of the engine label
+        registry (MetricsRegistry): Registry to record into (defaults to metrics)
+    """
+    registry = registry or metrics
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if registry.enabled:
+            conn.info["bdms_statement_start"] = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("bdms_statement_start", None)
+        if started is None:
+            return
+        operation = _statement_operation(statement)
+        registry.statement_duration.observe((label, operation), time.perf_counter() - started)
+        rowcount = cursor.rowcount
+        if rowcount is not None and rowcount > 0:
+            registry.statement_rows.inc((label, operation), rowcount)
+
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+
+# Application metrics registry
+metrics = MetricsRegistry(
+    enabled=os.getenv("BDMS_METRICS_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+)
@@ -0,0 +1,93 @@
+"""
+Keyset (cursor) pagination helpers.
+Cursors are opaque URL-safe tokens carrying the sort key of the last row seen,
+so every page is a bounded index range scan no matter how deep it is.
+"""
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import DateTime, literal, tuple_
+
+def filter_fingerprint(filters: Optional[Dict[str, Any]]) -> str:
+    """
+    Short stable hash of the applied filters, stored in the cursor so a cursor
+    cannot silently be replayed against a different filter set.
+
+    Args:
+        filters (Optional[Dict[str, Any]]): Filter values (None values ignored)
+
+    Returns:
+        str: Hex fingerprint
+    """
+    normalized = {key: value for key, value in (filters or {}).items() if value is not None}
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+def encode_cursor(sort_by: str, descending: bool, value: Any, last_id: int, fingerprint: str) -> str:
+    """
+    Build an opaque cursor pointing just after a row.
+
+    Args:
+        sort_by (str): Sort column name
+        descending (bool): Sort direction
+        value (Any): Sort column value of the last row
+        last_id (int): Primary key of the last row (tiebreaker)
+        fingerprint (str): Filter fingerprint
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "d": int(descending), "v": value, "i": last_id, "f": fingerprint}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor token
+
+    Returns:
+        Dict[str, Any]: Keys sort_by, descending, value, last_id, fingerprint
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return {
+            "sort_by": str(payload["s"]),
+            "descending": bool(payload["d"]),
+            "value": payload["v"],
+            "last_id": int(payload["i"]),
+            "fingerprint": str(payload["f"]),
+        }
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+def keyset_condition(sort_expr, id_column, value: Any, last_id: int, descending: bool):
+    """
+    Row-value predicate selecting rows strictly after (value, last_id).
+
+    Args:
+        sort_expr: Sort column or expression
+        id_column: Unique tiebreaker column
+        value (Any): Sort value of the last row seen
+        last_id (int): Tiebreaker value of the last row seen
+        descending (bool): Sort direction
+
+    Returns:
+        ColumnElement: SQLAlchemy boolean expression
+    """
+    if isinstance(sort_expr.type, DateTime) and isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    key = tuple_(sort_expr, id_column)
+    bound = tuple_(literal(value, sort_expr.type), literal(last_id, id_column.type))
+    return key < bound if descending else key > bound
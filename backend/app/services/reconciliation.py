@@ -0,0 +1,468 @@
+"""
+Zoho reconciliation for the transaction ledger.
+Matches the entries of a Zoho Books ledger export against transactions:
+candidate pairs are blocked by amount and a date window, scored on
+description similarity, and the accepted matches written back in bulk.
+
+Usage (from the backend directory):
+    python -m app.services.reconciliation zoho-ledger.csv
+    python -m app.services.reconciliation zoho-ledger.xlsx --window-days 5 --dry-run
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import AbstractSet, AsyncIterable, Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+from ..database.database import run_write
+from ..database.models import Transaction
+from ..schemas.file_schemas import BulkRowError
+from ..schemas.transaction_schemas import ReconciliationMatch, ReconciliationResult
+from .changes import change_feed
+from .ingest import ParsedRow
+from .ledger_import import header_key, parse_amount, parse_date
+from .transaction_service import normalize_ledger_date
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Normalized header -> Zoho entry field. Exports either carry a signed Amount
+# or separate Debit and Credit columns (amount = credit - debit)
+ZOHO_COLUMNS: Dict[str, str] = {
+    "date": "date",
+    "transactiondate": "date",
+    "description": "description",
+    "transactiondetails": "description",
+    "details": "description",
+    "narration": "description",
+    "particulars": "description",
+    "amount": "amount",
+    "debit": "debit",
+    "credit": "credit",
+    "transactionid": "zoho_id",
+    "entryid": "zoho_id",
+    "id": "zoho_id",
+    "referencenumber": "zoho_id",
+    "reference": "zoho_id",
+}
+
+# Confidence = weighted description similarity plus date closeness
+DESCRIPTION_WEIGHT = 0.7
+DATE_WEIGHT = 0.3
+
+DEFAULT_WINDOW_DAYS = 3
+DEFAULT_MIN_CONFIDENCE = 0.5
+
+# Zoho entries scored per transaction when many share its amount and dates
+DEFAULT_MAX_CANDIDATES = 50
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+# Matches written per write job, so other writes interleave with a large run
+WRITE_BATCH_ROWS = 5000
+
+@dataclass
+class ZohoEntry:
+    """One Zoho ledger line, with its amount in cents and its date as a day number."""
+    zoho_id: str
+    day: int
+    cents: int
+    description: str
+
+def map_zoho_row(raw: Dict[str, object], row_number: int) -> ZohoEntry:
+    """
+    Map one row of a Zoho ledger export onto a ZohoEntry.
+
+    Args:
+        raw (Dict[str, object]): Header-keyed row
+        row_number (int): 1-based data row number, the entry ID when the export has none
+
+    Returns:
+        ZohoEntry: Parsed entry
+
+    Raises:
+        ValueError: If the date or amount is missing or cannot be parsed
+    """
+    fields: Dict[str, object] = {}
+    for name, value in raw.items():
+        field = ZOHO_COLUMNS.get(header_key(name))
+        if field is not None and value is not None and value != "" and field not in fields:
+            fields[field] = value
+    if "date" not in fields:
+        raise ValueError("date: missing")
+    if not {"amount", "debit", "credit"} & fields.keys():
+        raise ValueError("amount: missing")
+    try:
+        day = date.fromisoformat(parse_date(fields["date"])).toordinal()
+    except ValueError as e:
+        raise ValueError(f"date: {e}")
+    try:
+        if "amount" in fields:
+            amount = parse_amount(fields["amount"])
+        else:
+            amount = parse_amount(fields.get("credit", 0)) - parse_amount(fields.get("debit", 0))
+    except ValueError:
+        raise ValueError("amount: invalid amount")
+    return ZohoEntry(
+        zoho_id=str(fields.get("zoho_id", f"row-{row_number}")).strip(),
+        day=day,
+        cents=round(amount * 100),
+        description=str(fields.get("description", "")).strip(),
+    )
+
+def trigrams(text_value: str) -> AbstractSet[str]:
+    """Character trigrams of a description, case and punctuation ignored."""
+    normalized = _NON_ALPHANUMERIC.sub(" ", text_value.lower()).strip()
+    if not normalized:
+        return frozenset()
+    padded = f"  {normalized} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+def similarity(left: AbstractSet[str], right: AbstractSet[str]) -> float:
+    """Dice coefficient of two trigram sets (0 when either is empty)."""
+    if not left or not right:
+        return 0.0
+    return 2 * len(left & right) / (len(left) + len(right))
+
+class Reconciler:
+    """
+    Pairs transactions with Zoho entries one to one.
+
+    Only pairs with the same absolute amount (to the cent; the sign depends
+    on which side of the account the export was taken from) and dates at
+    most window_days apart are scored, found through a hash index on amount
+    and binary search on dates within it, so the cost grows with the number
+    of plausible pairs rather than the product of both ledgers. Pairs are
+    then accepted greedily, best score first, skipping either side once it
+    is matched.
+    """
+
+    def __init__(
+        self,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        max_candidates: int = DEFAULT_MAX_CANDIDATES
+    ):
+        """
+        Args:
+            window_days (int): Largest date difference between matched entries
+            min_confidence (float): Lowest score accepted as a match (0-1)
+            max_candidates (int): Zoho entries scored per transaction, nearest dates first
+        """
+        self.window_days = window_days
+        self.min_confidence = min_confidence
+        self.max_candidates = max_candidates
+        self.candidate_pairs = 0
+
+    def match(
+        self,
+        transactions: List[Tuple[int, int, int, str]],
+        entries: List[ZohoEntry]
+    ) -> List[Tuple[int, int, float, int]]:
+        """
+        Match transactions to Zoho entries.
+
+        Args:
+            transactions (List[Tuple[int, int, int, str]]): (id, day, cents, description)
+            entries (List[ZohoEntry]): Zoho entries
+
+        Returns:
+            List[Tuple[int, int, float, int]]: (transaction id, entry index, confidence,
+                day offset) per match, best first
+        """
+        # Hash index on absolute amount; each bucket sorted by date
+        buckets: Dict[int, List[int]] = {}
+        for index, entry in enumerate(entries):
+            buckets.setdefault(abs(entry.cents), []).append(index)
+        bucket_days: Dict[int, List[int]] = {}
+        for cents, indexes in buckets.items():
+            indexes.sort(key=lambda index: entries[index].day)
+            bucket_days[cents] = [entries[index].day for index in indexes]
+
+        # Ledgers repeat descriptions, so trigram sets are computed once per text
+        grams_by_text: Dict[str, AbstractSet[str]] = {}
+
+        def grams_of(text_value: str) -> AbstractSet[str]:
+            grams = grams_by_text.get(text_value)
+            if grams is None:
+                grams = grams_by_text[text_value] = trigrams(text_value)
+            return grams
+
+        entry_days = [entry.day for entry in entries]
+        entry_grams = [grams_of(entry.description) for entry in entries]
+        window = self.window_days
+        scored: List[Tuple[float, int, int, int]] = []
+        for transaction_id, day, cents, description in transactions:
+            indexes = buckets.get(abs(cents))
+            if indexes is None:
+                continue
+            days = bucket_days[abs(cents)]
+            low, high = bisect_left(days, day - window), bisect_right(days, day + window)
+            if high - low <= self.max_candidates:
+                candidates = indexes[low:high]
+            else:
+                # The nearest dates only, walking outwards from the transaction's date
+                left = right = bisect_left(days, day, low, high)
+                candidates = []
+                while len(candidates) < self.max_candidates:
+                    if right < high and (left == low or days[right] - day <= day - days[left - 1]):
+                        candidates.append(indexes[right])
+                        right += 1
+                    else:
+                        left -= 1
+                        candidates.append(indexes[left])
+            if not candidates:
+                continue
+            self.candidate_pairs += len(candidates)
+            grams = grams_of(description)
+            for index in candidates:
+                offset = entry_days[index] - day
+                score = (
+                    DESCRIPTION_WEIGHT * similarity(grams, entry_grams[index])
+                    + DATE_WEIGHT * (1 - abs(offset) / (window + 1))
+                )
+                if score >= self.min_confidence:
+                    scored.append((score, transaction_id, index, offset))
+
+        # Best score first; ties go to the closer date, then to the earlier entries
+        scored.sort(key=lambda pair: (-pair[0], abs(pair[3]), pair[1], pair[2]))
+        matched_transactions = set()
+        matched_entries = set()
+        matches = []
+        for score, transaction_id, index, offset in scored:
+            if transaction_id in matched_transactions or index in matched_entries:
+                continue
+            matched_transactions.add(transaction_id)
+            matched_entries.add(index)
+            matches.append((transaction_id, index, round(score, 4), offset))
+        return matches
+
+async def read_zoho_entries(
+    rows: AsyncIterable[ParsedRow],
+    result: ReconciliationResult,
+    max_errors: int = 1000
+) -> List[ZohoEntry]:
+    """
+    Parse a Zoho ledger export, recording unreadable rows on the result.
+
+    Args:
+        rows (AsyncIterable[ParsedRow]): Header-keyed rows (CSV or XLSX)
+        result (ReconciliationResult): Receives the row counts and errors
+        max_errors (int): Maximum row errors listed in the result
+
+    Returns:
+        List[ZohoEntry]: Entries, without repeated entry IDs
+    """
+    entries: List[ZohoEntry] = []
+    seen = set()
+
+    def reject(row_number: int, message: str) -> None:
+        result.failed += 1
+        if len(result.errors) < max_errors:
+            result.errors.append(BulkRowError(row=row_number, errors=[message]))
+
+    async for row_number, payload in rows:
+        if isinstance(payload, str):
+            reject(row_number, payload)
+            continue
+        try:
+            entry = map_zoho_row(payload, row_number)
+        except ValueError as e:
+            reject(row_number, str(e))
+            continue
+        if entry.zoho_id in seen:
+            reject(row_number, f"zoho_id: duplicate entry '{entry.zoho_id}'")
+            continue
+        seen.add(entry.zoho_id)
+        entries.append(entry)
+    result.zoho_entries = len(entries)
+    return entries
+
+async def reconcile(
+    db: AsyncSession,
+    rows: AsyncIterable[ParsedRow],
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    rematch: bool = False,
+    dry_run: bool = False,
+    max_listed: int = 1000
+) -> ReconciliationResult:
+    """
+    Reconcile a Zoho ledger export with the transactions in its date range
+    (widened by the window) and write the matches back: zoho_match becomes
+    "Yes", with zoho_match_id and zoho_confidence set.
+
+    Args:
+        db (AsyncSession): Database session
+        rows (AsyncIterable[ParsedRow]): Header-keyed rows of the export
+        window_days (int): Largest date difference between matched entries
+        min_confidence (float): Lowest score accepted as a match (0-1)
+        rematch (bool): Clear earlier matches in the date range and match everything again;
+            otherwise matched transactions and Zoho entries are skipped
+        dry_run (bool): Report the matches without writing them
+        max_listed (int): Maximum matches, unmatched IDs and row errors listed
+
+    Returns:
+        ReconciliationResult: Counts, matches and unmatched Zoho entries
+
+    Raises:
+        ValueError: If a parameter is out of range
+    """
+    if window_days < 0 or not 0 <= min_confidence <= 1:
+        raise ValueError("window_days must be >= 0 and min_confidence between 0 and 1")
+    started = time.perf_counter()
+    result = ReconciliationResult(
+        zoho_entries=0, zoho_already_matched=0, transactions=0, candidate_pairs=0,
+        matched=0, unmatched_zoho=0, written=False, seconds=0.0
+    )
+    entries = await read_zoho_entries(rows, result, max_listed)
+    if not entries:
+        result.seconds = time.perf_counter() - started
+        return result
+
+    start = date.fromordinal(min(entry.day for entry in entries) - window_days).isoformat()
+    end = date.fromordinal(max(entry.day for entry in entries) + window_days).isoformat()
+    table = Transaction.__table__
+    ledger = await db.execute(
+        select(table.c.id, table.c.date, table.c.amount, table.c.description,
+               table.c.zoho_match, table.c.zoho_match_id)
+        .where(table.c.date.between(start, end))
+    )
+    transactions: List[Tuple[int, int, int, str]] = []
+    matched_ids = set()
+    for transaction_id, day, amount, description, zoho_match, zoho_match_id in ledger.all():
+        if not rematch and (zoho_match == "Yes" or zoho_match_id is not None):
+            if zoho_match_id is not None:
+                matched_ids.add(zoho_match_id)
+            continue
+        try:
+            ordinal = date.fromisoformat(normalize_ledger_date(day)).toordinal()
+        except ValueError:
+            result.skipped_transactions += 1
+            continue
+        transactions.append((transaction_id, ordinal, round(amount * 100), description))
+    if matched_ids:
+        result.zoho_already_matched = sum(entry.zoho_id in matched_ids for entry in entries)
+        entries = [entry for entry in entries if entry.zoho_id not in matched_ids]
+    result.transactions = len(transactions)
+
+    reconciler = Reconciler(window_days, min_confidence)
+    # CPU-bound: keep the event loop serving requests meanwhile
+    matches = await asyncio.to_thread(reconciler.match, transactions, entries)
+    result.candidate_pairs = reconciler.candidate_pairs
+    result.matched = len(matches)
+    matched_entries = {index for _, index, _, _ in matches}
+    unmatched = [entry.zoho_id for index, entry in enumerate(entries) if index not in matched_entries]
+    result.unmatched_zoho = len(unmatched)
+    result.unmatched_zoho_ids = unmatched[:max_listed]
+    result.matches = [
+        ReconciliationMatch(
+            transaction_id=transaction_id, zoho_id=entries[index].zoho_id,
+            confidence=score, day_offset=offset
+        )
+        for transaction_id, index, score, offset in matches[:max_listed]
+    ]
+
+    if not dry_run:
+        await _write_matches(db, matches, entries, start, end, rematch)
+        result.written = True
+        change_feed.publish("transaction", "reload", count=len(matches))
+    result.seconds = time.perf_counter() - started
+    logger.info(
+        f"Reconciled {len(entries)} Zoho entries with {len(transactions)} transactions: "
+        f"{len(matches)} matched in {result.seconds:.2f} s"
+    )
+    return result
+
+async def _write_matches(
+    db: AsyncSession,
+    matches: List[Tuple[int, int, float, int]],
+    entries: List[ZohoEntry],
+    start: str,
+    end: str,
+    rematch: bool
+) -> None:
+    """Write matches back with one executemany UPDATE per batch."""
+    table = Transaction.__table__
+    if rematch:
+        async def _clear(session: AsyncSession) -> None:
+            await session.execute(
+                update(table)
+                .where(table.c.date.between(start, end), table.c.zoho_match_id.is_not(None))
+                .values(zoho_match="No", zoho_match_id=None, zoho_confidence=None)
+            )
+
+        await run_write(db, _clear)
+
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("match_transaction_id"))
+        .values(zoho_match="Yes", zoho_match_id=bindparam("match_zoho_id"),
+                zoho_confidence=bindparam("match_confidence"))
+    )
+    for offset in range(0, len(matches), WRITE_BATCH_ROWS):
+        params = [
+            {"match_transaction_id": transaction_id, "match_zoho_id": entries[index].zoho_id,
+             "match_confidence": score}
+            for transaction_id, index, score, _ in matches[offset:offset + WRITE_BATCH_ROWS]
+        ]
+
+        async def _update(session: AsyncSession, params=params) -> None:
+            await session.execute(statement, params)
+
+        await run_write(db, _update)
+
+async def _reconcile_file(path: str, sheet: Optional[str], **options) -> dict:
+    """Reconcile a local CSV or XLSX Zoho export."""
+    from ..database.database import get_async_db_session, init_db, close_db
+    from .ingest import iter_csv_rows
+    from .ledger_import import iter_file_chunks, iter_xlsx_rows
+
+    await init_db()
+    try:
+        with open(path, "rb") as handle:
+            if path.lower().endswith((".xlsx", ".xlsm")):
+                rows = iter_xlsx_rows(handle, sheet)
+            else:
+                rows = iter_csv_rows(iter_file_chunks(handle))
+            async with get_async_db_session() as db:
+                result = await reconcile(db, rows, **options)
+    finally:
+        await close_db()
+    return result.model_dump()
+
+def main(argv) -> int:
+    """Command line entry point."""
+    from ..database.database import engine, async_engine, writer_engine
+
+    parser = argparse.ArgumentParser(description="Reconcile a Zoho ledger export with the transactions")
+    parser.add_argument("path", help="CSV or XLSX file")
+    parser.add_argument("--sheet", default=None, help="Worksheet name for XLSX files (default: the active sheet)")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS,
+                        help="Largest date difference between matched entries")
+    parser.add_argument("--min-confidence", type=float, default=DEFAULT_MIN_CONFIDENCE,
+                        help="Lowest score accepted as a match (0-1)")
+    parser.add_argument("--rematch", action="store_true", help="Clear earlier matches in the date range first")
+    parser.add_argument("--dry-run", action="store_true", help="Report matches without writing them")
+    args = parser.parse_args(argv)
+
+    engine.echo = async_engine.echo = writer_engine.echo = False
+    result = asyncio.run(_reconcile_file(
+        args.path, args.sheet, window_days=args.window_days, min_confidence=args.min_confidence,
+        rematch=args.rematch, dry_run=args.dry_run
+    ))
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,268 @@
+"""
+Service layer for materialized role reports.
+Keeps the report tables current, recomputing only the days written since the
+last refresh, and generates CA, Owner and Budget Analyst reports from them.
+Generated bodies are cached until a refresh changes the report tables.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, column, func, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+from ..database.database import get_async_db_session, run_write
+from ..database.models import ReportDirtyDay, ReportState
+from ..database.partitions import file_partitions
+from ..database.reports import REPORT_TEMPLATES, REPORTS, ReportTemplate, refresh_reports
+from .cache import CacheEntry, ResponseCache
+from .fast_json import dumps
+from .transaction_service import date_bucket, normalize_ledger_date
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ReportService:
+    """
+    Refreshes and serves the materialized role reports.
+
+    Reads check for dirty days at most every refresh_seconds and recompute
+    them in one write job before answering. Report versions are re-read on
+    every check, so a refresh made by another worker process also drops this
+    process's cached bodies.
+    """
+
+    def __init__(self, refresh_seconds: float = 30.0, cache: Optional[ResponseCache] = None):
+        """
+        Args:
+            refresh_seconds (float): Longest time a read may serve without checking
+                for dirty days (0 checks on every read); also the max-age clients
+                are told to cache reports for
+            cache (Optional[ResponseCache]): Cache of generated report bodies
+        """
+        self.refresh_seconds = refresh_seconds
+        self.cache = cache or ResponseCache()
+        self.refreshes = 0
+        self.last_refresh: Optional[Dict[str, Any]] = None
+        self.checked_at: Optional[datetime] = None
+        self._checked = float("-inf")
+        self._states: Dict[str, Tuple[int, Optional[datetime]]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def refresh(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Recompute the report rows of every day written since the last refresh.
+
+        Args:
+            force (bool): Check now even if the last check is younger than refresh_seconds
+
+        Returns:
+            Optional[Dict[str, Any]]: Fields of ReportRefresh, or None when
+                nothing was checked or nothing was dirty
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not force and time.monotonic() - self._checked < self.refresh_seconds:
+                return None
+            started = time.perf_counter()
+            result = None
+            async with get_async_db_session() as db:
+                pending = (await db.execute(select(ReportDirtyDay.day).limit(1))).first()
+                if pending is not None:
+                    async def _refresh(session: AsyncSession) -> Dict[str, object]:
+                        return await session.run_sync(lambda sync: refresh_reports(sync.connection()))
+
+                    result = await run_write(db, _refresh)
+                    result["refresh_ms"] = (time.perf_counter() - started) * 1000
+                    self.refreshes += 1
+                    self.last_refresh = result
+                    logger.info(
+                        f"Role reports refreshed: {result['days']} days in {result['refresh_ms']:.1f} ms"
+                    )
+            async with get_async_db_session() as db:
+                states = {
+                    state.name: (state.version, state.refreshed_at)
+                    for state in (await db.execute(select(ReportState))).scalars()
+                }
+            if states != self._states:
+                self.cache.clear()
+                self._states = states
+            self._checked = time.monotonic()
+            self.checked_at = datetime.utcnow()
+            return result
+
+    def _template(self, name: str) -> Optional[ReportTemplate]:
+        """Template of a report, refusing file reports with partitioned storage."""
+        template = REPORTS.get(name)
+        if template is not None and template.source == "files":
+            file_partitions.require_single_file(f"The {name} report")
+        return template
+
+    async def list_reports(self, role: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Report templates with the state of their tables.
+
+        Args:
+            role (Optional[str]): Only the reports prepared for this role
+
+        Returns:
+            List[Dict[str, Any]]: Fields of ReportDefinition
+        """
+        await self.refresh()
+        return [
+            {
+                "name": template.name,
+                "role": template.role,
+                "title": template.title,
+                "source": template.source,
+                "dimensions": list(template.dimensions),
+                "measures": list(template.measures),
+                "version": self._states.get(template.name, (0, None))[0],
+                "refreshed_at": self._states.get(template.name, (0, None))[1],
+            }
+            for template in REPORT_TEMPLATES
+            if role is None or template.role == role
+        ]
+
+    async def get_report(
+        self,
+        db: AsyncSession,
+        name: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        group_by: Optional[Sequence[str]] = None,
+        bucket: str = "day",
+        where: Sequence[str] = (),
+        limit: int = 10000
+    ) -> Optional[Tuple[CacheEntry, Optional[datetime]]]:
+        """
+        Generate a report from its table, or serve it from the cache.
+
+        Args:
+            db (AsyncSession): Database session
+            name (str): Report name
+            start_date (Optional[str]): First day included
+            end_date (Optional[str]): Last day included
+            group_by (Optional[Sequence[str]]): Dimensions and/or "period" to group by
+                (default: period and every dimension)
+            bucket (str): Date bucket of the period (day, week, month, year)
+            where (Sequence[str]): Dimension filters as "name=value"
+            limit (int): Maximum groups returned
+
+        Returns:
+            Optional[Tuple[CacheEntry, Optional[datetime]]]: The serialized RoleReport
+                with its ETag, and when the report was last recomputed; None if
+                there is no such report
+
+        Raises:
+            ValueError: If a date, group-by column or filter is invalid
+            RuntimeError: If it is a file report and file storage is partitioned
+        """
+        template = self._template(name)
+        if template is None:
+            return None
+        group_by = list(group_by) if group_by else ["period", *template.dimensions]
+        unknown = [value for value in group_by if value != "period" and value not in template.dimensions]
+        if unknown:
+            raise ValueError(f"Cannot group the {name} report by {', '.join(unknown)}")
+        filters = []
+        for condition in where:
+            dimension, separator, value = condition.partition("=")
+            if not separator or dimension not in template.dimensions:
+                raise ValueError(f"Invalid filter '{condition}': expected <dimension>=<value>")
+            filters.append((dimension, value))
+        start_date = normalize_ledger_date(start_date) if start_date else None
+        end_date = normalize_ledger_date(end_date) if end_date else None
+
+        await self.refresh()
+        key = (name, start_date, end_date, tuple(group_by), bucket, tuple(sorted(filters)), limit)
+        entry = self.cache.get(key)
+        if entry is None:
+            generation = self.cache.generation
+            body = await self._generate(db, template, start_date, end_date, group_by, bucket, filters, limit)
+            entry = self.cache.put(key, body, generation)
+        return entry, self._states.get(name, (0, None))[1]
+
+    async def _generate(
+        self,
+        db: AsyncSession,
+        template: ReportTemplate,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        group_by: List[str],
+        bucket: str,
+        filters: List[Tuple[str, str]],
+        limit: int
+    ) -> bytes:
+        """Aggregate a report table into the serialized RoleReport."""
+        report = table(
+            template.table, column("day"),
+            *(column(name) for name in [*template.dimensions, *template.measures])
+        )
+        conditions = [report.c[dimension] == value for dimension, value in filters]
+        if start_date:
+            conditions.append(report.c.day >= start_date)
+        if end_date:
+            conditions.append(report.c.day <= end_date)
+        condition = and_(*conditions) if conditions else None
+        groups = [
+            date_bucket(report.c.day, bucket).label("period") if name == "period" else report.c[name]
+            for name in group_by
+        ]
+        sums = [func.coalesce(func.sum(report.c[name]), 0).label(name) for name in template.measures]
+
+        totals_query = select(*sums)
+        query = select(*groups, *sums).group_by(*groups).order_by(*groups).limit(limit + 1)
+        if condition is not None:
+            totals_query, query = totals_query.where(condition), query.where(condition)
+        totals = (await db.execute(totals_query)).one()._asdict()
+        rows = []
+        for row in await db.execute(query):
+            values = row._asdict()
+            for name in group_by:
+                # NULL dimension values are stored as ''
+                if values[name] == "":
+                    values[name] = None
+            rows.append(values)
+
+        return dumps({
+            "name": template.name,
+            "role": template.role,
+            "title": template.title,
+            "refreshed_at": self._states.get(template.name, (0, None))[1],
+            "start_date": start_date,
+            "end_date": end_date,
+            "group_by": group_by,
+            "bucket": bucket,
+            "rows": rows[:limit],
+            "totals": totals,
+            "truncated": len(rows) > limit,
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Engine state for monitoring.
+
+        Returns:
+            Dict[str, Any]: Fields of ReportStatus
+        """
+        return {
+            "refresh_seconds": self.refresh_seconds,
+            "refreshes": self.refreshes,
+            "last_refresh": self.last_refresh,
+            "checked_at": self.checked_at,
+            "cache": self.cache.stats(),
+        }
+
+# Role reports served by /api/reports
+role_reports = ReportService(
+    refresh_seconds=float(os.getenv("BDMS_REPORTS_REFRESH_SECONDS", "30")),
+    cache=ResponseCache(
+        max_entries=int(os.getenv("BDMS_REPORTS_CACHE_ENTRIES", "256")),
+        ttl_seconds=float(os.getenv("BDMS_REPORTS_CACHE_TTL_SECONDS", "3600")),
+    ),
+)
@@ -0,0 +1,322 @@
+"""
+Due-date scheduler for planned (FreedomFuture) transactions.
+Keeps unpaid entries in a min-heap keyed by next due date and posts every due
+occurrence to the ledger in one batched write per run. Recurring entries are
+stored once and expanded lazily, one occurrence at a time.
+"""
+
+import asyncio
+import calendar
+import heapq
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+from ..database.database import get_async_db_session, run_write
+from ..database.models import FutureTransaction, Transaction
+from ..schemas.future_schemas import SchedulerRun
+from .changes import change_feed
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FREQUENCY_DAYS = {"daily": 1, "weekly": 7}
+FREQUENCY_MONTHS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+
+# Ids per IN() clause when loading due entries
+ID_BATCH = 10000
+
+def add_months(day: date, months: int) -> date:
+    """
+    Shift a date by whole months, clamping to the last day of shorter months.
+
+    Args:
+        day (date): Start date
+        months (int): Months to add
+
+    Returns:
+        date: Shifted date
+    """
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+def occurrence_date(
+    start_date: str,
+    frequency: str,
+    interval: int,
+    n: int,
+    max_occurrences: Optional[int] = None,
+    end_date: Optional[str] = None
+) -> Optional[str]:
+    """
+    Date of the n-th (0-based) occurrence of a planned transaction.
+    Computed from the start date rather than the previous occurrence, so a
+    monthly entry on the 31st comes back to the 31st after a short month.
+
+    Args:
+        start_date (str): ISO date of the first occurrence
+        frequency (str): once, daily, weekly, monthly, quarterly or yearly
+        interval (int): Recur every N frequency units
+        n (int): Occurrence index
+        max_occurrences (Optional[int]): Number of occurrences in the series
+        end_date (Optional[str]): Last ISO date an occurrence may fall on
+
+    Returns:
+        Optional[str]: ISO date, or None when the series has ended
+    """
+    if max_occurrences is not None and n >= max_occurrences:
+        return None
+    start = date.fromisoformat(start_date)
+    if frequency == "once":
+        day = start if n == 0 else None
+    elif frequency in FREQUENCY_DAYS:
+        day = start + timedelta(days=FREQUENCY_DAYS[frequency] * interval * n)
+    else:
+        day = add_months(start, FREQUENCY_MONTHS[frequency] * interval * n)
+    if day is None or (end_date is not None and day.isoformat() > end_date):
+        return None
+    return day.isoformat()
+
+def next_occurrence(entry: FutureTransaction) -> Optional[str]:
+    """
+    Next unposted occurrence of a planned transaction.
+
+    Args:
+        entry (FutureTransaction): Planned transaction
+
+    Returns:
+        Optional[str]: ISO date, or None when the series has ended
+    """
+    return occurrence_date(
+        entry.start_date, entry.frequency, entry.interval, entry.occurrences,
+        entry.max_occurrences, entry.end_date
+    )
+
+async def post_due(
+    db: AsyncSession,
+    as_of: str,
+    entry_ids: Optional[Sequence[int]] = None
+) -> Tuple[SchedulerRun, List[Tuple[str, int]]]:
+    """
+    Post every occurrence due on or before as_of in one write transaction.
+    Each entry is re-checked inside the transaction, so concurrent runs (or
+    other worker processes) never post the same occurrence twice.
+
+    Args:
+        db (AsyncSession): Database session
+        as_of (str): ISO date up to which occurrences are due
+        entry_ids (Optional[Sequence[int]]): Candidate entries; None to find them by index
+
+    Returns:
+        Tuple[SchedulerRun, List[Tuple[str, int]]]: Run counts and the (next_due, id)
+            of every entry that is still pending
+    """
+    async def _post(session: AsyncSession):
+        due = (FutureTransaction.paid.is_(False)) & (FutureTransaction.next_due <= as_of)
+        if entry_ids is None:
+            result = await session.execute(select(FutureTransaction).where(due))
+            entries = list(result.scalars().all())
+        else:
+            entries = []
+            for start in range(0, len(entry_ids), ID_BATCH):
+                batch = entry_ids[start:start + ID_BATCH]
+                result = await session.execute(
+                    select(FutureTransaction).where(due, FutureTransaction.id.in_(batch))
+                )
+                entries.extend(result.scalars().all())
+
+        postings: List[Dict[str, object]] = []
+        pending: List[Tuple[str, int]] = []
+        completed = 0
+        for entry in entries:
+            while entry.next_due is not None and entry.next_due <= as_of:
+                postings.append({
+                    "date": entry.next_due,
+                    "description": entry.description,
+                    "amount": entry.amount,
+                    "payment_mode": entry.payment_mode,
+                    "account_id": entry.account_id,
+                    "department": entry.department,
+                    "category": entry.category,
+                })
+                entry.occurrences += 1
+                entry.next_due = next_occurrence(entry)
+            if entry.next_due is None:
+                entry.paid = True
+                completed += 1
+            else:
+                pending.append((entry.next_due, entry.id))
+        if postings:
+            await session.execute(insert(Transaction), postings)
+        await session.flush()
+        run = SchedulerRun(as_of=as_of, entries=len(entries), posted=len(postings), completed=completed)
+        return run, pending
+
+    run, pending = await run_write(db, _post)
+    if run.posted:
+        change_feed.publish("transaction", "reload", count=run.posted)
+    return run, pending
+
+class FutureScheduler:
+    """
+    Min-heap of (next_due, entry id) for unpaid planned transactions.
+
+    Writes push the new due date of an entry; superseded heap items are not
+    removed but dropped when popped (post_due re-checks every entry), so a run
+    only touches entries that are actually due. A background task sleeps until
+    the earliest due date (or midnight) and then runs.
+    """
+
+    def __init__(self, enabled: bool = True, poll_seconds: float = 3600.0):
+        """
+        Args:
+            enabled (bool): Run the background task
+            poll_seconds (float): Longest sleep between due checks
+        """
+        self.enabled = enabled
+        self.poll_seconds = poll_seconds
+        self.runs = 0
+        self.last_run: Optional[SchedulerRun] = None
+        self._heap: List[Tuple[str, int]] = []
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def push(self, entry_id: int, next_due: Optional[str]) -> None:
+        """
+        Queue an entry under its next due date.
+
+        Args:
+            entry_id (int): Planned transaction ID
+            next_due (Optional[str]): ISO due date (None for finished entries)
+        """
+        if not self._loaded or next_due is None:
+            return
+        heapq.heappush(self._heap, (next_due, entry_id))
+        if next_due <= date.today().isoformat():
+            self._wake.set()
+
+    def _pop_due(self, as_of: str) -> List[Tuple[str, int]]:
+        """Pop every heap item due on or before as_of."""
+        popped = []
+        while self._heap and self._heap[0][0] <= as_of:
+            popped.append(heapq.heappop(self._heap))
+        return popped
+
+    async def load(self) -> None:
+        """Build the heap from unpaid entries (id and due date only)."""
+        async with get_async_db_session() as db:
+            result = await db.execute(
+                select(FutureTransaction.next_due, FutureTransaction.id).where(
+                    FutureTransaction.paid.is_(False), FutureTransaction.next_due.is_not(None)
+                )
+            )
+            self._heap = [tuple(row) for row in result.all()]
+        heapq.heapify(self._heap)
+        self._loaded = True
+        logger.info(f"Scheduler loaded {len(self._heap)} planned transactions")
+
+    async def run(self, db: Optional[AsyncSession] = None, as_of: Optional[str] = None) -> SchedulerRun:
+        """
+        Post everything due on or before as_of (default today).
+
+        Args:
+            db (Optional[AsyncSession]): Database session; a new one when None
+            as_of (Optional[str]): ISO date
+
+        Returns:
+            SchedulerRun: Run counts
+        """
+        as_of = as_of or date.today().isoformat()
+        async with self._lock:
+            popped = self._pop_due(as_of) if self._loaded else None
+            entry_ids = sorted({entry_id for _, entry_id in popped}) if popped is not None else None
+            try:
+                if entry_ids == []:
+                    run, pending = SchedulerRun(as_of=as_of, entries=0, posted=0, completed=0), []
+                elif db is None:
+                    async with get_async_db_session() as session:
+                        run, pending = await post_due(session, as_of, entry_ids)
+                else:
+                    run, pending = await post_due(db, as_of, entry_ids)
+            except Exception:
+                for item in popped or []:
+                    heapq.heappush(self._heap, item)
+                raise
+            for item in pending:
+                if self._loaded:
+                    heapq.heappush(self._heap, item)
+            self.runs += 1
+            self.last_run = run
+        logger.info(f"Scheduler run as of {as_of}: {run.posted} posted from {run.entries} entries")
+        return run
+
+    def _sleep_seconds(self) -> float:
+        """Seconds until the next due check: now if anything is due, else midnight."""
+        if self._heap and self._heap[0][0] <= date.today().isoformat():
+            return 0.0
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return min(self.poll_seconds, (midnight - now).total_seconds() + 1)
+
+    async def _loop(self) -> None:
+        """Background task: run whenever the earliest entry falls due."""
+        while True:
+            self._wake.clear()
+            try:
+                if self._sleep_seconds() == 0.0:
+                    await self.run()
+                    continue
+                await asyncio.wait_for(self._wake.wait(), timeout=self._sleep_seconds())
+            except asyncio.TimeoutError:
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduler run failed: {str(e)}")
+                await asyncio.sleep(min(self.poll_seconds, 60.0))
+
+    async def start(self) -> None:
+        """Load the heap and start the background task (if enabled)."""
+        if not self.enabled or self._task is not None:
+            return
+        await self.load()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the background task, waiting for an in-flight run to finish."""
+        if self._task is None:
+            return
+        async with self._lock:
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def status(self) -> dict:
+        """
+        Scheduler state for monitoring.
+
+        Returns:
+            dict: Fields of SchedulerStatus
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queued": len(self._heap),
+            "next_due": self._heap[0][0] if self._heap else None,
+            "last_run": self.last_run,
+            "runs": self.runs,
+        }
+
+# Scheduler for planned transactions
+future_scheduler = FutureScheduler(
+    enabled=os.getenv("BDMS_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+    poll_seconds=float(os.getenv("BDMS_SCHEDULER_POLL_SECONDS", "3600")),
+)
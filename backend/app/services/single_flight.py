@@ -0,0 +1,88 @@
+"""
+Request coalescing for hot reads.
+Identical reads that arrive while one is already running wait for that
+one's result instead of running the same query again.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Shares one in-flight call among concurrent callers with the same key.
+
+    The first caller (the leader) runs the call; callers arriving before it
+    finishes get its result or its exception. Results are shared, so calls
+    should return immutable values such as serialized bodies. Keys must
+    change whenever a result started earlier would be stale for a new caller
+    (for example by including a write generation). If the leader is
+    cancelled, a waiting caller takes over and runs the call itself.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.shared = 0
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, or join the identical call already in flight.
+
+        Args:
+            key (Hashable): Identity of the call
+            call (Callable[[], Awaitable[Any]]): Produces the result
+
+        Returns:
+            Any: The result of this call or of the one joined
+
+        Raises:
+            Exception: Whatever the call raised
+        """
+        while key in self._calls:
+            future = self._calls[key]
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled (its client went away): lead instead
+                continue
+            self.shared += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved: there may be no other caller to receive it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters for monitoring.
+
+        Returns:
+            Dict[str, int]: Calls run, calls answered by joining another, calls in flight
+        """
+        return {"leaders": self.leaders, "shared": self.shared, "in_flight": len(self._calls)}
+
+# Coalesces identical file record reads
+file_reads = SingleFlight()
@@ -0,0 +1,473 @@
+"""
+Service layer for handling transaction business logic.
+Implements ledger CRUD, imports and aggregations.
+"""
+
+from datetime import date, datetime
+from typing import Any, AsyncIterable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, select, insert, func, and_
+from pydantic import ValidationError
+import logging
+from ..database.database import run_write
+from ..database.models import Transaction, TransactionRollup
+from ..schemas.file_schemas import BulkIngestResult, BulkRowError
+from ..schemas.transaction_schemas import (
+    TransactionCreate, TransactionUpdate, TransactionQuery
+)
+from .ingest import ParsedRow
+from .export import export_columns
+from .changes import change_feed
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Date formats accepted for ledger dates; DD-MON-YY is the TransactionsPast sheet format
+LEDGER_DATE_FORMATS = ("%d-%b-%y", "%d-%b-%Y", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y")
+
+def normalize_ledger_date(value: str) -> str:
+    """
+    Convert a ledger date to ISO format (YYYY-MM-DD).
+    
+    Args:
+        value (str): ISO date or one of LEDGER_DATE_FORMATS
+    
+    Returns:
+        str: ISO date
+    
+    Raises:
+        ValueError: If the date cannot be parsed
+    """
+    text_value = value.strip()
+    try:
+        return date.fromisoformat(text_value[:10]).isoformat()
+    except ValueError:
+        pass
+    for fmt in LEDGER_DATE_FORMATS:
+        try:
+            return datetime.strptime(text_value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date '{value}'")
+
+def snapshot(record: Transaction) -> Dict[str, Any]:
+    """Plain dict copy of a transaction's column values."""
+    return {column.name: getattr(record, column.name) for column in Transaction.__table__.columns}
+
+def _day(model):
+    """
+    SQL expression for the ISO day of a ledger or rollup row. Ledger dates are
+    normalized on write, so the bare column is compared and its index is usable.
+    """
+    if model is TransactionRollup:
+        return TransactionRollup.day
+    return Transaction.date
+
+def date_bucket(day, bucket: str):
+    """SQL expression truncating an ISO day to the requested bucket."""
+    if bucket == "year":
+        return func.substr(day, 1, 4)
+    if bucket == "month":
+        return func.substr(day, 1, 7)
+    if bucket == "week":
+        return func.strftime("%Y-W%W", day)
+    return day
+
+class TransactionService:
+    """
+    Service class for handling transaction operations.
+    Implements business logic and database interactions for the ledger.
+    """
+    
+    @staticmethod
+    async def create_transaction(db: AsyncSession, transaction_data: TransactionCreate) -> Transaction:
+        """
+        Create a new transaction.
+
+        Args:
+            db (AsyncSession): Database session
+            transaction_data (TransactionCreate): Transaction data to create
+
+        Returns:
+            Transaction: Created transaction
+
+        Raises:
+            ValueError: If the date cannot be parsed
+            Exception: If creation fails
+        """
+        try:
+            logger.info(f"Creating new transaction: {transaction_data.description}")
+            values = transaction_data.model_dump()
+            values["date"] = normalize_ledger_date(values["date"])
+            
+            async def _create(session: AsyncSession) -> Transaction:
+                db_transaction = Transaction(**values)
+                session.add(db_transaction)
+                await session.flush()
+                return db_transaction
+                
+            db_transaction = await run_write(db, _create)
+            change_feed.publish("transaction", "created", [snapshot(db_transaction)])
+            logger.info(f"Transaction created successfully: {db_transaction.id}")
+            return db_transaction
+        except Exception as e:
+            logger.error(f"Error creating transaction: {str(e)}")
+            raise
+            
+    @staticmethod
+    async def get_transaction(db: AsyncSession, transaction_id: int) -> Optional[Transaction]:
+        """
+        Retrieve a transaction by ID.
+
+        Args:
+            db (AsyncSession): Database session
+            transaction_id (int): ID of the transaction to retrieve
+
+        Returns:
+            Optional[Transaction]: Found transaction or None
+        """
+        logger.info(f"Retrieving transaction: {transaction_id}")
+        result = await db.execute(select(Transaction).where(Transaction.id == transaction_id))
+        return result.scalars().first()
+        
+    @staticmethod
+    async def get_transactions(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        query_params: Optional[TransactionQuery] = None
+    ) -> List[Transaction]:
+        """
+        Retrieve transactions with optional filtering, newest first.
+
+        Args:
+            db (AsyncSession): Database session
+            skip (int): Number of transactions to skip
+            limit (int): Maximum number of transactions to return
+            query_params (TransactionQuery): Optional query parameters for filtering
+
+        Returns:
+            List[Transaction]: List of transactions
+
+        Raises:
+            ValueError: If a date filter cannot be parsed
+        """
+        logger.info("Retrieving transactions with filters")
+        query = TransactionService.build_list_query(query_params)
+        result = await db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+        
+    @staticmethod
+    def build_list_query(query_params: Optional[TransactionQuery] = None) -> Select:
+        """
+        Build the filtered listing query, ordered by date then id (newest first).
+        The date, department/date and category/date indexes serve both the
+        filters and the order.
+
+        Args:
+            query_params (TransactionQuery): Optional query parameters for filtering
+
+        Returns:
+            Select: Query selecting Transaction rows
+
+        Raises:
+            ValueError: If a date filter cannot be parsed
+        """
+        query = select(Transaction)
+        filters = TransactionService._build_filters(query_params)
+        if filters:
+            query = query.where(and_(*filters))
+        return query.order_by(Transaction.date.desc(), Transaction.id.desc())
+        
+    @staticmethod
+    async def update_transaction(
+        db: AsyncSession,
+        transaction_id: int,
+        transaction_data: TransactionUpdate
+    ) -> Optional[Transaction]:
+        """
+        Update an existing transaction.
+
+        Args:
+            db (AsyncSession): Database session
+            transaction_id (int): ID of the transaction to update
+            transaction_data (TransactionUpdate): Updated transaction data
+
+        Returns:
+            Optional[Transaction]: Updated transaction or None
+
+        Raises:
+            ValueError: If the date cannot be parsed
+            Exception: If update fails
+        """
+        try:
+            logger.info(f"Updating transaction: {transaction_id}")
+            update_data = transaction_data.model_dump(exclude_unset=True)
+            if update_data.get("date") is not None:
+                update_data["date"] = normalize_ledger_date(update_data["date"])
+                
+            async def _update(session: AsyncSession) -> Optional[Transaction]:
+                db_transaction = await session.get(Transaction, transaction_id)
+                if not db_transaction:
+                    return None
+                for key, value in update_data.items():
+                    setattr(db_transaction, key, value)
+                await session.flush()
+                return db_transaction
+                
+            db_transaction = await run_write(db, _update)
+            if db_transaction:
+                change_feed.publish("transaction", "updated", [snapshot(db_transaction)])
+                logger.info(f"Transaction updated successfully: {transaction_id}")
+            return db_transaction
+        except Exception as e:
+            logger.error(f"Error updating transaction: {str(e)}")
+            raise
+            
+    @staticmethod
+    async def delete_transaction(db: AsyncSession, transaction_id: int) -> bool:
+        """
+        Delete a transaction.
+
+        Args:
+            db (AsyncSession): Database session
+            transaction_id (int): ID of the transaction to delete
+
+        Returns:
+            bool: True if deleted successfully, False otherwise
+
+        Raises:
+            Exception: If deletion fails
+        """
+        try:
+            logger.info(f"Deleting transaction: {transaction_id}")
+            
+            async def _delete(session: AsyncSession) -> bool:
+                db_transaction = await session.get(Transaction, transaction_id)
+                if not db_transaction:
+                    return False
+                await session.delete(db_transaction)
+                await session.flush()
+                return True
+                
+            deleted = await run_write(db, _delete)
+            if deleted:
+                change_feed.publish("transaction", "deleted", ids=[transaction_id])
+                logger.info(f"Transaction deleted successfully: {transaction_id}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting transaction: {str(e)}")
+            raise
+            
+    @staticmethod
+    async def import_transactions(
+        db: AsyncSession,
+        rows: AsyncIterable[ParsedRow],
+        chunk_size: int = 5000,
+        max_errors: int = 1000
+    ) -> BulkIngestResult:
+        """
+        Validate and insert a stream of ledger rows in chunks.
+        Each chunk is validated against TransactionCreate and written with one
+        batched INSERT (the rollup triggers fire inside the same transaction).
+        Invalid rows are reported and skipped; only one chunk is held in memory.
+
+        Args:
+            db (AsyncSession): Database session
+            rows (AsyncIterable[ParsedRow]): Rows mapped onto transaction fields
+            chunk_size (int): Rows per validation/insert batch
+            max_errors (int): Maximum row errors listed in the result
+
+        Returns:
+            BulkIngestResult: Counts and per-row errors
+        """
+        logger.info(f"Importing transactions in chunks of {chunk_size}")
+        result = BulkIngestResult(received=0, inserted=0, failed=0)
+        chunk: List[Tuple[int, Dict[str, object]]] = []
+        
+        def reject(row_number: int, messages: List[str]) -> None:
+            result.failed += 1
+            if len(result.errors) < max_errors:
+                result.errors.append(BulkRowError(row=row_number, errors=messages))
+            else:
+                result.errors_truncated = True
+                
+        async def flush() -> None:
+            values = [value for _, value in chunk]
+            
+            async def _insert(session: AsyncSession) -> None:
+                await session.execute(insert(Transaction), values)
+                
+            try:
+                await run_write(db, _insert)
+                result.inserted += len(chunk)
+                change_feed.publish("transaction", "reload", count=len(chunk))
+            except Exception as e:
+                logger.error(f"Error inserting transaction chunk: {str(e)}")
+                for row_number, _ in chunk:
+                    reject(row_number, [f"Database error: {str(e)}"])
+            chunk.clear()
+            
+        async for row_number, payload in rows:
+            result.received += 1
+            if isinstance(payload, str):
+                reject(row_number, [payload])
+                continue
+            try:
+                values = TransactionCreate.model_validate(payload).model_dump()
+                values["date"] = normalize_ledger_date(values["date"])
+                chunk.append((row_number, values))
+            except ValidationError as e:
+                reject(row_number, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ])
+                continue
+            except ValueError as e:
+                reject(row_number, [f"date: {e}"])
+                continue
+            if len(chunk) >= chunk_size:
+                await flush()
+        if chunk:
+            await flush()
+            
+        logger.info(
+            f"Transaction import finished: {result.inserted} inserted, {result.failed} failed"
+        )
+        return result
+        
+    @staticmethod
+    async def get_summary(
+        db: AsyncSession,
+        query_params: Optional[TransactionQuery] = None,
+        group_by: Sequence[str] = ("department",),
+        bucket: str = "month"
+    ) -> Dict[str, Any]:
+        """
+        Aggregate transactions into totals, groups and distinct values.
+        Served from the incrementally maintained transaction_rollups table; only
+        amount range filters, which rollups cannot answer, fall back to the ledger.
+        
+        Args:
+            db (AsyncSession): Database session
+            query_params (TransactionQuery): Optional filters
+            group_by (Sequence[str]): Dimensions to group by (department, category,
+                payment_mode, period)
+            bucket (str): Date bucket of the period dimension (day, week, month, year)
+        
+        Returns:
+            Dict[str, Any]: totals, groups, distinct and source (TransactionSummary shape)
+        
+        Raises:
+            ValueError: If a date filter cannot be parsed
+        """
+        logger.info(f"Summarizing transactions by {list(group_by)}")
+        use_rollups = query_params is None or (
+            query_params.min_amount is None and query_params.max_amount is None
+        )
+        if use_rollups:
+            model = TransactionRollup
+            measures = [
+                func.coalesce(func.sum(TransactionRollup.txn_count), 0).label("count"),
+                func.coalesce(func.sum(TransactionRollup.total_amount), 0.0).label("total_amount"),
+                func.coalesce(func.sum(TransactionRollup.credit_amount), 0.0).label("credit_amount"),
+                func.coalesce(func.sum(TransactionRollup.debit_amount), 0.0).label("debit_amount"),
+            ]
+        else:
+            model = Transaction
+            measures = [
+                func.count().label("count"),
+                func.coalesce(func.sum(Transaction.amount), 0.0).label("total_amount"),
+                func.coalesce(func.sum(func.max(Transaction.amount, 0)), 0.0).label("credit_amount"),
+                func.coalesce(func.sum(func.min(Transaction.amount, 0)), 0.0).label("debit_amount"),
+            ]
+
+        dimensions = {
+            "department": model.department,
+            "category": model.category,
+            "payment_mode": model.payment_mode,
+            "period": date_bucket(_day(model), bucket),
+        }
+        filters = TransactionService._build_filters(query_params, model)
+        condition = and_(*filters) if filters else None
+
+        def where(query):
+            return query.where(condition) if condition is not None else query
+
+        totals = (await db.execute(where(select(*measures)))).one()._asdict()
+
+        groups: List[Dict[str, Any]] = []
+        if group_by:
+            columns = [dimensions[name].label(name) for name in group_by]
+            query = where(select(*columns, *measures)).group_by(*columns).order_by(*columns)
+            groups = [row._asdict() for row in await db.execute(query)]
+
+        distinct = {}
+        for name in ("department", "category", "payment_mode"):
+            column = dimensions[name]
+            query = where(select(column).distinct()).order_by(column)
+            distinct[name] = list((await db.execute(query)).scalars().all())
+
+        return {
+            "totals": totals,
+            "groups": groups,
+            "distinct": distinct,
+            "source": "rollup" if use_rollups else "ledger",
+        }
+
+    @staticmethod
+    def build_export_query(query_params: Optional[TransactionQuery] = None) -> Select:
+        """
+        Build the column query used to stream filtered transactions in id order.
+        Selects plain columns so rows are never hydrated into ORM objects.
+        
+        Args:
+            query_params (TransactionQuery): Optional filters
+        
+        Returns:
+            Select: Query over every transactions column
+        
+        Raises:
+            ValueError: If a date filter cannot be parsed
+        """
+        query = select(*export_columns(Transaction.__table__))
+        filters = TransactionService._build_filters(query_params)
+        if filters:
+            query = query.where(and_(*filters))
+        return query.order_by(Transaction.id)
+
+    @staticmethod
+    def _build_filters(query_params: Optional[TransactionQuery], model=Transaction) -> list:
+        """
+        Translate TransactionQuery parameters into filters on the ledger or rollups.
+        
+        Args:
+            query_params (TransactionQuery): Optional filters
+            model: Transaction or TransactionRollup (amount filters need the ledger)
+        
+        Returns:
+            list: Filter expressions to AND together
+        
+        Raises:
+            ValueError: If a date filter cannot be parsed
+        """
+        filters = []
+        day = _day(model)
+        if not query_params:
+            return filters
+        if query_params.department:
+            filters.append(model.department == query_params.department)
+        if query_params.category:
+            filters.append(model.category == query_params.category)
+        if query_params.payment_mode:
+            filters.append(model.payment_mode == query_params.payment_mode)
+        if query_params.start_date:
+            filters.append(day >= normalize_ledger_date(query_params.start_date))
+        if query_params.end_date:
+            filters.append(day <= normalize_ledger_date(query_params.end_date))
+        if query_params.min_amount is not None:
+            filters.append(Transaction.amount >= query_params.min_amount)
+        if query_params.max_amount is not None:
+            filters.append(Transaction.amount <= query_params.max_amount)
+        return filters
@@ -0,0 +1,4 @@
+"""
+Benchmark scripts for the BDMS backend.
+Run from the backend directory, e.g. ``python -m benchmarks.async_db``.
+"""
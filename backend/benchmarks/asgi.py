@@ -0,0 +1,48 @@
+"""
+Minimal in-process ASGI client for benchmarks.
+
+Calls the application coroutine directly with a synthetic HTTP scope, so
+the measurement covers routing, middleware, validation, the service layer
+and serialization without any socket or HTTP parsing cost.
+"""
+
+import asyncio
+from typing import Optional, Tuple
+from urllib.parse import urlencode
+
+
+async def asgi_request(app, method: str, path: str, params: Optional[dict] = None,
+                       body: bytes = b"", content_type: str = "application/json") -> Tuple[int, bytes]:
+    """Send one request to an ASGI app and return (status, response body)."""
+    query = urlencode(params or {}, doseq=True).encode()
+    headers = [(b"host", b"bench")]
+    if body:
+        headers += [(b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": query, "headers": headers,
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    sent = False
+    status = 0
+    chunks = []
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            # The client stays connected; streaming responses wait here until done
+            await asyncio.Event().wait()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
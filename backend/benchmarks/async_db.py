@@ -0,0 +1,213 @@
+"""
+Mixed read/write latency benchmark for the FileService database layer.
+
+Compares the async (aiosqlite) session path with the old pattern of running
+blocking SQLAlchemy session calls directly on the event loop. A background
+task issues slow full-table LIKE scans so the effect of one slow query on
+every other in-flight request shows up in the tail latencies.
+
+Usage (from the backend directory):
+    python -m benchmarks.async_db --rows 50000 --rate 500 --ops 4000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000, help="Rows to seed")
+    parser.add_argument("--concurrency", type=int, default=32, help="Max in-flight requests")
+    parser.add_argument("--rate", type=float, default=500.0, help="Arrival rate (ops/s)")
+    parser.add_argument("--ops", type=int, default=4000, help="Total operations per mode")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Fraction of writes")
+    parser.add_argument("--mode", choices=["async", "blocking", "both"], default="both")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--profile", default=None,
+                        help="SQLite storage profile (sets BDMS_SQLITE_PROFILE)")
+    return parser.parse_args()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: Dict[str, List[float]], elapsed: float) -> dict:
+    """Build a latency summary (milliseconds) per operation type."""
+    report = {}
+    everything = [value for values in latencies.values() for value in values]
+    for name, values in list(latencies.items()) + [("all", everything)]:
+        report[name] = {
+            "count": len(values),
+            "mean_ms": round(statistics.fmean(values) * 1000, 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 50) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "p99_ms": round(percentile(values, 99) * 1000, 3),
+        }
+    report["throughput_ops_per_s"] = round(len(everything) / elapsed, 1) if elapsed else 0.0
+    return report
+
+
+async def run_mode(mode: str, args: argparse.Namespace, max_id: int) -> dict:
+    """Run the mixed workload against one session strategy."""
+    from sqlalchemy import select
+    from app.database.database import SessionLocal, get_async_db_session
+    from app.database.models import FileRecord
+    from app.schemas.file_schemas import FileCreate, FileUpdate, FileQuery
+    from app.services.file_service import FileService
+
+    rng = random.Random(args.seed)
+    departments = ["Finance", "HR", "Engineering", "Sales", "Marketing", "IT"]
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    stop = asyncio.Event()
+
+    async def async_op(is_write: bool):
+        async with get_async_db_session() as db:
+            if is_write:
+                if rng.random() < 0.5:
+                    await FileService.create_file(db, FileCreate(
+                        file_name=f"bench_{rng.randrange(1 << 30)}.pdf", file_type="pdf",
+                        file_size=rng.randrange(1, 1 << 24), file_path="/bench/",
+                        department=rng.choice(departments), owner="bench"))
+                else:
+                    await FileService.update_file(db, rng.randrange(1, max_id + 1),
+                                                  FileUpdate(owner=f"owner_{rng.randrange(100)}"))
+            elif rng.random() < 0.5:
+                await FileService.get_file(db, rng.randrange(1, max_id + 1))
+            else:
+                await FileService.get_files(db, 0, 50, FileQuery(department=rng.choice(departments)))
+
+    async def blocking_op(is_write: bool):
+        # Old behaviour: synchronous session calls executed on the event loop.
+        db = SessionLocal()
+        try:
+            if is_write:
+                if rng.random() < 0.5:
+                    db.add(FileRecord(
+                        file_name=f"bench_{rng.randrange(1 << 30)}.pdf", file_type="pdf",
+                        file_size=rng.randrange(1, 1 << 24), file_path="/bench/",
+                        department=rng.choice(departments), owner="bench"))
+                else:
+                    record = db.get(FileRecord, rng.randrange(1, max_id + 1))
+                    if record:
+                        record.owner = f"owner_{rng.randrange(100)}"
+                db.commit()
+            elif rng.random() < 0.5:
+                db.get(FileRecord, rng.randrange(1, max_id + 1))
+            else:
+                db.execute(select(FileRecord).where(
+                    FileRecord.department == rng.choice(departments)).limit(50)).scalars().all()
+        finally:
+            db.close()
+
+    async def slow_scans():
+        # Unindexed leading-wildcard scans, the kind of query that used to stall the loop.
+        while not stop.is_set():
+            if mode == "async":
+                async with get_async_db_session() as db:
+                    await FileService.search_files(db, "zz_no_match", 100)
+            else:
+                db = SessionLocal()
+                try:
+                    db.execute(select(FileRecord).where(
+                        FileRecord.file_name.ilike("%zz_no_match%")).limit(100)).scalars().all()
+                finally:
+                    db.close()
+            await asyncio.sleep(0.01)
+
+    op = async_op if mode == "async" else blocking_op
+    in_flight = asyncio.Semaphore(args.concurrency)
+
+    async def request(is_write: bool, scheduled: float):
+        # Latency is measured from the scheduled arrival, so time spent waiting
+        # for a stalled event loop is charged to the request (no coordinated omission).
+        async with in_flight:
+            try:
+                await op(is_write)
+            except Exception as e:  # "database is locked" and friends count as samples too
+                logging.getLogger(__name__).debug(f"Benchmark op failed: {e}")
+        latencies["write" if is_write else "read"].append(time.perf_counter() - scheduled)
+
+    scanner = asyncio.create_task(slow_scans())
+    started = time.perf_counter()
+    interval = 1.0 / args.rate
+    tasks = []
+    for i in range(args.ops):
+        scheduled = started + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(rng.random() < args.write_ratio, scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await scanner
+    return summarize(latencies, elapsed)
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Seed a scratch database and benchmark the requested modes."""
+    logging.disable(logging.INFO)
+
+    from sqlalchemy import insert
+    from app.database import database
+    from app.database.database import engine, async_engine, writer_engine, init_db, close_db
+    from app.database.models import FileRecord
+
+    engine.echo = False
+    async_engine.echo = False
+    writer_engine.echo = False
+    await init_db()
+
+    rng = random.Random(args.seed)
+    departments = ["Finance", "HR", "Engineering", "Sales", "Marketing", "IT"]
+    with engine.begin() as conn:
+        batch = []
+        for i in range(args.rows):
+            batch.append({
+                "file_name": f"file_{i}.pdf", "file_type": "pdf",
+                "file_size": rng.randrange(1, 1 << 24), "file_path": "/seed/",
+                "department": rng.choice(departments), "owner": f"owner_{i % 500}",
+                "access_level": "internal",
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(FileRecord), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(FileRecord), batch)
+
+    modes = ["async", "blocking"] if args.mode == "both" else [args.mode]
+    results = {"database": database.database_path, "rows": args.rows,
+               "storage_profile": repr(database.storage_profile),
+               "concurrency": args.concurrency, "rate": args.rate, "ops": args.ops,
+               "write_ratio": args.write_ratio}
+    for mode in modes:
+        results[mode] = await run_mode(mode, args, args.rows)
+
+    await close_db()
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    scratch = tempfile.mkdtemp(prefix="bdms-bench-")
+    os.environ.setdefault("BDMS_DATABASE_PATH", os.path.join(scratch, "bench.db"))
+    if arguments.profile:
+        os.environ["BDMS_SQLITE_PROFILE"] = arguments.profile
+    asyncio.run(main(arguments))
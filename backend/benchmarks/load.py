@@ -0,0 +1,382 @@
+"""
+Load benchmark for the file API.
+
+Seeds ByteDB and transactions (see benchmarks.seed), then drives every route
+in file_router at a fixed concurrency, either in-process through the ASGI
+app or over HTTP against real uvicorn workers. Writes a JSON report with
+per-route throughput, p50/p95/p99 latency and peak RSS, suitable for diffing
+between commits.
+
+Usage (from the backend directory):
+    python -m benchmarks.load --size 10k --transport asgi --concurrency 16
+    python -m benchmarks.load --size 1m --transport uvicorn --workers 4 \\
+        --database /tmp/bdms-1m.db --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from .asgi import asgi_request
+from .async_db import percentile
+from .seed import FILE_DEPARTMENTS, FILE_TYPES, OWNERS, SIZES, WORDS, seed_database
+
+# (method, path, params, body, content type)
+Request = Tuple[str, str, Optional[dict], bytes, str]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", choices=sorted(SIZES, key=SIZES.get), default="10k",
+                        help="Rows seeded per table")
+    parser.add_argument("--transport", choices=["asgi", "uvicorn", "both"], default="asgi")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=0, help="uvicorn port (default: a free port)")
+    parser.add_argument("--routes", default=None, help="Comma-separated route names to run")
+    parser.add_argument("--database", default=None,
+                        help="SQLite file to seed and keep (reused when already seeded)")
+    parser.add_argument("--output", default=None, help="Write the report here instead of stdout")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+class Workload:
+    """Builds requests for each route; shares state between write phases."""
+
+    def __init__(self, rows: int, seed: int):
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.created: List[int] = []
+
+    def _filters(self) -> dict:
+        return {"department": self.rng.choice(FILE_DEPARTMENTS), "file_type": self.rng.choice(FILE_TYPES)}
+
+    def _record(self) -> dict:
+        return {
+            "file_name": f"load_{self.rng.randrange(1 << 30)}.pdf", "file_type": "pdf",
+            "file_size": self.rng.randrange(1, 1 << 24), "file_path": "/load/",
+            "department": self.rng.choice(FILE_DEPARTMENTS), "owner": self.rng.choice(OWNERS),
+        }
+
+    def record_created(self, status: int, body: bytes) -> None:
+        """Remember a created file_id so the delete phase can remove it."""
+        if status == 201:
+            self.created.append(json.loads(body)["file_id"])
+
+    def create(self) -> Request:
+        return "POST", "/api/files/", None, json.dumps(self._record()).encode(), "application/json"
+
+    def bulk(self) -> Request:
+        body = "".join(json.dumps(self._record()) + "\n" for _ in range(100)).encode()
+        return "POST", "/api/files/bulk", None, body, "application/x-ndjson"
+
+    def page(self) -> Request:
+        return "GET", "/api/files/page", {"limit": 100, **self._filters()}, b"", ""
+
+    def cache_stats(self) -> Request:
+        return "GET", "/api/files/cache/stats", None, b"", ""
+
+    def explain(self) -> Request:
+        return "GET", "/api/files/explain", {"sort_by": "file_size", **self._filters()}, b"", ""
+
+    def export(self) -> Request:
+        params = {"owner": self.rng.choice(OWNERS), **self._filters()}
+        return "GET", "/api/files/export", params, b"", ""
+
+    def get(self) -> Request:
+        return "GET", f"/api/files/{self.rng.randrange(1, self.rows + 1)}", None, b"", ""
+
+    def list(self) -> Request:
+        return "GET", "/api/files/", {"limit": 100, **self._filters()}, b"", ""
+
+    def update(self) -> Request:
+        body = json.dumps({"owner": self.rng.choice(OWNERS)}).encode()
+        return "PUT", f"/api/files/{self.rng.randrange(1, self.rows + 1)}", None, body, "application/json"
+
+    def delete(self) -> Request:
+        return "DELETE", f"/api/files/{self.created.pop()}", None, b"", ""
+
+    def search(self) -> Request:
+        return "GET", f"/api/files/search/{quote(self.rng.choice(WORDS))}", {"limit": 50}, b"", ""
+
+
+# Every file_router route: (name, Workload method, fraction of --requests).
+# Reads run first; deletes remove the records created by the create phase.
+ROUTES = [
+    ("get_file", "get", 1.0),
+    ("list_files", "list", 1.0),
+    ("page_files", "page", 1.0),
+    ("search_files", "search", 1.0),
+    ("explain_query", "explain", 0.2),
+    ("cache_stats", "cache_stats", 0.2),
+    ("export_files", "export", 0.05),
+    ("create_file", "create", 1.0),
+    ("bulk_create_files", "bulk", 0.05),
+    ("update_file", "update", 1.0),
+    ("delete_file", "delete", 1.0),
+]
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client connection (no third-party client needed)."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, params: Optional[dict], body: bytes,
+                      content_type: str) -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        target = path + ("?" + urlencode(params, doseq=True) if params else "")
+        head = f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+        if content_type:
+            head += f"Content-Type: {content_type}\r\n"
+        self.writer.write(head.encode() + b"\r\n" + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        chunks = []
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                chunks.append((await self.reader.readexactly(size + 2))[:-2])
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            chunks.append(await self.reader.readexactly(int(headers["content-length"])))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, b"".join(chunks)
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def run_route(send_factory: Callable, build: Callable[[], Request], count: int,
+                    concurrency: int, after: Optional[Callable[[int, bytes], None]] = None) -> dict:
+    """Issue count requests from concurrency workers; return the route's statistics."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = count
+
+    async def worker():
+        nonlocal remaining, errors
+        send, close = await send_factory()
+        try:
+            while remaining > 0:
+                remaining -= 1
+                request = build()
+                started = time.perf_counter()
+                try:
+                    status, body = await send(*request)
+                except Exception as e:
+                    logging.getLogger(__name__).debug(f"Request failed: {e}")
+                    status, body = 599, b""
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors += 1
+                elif after is not None:
+                    after(status, body)
+        finally:
+            await close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, count)))))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+async def run_routes(send_factory: Callable, args: argparse.Namespace, rows: int) -> Dict[str, dict]:
+    """Run every selected route in order with a fresh workload."""
+    workload = Workload(rows, args.seed)
+    selected = set(args.routes.split(",")) if args.routes else None
+    report = {}
+    for name, method, fraction in ROUTES:
+        if selected is not None and name not in selected:
+            continue
+        count = max(1, int(args.requests * fraction))
+        if method == "delete":
+            count = min(count, len(workload.created))
+            if not count:
+                continue
+        after = workload.record_created if method == "create" else None
+        report[name] = await run_route(send_factory, getattr(workload, method), count,
+                                       args.concurrency, after)
+    return report
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _process_tree_peak_rss_mb(pid: int) -> Dict[str, float]:
+    """VmHWM (peak RSS) of a process and its children, from /proc (Linux only)."""
+    pids = [pid]
+    try:
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                with open(f"/proc/{entry}/stat") as handle:
+                    if int(handle.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        pids.append(int(entry))
+    except OSError:
+        pass
+    peaks = {}
+    for child in pids:
+        try:
+            with open(f"/proc/{child}/status") as handle:
+                for line in handle:
+                    if line.startswith("VmHWM:"):
+                        peaks[str(child)] = round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            continue
+    return peaks
+
+
+async def run_asgi(args: argparse.Namespace, rows: int) -> dict:
+    """Drive the routes in-process through the ASGI app."""
+    from app.main import app
+
+    async def send_factory():
+        async def send(method, path, params, body, content_type):
+            return await asgi_request(app, method, path, params, body, content_type)
+
+        async def close():
+            return None
+        return send, close
+
+    routes = await run_routes(send_factory, args, rows)
+    return {"routes": routes, "peak_rss_mb": {"benchmark": _peak_rss_mb()}}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(args: argparse.Namespace, rows: int) -> dict:
+    """Drive the routes over HTTP against uvicorn worker processes."""
+    port = args.port or _free_port()
+    env = dict(os.environ, BDMS_SCHEDULER_ENABLED="false", BDMS_BALANCE_AUDIT_SECONDS="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        deadline = time.monotonic() + 120
+        while True:
+            probe = HttpConnection("127.0.0.1", port)
+            try:
+                if (await probe.request("GET", "/", None, b"", ""))[0] == 200:
+                    break
+            except OSError:
+                pass
+            finally:
+                await probe.close()
+            if server.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not start")
+            await asyncio.sleep(0.2)
+
+        async def send_factory():
+            connection = HttpConnection("127.0.0.1", port)
+            return connection.request, connection.close
+
+        routes = await run_routes(send_factory, args, rows)
+        peaks = _process_tree_peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {
+        "workers": args.workers,
+        "routes": routes,
+        "peak_rss_mb": {"benchmark": _peak_rss_mb(), "server": peaks,
+                        "server_total": round(sum(peaks.values()), 1)},
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    """Seed the database and run the selected transports."""
+    logging.disable(logging.INFO)
+    from app.database import database
+    from app.database.database import init_db, close_db
+
+    await init_db()
+    rows = SIZES[args.size]
+    seeded = seed_database(rows, args.seed)
+
+    report = {
+        "size": args.size,
+        "rows": rows,
+        "seed": seeded,
+        "database": database.database_path,
+        "concurrency": args.concurrency,
+        "requests_per_route": args.requests,
+        "storage_profile": repr(database.storage_profile),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    transports = ["asgi", "uvicorn"] if args.transport == "both" else [args.transport]
+    for transport in transports:
+        runner = run_asgi if transport == "asgi" else run_uvicorn
+        report[transport] = await runner(args, rows)
+    # Engines are disposed only once: re-creating the async pool while
+    # connections are first being opened concurrently can deadlock SQLAlchemy
+    await close_db()
+    return report
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.database:
+        os.environ["BDMS_DATABASE_PATH"] = os.path.abspath(arguments.database)
+    else:
+        os.environ.setdefault("BDMS_DATABASE_PATH",
+                              os.path.join(tempfile.mkdtemp(prefix="bdms-bench-"), "bench.db"))
+    os.environ.setdefault("BDMS_SCHEDULER_ENABLED", "false")
+    result = asyncio.run(main(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as out:
+            json.dump(result, out, indent=2)
+            out.write("\n")
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
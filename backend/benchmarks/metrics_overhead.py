@@ -0,0 +1,198 @@
+"""
+Overhead benchmark for the request and SQL metrics.
+
+Drives a set of read routes through the full ASGI application in-process,
+alternating rounds with metrics recording switched on and off, and reports
+the relative latency cost of the instrumentation. The response cache is
+disabled so every request reaches the database and the SQL hooks fire.
+
+Usage (from the backend directory):
+    python -m benchmarks.metrics_overhead --rows 50000 --rounds 20 --requests 200
+    python -m benchmarks.metrics_overhead --rows 2000 --quiet
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from .asgi import asgi_request
+from .async_db import percentile
+
+DEPARTMENTS = ["Finance", "HR", "Engineering", "Sales", "Marketing", "IT"]
+CATEGORIES = ["Rent", "Salary", "Travel", "Utilities", "Software", "Supplies"]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000, help="File records and transactions to seed")
+    parser.add_argument("--rounds", type=int, default=20, help="Rounds per mode (interleaved)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per round")
+    parser.add_argument("--iterations", type=int, default=20000,
+                        help="Iterations for the fixed-cost measurement")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Silence INFO logging instead of running at the default log level")
+    return parser.parse_args()
+
+
+def seed(rows: int, rng: random.Random) -> None:
+    """Insert synthetic file records and transactions."""
+    from sqlalchemy import insert
+    from app.database.database import engine
+    from app.database.models import FileRecord, Transaction
+
+    with engine.begin() as conn:
+        files, transactions = [], []
+        for i in range(rows):
+            files.append({
+                "file_name": f"file_{i}.pdf", "file_type": "pdf",
+                "file_size": rng.randrange(1, 1 << 24), "file_path": f"/seed/{i % 100}/",
+                "department": rng.choice(DEPARTMENTS), "owner": f"owner_{i % 500}",
+                "access_level": "internal",
+            })
+            transactions.append({
+                "date": f"20{rng.randrange(20, 25)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                "description": f"Payment {i}", "amount": round(rng.uniform(-50000, 50000), 2),
+                "payment_mode": "UPI", "account_id": f"ACC{i % 20}",
+                "department": rng.choice(DEPARTMENTS), "category": rng.choice(CATEGORIES),
+            })
+            if len(files) == 10000:
+                conn.execute(insert(FileRecord), files)
+                conn.execute(insert(Transaction), transactions)
+                files, transactions = [], []
+        if files:
+            conn.execute(insert(FileRecord), files)
+            conn.execute(insert(Transaction), transactions)
+
+
+def workload(rows: int, rng: random.Random):
+    """Yield (method, path, params) for a mix of read routes."""
+    while True:
+        choice = rng.random()
+        if choice < 0.4:
+            yield "GET", f"/api/files/{rng.randrange(1, rows + 1)}", None
+        elif choice < 0.7:
+            yield "GET", "/api/files/", {"department": rng.choice(DEPARTMENTS), "limit": 50}
+        elif choice < 0.9:
+            yield "GET", f"/api/transactions/{rng.randrange(1, rows + 1)}", None
+        else:
+            yield "GET", "/api/transactions/summary", {"group_by": "department"}
+
+
+async def run_round(app, requests, count: int) -> list:
+    """Issue count requests sequentially; return per-request latencies."""
+    samples = []
+    for _ in range(count):
+        method, path, params = next(requests)
+        started = time.perf_counter()
+        status, _ = await asgi_request(app, method, path, params)
+        samples.append(time.perf_counter() - started)
+        if status != 200:
+            raise RuntimeError(f"{method} {path} returned {status}")
+    return samples
+
+
+async def fixed_cost(iterations: int) -> dict:
+    """
+    Absolute cost of the instrumentation, measured without a database or
+    routing in the way: the middleware around a no-op app, and the cursor hooks
+    around SELECT 1 on an in-memory engine.
+    """
+    from sqlalchemy import create_engine, text
+    from app.services.metrics import MetricsMiddleware, MetricsRegistry, instrument_engine
+
+    async def noop_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    registry = MetricsRegistry()
+    wrapped = MetricsMiddleware(noop_app, registry)
+    memory = create_engine("sqlite://")
+    instrument_engine(memory, "bench", registry)
+    costs = {}
+    with memory.connect() as conn:
+        for name, enabled in (("off", False), ("on", True)):
+            registry.enabled = enabled
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await asgi_request(wrapped, "GET", "/")
+            request_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            for _ in range(iterations):
+                conn.execute(text("SELECT 1"))
+            costs[name] = (request_seconds / iterations, (time.perf_counter() - started) / iterations)
+    return {
+        "middleware_us": round((costs["on"][0] - costs["off"][0]) * 1e6, 3),
+        "statement_hook_us": round((costs["on"][1] - costs["off"][1]) * 1e6, 3),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Seed a scratch database and compare instrumented and plain rounds."""
+    if args.quiet:
+        logging.disable(logging.INFO)
+    from app.database import database
+    from app.database.database import engine, async_engine, writer_engine, init_db, close_db
+    from app.main import app
+    from app.services.metrics import metrics
+
+    engine.echo = async_engine.echo = writer_engine.echo = False
+    await init_db()
+    seed(args.rows, random.Random(args.seed))
+
+    requests = workload(args.rows, random.Random(args.seed))
+    # Warm up pools, statement caches and the page cache
+    await run_round(app, requests, args.requests)
+
+    rounds = {"on": [], "off": []}
+    samples = {"on": [], "off": []}
+    for i in range(args.rounds * 2):
+        # Alternate the order within each pair so drift does not favour one mode
+        mode = ("on", "off")[(i + i // 2) % 2]
+        metrics.enabled = mode == "on"
+        latencies = await run_round(app, requests, args.requests)
+        rounds[mode].append(statistics.fmean(latencies))
+        samples[mode].extend(latencies)
+    metrics.enabled = True
+
+    report = {"database": database.database_path, "rows": args.rows,
+              "rounds": args.rounds, "requests_per_round": args.requests}
+    for mode in ("on", "off"):
+        report[mode] = {
+            "median_round_mean_ms": round(statistics.median(rounds[mode]) * 1000, 4),
+            "p50_ms": round(percentile(samples[mode], 50) * 1000, 4),
+            "p99_ms": round(percentile(samples[mode], 99) * 1000, 4),
+        }
+    # Per-pair ratios cancel slow drift (page cache, WAL growth) between rounds
+    ratios = [on / off for on, off in zip(rounds["on"], rounds["off"])]
+    report["overhead_pct"] = round((statistics.median(ratios) - 1) * 100, 3)
+    # The end-to-end figure is noisy at this scale, so also derive the overhead
+    # from the measured fixed costs and the statements issued per request
+    report["fixed_cost"] = await fixed_cost(args.iterations)
+    statements = metrics.statement_duration.count()
+    http = metrics.request_duration.count()
+    per_request_us = (report["fixed_cost"]["middleware_us"]
+                      + report["fixed_cost"]["statement_hook_us"] * statements / max(http, 1))
+    report["statements_per_request"] = round(statements / max(http, 1), 2)
+    report["estimated_overhead_pct"] = round(per_request_us / (statistics.median(rounds["off"]) * 1e6) * 100, 3)
+    report["metrics_bytes"] = len(metrics.render())
+    await close_db()
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    scratch = tempfile.mkdtemp(prefix="bdms-bench-")
+    os.environ.setdefault("BDMS_DATABASE_PATH", os.path.join(scratch, "bench.db"))
+    os.environ.setdefault("BDMS_CACHE_ENABLED", "false")
+    os.environ.setdefault("BDMS_SCHEDULER_ENABLED", "false")
+    asyncio.run(main(arguments))
@@ -0,0 +1,127 @@
+"""
+Search benchmark: FTS5 index vs. the LIKE substring scan.
+
+Seeds a scratch database with synthetic file records and times
+FileService.search_files on both paths for a set of search terms.
+
+Usage (from the backend directory):
+    python -m benchmarks.search --rows 1000000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+from .async_db import percentile
+
+WORDS = [
+    "annual", "report", "budget", "invoice", "payroll", "roadmap", "handbook", "policy",
+    "contract", "forecast", "summary", "minutes", "design", "release", "audit", "backup",
+    "customer", "vendor", "quarterly", "campaign", "security", "training", "proposal", "draft",
+]
+DEPARTMENTS = ["Finance", "HR", "Engineering", "Sales", "Marketing", "IT", "Legal", "Product"]
+FIRST_NAMES = ["John", "Jane", "Mike", "Sarah", "David", "Lisa", "Tom", "Priya", "Arjun", "Meera"]
+LAST_NAMES = ["Doe", "Smith", "Johnson", "Wilson", "Brown", "Anderson", "Clark", "Rao", "Hegde"]
+TYPES = ["pdf", "docx", "xlsx", "csv", "png", "zip", "md"]
+TERMS = ["report", "rep", "budget forecast", "sarah", "finance", "audit 2019", "zzz_missing"]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per term and path")
+    parser.add_argument("--limit", type=int, default=100, help="Result limit per search")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+def seed(rows: int, rng: random.Random) -> None:
+    """Insert synthetic file records (the FTS triggers index them as they go)."""
+    from sqlalchemy import insert
+    from app.database.database import engine
+    from app.database.models import FileRecord
+
+    with engine.begin() as conn:
+        batch = []
+        for i in range(rows):
+            name = "_".join(rng.sample(WORDS, 2)) + f"_{rng.randrange(2000, 2025)}"
+            batch.append({
+                "file_name": f"{name}.{rng.choice(TYPES)}", "file_type": rng.choice(TYPES),
+                "file_size": rng.randrange(1, 1 << 26), "file_path": f"/seed/{i % 1000}/",
+                "department": rng.choice(DEPARTMENTS),
+                "owner": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "access_level": "internal",
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(FileRecord), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(FileRecord), batch)
+
+
+async def time_path(path: str, args: argparse.Namespace) -> dict:
+    """Time every search term on one path."""
+    from app.database.database import get_async_db_session
+    from app.services.file_service import FileService
+
+    report = {}
+    for term in TERMS:
+        samples = []
+        hits = 0
+        for _ in range(args.repeat):
+            async with get_async_db_session() as db:
+                started = time.perf_counter()
+                if path == "fts":
+                    results = await FileService.search_files(db, term, args.limit)
+                else:
+                    results = await FileService._search_files_like(db, term, args.limit)
+                samples.append(time.perf_counter() - started)
+                hits = len(results)
+        report[term] = {
+            "hits": hits,
+            "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        }
+    return report
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Seed a scratch database and compare both search paths."""
+    logging.disable(logging.INFO)
+    from app.database import database
+    from app.database.database import engine, async_engine, writer_engine, init_db, close_db
+    from app.database.fts import optimize_fts
+
+    engine.echo = async_engine.echo = writer_engine.echo = False
+    await init_db()
+
+    started = time.perf_counter()
+    seed(args.rows, random.Random(args.seed))
+    seed_seconds = time.perf_counter() - started
+    with engine.begin() as conn:
+        optimize_fts(conn)
+
+    results = {
+        "database": database.database_path,
+        "rows": args.rows,
+        "seed_seconds": round(seed_seconds, 2),
+        "fts": await time_path("fts", args),
+        "like": await time_path("like", args),
+    }
+    await close_db()
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    scratch = tempfile.mkdtemp(prefix="bdms-bench-")
+    os.environ.setdefault("BDMS_DATABASE_PATH", os.path.join(scratch, "bench.db"))
+    asyncio.run(main(arguments))
@@ -0,0 +1,172 @@
+"""
+Synthetic data for benchmarks.
+
+Seeds ByteDB (file records) and transactions at a named size. Transaction
+fields follow the TransactionsPast definitions in bdms-seed_ref.json:
+payment modes, departments and categories come from its enum values and
+account IDs use the documented prefix per category. A seeded database can
+be kept and reused across runs with --database.
+
+Usage (from the backend directory):
+    python -m benchmarks.seed --size 1m --database /tmp/bdms-1m.db
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+REFERENCE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "bdms-seed_ref.json")
+BATCH_ROWS = 20_000
+
+WORDS = [
+    "annual", "report", "budget", "invoice", "payroll", "roadmap", "handbook", "policy",
+    "contract", "forecast", "summary", "minutes", "design", "release", "audit", "backup",
+    "customer", "vendor", "quarterly", "campaign", "security", "training", "proposal", "draft",
+]
+FILE_DEPARTMENTS = ["Finance", "HR", "Engineering", "Sales", "Marketing", "IT", "Legal", "Product"]
+OWNERS = [f"{first} {last}" for first in ("John", "Jane", "Mike", "Sarah", "David", "Priya", "Arjun", "Meera")
+          for last in ("Doe", "Smith", "Rao", "Hegde", "Kittur", "Clark")]
+FILE_TYPES = ["pdf", "docx", "xlsx", "csv", "png", "zip", "md"]
+ACCESS_LEVELS = ["private", "internal", "public"]
+
+# Used when bdms-seed_ref.json is not available
+DEFAULT_REFERENCE = {
+    "PaymentMode": ["ICICI Current", "ICICI-CC-9003", "ICICI-CC-1009", "Cash", "SBI", "ICICI", "Credit"],
+    "Department": ["Serendipity", "Dhoom Studios", "Trademan"],
+    "Category": ["Salaries", "Hand Loans", "Maintenance", "Income", "EMI", "Chits"],
+}
+
+# AccID prefix per category, from the AccID rules in bdms-seed_ref.json
+ACCOUNT_PREFIXES = {
+    "Maintenance": "MAT", "Salaries": "SPY", "Income": "INC",
+    "Hand Loans": "HL", "EMI": "EMI", "Chits": "CHT",
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", choices=sorted(SIZES, key=SIZES.get), default="10k",
+                        help="Rows per table")
+    parser.add_argument("--database", default=None, help="SQLite file to seed (default: scratch dir)")
+    parser.add_argument("--reference", default=REFERENCE_PATH, help="Path to bdms-seed_ref.json")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+def load_reference(path: str = REFERENCE_PATH) -> Dict[str, List[str]]:
+    """Enum values of the TransactionsPast fields in bdms-seed_ref.json."""
+    reference = dict(DEFAULT_REFERENCE)
+    try:
+        with open(path) as handle:
+            tables = json.load(handle)["database_schema"]["tables"]
+    except (OSError, KeyError, ValueError):
+        return reference
+    for table in tables:
+        if table.get("name") != "TransactionsPast":
+            continue
+        for field in table.get("fields", []):
+            if field.get("name") in reference and field.get("enum_values"):
+                reference[field["name"]] = list(field["enum_values"])
+    return reference
+
+
+def file_rows(count: int, rng: random.Random, start: int = 0):
+    """Yield batches of synthetic ByteDB rows."""
+    now = datetime.utcnow()
+    batch = []
+    for i in range(start, start + count):
+        file_type = rng.choice(FILE_TYPES)
+        stamp = now - timedelta(seconds=rng.randrange(0, 3 * 365 * 86400))
+        batch.append({
+            "file_name": f"{'_'.join(rng.sample(WORDS, 2))}_{rng.randrange(2015, 2026)}.{file_type}",
+            "file_type": file_type, "file_size": rng.randrange(1, 1 << 28),
+            "file_path": f"/{rng.choice(FILE_DEPARTMENTS).lower()}/{i % 1000}/",
+            "department": rng.choice(FILE_DEPARTMENTS), "owner": rng.choice(OWNERS),
+            "access_level": rng.choice(ACCESS_LEVELS), "created_at": stamp, "updated_at": stamp,
+        })
+        if len(batch) == BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def transaction_rows(count: int, rng: random.Random, reference: Dict[str, List[str]]):
+    """Yield batches of synthetic transactions spread over the last five years."""
+    today = date.today()
+    batch = []
+    for i in range(count):
+        category = rng.choice(reference["Category"])
+        prefix = ACCOUNT_PREFIXES.get(category, category[:3].upper())
+        amount = round(rng.lognormvariate(9, 1.5), 2)
+        batch.append({
+            "date": (today - timedelta(days=rng.randrange(0, 5 * 365))).isoformat(),
+            "description": f"{rng.choice(OWNERS).split()[0]}_{category.replace(' ', '')}_{i % 12 + 1:02d}",
+            "amount": amount if category == "Income" else -amount,
+            "payment_mode": rng.choice(reference["PaymentMode"]),
+            "account_id": f"{prefix}-{rng.randrange(1, 40):03d}",
+            "department": rng.choice(reference["Department"]),
+            "category": category,
+            "zoho_match": rng.choice(("Yes", "No")),
+        })
+        if len(batch) == BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed_database(rows: int, seed: int = 42, reference_path: str = REFERENCE_PATH) -> dict:
+    """
+    Bring ByteDB and transactions up to rows rows each.
+    Tables that already hold enough rows are left alone, so a kept database is
+    reused as-is. The schema (and its triggers) must already exist.
+    """
+    from sqlalchemy import func, insert, select
+    from app.database.database import engine
+    from app.database.models import FileRecord, Transaction
+
+    rng = random.Random(seed)
+    reference = load_reference(reference_path)
+    started = time.perf_counter()
+    counts = {}
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(FileRecord)).scalar_one()
+        for batch in file_rows(max(0, rows - existing), rng, existing):
+            conn.execute(insert(FileRecord), batch)
+        counts["ByteDB"] = max(rows, existing)
+        existing = conn.execute(select(func.count()).select_from(Transaction)).scalar_one()
+        for batch in transaction_rows(max(0, rows - existing), rng, reference):
+            conn.execute(insert(Transaction), batch)
+        counts["transactions"] = max(rows, existing)
+    counts["seed_seconds"] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+def main(args: argparse.Namespace) -> None:
+    """Seed the database and print the row counts."""
+    logging.disable(logging.INFO)
+    from app.database.database import init_db_sync
+
+    init_db_sync()
+    json.dump(seed_database(SIZES[args.size], args.seed, args.reference), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.database:
+        os.environ["BDMS_DATABASE_PATH"] = os.path.abspath(arguments.database)
+    else:
+        os.environ.setdefault("BDMS_DATABASE_PATH",
+                              os.path.join(tempfile.mkdtemp(prefix="bdms-bench-"), "bench.db"))
+    main(arguments)
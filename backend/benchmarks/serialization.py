@@ -0,0 +1,110 @@
+"""
+Serialization microbenchmark for the file list endpoints.
+
+Times the default path (ORM objects validated through FileResponse) against
+the fast path (column tuples encoded directly) for get_files and search_files
+at several page sizes, reports rows/sec for each, and checks that both paths
+produce the same JSON.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --rows 20000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+from .async_db import percentile
+from .seed import file_rows
+
+LIMITS = [10, 100, 1000]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000, help="File records to seed")
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per path and page size")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+async def time_path(load, repeat: int) -> List[float]:
+    """Run load repeat times, each in a fresh session; return the durations."""
+    from app.database.database import get_async_db_session
+
+    samples = []
+    for _ in range(repeat):
+        async with get_async_db_session() as db:
+            started = time.perf_counter()
+            await load(db)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Seed a scratch database and compare both serialization paths."""
+    logging.disable(logging.INFO)
+    from pydantic import TypeAdapter
+    from sqlalchemy import insert
+    from app.database.database import engine, init_db, close_db, get_async_db_session
+    from app.database.models import FileRecord
+    from app.schemas.file_schemas import FileResponse, FileSearchResult
+    from app.services import fast_json
+    from app.services.file_service import FileService
+
+    await init_db()
+    with engine.begin() as conn:
+        for batch in file_rows(args.rows, random.Random(args.seed)):
+            conn.execute(insert(FileRecord), batch)
+
+    files = TypeAdapter(List[FileResponse])
+    results = TypeAdapter(List[FileSearchResult])
+
+    async def orm_list(db, limit):
+        records = await FileService.get_files(db, 0, limit)
+        return files.dump_json(files.validate_python(records, from_attributes=True))
+
+    async def orm_search(db, limit):
+        records = await FileService.search_files(db, "report", limit)
+        return results.dump_json(results.validate_python(records, from_attributes=True))
+
+    cases = {
+        "get_files": (orm_list, lambda db, limit: FileService.get_files_json(db, 0, limit)),
+        "search_files": (orm_search, lambda db, limit: FileService.search_files_json(db, "report", limit)),
+    }
+    report = {"rows": args.rows, "repeat": args.repeat,
+              "encoder": "orjson" if fast_json.orjson is not None else "pydantic-core"}
+    for name, (default, fast) in cases.items():
+        report[name] = {}
+        for limit in LIMITS:
+            async with get_async_db_session() as db:
+                expected, actual = await default(db, limit), await fast(db, limit)
+            returned = len(json.loads(expected))
+            entry = {"returned": returned, "identical_json": json.loads(expected) == json.loads(actual)}
+            for path, load in (("default", default), ("fast", fast)):
+                samples = await time_path(lambda db: load(db, limit), args.repeat)
+                median = percentile(samples, 50)
+                entry[path] = {
+                    "p50_ms": round(median * 1000, 3),
+                    "rows_per_s": round(returned / median) if median else 0,
+                }
+            entry["speedup"] = round(entry["fast"]["rows_per_s"] / max(entry["default"]["rows_per_s"], 1), 2)
+            report[name][str(limit)] = entry
+    await close_db()
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    scratch = tempfile.mkdtemp(prefix="bdms-bench-")
+    os.environ.setdefault("BDMS_DATABASE_PATH", os.path.join(scratch, "bench.db"))
+    asyncio.run(main(arguments))
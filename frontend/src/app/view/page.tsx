@@ -2,21 +2,11 @@
 
 import React, { useEffect, useState } from 'react';
 import { FiFilter, FiRefreshCw } from 'react-icons/fi';
-
-interface Transaction {
-  id: number;
-  date: string;
-  description: string;
-  amount: number;
-  payment_mode: string;
-  account_id: string;
-  department: string;
-  category: string;
-  zoho_match: string;
-}
+import { ChangeAPI, TransactionAPI } from '../../services/api';
+import { TransactionSummary } from '../../types/transaction';
 
 const ViewPage = () => {
-  const [transactions, setTransactions] = useState<Transaction[]>([]);
+  const [summary, setSummary] = useState<TransactionSummary | null>(null);
   const [loading, setLoading] = useState(true);
   const [filters, setFilters] = useState({
     department: '',
@@ -25,43 +15,40 @@ const ViewPage = () => {
   });
   const [isFilterModalOpen, setIsFilterModalOpen] = useState(false);
 
-  const fetchTransactions = async () => {
+  const fetchSummary = async () => {
     try {
       setLoading(true);
-      const queryParams = new URLSearchParams();
-      Object.entries(filters).forEach(([key, value]) => {
-        if (value) queryParams.append(key, value);
-      });
-
-      const response = await fetch(`/api/transactions?${queryParams}`);
-      const data = await response.json();
-      setTransactions(data);
+      const params = Object.fromEntries(
+        Object.entries(filters).filter(([, value]) => value)
+      );
+      setSummary(await TransactionAPI.getSummary(params, ['department']));
     } catch (error) {
-      console.error('Error fetching transactions:', error);
+      console.error('Error fetching transaction summary:', error);
     } finally {
       setLoading(false);
     }
   };
 
   useEffect(() => {
-    fetchTransactions();
+    fetchSummary();
+    // Totals are aggregates, so ledger changes trigger one re-fetch per burst
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const refetch = () => {
+      clearTimeout(timer);
+      timer = setTimeout(fetchSummary, 500);
+    };
+    const unsubscribe = ChangeAPI.subscribe(['transaction'], refetch, refetch);
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
   }, [filters]);
 
-  const uniqueDepartments = [...new Set(transactions.map(t => t.department))];
-  const uniqueCategories = [...new Set(transactions.map(t => t.category))];
-  const uniquePaymentModes = [...new Set(transactions.map(t => t.payment_mode))];
-
-  const getTotalAmount = () => {
-    return transactions.reduce((sum, t) => sum + t.amount, 0);
-  };
-
-  const getTransactionsByDepartment = () => {
-    const result: Record<string, number> = {};
-    transactions.forEach(t => {
-      result[t.department] = (result[t.department] || 0) + t.amount;
-    });
-    return result;
-  };
+  const uniqueDepartments = summary?.distinct.department ?? [];
+  const uniqueCategories = summary?.distinct.category ?? [];
+  const uniquePaymentModes = summary?.distinct.payment_mode ?? [];
+  const totalAmount = summary?.totals.total_amount ?? 0;
+  const departmentGroups = summary?.groups ?? [];
 
   return (
     <div className="p-6">
@@ -76,7 +63,7 @@ const ViewPage = () => {
             Filter
           </button>
           <button
-            onClick={fetchTransactions}
+            onClick={fetchSummary}
             className="flex items-center px-4 py-2 bg-indigo-600 text-white rounded-lg hover:bg-indigo-700"
           >
             <FiRefreshCw className="mr-2" />
@@ -89,11 +76,11 @@ const ViewPage = () => {
       <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-6">
         <div className="bg-white p-6 rounded-lg shadow">
           <h3 className="text-sm font-medium text-gray-500 mb-2">Total Amount</h3>
-          <p className="text-2xl font-bold text-gray-900">₹{getTotalAmount().toFixed(2)}</p>
+          <p className="text-2xl font-bold text-gray-900">₹{totalAmount.toFixed(2)}</p>
         </div>
         <div className="bg-white p-6 rounded-lg shadow">
           <h3 className="text-sm font-medium text-gray-500 mb-2">Total Transactions</h3>
-          <p className="text-2xl font-bold text-gray-900">{transactions.length}</p>
+          <p className="text-2xl font-bold text-gray-900">{summary?.totals.count ?? 0}</p>
         </div>
         <div className="bg-white p-6 rounded-lg shadow">
           <h3 className="text-sm font-medium text-gray-500 mb-2">Departments</h3>
@@ -105,15 +92,15 @@ const ViewPage = () => {
       <div className="bg-white rounded-lg shadow p-6 mb-6">
         <h2 className="text-lg font-semibold mb-4">Department-wise Breakdown</h2>
         <div className="space-y-4">
-          {Object.entries(getTransactionsByDepartment()).map(([dept, amount]) => (
-            <div key={dept} className="flex items-center">
+          {departmentGroups.map(({ department: dept, total_amount: amount }) => (
+            <div key={dept ?? ''} className="flex items-center">
               <div className="w-32 font-medium text-gray-700">{dept}</div>
               <div className="flex-1">
                 <div className="h-4 bg-gray-200 rounded-full overflow-hidden">
                   <div
                     className="h-full bg-indigo-600"
                     style={{
-                      width: `${(amount / getTotalAmount()) * 100}%`,
+                      width: `${(amount / totalAmount) * 100}%`,
                     }}
                   ></div>
                 </div>
@@ -4,7 +4,24 @@
  */
 
 import axios from 'axios';
-import { FileRecord, FileCreateInput, FileUpdateInput, FileQueryParams } from '../types/file';
+import {
+  FileRecord,
+  FileCreateInput,
+  FileUpdateInput,
+  FileQueryParams,
+  FilePage,
+  FilePageOptions,
+  FileBatchResult,
+  FileFacets,
+  DuplicateReport,
+} from '../types/file';
+import {
+  TransactionQueryParams,
+  TransactionSummary,
+  SummaryDimension,
+  SummaryBucket,
+} from '../types/transaction';
+import { ChangeEntity, ChangeEvent } from '../types/change';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api';
 
@@ -62,6 +79,49 @@ export const FileAPI = {
     return response.data;
   },
 
+  /**
+   * Get one page of file records using cursor (keyset) pagination.
+   * Pass the returned next_cursor back with the same filters to fetch the next page;
+   * every page costs the same no matter how deep it is.
+   * @param params Query parameters for filtering
+   * @param options Cursor, page size and sort order
+   * @returns Promise with the page of file records and the next cursor
+   */
+  getFilesPage: async (
+    params?: FileQueryParams,
+    options: FilePageOptions = {}
+  ): Promise<FilePage> => {
+    const { cursor, limit = 100, sortBy = 'file_id', order = 'asc' } = options;
+    const response = await api.get<FilePage>('/files/page', {
+      params: {
+        ...params,
+        ...(cursor ? { cursor } : {}),
+        limit,
+        sort_by: sortBy,
+        order,
+      },
+    });
+    return response.data;
+  },
+
+  /**
+   * Walk every file record matching the filters, one page at a time
+   * @param params Query parameters for filtering
+   * @param options Page size and sort order
+   * @returns Async iterator over pages of file records
+   */
+  iterateFiles: async function* (
+    params?: FileQueryParams,
+    options: Omit<FilePageOptions, 'cursor'> = {}
+  ): AsyncGenerator<FileRecord[]> {
+    let cursor: string | null = null;
+    do {
+      const page: FilePage = await FileAPI.getFilesPage(params, { ...options, cursor });
+      yield page.items;
+      cursor = page.next_cursor;
+    } while (cursor);
+  },
+
   /**
    * Update a file record
    * @param id File record ID
@@ -82,6 +142,77 @@ export const FileAPI = {
     await api.delete(`/files/${id}`);
   },
 
+  /**
+   * Get counts and size totals per department, owner, file type and access level
+   * for the filter sidebar. Each dimension ignores its own filter.
+   * @param params Query parameters for filtering
+   * @param limit Maximum values per dimension
+   * @returns Promise with totals and per-dimension counts
+   */
+  getFileFacets: async (params?: FileQueryParams, limit: number = 100): Promise<FileFacets> => {
+    const response = await api.get<FileFacets>('/files/facets', {
+      params: {
+        ...params,
+        limit,
+      },
+    });
+    return response.data;
+  },
+
+  /**
+   * Get files with identical content, grouped by content hash, with the bytes
+   * reclaimable per department
+   * @param params Query parameters for filtering
+   * @param skip Number of groups to skip
+   * @param limit Maximum number of groups to return
+   * @returns Promise with totals and duplicate groups
+   */
+  getDuplicateFiles: async (
+    params?: FileQueryParams,
+    skip: number = 0,
+    limit: number = 50
+  ): Promise<DuplicateReport> => {
+    const response = await api.get<DuplicateReport>('/files/duplicates', {
+      params: {
+        ...params,
+        skip,
+        limit,
+      },
+    });
+    return response.data;
+  },
+
+  /**
+   * Get many file records in one request
+   * @param ids File record IDs
+   * @returns Promise with per-ID outcomes (found or not_found)
+   */
+  getFilesBatch: async (ids: number[]): Promise<FileBatchResult> => {
+    const response = await api.post<FileBatchResult>('/files/batch/get', { file_ids: ids });
+    return response.data;
+  },
+
+  /**
+   * Apply the same update to many file records in one transaction
+   * @param ids File record IDs
+   * @param data Update data applied to every record
+   * @returns Promise with per-ID outcomes (updated or not_found)
+   */
+  updateFilesBatch: async (ids: number[], data: FileUpdateInput): Promise<FileBatchResult> => {
+    const response = await api.put<FileBatchResult>('/files/batch', { file_ids: ids, changes: data });
+    return response.data;
+  },
+
+  /**
+   * Delete many file records in one transaction
+   * @param ids File record IDs
+   * @returns Promise with per-ID outcomes (deleted or not_found)
+   */
+  deleteFilesBatch: async (ids: number[]): Promise<FileBatchResult> => {
+    const response = await api.post<FileBatchResult>('/files/batch/delete', { file_ids: ids });
+    return response.data;
+  },
+
   /**
    * Search file records
    * @param searchTerm Search term
@@ -96,6 +227,62 @@ export const FileAPI = {
   },
 };
 
+/**
+ * Transaction API Service
+ * Implements ledger queries and aggregations
+ */
+export const TransactionAPI = {
+  /**
+   * Get aggregated transactions (computed server-side)
+   * @param params Query parameters for filtering
+   * @param groupBy Dimensions to group by
+   * @param bucket Date bucket for the period dimension
+   * @returns Promise with totals, groups and distinct filter values
+   */
+  getSummary: async (
+    params?: TransactionQueryParams,
+    groupBy: SummaryDimension[] = ['department'],
+    bucket: SummaryBucket = 'month'
+  ): Promise<TransactionSummary> => {
+    const response = await api.get<TransactionSummary>('/transactions/summary', {
+      params: { ...params, group_by: groupBy, bucket },
+      paramsSerializer: { indexes: null },
+    });
+    return response.data;
+  },
+};
+
+/**
+ * Change Feed Service
+ * Streams committed writes so pages can apply deltas instead of re-fetching
+ */
+export const ChangeAPI = {
+  /**
+   * Subscribe to committed writes (Server-Sent Events). The browser reconnects
+   * on its own and resumes after the last event it received.
+   * @param entities Entities to receive events for
+   * @param onChange Called with each change
+   * @param onReset Called when events were missed; re-fetch everything shown
+   * @returns Function closing the subscription
+   */
+  subscribe: (
+    entities: ChangeEntity[],
+    onChange: (change: ChangeEvent) => void,
+    onReset: () => void
+  ): (() => void) => {
+    const params = new URLSearchParams();
+    entities.forEach((entity) => params.append('entity', entity));
+    const source = new EventSource(`${API_BASE_URL}/changes/?${params}`);
+    entities.forEach((entity) =>
+      source.addEventListener(entity, (event) =>
+        onChange(JSON.parse((event as MessageEvent).data) as ChangeEvent)
+      )
+    );
+    source.addEventListener('reset', onReset);
+    return () => source.close();
+  },
+};
+
 // Error handling interceptor
 api.interceptors.response.use(
   (response) => response,
@@ -0,0 +1,17 @@
+/**
+ * Type definitions for the change feed
+ */
+
+export type ChangeEntity = 'file' | 'transaction';
+
+export type ChangeOp = 'created' | 'updated' | 'deleted' | 'reload';
+
+export interface ChangeEvent<T = Record<string, unknown>> {
+  seq: number;
+  entity: ChangeEntity;
+  op: ChangeOp;
+  at: string;
+  count?: number | null;
+  rows?: T[] | null;
+  ids?: number[] | null;
+}
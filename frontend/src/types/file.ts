@@ -13,6 +13,7 @@ export interface FileRecord {
   access_level: string;
   created_at: string;
   updated_at: string;
+  content_hash?: string | null;
 }
 
 export interface FileCreateInput {
@@ -43,3 +44,77 @@ export interface FileQueryParams {
   min_size?: number;
   max_size?: number;
 }
+
+export type FileSortField =
+  | 'file_id'
+  | 'file_name'
+  | 'file_type'
+  | 'file_size'
+  | 'created_at'
+  | 'updated_at'
+  | 'department'
+  | 'owner'
+  | 'access_level';
+
+export interface FilePage {
+  items: FileRecord[];
+  next_cursor: string | null;
+}
+
+export interface FilePageOptions {
+  cursor?: string | null;
+  limit?: number;
+  sortBy?: FileSortField;
+  order?: 'asc' | 'desc';
+}
+
+export type FileBatchStatus = 'found' | 'updated' | 'deleted' | 'not_found';
+
+export interface FileBatchItem {
+  file_id: number;
+  status: FileBatchStatus;
+  file: FileRecord | null;
+}
+
+export interface FileBatchResult {
+  requested: number;
+  succeeded: number;
+  not_found: number;
+  results: FileBatchItem[];
+}
+
+export interface FacetValue {
+  value: string | null;
+  count: number;
+  total_size: number;
+}
+
+export interface FileFacets {
+  total: number;
+  total_size: number;
+  department: FacetValue[];
+  owner: FacetValue[];
+  file_type: FacetValue[];
+  access_level: FacetValue[];
+}
+
+export interface DuplicateGroup {
+  content_hash: string;
+  file_size: number;
+  count: number;
+  reclaimable_bytes: number;
+  files: FileRecord[];
+}
+
+export interface DepartmentReclaim {
+  department: string | null;
+  files: number;
+  reclaimable_bytes: number;
+}
+
+export interface DuplicateReport {
+  total_groups: number;
+  reclaimable_bytes: number;
+  departments: DepartmentReclaim[];
+  groups: DuplicateGroup[];
+}
@@ -0,0 +1,42 @@
+/**
+ * Type definitions for transactions
+ */
+
+export interface TransactionQueryParams {
+  department?: string;
+  category?: string;
+  payment_mode?: string;
+  min_amount?: number;
+  max_amount?: number;
+  start_date?: string;
+  end_date?: string;
+}
+
+export type SummaryDimension = 'department' | 'category' | 'payment_mode' | 'period';
+
+export type SummaryBucket = 'day' | 'week' | 'month' | 'year';
+
+export interface TransactionTotals {
+  count: number;
+  total_amount: number;
+  credit_amount: number;
+  debit_amount: number;
+}
+
+export interface TransactionGroup extends TransactionTotals {
+  department?: string | null;
+  category?: string | null;
+  payment_mode?: string | null;
+  period?: string | null;
+}
+
+export interface TransactionSummary {
+  totals: TransactionTotals;
+  groups: TransactionGroup[];
+  distinct: {
+    department: string[];
+    category: string[];
+    payment_mode: string[];
+  };
+  source: 'rollup' | 'ledger';
+}